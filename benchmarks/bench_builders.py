@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Time every derived-pipeline stage on a synthetic season.
+
+Generates a season with ``synthetic_season.generate_season`` in a temporary
+directory, points the pipeline's path constants at it, and runs
+``derived_pipeline.DERIVED_GRAPH`` ``--repeat`` times (sequentially, so each
+stage's time is its own) after an untimed warm-up run. Reports min/median wall time per stage plus
+snapshot loading, and optionally writes the numbers as JSON so runs from
+different commits can be diffed.
+
+Several ``--days`` values give a scaling sweep: a stage whose time grows
+faster than the number of days is the one to look at.
+
+Usage:
+    python benchmarks/bench_builders.py
+    python benchmarks/bench_builders.py --participants 30 --days 30 60 120 --captures 8 --repeat 3
+    python benchmarks/bench_builders.py --days 120 --output /tmp/bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import audit_manual_events  # noqa: E402,F401 — imported lazily by the audit stage; load it before patching paths
+import data_utils  # noqa: E402
+import derived_pipeline  # noqa: E402
+from builders.relations import get_all_snapshots  # noqa: E402
+from data_utils import SnapshotStore, clear_reaction_matrix_cache, get_cycle_calendar  # noqa: E402
+from synthetic_season import generate_season  # noqa: E402
+
+# Trees whose module-level Path constants get redirected to the season root
+_REDIRECTED = (REPO_ROOT / "data", REPO_ROOT / "docs")
+
+
+def _redirect(value: Path, root: Path) -> Path | None:
+    for base in _REDIRECTED:
+        try:
+            return root / base.name / value.relative_to(base)
+        except ValueError:
+            continue
+    return None
+
+
+@contextmanager
+def season_paths(root: Path) -> Iterator[None]:
+    """Run the pipeline against ``root/data`` and ``root/docs`` instead of the repo's.
+
+    Rewrites every module-level ``Path`` under the repo's ``data/`` or
+    ``docs/`` in the loaded pipeline modules, and chdirs to ``root`` for the
+    helpers that use cwd-relative paths. The confirmed ``CYCLE_END_DATES``
+    belong to the real season, so they are cleared and every cycle boundary
+    is inferred from the synthetic provas. Everything is restored on exit.
+    """
+    scripts_dir = str(REPO_ROOT / "scripts")
+    patched: list[tuple[Any, str, Path]] = []
+    for module in list(sys.modules.values()):
+        if not (getattr(module, "__file__", None) or "").startswith(scripts_dir):
+            continue
+        for attr, value in list(vars(module).items()):
+            if isinstance(value, Path) and (target := _redirect(value.resolve(), root)) is not None:
+                patched.append((module, attr, value))
+                setattr(module, attr, target)
+    cycle_end_dates = data_utils.CYCLE_END_DATES
+    data_utils.CYCLE_END_DATES = []
+    cwd = os.getcwd()
+    os.chdir(root)
+    data_utils._effective_cycle_end_dates_cached.cache_clear()
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+        data_utils.CYCLE_END_DATES = cycle_end_dates
+        for module, attr, value in patched:
+            setattr(module, attr, value)
+        data_utils._effective_cycle_end_dates_cached.cache_clear()
+        clear_reaction_matrix_cache()
+
+
+def _load_context(root: Path) -> tuple[dict[str, Any], float]:
+    clear_reaction_matrix_cache()
+    started = time.perf_counter()
+    store = SnapshotStore(root / "data" / "snapshots")
+    snapshots = get_all_snapshots(store)
+    daily_snapshots = store.daily()
+    load_s = time.perf_counter() - started
+
+    def read(name: str) -> dict:
+        with open(root / "data" / name, encoding="utf-8") as f:
+            return json.load(f)
+
+    manual_events, paredoes, provas_data = read("manual_events.json"), read("paredoes.json"), read("provas.json")
+    return {
+        "plan": None,
+        "store": store,
+        "snapshots": snapshots,
+        "daily_snapshots": daily_snapshots,
+        "manual_events": manual_events,
+        "paredoes": paredoes,
+        "provas_data": provas_data,
+        "calendar": get_cycle_calendar(manual_events, paredoes, provas_data),
+        "now": datetime.now(timezone.utc).isoformat(),
+        "verify_streaks": False,
+        "jobs": 1,
+    }, load_s
+
+
+def bench_season(root: Path, repeat: int = 3, warmup: int = 1) -> dict[str, dict[str, float]]:
+    """Run the whole stage graph ``warmup + repeat`` times on the season at ``root``.
+
+    Warm-up runs absorb one-time imports (jsonschema, sklearn, networkx) and
+    are discarded. Returns ``{stage: {"min_s", "median_s"}}`` over the timed
+    runs, with snapshot loading under ``load_snapshots`` and the whole run
+    under ``total``. Builder output on stdout is suppressed.
+    """
+    samples: dict[str, list[float]] = {}
+    with season_paths(root), open(os.devnull, "w") as devnull:
+        for directory in (root / "data" / "derived", root / "docs"):
+            directory.mkdir(parents=True, exist_ok=True)
+        for run in range(warmup + repeat):
+            with redirect_stdout(devnull):
+                context, load_s = _load_context(root)
+                started = time.perf_counter()
+                stats = derived_pipeline.DERIVED_GRAPH.run(context)
+                total = load_s + time.perf_counter() - started
+            if run < warmup:
+                continue
+            samples.setdefault("load_snapshots", []).append(load_s)
+            for name, s in stats.items():
+                samples.setdefault(name, []).append(s["wall_s"])
+            samples.setdefault("total", []).append(total)
+    return {
+        name: {"min_s": min(values), "median_s": statistics.median(values)}
+        for name, values in samples.items()
+    }
+
+
+def format_results(results: dict[str, dict[str, dict[str, float]]]) -> str:
+    """One row per stage, one median column per season size (slowest first)."""
+    seasons = list(results)
+    last = results[seasons[-1]]
+    stages = sorted((n for n in last if n != "total"), key=lambda n: -last[n]["median_s"]) + ["total"]
+    header = f"{'stage':<24}" + "".join(f"{label:>14}" for label in seasons)
+    lines = [header, "-" * len(header)]
+    for name in stages:
+        cells = "".join(
+            f"{results[label][name]['median_s']:>14.3f}" if name in results[label] else f"{'-':>14}"
+            for label in seasons
+        )
+        lines.append(f"{name:<24}{cells}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the derived builders on synthetic seasons.")
+    parser.add_argument("--participants", type=int, default=30)
+    parser.add_argument("--days", type=int, nargs="+", default=[120], help="One or more season lengths")
+    parser.add_argument("--captures", type=int, default=8, help="Captures per game day")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs before the timed ones")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for days in args.days:
+        label = f"{args.participants}p×{days}d"
+        with tempfile.TemporaryDirectory(prefix="bbb-bench-") as tmp:
+            started = time.perf_counter()
+            info = generate_season(tmp, args.participants, days, args.captures, seed=args.seed)
+            print(f"{label}: generated {info.snapshot_files} snapshots in {time.perf_counter() - started:.1f}s",
+                  file=sys.stderr)
+            results[label] = bench_season(Path(tmp), args.repeat, args.warmup)
+
+    print(format_results(results))
+    if args.output:
+        payload = {
+            "_metadata": {
+                "participants": args.participants,
+                "captures_per_day": args.captures,
+                "repeat": args.repeat,
+                "warmup": args.warmup,
+                "seed": args.seed,
+                "python": sys.version.split()[0],
+            },
+            "results": results,
+        }
+        args.output.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
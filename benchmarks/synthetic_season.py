@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Synthetic season generator for the builder benchmarks.
+
+Writes a self-contained data tree (``data/snapshots/*.json`` in the API
+format, ``manual_events.json``, ``paredoes.json``, ``provas.json`` and
+``votalhada/polls.json``) for a season of configurable size, so every
+derived builder can run on it exactly as it does on the real season.
+
+The season follows the real weekly rhythm: a Líder each week (each Prova do
+Líder opens a cycle), an Anjo and a Monstro mid-week, a three-way paredão with house votes, and one
+elimination per week (the house never drops below ``MIN_ACTIVE``). The
+queridômetro is a Markov chain: each day a pair keeps its label or, with
+probability ``change_rate``, draws a new one. Balances move every capture.
+
+Usage:
+    python benchmarks/synthetic_season.py /tmp/season --participants 30 --days 120 --captures 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+PREMIERE = date(2026, 1, 13)
+MIN_ACTIVE = 5
+
+# Label → draw weight (the real season is roughly half hearts)
+LABEL_WEIGHTS = {
+    "Coração": 0.55,
+    "Planta": 0.08, "Mala": 0.06, "Biscoito": 0.05, "Coração partido": 0.06,
+    "Cobra": 0.07, "Alvo": 0.05, "Vômito": 0.04, "Mentiroso": 0.04,
+}
+GROUPS = ("Camarote", "Veterano", "Pipoca")
+ROLE_COLORS = {
+    "Líder": "#FF7602", "Anjo": "#1EAED4", "Monstro": "#8244D4", "Imune": "#2EA348", "Paredão": "#AF0C10",
+}
+
+
+@dataclass
+class SeasonInfo:
+    root: Path
+    participants: int
+    days: int
+    captures_per_day: int
+    snapshot_files: int = 0
+    eliminated: list[str] = field(default_factory=list)
+
+
+def _role(label: str) -> dict:
+    color = ROLE_COLORS[label]
+    return {"label": label, "colors": {"primary": color, "secondary": color}}
+
+
+def _participant(pid: int, name: str, member_of: str, group: str, balance: int, roles: list[str],
+                 received: dict[str, list[tuple[int, str]]]) -> dict:
+    return {
+        "id": str(pid),
+        "name": name,
+        "avatar": f"https://example.com/avatars/{pid}.png",
+        "characteristics": {
+            "job": "Participante",
+            "group": group,
+            "memberOf": member_of,
+            "balance": balance,
+            "roles": [_role(r) for r in roles],
+            "mainRole": _role(roles[0]) if roles else None,
+            "eliminated": False,
+            "receivedReactions": [
+                {
+                    "label": label,
+                    "amount": len(givers),
+                    "participants": [{"id": str(gid), "name": gname} for gid, gname in givers],
+                }
+                for label, givers in received.items()
+            ],
+        },
+    }
+
+
+def _write_json(path: Path, payload: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+
+
+def generate_season(
+    root: str | Path,
+    participants: int = 30,
+    days: int = 120,
+    captures_per_day: int = 8,
+    change_rate: float = 0.15,
+    seed: int = 0,
+) -> SeasonInfo:
+    """Write a synthetic season under ``root`` (``root/data/...``) and describe it."""
+    rng = random.Random(seed)
+    root = Path(root)
+    data_dir = root / "data"
+    snap_dir = data_dir / "snapshots"
+    snap_dir.mkdir(parents=True, exist_ok=True)
+    info = SeasonInfo(root, participants, days, captures_per_day)
+
+    names = [f"Participante {i:02d}" for i in range(1, participants + 1)]
+    ids = {name: 100 + i for i, name in enumerate(names)}
+    member_of = {name: GROUPS[i % len(GROUPS)] for i, name in enumerate(names)}
+    balance = {name: 500 for name in names}
+    labels, weights = list(LABEL_WEIGHTS), list(LABEL_WEIGHTS.values())
+    reactions = {(g, r): rng.choices(labels, weights)[0] for g in names for r in names if g != r}
+
+    active = list(names)
+    manual_participants: dict[str, dict] = {}
+    power_events: list[dict] = []
+    paredoes: list[dict] = []
+    provas: list[dict] = []
+    polls: list[dict] = []
+    roles: dict[str, list[str]] = {}
+    nominees: list[str] = []
+    lider = None
+
+    for day in range(days):
+        game_date = PREMIERE + timedelta(days=day)
+        iso = game_date.isoformat()
+        week, weekday = divmod(day, 7)
+        cycle = week + 1
+
+        # ── Weekly events ──
+        if weekday == 0 and day > 0 and nominees and len(active) > MIN_ACTIVE:
+            out = rng.choice(nominees)
+            active.remove(out)
+            info.eliminated.append(out)
+            manual_participants[out] = {"status": "eliminada", "exit_date": iso}
+            votes = {n: rng.uniform(5, 30) for n in nominees}
+            votes[out] = 100 - sum(v for n, v in votes.items() if n != out)
+            paredoes[-1].update(status="finalizado", resultado={
+                "eliminado": out,
+                "votos": {n: {"voto_total": round(v, 2)} for n, v in votes.items()},
+            })
+            nominees = []
+        if weekday == 0:
+            lider = rng.choice(active)
+            roles = {lider: ["Líder"]}
+            ranking = rng.sample(active, len(active))
+            ranking.remove(lider)
+            provas.append({
+                "numero": len(provas) + 1, "tipo": "lider", "cycle": cycle, "date": iso, "nome": f"Prova do Líder {cycle}",
+                "vencedor": lider, "participantes_total": len(active),
+                "fases": [{"fase": 1, "tipo": "individual", "classificacao": [
+                    {"pos": pos, "nome": name} for pos, name in enumerate([lider] + ranking, start=1)
+                ]}],
+            })
+        if weekday == 2:
+            anjo, monstro = rng.sample([n for n in active if n != lider], 2)
+            roles[anjo] = ["Anjo"]
+            roles[monstro] = ["Monstro"]  # auto-detected from the API roles, no manual event
+        if weekday == 5 and len(active) > MIN_ACTIVE:
+            house = [n for n in active if n != lider]
+            indicado = rng.choice(house)
+            votos_casa = {n: rng.choice([h for h in house if h not in (n, indicado)]) for n in house}
+            tally: dict[str, int] = {}
+            for target in votos_casa.values():
+                tally[target] = tally.get(target, 0) + 1
+            voted = sorted(tally, key=lambda n: -tally[n])[:2]
+            nominees = [indicado] + voted
+            for n in nominees:
+                roles[n] = roles.get(n, []) + ["Paredão"]
+            power_events.append({
+                "date": iso, "type": "indicacao", "actor": lider, "target": indicado, "source": "Líder",
+                "impacto": "negativo", "origem": "manual", "cycle": cycle,
+                "fontes": ["https://example.com/synthetic"],
+            })
+            paredoes.append({
+                "numero": len(paredoes) + 1,
+                "status": "em_andamento",
+                "data": (game_date + timedelta(days=2)).isoformat(),
+                "data_formacao": iso,
+                "titulo": f"{len(paredoes) + 1}º Paredão",
+                "cycle": cycle,
+                "formacao": {"lider": lider, "indicado_lider": indicado},
+                "indicados_finais": [
+                    {"nome": n, "grupo": member_of[n], "como": "Líder" if n == indicado else "Casa"}
+                    for n in nominees
+                ],
+                "votos_casa": votos_casa,
+            })
+            shares = [rng.uniform(10, 60) for _ in nominees]
+            polls.append({
+                "numero": len(paredoes),
+                "data_paredao": paredoes[-1]["data"],
+                "participantes": nominees,
+                "consolidado": {
+                    **{n: round(100 * s / sum(shares), 2) for n, s in zip(nominees, shares)},
+                    "predicao_eliminado": nominees[shares.index(max(shares))],
+                },
+            })
+
+        # ── Daily queridômetro update ──
+        if day > 0:
+            for pair in reactions:
+                if rng.random() < change_rate:
+                    reactions[pair] = rng.choices(labels, weights)[0]
+
+        # ── Captures (BRT 07:00–21:00, i.e. same game date) ──
+        for capture in range(captures_per_day):
+            minutes = 10 * 60 + capture * (14 * 60 // captures_per_day)
+            captured = datetime(game_date.year, game_date.month, game_date.day, tzinfo=timezone.utc) + timedelta(
+                minutes=minutes, seconds=rng.randrange(60))
+            for name in active:
+                balance[name] = max(0, balance[name] + rng.choice((-50, 0, 0, 25, 100)))
+            group = "Vip" if week % 2 == 0 else "Xepa"
+            snapshot = []
+            for name in active:
+                received: dict[str, list[tuple[int, str]]] = {}
+                for giver in active:
+                    if giver != name:
+                        received.setdefault(reactions[(giver, name)], []).append((ids[giver], giver))
+                snapshot.append(_participant(
+                    ids[name], name, member_of[name], group if name in roles else "Xepa",
+                    balance[name], roles.get(name, []), received,
+                ))
+            _write_json(snap_dir / f"{captured.strftime('%Y-%m-%d_%H-%M-%S')}.json", {
+                "_metadata": {
+                    "captured_at": captured.isoformat(),
+                    "participant_count": len(snapshot),
+                    "synthetic_benchmark": True,
+                },
+                "participants": snapshot,
+            })
+            info.snapshot_files += 1
+
+    _write_json(data_dir / "manual_events.json", {
+        "participants": manual_participants,
+        "special_events": [],
+        "power_events": power_events,
+        "scheduled_events": [],
+        "cycles": [],
+    })
+    _write_json(data_dir / "paredoes.json", {"paredoes": paredoes})
+    _write_json(data_dir / "provas.json", {"provas": provas})
+    _write_json(data_dir / "votalhada" / "polls.json", {"paredoes": polls})
+    return info
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic season for benchmarking.")
+    parser.add_argument("root", type=Path, help="Output root (the data tree goes to ROOT/data)")
+    parser.add_argument("--participants", type=int, default=30)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--captures", type=int, default=8, help="Captures per game day")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    info = generate_season(args.root, args.participants, args.days, args.captures, seed=args.seed)
+    print(f"Wrote {info.snapshot_files} snapshots ({info.participants} participants × {info.days} days) "
+          f"to {info.root / 'data'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,4 +14,4 @@ build_derived_data = _impl.build_derived_data
 
 
 if __name__ == "__main__":
-    build_derived_data()
+    _impl.main()
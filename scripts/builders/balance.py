@@ -1,10 +1,14 @@
 """Balance event detection — mesada, compras, punições, prêmios, tá com nada."""
 from __future__ import annotations
 
+import json
 from datetime import datetime, timezone
 from collections import Counter, defaultdict
+from pathlib import Path
 
-from data_utils import get_cycle_number, UTC
+import numpy as np
+
+from data_utils import CycleCalendar, get_cycle_calendar, UTC, write_json_artifact
 
 # ── Constants ────────────────────────────────────────────────────────────────
 
@@ -84,6 +88,135 @@ def _get_balances(participants: list[dict]) -> dict[str, int]:
     return result
 
 
+# ── Balance time series ──────────────────────────────────────────────────────
+
+BALANCE_SERIES_VERSION = 1
+
+
+class BalanceSeries:
+    """Balances of every capture as a captures × participants int32 matrix.
+
+    ``present`` marks the participants listed in each capture (columns are
+    in order of first appearance). ``append()`` adds one capture, so a saved
+    series only pays for the captures added since; ``resumed()`` rebuilds
+    from scratch when the saved stems are not a prefix of the current ones.
+    """
+
+    def __init__(self, names: list[str] | None = None, stems: list[str] | None = None,
+                 balances: np.ndarray | None = None, present: np.ndarray | None = None) -> None:
+        self.names = list(names or [])
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.stems = list(stems or [])
+        shape = (max(len(self.stems), 16), max(len(self.names), 1))
+        # Row/column capacity doubles as captures and participants arrive
+        self._balances = np.zeros(shape, dtype=np.int32)
+        self._present = np.zeros(shape, dtype=bool)
+        if balances is not None:
+            self._balances[:balances.shape[0], :balances.shape[1]] = balances
+            self._present[:present.shape[0], :present.shape[1]] = present
+
+    @property
+    def balances(self) -> np.ndarray:
+        return self._balances[:len(self.stems), :len(self.names)]
+
+    @property
+    def present(self) -> np.ndarray:
+        return self._present[:len(self.stems), :len(self.names)]
+
+    def copy(self) -> BalanceSeries:
+        return BalanceSeries(self.names, self.stems, self.balances.copy(), self.present.copy())
+
+    def _reserve(self, rows: int, cols: int) -> None:
+        cap_rows, cap_cols = self._balances.shape
+        if rows <= cap_rows and cols <= cap_cols:
+            return
+        shape = tuple(cap if need <= cap else max(need, 2 * cap) for need, cap in ((rows, cap_rows), (cols, cap_cols)))
+        balances, present = np.zeros(shape, dtype=np.int32), np.zeros(shape, dtype=bool)
+        balances[:cap_rows, :cap_cols] = self._balances
+        present[:cap_rows, :cap_cols] = self._present
+        self._balances, self._present = balances, present
+
+    def append(self, snap: dict) -> None:
+        """Add one capture as the next row."""
+        row_balances = _get_balances(snap["participants"])
+        for name in row_balances:
+            if name not in self.index:
+                self.index[name] = len(self.names)
+                self.names.append(name)
+        row = len(self.stems)
+        self._reserve(row + 1, len(self.names))
+        cols = [self.index[name] for name in row_balances]
+        self._balances[row, cols] = list(row_balances.values())
+        self._present[row, cols] = True
+        self.stems.append(_snapshot_stem(snap))
+
+    def covers_prefix_of(self, snapshots: list[dict]) -> bool:
+        """True when this series' captures are the first captures of ``snapshots``."""
+        if len(self.stems) > len(snapshots):
+            return False
+        return all(_snapshot_stem(snap) == stem for snap, stem in zip(snapshots, self.stems))
+
+    def resumed(self, snapshots: list[dict]) -> BalanceSeries:
+        """Series covering all of ``snapshots``: this one extended, or a rebuild."""
+        if self.covers_prefix_of(snapshots):
+            series, remaining = self.copy(), snapshots[len(self.stems):]
+        else:
+            series, remaining = BalanceSeries(), snapshots
+        for snap in remaining:
+            series.append(snap)
+        return series
+
+    @classmethod
+    def build(cls, snapshots: list[dict]) -> BalanceSeries:
+        return cls().resumed(snapshots)
+
+    def transitions(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per consecutive-capture transition: deltas, new zero balances, active count.
+
+        Row ``t`` compares capture ``t`` with ``t + 1`` over the participants
+        present in both (exits and entries are not deltas).
+        """
+        balances, present = self.balances, self.present
+        common = present[:-1] & present[1:]
+        deltas = np.where(common, balances[1:] - balances[:-1], 0)
+        new_zeros = common & (balances[1:] == 0) & (balances[:-1] > 0)
+        return deltas, new_zeros, common.sum(axis=1)
+
+    def to_dict(self) -> dict:
+        return {
+            "_metadata": {"version": BALANCE_SERIES_VERSION},
+            "names": self.names,
+            "stems": self.stems,
+            "balances": self.balances.tolist(),
+            "present": self.present.astype(np.int8).tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BalanceSeries:
+        shape = (len(data["stems"]), len(data["names"]))
+        return cls(
+            data["names"],
+            data["stems"],
+            np.array(data["balances"], dtype=np.int32).reshape(shape),
+            np.array(data["present"], dtype=bool).reshape(shape),
+        )
+
+
+def load_balance_series(path: Path) -> BalanceSeries | None:
+    """Saved series, or None when missing, unreadable or from another version."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("_metadata", {}).get("version") != BALANCE_SERIES_VERSION:
+            return None
+        return BalanceSeries.from_dict(data)
+    except (FileNotFoundError, ValueError, KeyError, TypeError, IndexError):
+        return None
+
+
+def save_balance_series(series: BalanceSeries, path: Path) -> bool:
+    return write_json_artifact(path, series.to_dict())
+
+
 def _classify_event(
     gains: dict[str, int],
     losses: dict[str, int],
@@ -177,6 +310,7 @@ def _classify_punishment_severity(delta: int) -> dict:
 def _build_punishment_deep_dive(
     merged_events: list[dict],
     by_participant: dict[str, dict],
+    calendar: CycleCalendar | None = None,
 ) -> dict:
     """Build punishment analytics: recent list, who-lost-most, severity summary, tá-com-nada cycles.
 
@@ -240,7 +374,7 @@ def _build_punishment_deep_dive(
         dates = rec.get("ta_com_nada_dates", [])
         if len(dates) < 2:
             continue
-        cycles = [get_cycle_number(d) for d in sorted(dates)]
+        cycles = (calendar or get_cycle_calendar()).cycles_for(sorted(dates))
         gaps = [cycles[i + 1] - cycles[i] for i in range(len(cycles) - 1)]
         avg_gap = round(sum(gaps) / len(gaps), 1) if gaps else 0
         ta_com_nada_analysis[name] = {
@@ -314,15 +448,38 @@ def _events_should_merge(a: dict, b: dict) -> bool:
     return bool(names_a & names_b)
 
 
+def _event_time(e: dict) -> datetime:
+    """Event ``_timestamp`` as an aware datetime (``datetime.min`` when missing)."""
+    ts = e.get("_timestamp")
+    if ts is None:
+        return datetime.min.replace(tzinfo=UTC)
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=UTC)
+    return ts
+
+
 def _merge_events(events: list[dict]) -> list[dict]:
-    """Merge events within the time window that affect overlapping participants."""
+    """Merge events within the time window that affect overlapping participants.
+
+    ``events`` are sorted by ``_event_time``. A merged event whose latest
+    timestamp falls out of the window can absorb nothing later, so only
+    the ones still open are checked.
+    """
     if len(events) <= 1:
         return events
 
     merged: list[dict] = []
+    open_events: list[dict] = []
     for ev in events:
+        if ev.get("_timestamp") is not None:
+            ev_time = _event_time(ev)
+            open_events = [
+                m for m in open_events
+                if m.get("_timestamp") is None
+                or (ev_time - _event_time(m)).total_seconds() <= BALANCE_MERGE_WINDOW_SECONDS
+            ]
         did_merge = False
-        for m in merged:
+        for m in open_events:
             if _events_should_merge(m, ev):
                 # Merge: sum changes, keep earlier from_snapshot, later to_snapshot
                 for name, delta in ev["changes"].items():
@@ -334,6 +491,7 @@ def _merge_events(events: list[dict]) -> list[dict]:
                 break
         if not did_merge:
             merged.append(dict(ev))  # shallow copy
+            open_events.append(merged[-1])
 
     return merged
 
@@ -750,9 +908,6 @@ def _reclassify_monstro_anjo_events(events: list[dict]) -> list[dict]:
     - premio with single person at +500 matching an Anjo target → type=premio_anjo
     - dinamica with -300 and +500 matching Monstro/Anjo targets → type=monstro_anjo
     """
-    import json
-    from pathlib import Path
-
     auto_events_path = Path("data/derived/auto_events.json")
     if not auto_events_path.exists():
         return events
@@ -927,12 +1082,17 @@ def _reclassify_mesada_events(
 
 # ── Main builder ─────────────────────────────────────────────────────────────
 
-def build_balance_events(snapshots: list[dict]) -> dict:
+def build_balance_events(snapshots: list[dict], calendar: CycleCalendar | None = None,
+                         series: BalanceSeries | None = None) -> dict:
     """Detect and classify balance events from all snapshots.
 
     Args:
         snapshots: list of dicts with 'file', 'date', 'participants', 'metadata' keys
                    (from get_all_snapshots_with_data / get_all_snapshots in builders)
+        calendar: cycle calendar for the run (default: built from the data files)
+        series: balance series; used as is when it already ends at the last
+                capture (the pipeline's ``balance_series`` stage), otherwise
+                extended with the captures it lacks (default: built from ``snapshots``)
 
     Returns:
         dict with 'events', 'by_participant', 'weekly_summary', '_metadata'
@@ -946,60 +1106,46 @@ def build_balance_events(snapshots: list[dict]) -> dict:
             "weekly_summary": [],
         }
 
+    calendar = calendar or get_cycle_calendar()
     raw_events: list[dict] = []
     event_counter: dict[str, int] = defaultdict(int)  # per game_date
 
-    prev_snap = snapshots[0]
-    prev_balances = _get_balances(prev_snap["participants"])
-
-    for snap in snapshots[1:]:
-        cur_balances = _get_balances(snap["participants"])
-
-        # Only compare participants present in BOTH snapshots (skip exits/entries)
-        common_names = set(prev_balances) & set(cur_balances)
-        n_active = len(common_names)
-
-        gains: dict[str, int] = {}
-        losses: dict[str, int] = {}
-        new_zeros: list[str] = []
-
-        for name in common_names:
-            delta = cur_balances[name] - prev_balances[name]
-            if delta > 0:
-                gains[name] = delta
-            elif delta < 0:
-                losses[name] = delta
-
-            # Detect transition TO zero
-            if cur_balances[name] == 0 and prev_balances[name] > 0:
-                new_zeros.append(name)
-
-        if gains or losses:
-            classified = _classify_event(gains, losses, n_active, new_zeros)
-            ts = _snapshot_timestamp(snap)
-            game_date = snap.get("date", "")
-
-            for ev in classified:
-                event_counter[game_date] += 1
-                seq = event_counter[game_date]
-                ev_type = ev["type"]
-                meta = BALANCE_EVENT_TYPES.get(ev_type, BALANCE_EVENT_TYPES["outro"])
-
-                raw_events.append({
-                    "id": f"bal_{game_date}_{seq:03d}",
-                    "type": ev_type,
-                    "game_date": game_date,
-                    "cycle": get_cycle_number(game_date) if game_date else 0,
-                    "from_snapshot": _snapshot_stem(prev_snap),
-                    "to_snapshot": _snapshot_stem(snap),
-                    "changes": ev["changes"],
-                    "emoji": meta["emoji"],
-                    "label": meta["label"],
-                    "_timestamp": ts,
-                })
-
-        prev_snap = snap
-        prev_balances = cur_balances
+    # Deltas between consecutive captures, over the participants present in
+    # both (exits and entries are skipped); only changed transitions are walked
+    if series is None or len(series.stems) != len(snapshots) or series.stems[-1] != _snapshot_stem(snapshots[-1]):
+        series = (series or BalanceSeries()).resumed(snapshots)
+    names = series.names
+    deltas, new_zero_mask, n_active = series.transitions()
+
+    for t in np.flatnonzero(deltas.any(axis=1)):
+        row = deltas[t]
+        gains = {names[j]: int(row[j]) for j in np.flatnonzero(row > 0)}
+        losses = {names[j]: int(row[j]) for j in np.flatnonzero(row < 0)}
+        new_zeros = [names[j] for j in np.flatnonzero(new_zero_mask[t])]
+
+        classified = _classify_event(gains, losses, int(n_active[t]), new_zeros)
+        snap = snapshots[t + 1]
+        ts = _snapshot_timestamp(snap)
+        game_date = snap.get("date", "")
+
+        for ev in classified:
+            event_counter[game_date] += 1
+            seq = event_counter[game_date]
+            ev_type = ev["type"]
+            meta = BALANCE_EVENT_TYPES.get(ev_type, BALANCE_EVENT_TYPES["outro"])
+
+            raw_events.append({
+                "id": f"bal_{game_date}_{seq:03d}",
+                "type": ev_type,
+                "game_date": game_date,
+                "cycle": calendar.cycle(game_date) if game_date else 0,
+                "from_snapshot": series.stems[t],
+                "to_snapshot": series.stems[t + 1],
+                "changes": ev["changes"],
+                "emoji": meta["emoji"],
+                "label": meta["label"],
+                "_timestamp": ts,
+            })
 
     # Merge events within time windows
     # Group by type for merging, then recombine
@@ -1010,25 +1156,11 @@ def build_balance_events(snapshots: list[dict]) -> dict:
     merged_events: list[dict] = []
     for ev_type, type_events in by_type.items():
         # Sort by timestamp before merging
-        def _ts_key(e: dict) -> datetime:
-            ts = e.get("_timestamp")
-            if ts is None:
-                return datetime.min.replace(tzinfo=UTC)
-            if ts.tzinfo is None:
-                return ts.replace(tzinfo=UTC)
-            return ts
-        type_events.sort(key=_ts_key)
+        type_events.sort(key=_event_time)
         merged_events.extend(_merge_events(type_events))
 
     # Sort all events chronologically
-    def _merged_key(e: dict) -> tuple:
-        ts = e.get("_timestamp")
-        if ts is None:
-            ts = datetime.min.replace(tzinfo=UTC)
-        elif ts.tzinfo is None:
-            ts = ts.replace(tzinfo=UTC)
-        return (e.get("game_date", ""), ts)
-    merged_events.sort(key=_merged_key)
+    merged_events.sort(key=lambda e: (e.get("game_date", ""), _event_time(e)))
 
     # Re-assign sequential IDs after merge
     date_counters: dict[str, int] = defaultdict(int)
@@ -1048,10 +1180,7 @@ def build_balance_events(snapshots: list[dict]) -> dict:
     merged_events = _reclassify_monstro_anjo_events(merged_events)
 
     # Build snapshot lookup for pre-event VIP/Xepa resolution
-    snap_by_stem: dict[str, dict] = {}
-    for snap in snapshots:
-        stem = _snapshot_stem(snap)
-        snap_by_stem[stem] = snap
+    snap_by_stem = dict(zip(series.stems, snapshots))
 
     # Validate mesada events against VIP/Xepa amounts
     merged_events = _reclassify_mesada_events(merged_events, snap_by_stem)
@@ -1128,6 +1257,6 @@ def build_balance_events(snapshots: list[dict]) -> dict:
         result["compras_fairness"] = fairness
 
     # Punishment deep dive (formal punicao only)
-    result["punishment_deep_dive"] = _build_punishment_deep_dive(merged_events, by_participant)
+    result["punishment_deep_dive"] = _build_punishment_deep_dive(merged_events, by_participant, calendar)
 
     return result
@@ -4,7 +4,7 @@ from __future__ import annotations
 from collections import defaultdict
 from datetime import datetime, timezone
 
-from data_utils import CARTOLA_POINTS, get_cycle_number, normalize_route_label, parse_roles
+from data_utils import CARTOLA_POINTS, CycleCalendar, get_cycle_calendar, normalize_route_label, parse_roles
 from builders.participants import _normalize_big_fone
 
 
@@ -71,7 +71,7 @@ def _collect_current_holders_and_vip(snap_participants: list[dict]) -> tuple[dic
     return current_holders, current_vip
 
 
-def _detect_cartola_roles(daily_snapshots: list[dict], calculated_points: dict) -> None:
+def _detect_cartola_roles(daily_snapshots: list[dict], calculated_points: dict, calendar: CycleCalendar) -> None:
     """Auto-detect roles from API snapshots and populate calculated_points."""
     def has_event(name, week, event_key):
         week_events = calculated_points.get(name, {}).get(week, [])
@@ -87,7 +87,7 @@ def _detect_cartola_roles(daily_snapshots: list[dict], calculated_points: dict)
 
     for snap in daily_snapshots:
         date = snap['date']
-        week = get_cycle_number(date)
+        week = calendar.cycle(date)
 
         current_holders, current_vip = _collect_current_holders_and_vip(snap['participants'])
 
@@ -180,11 +180,11 @@ def _normalize_int_list(value) -> list[int]:
     return out
 
 
-def _week_from_payload(week_raw, date_str: str) -> int:
+def _week_from_payload(week_raw, date_str: str, calendar: CycleCalendar) -> int:
     if isinstance(week_raw, int) and week_raw > 0:
         return week_raw
     if date_str:
-        return get_cycle_number(date_str)
+        return calendar.cycle(date_str)
     return 1
 
 
@@ -325,7 +325,8 @@ def _build_cartola_round_views(all_points: dict, manual_events: dict, n_cycles:
     return round_points, rounds, current_round, cumulative_round_evolution
 
 
-def _collect_official_role_events(provas_data: dict | None, manual_events: dict, paredoes_data: dict) -> tuple[dict, dict, dict]:
+def _collect_official_role_events(provas_data: dict | None, manual_events: dict, paredoes_data: dict,
+                                  calendar: CycleCalendar) -> tuple[dict, dict, dict]:
     """Collect canonical event assignments from provas/manual/ paredões.
 
     Returns:
@@ -354,7 +355,7 @@ def _collect_official_role_events(provas_data: dict | None, manual_events: dict,
                 continue
             tipo = str(prova.get('tipo', '')).strip().lower()
             date_str = str(prova.get('date') or '').strip()
-            week = _week_from_payload(prova.get('cycle'), date_str)
+            week = _week_from_payload(prova.get('cycle'), date_str, calendar)
             winners = _normalize_name_list(prova.get('vencedores')) or _normalize_name_list(prova.get('vencedor'))
 
             if tipo in {'lider', 'líder'}:
@@ -394,7 +395,7 @@ def _collect_official_role_events(provas_data: dict | None, manual_events: dict,
             continue
         ev_type = ev.get('type')
         date_str = str(ev.get('date') or '').strip()
-        week = _week_from_payload(ev.get('cycle'), date_str)
+        week = _week_from_payload(ev.get('cycle'), date_str, calendar)
         target = str(ev.get('target') or '').strip()
         if not target:
             continue
@@ -407,7 +408,7 @@ def _collect_official_role_events(provas_data: dict | None, manual_events: dict,
         if not isinstance(paredao, dict):
             continue
         date_str = str(paredao.get('data_formacao') or paredao.get('data') or '').strip()
-        week = _week_from_payload(paredao.get('cycle'), date_str)
+        week = _week_from_payload(paredao.get('cycle'), date_str, calendar)
         indicados = [
             str(item.get('nome') or '').strip()
             for item in paredao.get('indicados_finais', [])
@@ -479,7 +480,8 @@ def _apply_official_role_fallbacks(calculated_points: dict, official_events: dic
             )
 
 
-def _apply_cartola_manual(calculated_points: dict, manual_events: dict, paredoes_data: dict, daily_snapshots: list[dict]) -> dict:
+def _apply_cartola_manual(calculated_points: dict, manual_events: dict, paredoes_data: dict, daily_snapshots: list[dict],
+                          calendar: CycleCalendar) -> dict:
     """Apply manual events, paredão-derived events, and merge with cartola_points_log.
 
     Returns all_points (merged calculated + manual log).
@@ -522,7 +524,7 @@ def _apply_cartola_manual(calculated_points: dict, manual_events: dict, paredoes
         exit_date = info.get('exit_date', '')
         # Use paredão's cycle for eliminations (handles cross-cycle dates)
         paredao_num = info.get('paredao') or info.get('paredao_numero')
-        week = _paredao_cycle.get(paredao_num, get_cycle_number(exit_date) if exit_date else 1)
+        week = _paredao_cycle.get(paredao_num, calendar.cycle(exit_date) if exit_date else 1)
         if status == 'desistente':
             calculated_points[name][week].append(('desistente', CARTOLA_POINTS['desistente'], exit_date))
         elif status in ('eliminada', 'eliminado'):
@@ -549,7 +551,7 @@ def _apply_cartola_manual(calculated_points: dict, manual_events: dict, paredoes
         # (campeao/segundo/terceiro) e pula o scoring de paredão padrão.
         if p.get('grande_final'):
             if p.get('status') == 'finalizado':
-                final_week = p.get('cycle') or get_cycle_number(paredao_date)
+                final_week = p.get('cycle') or calendar.cycle(paredao_date)
                 final_res = p.get('resultado') or {}
                 for slot in ('campeao', 'segundo', 'terceiro'):
                     nome_final = final_res.get(slot)
@@ -557,7 +559,7 @@ def _apply_cartola_manual(calculated_points: dict, manual_events: dict, paredoes
                         add_event_points(nome_final, final_week, slot,
                                          CARTOLA_POINTS[slot], paredao_date)
             continue
-        week = p.get('cycle') or get_cycle_number(paredao_date)
+        week = p.get('cycle') or calendar.cycle(paredao_date)
         indicados = [i.get('nome') for i in p.get('indicados_finais', []) if i.get('nome')]
         if not indicados:
             continue
@@ -623,7 +625,7 @@ def _apply_cartola_manual(calculated_points: dict, manual_events: dict, paredoes
             for ev in manual_events.get('power_events', []):
                 if ev.get('type') != 'imunidade':
                     continue
-                ev_week = get_cycle_number(ev['date']) if ev.get('date') else ev.get('cycle', 0)
+                ev_week = calendar.cycle(ev['date']) if ev.get('date') else ev.get('cycle', 0)
                 if ev_week == week and ev.get('target'):
                     extra_imunes.add(ev['target'].strip())
 
@@ -709,7 +711,8 @@ def _apply_cartola_manual(calculated_points: dict, manual_events: dict, paredoes
     return all_points
 
 
-def _format_cartola_output(all_points: dict, participants_index: list[dict], manual_events: dict, daily_snapshots: list[dict]) -> dict:
+def _format_cartola_output(all_points: dict, participants_index: list[dict], manual_events: dict, daily_snapshots: list[dict],
+                           calendar: CycleCalendar) -> dict:
     """Format Cartola output: leaderboard, weekly points, stats, cumulative evolution."""
     # Build participant info from index
     participant_info = {}
@@ -776,7 +779,7 @@ def _format_cartola_output(all_points: dict, participants_index: list[dict], man
             cycle_points[week_str][participant] = [[evt, pts, date] for evt, pts, date in events]
 
     # Stats
-    n_cycles = max([get_cycle_number(s['date']) for s in daily_snapshots], default=1) if daily_snapshots else 1
+    n_cycles = max(calendar.cycles_for([s['date'] for s in daily_snapshots]), default=1) if daily_snapshots else 1
     round_points, rounds, current_round, cumulative_round_evolution = _build_cartola_round_views(
         all_points, manual_events, n_cycles
     )
@@ -846,7 +849,7 @@ def _format_cartola_output(all_points: dict, participants_index: list[dict], man
     }
 
 
-def _filter_janela_aberta_lider(all_points: dict, provas_data: dict | None) -> dict:
+def _filter_janela_aberta_lider(all_points: dict, provas_data: dict | None, calendar: CycleCalendar) -> dict:
     """Strip `lider` events for Prova do Líder wins flagged cartola_janela_aberta.
 
     When Cartola BBB's escalation window was still open during a Prova do Líder,
@@ -860,7 +863,7 @@ def _filter_janela_aberta_lider(all_points: dict, provas_data: dict | None) -> d
             continue
         if str(prova.get('tipo', '')).lower() not in {'lider', 'líder'}:
             continue
-        cycle = _week_from_payload(prova.get('cycle'), str(prova.get('date') or ''))
+        cycle = _week_from_payload(prova.get('cycle'), str(prova.get('date') or ''), calendar)
         winners = _normalize_name_list(prova.get('vencedores')) or _normalize_name_list(prova.get('vencedor'))
         for name in winners:
             excluded.add((cycle, name))
@@ -879,18 +882,22 @@ def build_cartola_data(
     paredoes_data: dict,
     participants_index: list[dict],
     provas_data: dict | None = None,
+    calendar: CycleCalendar | None = None,
 ) -> dict:
     """Build Cartola BBB points data from snapshots, manual events, and paredões.
 
     Returns a dict suitable for writing to cartola_data.json.
     """
+    calendar = calendar or get_cycle_calendar()
     calculated_points = defaultdict(lambda: defaultdict(list))
 
-    _detect_cartola_roles(daily_snapshots, calculated_points)
+    _detect_cartola_roles(daily_snapshots, calculated_points, calendar)
     api_detected = _collect_api_detected(calculated_points)
-    official_events, strict_weeks, leaders_by_week = _collect_official_role_events(provas_data, manual_events, paredoes_data)
+    official_events, strict_weeks, leaders_by_week = _collect_official_role_events(
+        provas_data, manual_events, paredoes_data, calendar,
+    )
     _validate_unexpected_api_extras(api_detected, official_events, strict_weeks, leaders_by_week)
     _apply_official_role_fallbacks(calculated_points, official_events, leaders_by_week)
-    all_points = _apply_cartola_manual(calculated_points, manual_events, paredoes_data, daily_snapshots)
-    all_points = _filter_janela_aberta_lider(all_points, provas_data)
-    return _format_cartola_output(all_points, participants_index, manual_events, daily_snapshots)
+    all_points = _apply_cartola_manual(calculated_points, manual_events, paredoes_data, daily_snapshots, calendar)
+    all_points = _filter_janela_aberta_lider(all_points, provas_data, calendar)
+    return _format_cartola_output(all_points, participants_index, manual_events, daily_snapshots, calendar)
@@ -2,80 +2,132 @@
 from __future__ import annotations
 
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from typing import Any
+from functools import partial
+from typing import Any, Callable, Iterable
 
+import numpy as np
+
+from builders.reaction_tensor import ReactionTensor
 from data_utils import (
-    SENTIMENT_WEIGHTS,
-    build_reaction_matrix,
-    get_cycle_number,
+    CycleCalendar,
+    get_cycle_calendar,
 )
+from pipeline_dag import pool_context
 
 CLUSTER_COLORS = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c', '#e67e22']
 
+# Louvain resolutions tried by the silhouette sweep (ties keep the earliest)
+SWEEP_RESOLUTIONS = (0.5, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3, 1.5)
 
-def _run_cluster_detection(active_names: list[str], sym_mat: list[list[float]], participant_info: dict, n_active: int, nx: Any, louvain_communities: Any, np: Any) -> dict:
-    """Run Louvain community detection with silhouette-based resolution tuning.
+# Days between the daily snapshots sampled by build_cluster_evolution
+# (the latest snapshot is always included)
+CLUSTER_EVOLUTION_CADENCE_DAYS = 1
 
-    Returns dict with: cluster_of, cluster_members, n_clusters, silhouette_coefficient, resolution_used.
+
+def _pool_map(func: Callable[[Any], Any], items: Iterable[Any], jobs: int = 1) -> list[Any]:
+    """``[func(item) for item in items]``, in a process pool when ``jobs > 1``."""
+    items = list(items)
+    if jobs <= 1 or len(items) < 2:
+        return [func(item) for item in items]
+    workers = min(jobs, len(items))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context()) as pool:
+        return list(pool.map(func, items, chunksize=-(-len(items) // workers)))
+
+
+def _cluster_graph(nx: Any, names: list[str], sym: np.ndarray, groups: dict[str, str] | None = None) -> Any:
+    """Undirected graph with one edge per positive symmetric score.
+
+    Edges are added in row-major upper-triangle order, which Louvain's
+    seeded node/edge traversal depends on.
     """
+    G = nx.Graph()
+    if groups is None:
+        G.add_nodes_from(names)
+    else:
+        G.add_nodes_from((name, {"group": groups.get(name, "?")}) for name in names)
+    rows, cols = np.triu_indices(len(names), 1)
+    weights = sym[rows, cols]
+    keep = weights > 0
+    G.add_weighted_edges_from(zip(
+        [names[i] for i in rows[keep]], [names[j] for j in cols[keep]], weights[keep].tolist(),
+    ))
+    return G
+
+
+def _distance_matrix(sym: np.ndarray) -> np.ndarray:
+    """Euclidean distances between score rows (the silhouette's feature vectors)."""
+    return np.sqrt(((sym[:, None, :] - sym[None, :, :]) ** 2).sum(axis=-1))
+
+
+def _silhouette(distances: np.ndarray, names: list[str], communities: list[set[str]]) -> float | None:
+    """Mean silhouette of ``communities`` on precomputed distances, or None when
+    it is undefined (fewer than two communities or a singleton).
+
+    Same definition as ``sklearn.metrics.silhouette_score(metric="precomputed")``
+    without its per-call input validation, which dominated the daily sweep.
+    """
+    if len(communities) < 2 or min(len(c) for c in communities) < 2:
+        return None
+    label_of = {name: idx for idx, comm in enumerate(communities) for name in comm}
+    labels = np.array([label_of[n] for n in names])
+    rows = np.arange(len(names))
+    members = labels[:, None] == np.arange(len(communities))[None, :]
+    sizes = members.sum(axis=0)
+    totals = distances @ members  # summed distance from each sample to each community
+    intra = totals[rows, labels] / (sizes[labels] - 1)  # excluding the sample itself
+    mean_to = totals / sizes
+    mean_to[rows, labels] = np.inf
+    nearest = mean_to.min(axis=1)
+    scores = np.nan_to_num((nearest - intra) / np.maximum(intra, nearest))
+    return float(scores.mean())
+
+
+def _louvain_at_resolution(graph: Any, names: list[str], distances: np.ndarray | None,
+                           resolution: float) -> tuple[list[set[str]] | None, float | None]:
+    """Louvain communities at ``resolution`` and their silhouette.
+
+    ``(None, None)`` when Louvain or the silhouette fails on a degenerate
+    graph; the silhouette is None when ``distances`` is None or it is undefined.
+    """
+    from networkx.algorithms.community import louvain_communities
+
     try:
-        from sklearn.metrics import silhouette_score
-        has_sklearn = True
-    except ImportError:
-        has_sklearn = False
+        comms = list(louvain_communities(graph, weight='weight', resolution=resolution, seed=42))
+        return comms, _silhouette(distances, names, comms) if distances is not None else None
+    except (ValueError, KeyError, ZeroDivisionError):
+        return None, None
 
-    G = nx.Graph()
-    for name in active_names:
-        G.add_node(name, group=participant_info.get(name, {}).get("grupo", "?"))
 
-    for i, a in enumerate(active_names):
-        for j, b in enumerate(active_names):
-            if i >= j:
-                continue
-            w = sym_mat[i][j]
-            if w > 0:
-                G.add_edge(a, b, weight=w)
+def _run_cluster_detection(active_names: list[str], sym: np.ndarray, participant_info: dict, nx: Any,
+                           jobs: int = 1) -> dict:
+    """Run Louvain community detection with silhouette-based resolution tuning.
 
-    # Convert sym_mat to numpy for silhouette computation
-    sym_arr = np.array(sym_mat)
+    The graph and the distance matrix are built once and shared by every
+    resolution of the sweep, which runs in a process pool when ``jobs > 1``.
+
+    Returns dict with: cluster_of, cluster_members, n_clusters, silhouette_coefficient, resolution_used.
+    """
+    G = _cluster_graph(nx, active_names, sym, {n: participant_info.get(n, {}).get("grupo", "?") for n in active_names})
 
     # Silhouette sweep to find optimal resolution
-    resolutions = [0.5, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3, 1.5]
     best_resolution = 1.0
     best_silhouette = -1.0
     best_communities = None
 
-    if has_sklearn and n_active >= 4:
-        for res in resolutions:
-            try:
-                comms = list(louvain_communities(G, weight='weight', resolution=res, seed=42))
-                # Skip if too few clusters or singleton clusters dominate
-                if len(comms) < 2:
-                    continue
-                if min(len(c) for c in comms) < 2:
-                    continue
-
-                # Build label array for silhouette
-                name_to_label = {}
-                for label_idx, comm in enumerate(comms):
-                    for name in comm:
-                        name_to_label[name] = label_idx
-                labels = [name_to_label[n] for n in active_names]
-
-                # Use symmetric matrix as distance-like features
-                # silhouette expects samples x features; use each row as feature vector
-                sil = silhouette_score(sym_arr, labels, metric='euclidean')
-                if sil > best_silhouette:
-                    best_silhouette = sil
-                    best_resolution = res
-                    best_communities = comms
-            except (ValueError, KeyError, ZeroDivisionError):
-                # Louvain or silhouette can fail on degenerate graphs
-                continue
+    if len(active_names) >= 4:
+        sweep = partial(_louvain_at_resolution, G, active_names, _distance_matrix(sym))
+        for res, (comms, sil) in zip(SWEEP_RESOLUTIONS, _pool_map(sweep, SWEEP_RESOLUTIONS, jobs)):
+            # Skip failed runs and too few clusters / singleton clusters
+            if sil is not None and sil > best_silhouette:
+                best_silhouette = sil
+                best_resolution = res
+                best_communities = comms
 
     # Fallback to default resolution if sweep didn't produce valid clusters
     if best_communities is None:
+        from networkx.algorithms.community import louvain_communities
         best_communities = list(louvain_communities(G, weight='weight', resolution=1.0, seed=42))
         best_silhouette = -1.0
         best_resolution = 1.0
@@ -190,18 +242,17 @@ def _compute_cluster_metrics(cluster_members: dict, name_to_idx: dict[str, int],
     }
 
 
-def build_clusters_data(relations_scores: dict, participants_index: list[dict] | dict, paredoes_data: dict | list) -> dict | None:
+def build_clusters_data(relations_scores: dict, participants_index: list[dict] | dict, paredoes_data: dict | list,
+                        jobs: int = 1) -> dict | None:
     """Build community detection + vote alignment data for clusters.qmd.
 
     Uses Louvain community detection on the composite relation scores graph.
     Outputs: communities, auto-names, inter-cluster metrics, vote alignment,
     and polarization data — all precomputed so clusters.qmd just renders.
+    ``jobs > 1`` runs the resolution sweep in a process pool.
     """
-    import numpy as np
-
     try:
         import networkx as nx
-        from networkx.algorithms.community import louvain_communities
     except ImportError:
         print("networkx not available — skipping clusters_data")
         return None
@@ -220,22 +271,19 @@ def build_clusters_data(relations_scores: dict, participants_index: list[dict] |
     # -------------------------------------------------------------------
     # Score matrices
     # -------------------------------------------------------------------
-    score_mat = [[0.0] * n_active for _ in range(n_active)]
+    score = np.zeros((n_active, n_active))
     for src, targets in pairs_daily.items():
         if src not in name_to_idx:
             continue
         i = name_to_idx[src]
         for tgt, entry in targets.items():
-            if tgt not in name_to_idx:
-                continue
-            j = name_to_idx[tgt]
-            score_mat[i][j] = entry["score"]
+            if tgt in name_to_idx:
+                score[i, name_to_idx[tgt]] = entry["score"]
 
     # Symmetric
-    sym_mat = [[0.0] * n_active for _ in range(n_active)]
-    for i in range(n_active):
-        for j in range(n_active):
-            sym_mat[i][j] = (score_mat[i][j] + score_mat[j][i]) / 2
+    sym = (score + score.T) / 2
+    score_mat = score.tolist()
+    sym_mat = sym.tolist()
 
     # -------------------------------------------------------------------
     # Vote co-occurrence matrix
@@ -266,7 +314,7 @@ def build_clusters_data(relations_scores: dict, participants_index: list[dict] |
                 vote_align[i][j] = vote_cooccur[i][j] / vote_participated[i][j]
 
     # Louvain community detection with silhouette-based resolution tuning
-    detection = _run_cluster_detection(active_names, sym_mat, participant_info, n_active, nx, louvain_communities, np)
+    detection = _run_cluster_detection(active_names, sym, participant_info, nx, jobs)
     cluster_of = detection["cluster_of"]
     cluster_members = detection["cluster_members"]
     n_clusters = detection["n_clusters"]
@@ -416,109 +464,81 @@ def build_clusters_data(relations_scores: dict, participants_index: list[dict] |
     }
 
 
-def build_cluster_evolution(daily_snapshots: list[dict], participants_index: list[dict] | dict, paredoes_data: dict | list) -> dict | None:
-    """Track cluster membership changes across weekly snapshots.
+def _day_communities(day: tuple[list[str], np.ndarray]) -> tuple[list[set[str]] | None, float | None]:
+    """Louvain communities (largest first) and silhouette for one day's ``(names, sym)``.
+
+    Uses a fixed resolution of 1.0 so days are comparable. ``(None, None)``
+    when Louvain fails on a degenerate graph.
+    """
+    import networkx as nx
+
+    names, sym = day
+    comms, _ = _louvain_at_resolution(_cluster_graph(nx, names, sym), names, None, 1.0)
+    if comms is None:
+        return None, None
+    comms = sorted(comms, key=lambda c: -len(c))
+    return comms, _silhouette(_distance_matrix(sym), names, comms)
+
 
-    Computes Louvain communities for one snapshot per week, tracks:
+def build_cluster_evolution(daily_snapshots: list[dict], participants_index: list[dict] | dict, paredoes_data: dict | list,
+                            calendar: CycleCalendar | None = None, jobs: int = 1,
+                            cadence_days: int = CLUSTER_EVOLUTION_CADENCE_DAYS) -> dict | None:
+    """Track cluster membership changes across daily snapshots.
+
+    Computes Louvain communities for every ``cadence_days``-th daily snapshot
+    (counting back from the latest), tracks:
     - Cluster sizes over time
     - Silhouette quality per date
-    - Member transitions (who moved between clusters)
+    - Member transitions (who moved between clusters since the previous sampled date)
+
+    Scores come from each day's queridômetro (sentiment weight of the label
+    each giver assigns). ``jobs > 1`` runs the per-day detection in a process pool.
 
     Returns dict with timeline and transition data, or None if insufficient data.
     """
-    import numpy as np
-
     try:
-        import networkx as nx
-        from networkx.algorithms.community import louvain_communities
-        from sklearn.metrics import silhouette_score
+        import networkx  # noqa: F401
     except ImportError:
-        print("networkx or sklearn not available — skipping cluster evolution")
+        print("networkx not available — skipping cluster evolution")
         return None
 
     if len(daily_snapshots) < 7:
         return None
 
-    # Active participants (current)
-    pi_list = participants_index if isinstance(participants_index, list) else participants_index.get("participants", participants_index)
-    participant_info = {p["name"]: {"grupo": p.get("grupo", "?"), "avatar": p.get("avatar", "")} for p in pi_list}
-
-    # Sample one snapshot per week (use last snapshot of each week)
-    snapshots_by_week = {}
-    for snap in daily_snapshots:
-        week = get_cycle_number(snap["date"])
-        snapshots_by_week[week] = snap
-
-    sampled_weeks = sorted(snapshots_by_week.keys())
-    if len(sampled_weeks) < 2:
+    cadence = max(1, cadence_days)
+    last = len(daily_snapshots) - 1
+    sampled = [day for day in range(len(daily_snapshots)) if (last - day) % cadence == 0]
+    if len(sampled) < 2:
         return None
 
-    timeline = []
-    prev_membership = {}
+    calendar = calendar or get_cycle_calendar()
+    cycles = calendar.cycles_for([daily_snapshots[day]["date"] for day in sampled])
+    tensor = ReactionTensor.for_snapshots(
+        daily_snapshots,
+        dict.fromkeys(p["name"] for snap in daily_snapshots for p in snap["participants"] if p.get("name")),
+    )
 
-    for week in sampled_weeks:
-        snap = snapshots_by_week[week]
-        date_str = snap["date"]
-        participants = snap["participants"]
-
-        # Get active participants for this snapshot
+    days = []
+    for day, cycle in zip(sampled, cycles):
+        snap = daily_snapshots[day]
         active_names = sorted([
-            p["name"] for p in participants
+            p["name"] for p in snap["participants"]
             if not p.get("characteristics", {}).get("eliminated")
         ])
-        n_active = len(active_names)
-        if n_active < 4:
+        if len(active_names) < 4:
             continue
+        score = tensor.weight[tensor.day(day, tensor.indices(active_names))]
+        days.append((snap["date"], cycle, active_names, (score + score.T) / 2))
 
-        name_to_idx = {name: i for i, name in enumerate(active_names)}
+    detections = _pool_map(_day_communities, [(names, sym) for _, _, names, sym in days], jobs)
 
-        # Build reaction matrix for this snapshot
-        matrix = build_reaction_matrix(participants)
+    timeline = []
+    prev_membership = {}
 
-        # Build score matrix from reactions (simplified: use sentiment weights)
-        score_mat = [[0.0] * n_active for _ in range(n_active)]
-        for p in participants:
-            giver = p["name"]
-            if giver not in name_to_idx:
-                continue
-            i = name_to_idx[giver]
-            reactions = p.get("receivedReactions", {})
-            for rxn_label, senders in reactions.items():
-                weight = SENTIMENT_WEIGHTS.get(rxn_label, 0)
-                for sender_dict in senders:
-                    receiver = sender_dict.get("name", "")
-                    if receiver in name_to_idx:
-                        j = name_to_idx[receiver]
-                        score_mat[i][j] = weight
-
-        # Symmetric matrix
-        sym_mat = [[0.0] * n_active for _ in range(n_active)]
-        for i in range(n_active):
-            for j in range(n_active):
-                sym_mat[i][j] = (score_mat[i][j] + score_mat[j][i]) / 2
-
-        sym_arr = np.array(sym_mat)
-
-        # Build graph
-        G = nx.Graph()
-        for name in active_names:
-            G.add_node(name)
-        for i, a in enumerate(active_names):
-            for j, b in enumerate(active_names):
-                if i >= j:
-                    continue
-                w = sym_mat[i][j]
-                if w > 0:
-                    G.add_edge(a, b, weight=w)
-
-        # Run Louvain with fixed resolution for comparability
-        try:
-            comms = list(louvain_communities(G, weight='weight', resolution=1.0, seed=42))
-        except (ValueError, KeyError, ZeroDivisionError):
-            # Louvain can fail on degenerate or disconnected graphs
+    for (date_str, cycle, active_names, sym), (comms, silhouette) in zip(days, detections):
+        if comms is None:
             continue
-
-        comms = sorted(comms, key=lambda c: -len(c))
+        name_to_idx = {name: i for i, name in enumerate(active_names)}
 
         # Build membership map
         membership = {}
@@ -529,31 +549,21 @@ def build_cluster_evolution(daily_snapshots: list[dict], participants_index: lis
             for name in members:
                 membership[name] = label
 
-            # Compute cohesion
+            # Cohesion: mean symmetric score between distinct members
             indices = [name_to_idx[m] for m in members]
-            internal_scores = [sym_mat[a][b] for a in indices for b in indices if a != b]
-            cohesion = sum(internal_scores) / len(internal_scores) if internal_scores else 0
+            internal = sym[np.ix_(indices, indices)]
+            n_pairs = len(members) * (len(members) - 1)
+            cohesion = (internal.sum() - np.trace(internal)) / n_pairs if n_pairs else 0
 
             communities_out.append({
                 "label": label,
                 "members": members,
                 "size": len(members),
-                "cohesion": round(cohesion, 4),
+                "cohesion": round(float(cohesion), 4),
                 "color": CLUSTER_COLORS[(label - 1) % len(CLUSTER_COLORS)],
             })
 
-        # Compute silhouette
-        silhouette = None
-        if len(comms) >= 2 and min(len(c) for c in comms) >= 2:
-            try:
-                labels = [membership[n] for n in active_names]
-                silhouette = silhouette_score(sym_arr, labels, metric='euclidean')
-                silhouette = round(silhouette, 4)
-            except (ValueError, KeyError):
-                # Silhouette can fail with degenerate label assignments
-                pass
-
-        # Detect transitions from previous week
+        # Detect transitions from the previous sampled date
         transitions = []
         if prev_membership:
             for name in active_names:
@@ -568,10 +578,10 @@ def build_cluster_evolution(daily_snapshots: list[dict], participants_index: lis
 
         timeline.append({
             "date": date_str,
-            "cycle": week,
-            "n_active": n_active,
+            "cycle": cycle,
+            "n_active": len(active_names),
             "n_clusters": len(comms),
-            "silhouette": silhouette,
+            "silhouette": round(silhouette, 4) if silhouette is not None else None,
             "communities": communities_out,
             "transitions": transitions,
         })
@@ -581,7 +591,7 @@ def build_cluster_evolution(daily_snapshots: list[dict], participants_index: lis
     if len(timeline) < 2:
         return None
 
-    # Aggregate transitions across all weeks
+    # Aggregate transitions across all sampled dates
     all_transitions = []
     for entry in timeline:
         for t in entry.get("transitions", []):
@@ -598,7 +608,9 @@ def build_cluster_evolution(daily_snapshots: list[dict], participants_index: lis
     return {
         "_metadata": {
             "generated_at": datetime.now(timezone.utc).isoformat(),
-            "n_cycles": len(timeline),
+            "n_cycles": len({entry["cycle"] for entry in timeline}),
+            "n_snapshots": len(timeline),
+            "cadence_days": cadence,
             "total_transitions": len(all_transitions),
         },
         "timeline": timeline,
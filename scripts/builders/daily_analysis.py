@@ -4,10 +4,13 @@ from __future__ import annotations
 from datetime import datetime
 from collections import defaultdict
 
+import numpy as np
+
 from data_utils import (
-    calc_sentiment, SENTIMENT_WEIGHTS, POSITIVE,
-    build_reaction_matrix, patch_missing_raio_x,
+    calc_sentiment,
+    get_reaction_matrix, get_patched_reaction_matrix,
 )
+from builders.reaction_tensor import ReactionTensor, changed_pairs, hostility_masks, vulnerability_counts
 
 
 def build_daily_metrics(daily_snapshots: list[dict]) -> list[dict]:
@@ -45,41 +48,9 @@ def build_daily_metrics(daily_snapshots: list[dict]) -> list[dict]:
     return daily
 
 
-def _classify_hostility_pairs(matrix: dict, active_names: set[str]) -> tuple[set, set]:
-    """Classify mutual hostilities and blind spots in a reaction matrix.
-
-    Returns:
-        mutual: set of frozenset({A, B}) — both give negative
-        blind_spots: set of (attacker, victim) — attacker gives negative, victim gives ❤️
-    """
-    mutual = set()
-    blind_spots = set()
-    checked = set()
-
-    for (a, b), rxn_ab in matrix.items():
-        if a not in active_names or b not in active_names:
-            continue
-        pair = frozenset([a, b])
-        if pair in checked:
-            continue
-
-        rxn_ba = matrix.get((b, a), "")
-        a_neg = rxn_ab not in POSITIVE and rxn_ab != ""
-        b_neg = rxn_ba not in POSITIVE and rxn_ba != ""
-        a_pos = rxn_ab in POSITIVE
-        b_pos = rxn_ba in POSITIVE
-
-        if a_neg and b_neg:
-            mutual.add(pair)
-            checked.add(pair)
-        else:
-            if a_neg and b_pos:
-                blind_spots.add((a, b))
-            if b_neg and a_pos:
-                blind_spots.add((b, a))
-            checked.add(pair)
-
-    return mutual, blind_spots
+def _snapshot_names(daily_snapshots: list[dict]) -> dict[str, None]:
+    """Every participant name across the snapshots (tensor name universe)."""
+    return dict.fromkeys(p["name"] for snap in daily_snapshots for p in snap["participants"] if p.get("name"))
 
 
 def build_daily_changes_summary(daily_snapshots: list[dict]) -> list[dict]:
@@ -87,59 +58,83 @@ def build_daily_changes_summary(daily_snapshots: list[dict]) -> list[dict]:
 
     Returns a list of dicts with per-day change metrics for historical volatility charts.
     """
+    if len(daily_snapshots) < 2:
+        return []
+    raw_matrices = [get_reaction_matrix(snap) for snap in daily_snapshots]
+    # Carry forward reactions for participants who missed Raio-X
+    curr_matrices = [
+        get_patched_reaction_matrix(curr_snap, prev_matrix)[0]
+        for curr_snap, prev_matrix in zip(daily_snapshots[1:], raw_matrices)
+    ]
+    tensor = ReactionTensor.from_matrices(raw_matrices[:-1] + curr_matrices, _snapshot_names(daily_snapshots))
+    n_prev = len(daily_snapshots) - 1
+
     results = []
     for i in range(1, len(daily_snapshots)):
         prev_snap = daily_snapshots[i - 1]
         curr_snap = daily_snapshots[i]
-        prev_matrix = build_reaction_matrix(prev_snap["participants"])
-        curr_matrix = build_reaction_matrix(curr_snap["participants"])
-        # Carry forward reactions for participants who missed Raio-X
-        curr_matrix, _ = patch_missing_raio_x(curr_matrix, curr_snap["participants"], prev_matrix)
 
         prev_names = {p["name"] for p in prev_snap["participants"] if p.get("name")}
         curr_names = {p["name"] for p in curr_snap["participants"] if p.get("name")}
         common = prev_names & curr_names
+        # Set iteration order drives the order of every per-pair output below
+        order = list(common)
+        idx = tensor.indices(order)
+        prev_codes = tensor.day(i - 1, idx)
+        curr_codes = tensor.day(n_prev + i - 1, idx)
 
         total_pairs = len(common) * (len(common) - 1)
         n_melhora = 0
         n_piora = 0
         n_lateral = 0
-        dramatic_count = 0
-        hearts_gained = 0
-        hearts_lost = 0
         receiver_delta = defaultdict(float)
         giver_changes = defaultdict(int)
 
-        for giver in common:
-            for receiver in common:
-                if giver == receiver:
-                    continue
-                prev_rxn = prev_matrix.get((giver, receiver), "")
-                curr_rxn = curr_matrix.get((giver, receiver), "")
-                if prev_rxn == curr_rxn:
-                    continue
-
-                prev_w = SENTIMENT_WEIGHTS.get(prev_rxn, 0)
-                curr_w = SENTIMENT_WEIGHTS.get(curr_rxn, 0)
-                delta = curr_w - prev_w
-
-                if delta > 0:
-                    n_melhora += 1
-                elif delta < 0:
-                    n_piora += 1
-                else:
-                    n_lateral += 1
-
-                if abs(delta) >= 1.5:
-                    dramatic_count += 1
-
-                if curr_rxn in POSITIVE and prev_rxn not in POSITIVE:
-                    hearts_gained += 1
-                if prev_rxn in POSITIVE and curr_rxn not in POSITIVE:
-                    hearts_lost += 1
-
-                receiver_delta[receiver] += delta
-                giver_changes[giver] += 1
+        # Per-pair change details (for Pulso Diário visualizations)
+        pair_changes = []
+        transition_counts = defaultdict(int)
+        giver_volatility = {}
+        giver_melhora = defaultdict(int)
+        giver_piora = defaultdict(int)
+        giver_lateral = defaultdict(int)
+
+        gi, ri = changed_pairs(prev_codes, curr_codes)
+        prev_changed = prev_codes[gi, ri]
+        curr_changed = curr_codes[gi, ri]
+        deltas = tensor.weight[curr_changed] - tensor.weight[prev_changed]
+        dramatic_count = int((np.abs(deltas) >= 1.5).sum())
+        prev_pos = tensor.positive[prev_changed]
+        curr_pos = tensor.positive[curr_changed]
+        hearts_gained = int((curr_pos & ~prev_pos).sum())
+        hearts_lost = int((prev_pos & ~curr_pos).sum())
+
+        labels = tensor.labels
+        for g, r, pc, cc, delta in zip(gi.tolist(), ri.tolist(), prev_changed.tolist(), curr_changed.tolist(), deltas.tolist()):
+            giver, receiver = order[g], order[r]
+            prev_rxn, curr_rxn = labels[pc], labels[cc]
+            if delta > 0:
+                n_melhora += 1
+                tipo = "Melhora"
+                giver_melhora[giver] += 1
+            elif delta < 0:
+                n_piora += 1
+                tipo = "Piora"
+                giver_piora[giver] += 1
+            else:
+                n_lateral += 1
+                tipo = "Lateral"
+                giver_lateral[giver] += 1
+            receiver_delta[receiver] += delta
+            giver_changes[giver] += 1
+            pair_changes.append({
+                "giver": giver,
+                "receiver": receiver,
+                "prev_rxn": prev_rxn,
+                "curr_rxn": curr_rxn,
+                "delta": round(delta, 2),
+                "tipo": tipo,
+            })
+            transition_counts[f"{prev_rxn}→{curr_rxn}"] += 1
 
         total_changes = n_melhora + n_piora + n_lateral
         pct_changed = (total_changes / total_pairs * 100) if total_pairs > 0 else 0.0
@@ -157,42 +152,6 @@ def build_daily_changes_summary(daily_snapshots: list[dict]) -> list[dict]:
             top_g = max(giver_changes.items(), key=lambda x: x[1])
             top_volatile_giver = {"name": top_g[0], "changes": top_g[1]}
 
-        # Per-pair change details (for Pulso Diário visualizations)
-        pair_changes = []
-        transition_counts = defaultdict(int)
-        giver_volatility = {}
-        giver_melhora = defaultdict(int)
-        giver_piora = defaultdict(int)
-        giver_lateral = defaultdict(int)
-
-        for giver in common:
-            for receiver in common:
-                if giver == receiver:
-                    continue
-                prev_rxn = prev_matrix.get((giver, receiver), "")
-                curr_rxn = curr_matrix.get((giver, receiver), "")
-                if prev_rxn == curr_rxn:
-                    continue
-                prev_w = SENTIMENT_WEIGHTS.get(prev_rxn, 0)
-                curr_w = SENTIMENT_WEIGHTS.get(curr_rxn, 0)
-                delta = curr_w - prev_w
-                tipo = "Melhora" if delta > 0 else ("Piora" if delta < 0 else "Lateral")
-                pair_changes.append({
-                    "giver": giver,
-                    "receiver": receiver,
-                    "prev_rxn": prev_rxn,
-                    "curr_rxn": curr_rxn,
-                    "delta": round(delta, 2),
-                    "tipo": tipo,
-                })
-                transition_counts[f"{prev_rxn}→{curr_rxn}"] += 1
-                if tipo == "Melhora":
-                    giver_melhora[giver] += 1
-                elif tipo == "Piora":
-                    giver_piora[giver] += 1
-                else:
-                    giver_lateral[giver] += 1
-
         for g in giver_changes:
             giver_volatility[g] = {
                 "total": giver_changes[g],
@@ -205,52 +164,58 @@ def build_daily_changes_summary(daily_snapshots: list[dict]) -> list[dict]:
         receiver_deltas = {k: round(v, 2) for k, v in receiver_delta.items() if v != 0}
 
         # Hostility pair classification (mutual hostilities + blind spots)
-        prev_mutual, prev_blind = _classify_hostility_pairs(prev_matrix, common)
-        curr_mutual, curr_blind = _classify_hostility_pairs(curr_matrix, common)
-
-        new_mutual = curr_mutual - prev_mutual
-        resolved_mutual = prev_mutual - curr_mutual
-        new_blind = curr_blind - prev_blind
-        resolved_blind = prev_blind - curr_blind
-
-        new_mutual_list = []
-        for pair in sorted(new_mutual, key=lambda p: tuple(sorted(p))):
-            a, b = sorted(pair)
-            new_mutual_list.append({
+        prev_mutual, prev_blind = hostility_masks(tensor, prev_codes)
+        curr_mutual, curr_blind = hostility_masks(tensor, curr_codes)
+
+        position = {name: k for k, name in enumerate(order)}
+
+        def label_at(codes: np.ndarray, a: str, b: str) -> str:
+            return labels[codes[position[a], position[b]]]
+
+        def name_pairs(mask: np.ndarray, symmetric: bool) -> list[tuple[str, str]]:
+            pairs = [(order[a], order[b]) for a, b in zip(*np.nonzero(mask))]
+            if symmetric:
+                pairs = {tuple(sorted(pair)) for pair in pairs}
+            return sorted(pairs)
+
+        new_mutual_list = [
+            {
                 "pair": [a, b],
                 "reactions": {
-                    "a_to_b": curr_matrix.get((a, b), ""),
-                    "b_to_a": curr_matrix.get((b, a), ""),
+                    "a_to_b": label_at(curr_codes, a, b),
+                    "b_to_a": label_at(curr_codes, b, a),
                 },
-            })
+            }
+            for a, b in name_pairs(curr_mutual & ~prev_mutual, symmetric=True)
+        ]
 
-        resolved_mutual_list = []
-        for pair in sorted(resolved_mutual, key=lambda p: tuple(sorted(p))):
-            a, b = sorted(pair)
-            resolved_mutual_list.append({
+        resolved_mutual_list = [
+            {
                 "pair": [a, b],
                 "prev_reactions": {
-                    "a_to_b": prev_matrix.get((a, b), ""),
-                    "b_to_a": prev_matrix.get((b, a), ""),
+                    "a_to_b": label_at(prev_codes, a, b),
+                    "b_to_a": label_at(prev_codes, b, a),
                 },
                 "curr_reactions": {
-                    "a_to_b": curr_matrix.get((a, b), ""),
-                    "b_to_a": curr_matrix.get((b, a), ""),
+                    "a_to_b": label_at(curr_codes, a, b),
+                    "b_to_a": label_at(curr_codes, b, a),
                 },
-            })
+            }
+            for a, b in name_pairs(prev_mutual & ~curr_mutual, symmetric=True)
+        ]
 
         new_blind_list = [
-            {"attacker": atk, "victim": vic, "attack_reaction": curr_matrix.get((atk, vic), "")}
-            for atk, vic in sorted(new_blind)
+            {"attacker": atk, "victim": vic, "attack_reaction": label_at(curr_codes, atk, vic)}
+            for atk, vic in name_pairs(curr_blind & ~prev_blind, symmetric=False)
         ]
 
         resolved_blind_list = [
             {
                 "attacker": atk, "victim": vic,
-                "prev_reaction": prev_matrix.get((atk, vic), ""),
-                "curr_reaction": curr_matrix.get((atk, vic), ""),
+                "prev_reaction": label_at(prev_codes, atk, vic),
+                "curr_reaction": label_at(curr_codes, atk, vic),
             }
-            for atk, vic in sorted(resolved_blind)
+            for atk, vic in name_pairs(prev_blind & ~curr_blind, symmetric=False)
         ]
 
         results.append({
@@ -284,38 +249,13 @@ def build_hostility_daily_counts(daily_snapshots: list[dict]) -> list[dict]:
 
     Returns a list of dicts with per-day hostility counts.
     """
+    tensor = ReactionTensor.for_snapshots(daily_snapshots, _snapshot_names(daily_snapshots))
     results = []
-    for snap in daily_snapshots:
-        matrix = build_reaction_matrix(snap["participants"])
+    for day, snap in enumerate(daily_snapshots):
         active_names = {p["name"] for p in snap["participants"] if p.get("name")}
-
-        mutual_count = 0
-        one_sided_count = 0
-        checked = set()
-
-        for (a, b), rxn_ab in matrix.items():
-            if a not in active_names or b not in active_names:
-                continue
-            pair = frozenset([a, b])
-            if pair in checked:
-                continue
-
-            rxn_ba = matrix.get((b, a), "")
-            a_neg = rxn_ab not in POSITIVE and rxn_ab != ""
-            b_neg = rxn_ba not in POSITIVE and rxn_ba != ""
-            b_pos = rxn_ba in POSITIVE
-            a_pos = rxn_ab in POSITIVE
-
-            if a_neg and b_neg:
-                mutual_count += 1
-                checked.add(pair)
-            else:
-                # Check one-sided both directions
-                if a_neg and b_pos:
-                    one_sided_count += 1
-                if b_neg and a_pos:
-                    one_sided_count += 1
-                checked.add(pair)
+        mutual, blind = hostility_masks(tensor, tensor.day(day, tensor.indices(active_names)))
+        mutual_count = int(mutual.sum()) // 2
+        one_sided_count = int(blind.sum())
 
         results.append({
             "date": snap["date"],
@@ -333,35 +273,16 @@ def build_vulnerability_history(daily_snapshots: list[dict]) -> list[dict]:
     false_friends: gives ❤️ to people who give them negative
     blind_attacks: gives negative to people who give them ❤️
     """
+    tensor = ReactionTensor.for_snapshots(daily_snapshots, _snapshot_names(daily_snapshots))
     results = []
-    for snap in daily_snapshots:
-        matrix = build_reaction_matrix(snap["participants"])
-        active_names = {p["name"] for p in snap["participants"] if p.get("name")}
-
-        participants = {}
-        for name in active_names:
-            false_friends = 0
-            blind_attacks = 0
-            for other in active_names:
-                if name == other:
-                    continue
-                my_rxn = matrix.get((name, other), "")
-                their_rxn = matrix.get((other, name), "")
-
-                i_give_heart = my_rxn in POSITIVE
-                they_give_neg = their_rxn not in POSITIVE and their_rxn != ""
-                i_give_neg = my_rxn not in POSITIVE and my_rxn != ""
-                they_give_heart = their_rxn in POSITIVE
-
-                if i_give_heart and they_give_neg:
-                    false_friends += 1
-                if i_give_neg and they_give_heart:
-                    blind_attacks += 1
-
-            participants[name] = {
-                "false_friends": false_friends,
-                "blind_attacks": blind_attacks,
-            }
+    for day, snap in enumerate(daily_snapshots):
+        active_names = list({p["name"] for p in snap["participants"] if p.get("name")})
+        false_friends, blind_attacks = vulnerability_counts(tensor, tensor.day(day, tensor.indices(active_names)))
+
+        participants = {
+            name: {"false_friends": ff, "blind_attacks": ba}
+            for name, ff, ba in zip(active_names, false_friends.tolist(), blind_attacks.tolist())
+        }
 
         results.append({
             "date": snap["date"],
@@ -3,7 +3,9 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import pickle
 import unicodedata
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
@@ -14,11 +16,11 @@ UTC = timezone.utc
 BRT = timezone(timedelta(hours=-3))
 
 from data_utils import (
-    load_snapshot, build_reaction_matrix, parse_roles, calc_sentiment,
+    load_snapshot, get_reaction_matrix, parse_roles, calc_sentiment,
     REACTION_EMOJI, REACTION_SLUG_TO_LABEL, SENTIMENT_WEIGHTS, POSITIVE, MILD_NEGATIVE, STRONG_NEGATIVE,
     POWER_EVENT_EMOJI, POWER_EVENT_LABELS,
-    utc_to_game_date, get_cycle_number, get_cycle_start_date, get_effective_cycle_end_dates,
-    normalize_actors, get_daily_snapshots, get_all_snapshots_with_data,
+    utc_to_game_date, get_cycle_number, CycleCalendar, get_cycle_calendar,
+    normalize_actors, get_daily_snapshots, get_all_snapshots_with_data, SnapshotStore,
     genero, resolve_leaders, compute_protected_names, load_paredoes_transformed, load_votalhada_polls, get_poll_for_paredao, GROUP_COLORS,
     get_bv_winners,
 )
@@ -30,6 +32,7 @@ from builders.paredao_exposure import (
     build_figurinha_repetida_items,
 )
 from paredao_viz import build_paredao_history, build_paredao_card_payload
+from pipeline_profile import section
 
 _PROJECT_ROOT = Path(__file__).parent.parent.parent
 DATA_DIR = _PROJECT_ROOT / "data" / "snapshots"
@@ -553,15 +556,17 @@ def build_big_fone_consensus(
     roles_current: dict[str, list[str]],
     latest_matrix: dict[tuple[str, str], str],
     pair_sentiment_fn: Callable[[str, str], float],
+    calendar: CycleCalendar | None = None,
 ) -> dict | None:
     """Build Big Fone consensus analysis for the current week.
 
     Returns a dict with attendees, target analysis, potential 3rd persons,
     and facilitator/disruptor lists — or None if fewer than 2 bracelet holders.
     """
+    calendar = calendar or get_cycle_calendar()
     big_fone_attendees = []
     for wev in _iter_cycle_entries(manual_events):
-        wev_week = get_cycle_number(wev["start_date"]) if wev.get("start_date") else _get_event_cycle(wev)
+        wev_week = calendar.cycle(wev["start_date"]) if wev.get("start_date") else _get_event_cycle(wev)
         if wev_week == current_cycle:
             for bf in wev.get("big_fone", []) or []:
                 att = bf.get("atendeu", "")
@@ -707,9 +712,9 @@ def build_big_fone_consensus(
     }
 
 
-def get_all_snapshots() -> list[dict]:
-    """Wrapper for backward-compatible call sites."""
-    return get_all_snapshots_with_data(DATA_DIR)
+def get_all_snapshots(store: SnapshotStore | None = None) -> list[dict]:
+    """Wrapper for backward-compatible call sites (optionally backed by a shared store)."""
+    return get_all_snapshots_with_data(DATA_DIR, store=store)
 
 
 def build_alignment(participants: list[dict], sinc_data: dict, week: int) -> list[dict] | None:
@@ -745,7 +750,7 @@ def build_alignment(participants: list[dict], sinc_data: dict, week: int) -> lis
 # ── Sub-functions for build_index_data() ──────────────────────────────────
 
 
-def _load_and_parse_snapshots(snapshots: list[dict]) -> dict[str, Any]:
+def _load_and_parse_snapshots(snapshots: list[dict], calendar: CycleCalendar) -> dict[str, Any]:
     """Label snapshots, extract member_of/avatars, load all derived JSONs.
 
     Returns a dict with loaded data and basic lookups.
@@ -759,7 +764,7 @@ def _load_and_parse_snapshots(snapshots: list[dict]) -> dict[str, Any]:
 
     latest = snapshots[-1]
     latest_date = latest["date"]
-    current_cycle = get_cycle_number(latest_date)
+    current_cycle = calendar.cycle(latest_date)
 
     member_of = {}
     avatars = {}
@@ -819,11 +824,13 @@ def _load_and_parse_snapshots(snapshots: list[dict]) -> dict[str, Any]:
     }
 
 
-def _aggregate_latest_state(parsed: dict[str, Any], daily_snapshots: list[dict]) -> dict[str, Any]:
+def _aggregate_latest_state(parsed: dict[str, Any], daily_snapshots: list[dict],
+                            calendar: CycleCalendar | None = None) -> dict[str, Any]:
     """Compute active participants, roles, VIP/Xepa days, leader periods, plant scores.
 
     Returns a dict with aggregated state lookups.
     """
+    calendar = calendar or get_cycle_calendar()
     latest = parsed["latest"]
     latest_date = parsed["latest_date"]
     current_cycle = parsed["current_cycle"]
@@ -902,10 +909,10 @@ def _aggregate_latest_state(parsed: dict[str, Any], daily_snapshots: list[dict])
         lider_by_paredao[cycle_num] = formacao.get("lider")
         lideres_by_paredao[cycle_num] = resolve_leaders(formacao)
 
-    effective_cycle_ends = get_effective_cycle_end_dates()
+    effective_cycle_ends = list(calendar.boundaries)
     n_cycles = len(effective_cycle_ends)
     for cyc_num in range(1, n_cycles + 2):  # +1 for open current cycle
-        start_date = get_cycle_start_date(cyc_num)
+        start_date = calendar.start(cyc_num)
 
         if cyc_num <= n_cycles:
             end_date = effective_cycle_ends[cyc_num - 1]
@@ -988,7 +995,7 @@ def _aggregate_latest_state(parsed: dict[str, Any], daily_snapshots: list[dict])
 
     # leader_start_date: derived from effective week boundaries for current open week.
     current_open_cycle = len(effective_cycle_ends) + 1
-    leader_start_date = get_cycle_start_date(current_open_cycle)
+    leader_start_date = calendar.start(current_open_cycle)
 
     first_seen = {p["name"]: p.get("first_seen") for p in participants_index.get("participants", []) if p.get("name")}
     vip_group = {p.get("name") for p in latest["participants"]
@@ -1021,13 +1028,14 @@ def _aggregate_latest_state(parsed: dict[str, Any], daily_snapshots: list[dict])
     }
 
 
-def _build_shared_context(snapshots: list[dict], daily_snapshots: list[dict], daily_matrices: list[dict]) -> dict[str, Any]:
+def _build_shared_context(snapshots: list[dict], daily_snapshots: list[dict], daily_matrices: list[dict],
+                          calendar: CycleCalendar) -> dict[str, Any]:
     """Load JSONs, compute shared lookups (member_of, avatars, roles, VIP, plant scores).
 
     Returns a ctx dict that other sub-functions use.
     """
-    parsed = _load_and_parse_snapshots(snapshots)
-    aggregated = _aggregate_latest_state(parsed, daily_snapshots)
+    parsed = _load_and_parse_snapshots(snapshots, calendar)
+    aggregated = _aggregate_latest_state(parsed, daily_snapshots, calendar)
 
     # Use the most recent daily matrix that has complete reaction data.
     # When the API is broken (e.g. Breno/Quarto Secreto gap), the latest
@@ -1059,6 +1067,7 @@ def _build_shared_context(snapshots: list[dict], daily_snapshots: list[dict], da
         "daily_snapshots": daily_snapshots,
         "daily_matrices": daily_matrices,
         "latest_matrix": latest_matrix,
+        "calendar": calendar,
     }
     ctx.update(parsed)
     ctx.update(aggregated)
@@ -3616,7 +3625,7 @@ def _build_ranking_tables(ctx: dict[str, Any]) -> dict[str, Any]:
             if len(snap_names) < 2:
                 continue
 
-            snap_matrix = build_reaction_matrix(snap_parts)
+            snap_matrix = get_reaction_matrix(snap, active_only=True)
             pair_base = {}
             for (giver, receiver), label in snap_matrix.items():
                 pair_base[(giver, receiver)] = SENTIMENT_WEIGHTS.get(label, 0)
@@ -3724,7 +3733,7 @@ def _build_cross_table_and_summary(ctx: dict[str, Any]) -> dict[str, Any]:
 
 
 def _compute_vote_multipliers_for_paredao(
-    par: dict[str, Any], power_events: list[dict[str, Any]], week: Any
+    par: dict[str, Any], power_events: list[dict[str, Any]], week: Any, calendar: CycleCalendar
 ) -> dict[str, int]:
     """Build {voter_name: multiplier} for a single paredao entry.
 
@@ -3739,7 +3748,7 @@ def _compute_vote_multipliers_for_paredao(
         multiplier[voter] = 0
 
     for ev in power_events:
-        ev_week = get_cycle_number(ev["date"]) if ev.get("date") else (ev.get("cycle") or ev.get("week", 0))
+        ev_week = calendar.cycle(ev["date"]) if ev.get("date") else (ev.get("cycle") or ev.get("week", 0))
         if week and ev_week == week:
             if ev.get("type") == "voto_duplo":
                 for a in normalize_actors(ev):
@@ -3850,7 +3859,7 @@ def _build_curiosity_lookups(ctx: dict[str, Any]) -> dict[str, Any]:
         if not votos:
             continue
         week = par.get("cycle")
-        multiplier = _compute_vote_multipliers_for_paredao(par, power_events, week)
+        multiplier = _compute_vote_multipliers_for_paredao(par, power_events, week, ctx["calendar"])
 
         for voter, target in votos.items():
             v = voter.strip()
@@ -4044,7 +4053,8 @@ def _build_profile_header(name: str, latest: dict, latest_matrix: dict[tuple[str
 
 def _build_profile_stats_grid(name: str, latest_matrix: dict[tuple[str, str], str], active_names: list[str], relations_pairs: dict,
                                received_impact: dict, relations_data: dict | list, power_events: list[dict],
-                               roles_current: dict[str, list[str]], current_cycle: int | None) -> dict[str, Any]:
+                               roles_current: dict[str, list[str]], current_cycle: int | None,
+                               calendar: CycleCalendar) -> dict[str, Any]:
     """Relations (allies/enemies/false_friends/blind_targets), risk level, impact, animosity, events.
 
     Returns a dict with relations, risk, impact, animosity, and event data.
@@ -4121,7 +4131,7 @@ def _build_profile_stats_grid(name: str, latest_matrix: dict[tuple[str, str], st
     historic_events = []
     for ev in target_events_all:
         ev_type = ev.get("type")
-        ev_week = get_cycle_number(ev["date"]) if ev.get("date") else (ev.get("cycle") or ev.get("week", 0))
+        ev_week = calendar.cycle(ev["date"]) if ev.get("date") else (ev.get("cycle") or ev.get("week", 0))
         if ev_type in ["lider", "anjo", "monstro", "imunidade"]:
             role_label = next((k for k, v in ROLE_TYPES.items() if v == ev_type), None)
             if role_label and name in roles_current.get(role_label, []):
@@ -4575,7 +4585,7 @@ def _build_profile_entry(name: str, ctx: dict[str, Any], lookups: dict[str, Any]
     stats = _build_profile_stats_grid(
         name, latest_matrix, active_names, relations_pairs,
         received_impact, relations_data, power_events,
-        roles_current, current_cycle)
+        roles_current, current_cycle, ctx["calendar"])
 
     # 3. Queridômetro section: votes, plant index
     querido = _build_profile_querido_section(
@@ -4799,50 +4809,207 @@ def _build_eliminated_list(ctx: dict[str, Any]) -> list[dict]:
     return eliminated_list
 
 
+# ── Section cache ─────────────────────────────────────────────────────────
+#
+# Each memoized section declares the inputs it reads (through ctx or
+# directly). Its result is reused from the cache file while the digests of
+# those inputs are unchanged. "code" covers every module under scripts/, so
+# any code change recomputes everything. The paredão card is not cached: it
+# depends on polls.json and on the current time (live poll countdowns).
+
+INDEX_SECTIONS_FILE = DERIVED_DIR / "_index_sections.pkl"
+INDEX_SECTIONS_VERSION = 1
+
+
+def _index_input_files() -> dict[str, Path]:
+    """Files behind the ctx keys loaded by ``_build_shared_context``."""
+    return {
+        "manual_events": MANUAL_EVENTS_FILE,
+        "paredoes": PAREDOES_FILE,
+        "provas": PROVAS_RAW_FILE,
+        "auto_events": AUTO_EVENTS_FILE,
+        "sincerao_edges": SINCERAO_FILE,
+        "daily_metrics": DAILY_METRICS_FILE,
+        "roles_daily": ROLES_DAILY_FILE,
+        "participants_index": PARTICIPANTS_INDEX_FILE,
+        "plant_index": PLANT_INDEX_FILE,
+        "relations_scores": RELATIONS_FILE,
+        "cartola_data": CARTOLA_FILE,
+        "prova_rankings": PROVA_FILE,
+    }
+
+
+_SCRIPTS_DIR = _PROJECT_ROOT / "scripts"
+
+# Everything behind the ctx keys all sections read: calendar/current cycle
+# (manual sources), active set, roles, VIP/Xepa days, plant scores
+_BASE_SECTION_INPUTS = (
+    "code", "snapshots", "manual_events", "paredoes", "provas", "roles_daily", "participants_index", "plant_index",
+)
+_HIGHLIGHTS_INPUTS = _BASE_SECTION_INPUTS + ("auto_events", "daily_metrics", "relations_scores", "sincerao_edges")
+_LOOKUPS_INPUTS = _BASE_SECTION_INPUTS + (
+    "auto_events", "cartola_data", "daily_metrics", "prova_rankings", "relations_scores", "sincerao_edges",
+)
+INDEX_SECTION_INPUTS: dict[str, tuple[str, ...]] = {
+    "highlights_and_cards": _HIGHLIGHTS_INPUTS,
+    "overview_stats": _BASE_SECTION_INPUTS,
+    "ranking_tables": _BASE_SECTION_INPUTS + ("daily_metrics", "relations_scores"),
+    "cross_table": _BASE_SECTION_INPUTS,
+    # Profiles also read the Sincerão week chosen by highlights and the curiosity lookups
+    "profiles": tuple(dict.fromkeys(_HIGHLIGHTS_INPUTS + _LOOKUPS_INPUTS)),
+    "eliminated_list": _BASE_SECTION_INPUTS,
+    "big_fone_consensus": _BASE_SECTION_INPUTS + ("relations_scores",),
+}
+
+
+def _file_digest(path: Path) -> str:
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return ""
+
+
+def _code_digest() -> str:
+    h = hashlib.sha1()
+    for path in sorted(_SCRIPTS_DIR.rglob("*.py")):
+        h.update(path.relative_to(_SCRIPTS_DIR).as_posix().encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _snapshots_digest(snapshots: list[dict]) -> str:
+    """Capture files by path, size and mtime (captures are not edited in place);
+    in-memory snapshots without a file are hashed by content."""
+    h = hashlib.sha1()
+    for snap in snapshots:
+        try:
+            st = Path(snap["file"]).stat()
+            h.update(f"{snap['file']}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+        except (KeyError, TypeError, OSError):
+            h.update(json.dumps([snap.get("date"), snap.get("participants")], sort_keys=True, ensure_ascii=False).encode())
+    return h.hexdigest()
+
+
+class IndexSectionCache:
+    """On-disk memo of ``build_index_data`` sections keyed by their input digests.
+
+    Input digests are computed lazily, once per build. ``save()`` rewrites the
+    file only when a section was recomputed.
+    """
+
+    def __init__(self, path: Path, snapshots: list[dict]) -> None:
+        self.path = path
+        self.snapshots = snapshots
+        self._digests: dict[str, str] = {}
+        self.entries: dict[str, tuple[str, bytes]] = {}
+        self.hits: list[str] = []
+        self.misses: list[str] = []
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+            if data.get("version") == INDEX_SECTIONS_VERSION:
+                self.entries = data["sections"]
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError, AttributeError, KeyError, TypeError):
+            pass
+
+    def digest(self, source: str) -> str:
+        if source not in self._digests:
+            if source == "code":
+                self._digests[source] = _code_digest()
+            elif source == "snapshots":
+                self._digests[source] = _snapshots_digest(self.snapshots)
+            else:
+                self._digests[source] = _file_digest(_index_input_files()[source])
+        return self._digests[source]
+
+    def key(self, name: str) -> str:
+        inputs = INDEX_SECTION_INPUTS[name]
+        return hashlib.sha1("|".join(f"{s}={self.digest(s)}" for s in inputs).encode()).hexdigest()
+
+    def get(self, name: str, compute: Callable[[], Any]) -> Any:
+        key = self.key(name)
+        cached = self.entries.get(name)
+        if cached is not None and cached[0] == key:
+            self.hits.append(name)
+            return pickle.loads(cached[1])
+        value = compute()
+        # Pickled right away: the orchestrator edits some results afterwards
+        self.entries[name] = (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        self.misses.append(name)
+        return value
+
+    def save(self) -> None:
+        if not self.misses:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": INDEX_SECTIONS_VERSION, "sections": self.entries}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(self.path)
+
+
 # ── Main orchestrator ─────────────────────────────────────────────────────
 
 
-def build_index_data() -> dict | None:
-    snapshots = get_all_snapshots()
+def build_index_data(store: SnapshotStore | None = None, calendar: CycleCalendar | None = None,
+                     section_cache: Path | None = None) -> dict | None:
+    """Build the index.qmd payload.
+
+    Pass the pipeline's ``SnapshotStore`` to reuse already-parsed snapshots;
+    without it the snapshot directory is read from disk. ``calendar``
+    defaults to ``get_cycle_calendar()``. With ``section_cache`` (a file
+    path, see ``IndexSectionCache``) sections whose declared inputs are
+    unchanged are reused from the previous build.
+    """
+    snapshots = get_all_snapshots(store)
     if not snapshots:
         print("No snapshots found. Skipping index data.")
         return None
 
-    daily_snapshots = get_daily_snapshots(snapshots)
-    daily_matrices = [build_reaction_matrix(s["participants"]) for s in daily_snapshots]
+    daily_snapshots = store.daily() if store is not None else get_daily_snapshots(snapshots)
+    daily_matrices = [get_reaction_matrix(s) for s in daily_snapshots]
 
     # 1. Shared context (loads JSONs, computes member_of, avatars, roles, VIP, etc.)
-    ctx = _build_shared_context(snapshots, daily_snapshots, daily_matrices)
+    with section("shared_context"):
+        ctx = _build_shared_context(snapshots, daily_snapshots, daily_matrices, calendar or get_cycle_calendar())
+
+    cache = IndexSectionCache(section_cache, snapshots) if section_cache is not None else None
+
+    def run(name: str, compute: Callable[[], Any]) -> Any:
+        with section(name):
+            return cache.get(name, compute) if cache is not None else compute()
 
     # 2. Highlights and cards
-    hl = _build_highlights_and_cards(ctx)
+    hl = run("highlights_and_cards", lambda: _build_highlights_and_cards(ctx))
     ctx["sinc_week_used"] = hl["sinc_week_used"]
     ctx["sinc_reference_matrix"] = hl.get("sinc_reference_matrix", ctx["latest_matrix"])
 
     # 3. Overview stats
-    ov = _build_overview_stats(ctx)
+    ov = run("overview_stats", lambda: _build_overview_stats(ctx))
 
     # 4. Ranking tables + timelines
-    rk = _build_ranking_tables(ctx)
+    rk = run("ranking_tables", lambda: _build_ranking_tables(ctx))
 
     # 5. Cross table and reaction summary
-    ct = _build_cross_table_and_summary(ctx)
-
-    # 6. Curiosity lookups
-    lookups = _build_curiosity_lookups(ctx)
+    ct = run("cross_table", lambda: _build_cross_table_and_summary(ctx))
 
-    # 7. Build profiles
+    # 6. Curiosity lookups (only feed the profiles), 7. profiles,
+    # 8. record-holder curiosities (post-processing)
     active = ctx["active"]
-    profiles = []
-    for p in sorted(active, key=lambda x: x["name"]):
-        profiles.append(_build_profile_entry(p["name"], ctx, lookups))
 
-    # 8. Record-holder curiosities (post-processing)
-    _build_record_holder_curiosities(profiles, ctx)
-    saldo_card = _build_saldo_card(profiles)
+    def build_profiles() -> tuple[list[dict], dict | None]:
+        with section("curiosity_lookups"):
+            lookups = _build_curiosity_lookups(ctx)
+        profiles = [_build_profile_entry(p["name"], ctx, lookups) for p in sorted(active, key=lambda x: x["name"])]
+        with section("record_holders"):
+            _build_record_holder_curiosities(profiles, ctx)
+            return profiles, _build_saldo_card(profiles)
+
+    profiles, saldo_card = run("profiles", build_profiles)
 
     # 9. Eliminated list
-    eliminated_list = _build_eliminated_list(ctx)
+    eliminated_list = run("eliminated_list", lambda: _build_eliminated_list(ctx))
 
     # Big Fone consensus analysis
     def pair_sentiment(giver: str, receiver: str) -> float:
@@ -4852,28 +5019,30 @@ def build_index_data() -> dict | None:
         label = ctx["latest_matrix"].get((giver, receiver), "")
         return SENTIMENT_WEIGHTS.get(label, 0)
 
-    big_fone_consensus = build_big_fone_consensus(
+    big_fone_consensus = run("big_fone_consensus", lambda: build_big_fone_consensus(
         ctx["manual_events"], ctx["current_cycle"], ctx["active_names"], ctx["active_set"],
         ctx["avatars"], ctx["member_of"], ctx["roles_current"], ctx["latest_matrix"], pair_sentiment,
-    )
+        calendar=ctx["calendar"],
+    ))
 
     latest_paredao = None
     paredao_card = None
-    transformed_paredoes = load_paredoes_transformed(member_of=ctx["member_of"])
-    if transformed_paredoes:
-        latest_paredao = transformed_paredoes[-1]
-        # If latest paredão has no nominees yet, show the last finalized result instead
-        if not latest_paredao.get("participantes") and len(transformed_paredoes) >= 2:
-            last_finalized = next(
-                (p for p in reversed(transformed_paredoes[:-1]) if p.get("status") == "finalizado"),
-                None,
-            )
-            if last_finalized:
-                latest_paredao = last_finalized
-        polls_data = load_votalhada_polls()
-        current_poll = get_poll_for_paredao(polls_data, latest_paredao["numero"])
-        history = build_paredao_history(ctx["paredoes"].get("paredoes", []), latest_paredao["numero"])
-        paredao_card = build_paredao_card_payload(latest_paredao, current_poll, polls_data, history)
+    with section("paredao_card"):
+        transformed_paredoes = load_paredoes_transformed(member_of=ctx["member_of"])
+        if transformed_paredoes:
+            latest_paredao = transformed_paredoes[-1]
+            # If latest paredão has no nominees yet, show the last finalized result instead
+            if not latest_paredao.get("participantes") and len(transformed_paredoes) >= 2:
+                last_finalized = next(
+                    (p for p in reversed(transformed_paredoes[:-1]) if p.get("status") == "finalizado"),
+                    None,
+                )
+                if last_finalized:
+                    latest_paredao = last_finalized
+            polls_data = load_votalhada_polls()
+            current_poll = get_poll_for_paredao(polls_data, latest_paredao["numero"])
+            history = build_paredao_history(ctx["paredoes"].get("paredoes", []), latest_paredao["numero"])
+            paredao_card = build_paredao_card_payload(latest_paredao, current_poll, polls_data, history)
 
     paredao_names = [n["name"] for n in paredao_card.get("nominees", [])] if paredao_card else hl["paredao_names"]
     paredao_status = {
@@ -4992,6 +5161,8 @@ def build_index_data() -> dict | None:
         },
     }
 
+    if cache is not None:
+        cache.save()
     return payload
 
 
@@ -0,0 +1,171 @@
+"""Per-pair queridômetro label history — run-length encoded, with a date index.
+
+The paredão stories used to walk every daily matrix for each ``(actor,
+target)`` pair they looked at, once per paredão. ``PairLabelHistory``
+walks the matrices once and keeps, per pair, the days it had a label, the
+runs of identical consecutive labels over those days and the days both
+directions were ❤️. A cutoff date is then a bisect, and the summary
+fields (longest/current streak, last ❤️, last mutual ❤️, most frequent
+label) are read from the runs instead of the days.
+
+Days without a label are skipped, as in the day-by-day walk: they
+neither end nor extend a run.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import Counter
+from datetime import date
+
+from data_utils import POSITIVE, REACTION_EMOJI
+
+HEART = "Coração"
+
+_EMPTY_SUMMARY = {
+    "days_with_data": 0,
+    "ever_sent_heart": False,
+    "heart_days": 0,
+    "mutual_heart_days": 0,
+    "first_non_heart_date": None,
+    "last_positive_date": None,
+    "days_since_last_positive": None,
+    "last_mutual_positive_date": None,
+    "days_since_last_mutual_positive": None,
+    "latest_label": "",
+    "latest_emoji": "",
+    "most_frequent_label": "",
+    "most_frequent_emoji": "",
+    "most_frequent_count": 0,
+    "longest_streak": {},
+    "current_streak": {},
+}
+
+
+class _PairRuns:
+    """Labelled days of one pair and its runs over them."""
+
+    __slots__ = ("days", "starts", "labels", "best", "mutual")
+
+    def __init__(self) -> None:
+        self.days: list[int] = []     # day indices with a label
+        self.starts: list[int] = []   # run start, as a position in ``days``
+        self.labels: list[str] = []   # run label
+        self.best: list[int] = []     # best[k]: first longest run among runs[0..k]
+        self.mutual: list[int] = []   # day indices with ❤️ both ways
+
+    def add(self, day: int, label: str) -> None:
+        if not self.labels or self.labels[-1] != label:
+            self.starts.append(len(self.days))
+            self.labels.append(label)
+        self.days.append(day)
+
+    def finish(self) -> None:
+        """Fill ``best`` (prefix argmax of run length; ties keep the earlier run)."""
+        ends = self.starts[1:] + [len(self.days)]
+        best = 0
+        for k, (start, end) in enumerate(zip(self.starts, ends)):
+            if end - start > ends[best] - self.starts[best]:
+                best = k
+            self.best.append(best)
+
+
+class PairLabelHistory:
+    """Run-length-encoded label history for every pair of the daily matrices."""
+
+    def __init__(self, dates: list[str], matrices: list[dict[tuple[str, str], str]]) -> None:
+        self.dates = list(dates)
+        self.pairs: dict[tuple[str, str], _PairRuns] = {}
+        for day, matrix in enumerate(matrices):
+            for pair, label in matrix.items():
+                if not label:
+                    continue
+                runs = self.pairs.get(pair)
+                if runs is None:
+                    runs = self.pairs[pair] = _PairRuns()
+                runs.add(day, label)
+                if label in POSITIVE and matrix.get((pair[1], pair[0]), "") in POSITIVE:
+                    runs.mutual.append(day)
+        for runs in self.pairs.values():
+            runs.finish()
+
+    @classmethod
+    def from_snapshots(cls, daily_snapshots: list[dict], daily_matrices: list[dict]) -> PairLabelHistory:
+        return cls([snap["date"] for snap in daily_snapshots], daily_matrices)
+
+    def day_at_or_before(self, target_date: str) -> int:
+        """Index of the last day on or before ``target_date`` (-1 when none)."""
+        return bisect_right(self.dates, target_date) - 1
+
+    def summary(self, actor: str, target: str, cutoff_date: str) -> dict:
+        """Secret-queridômetro summary of actor→target over the days up to ``cutoff_date``."""
+        runs = self.pairs.get((actor, target))
+        n = bisect_right(runs.days, self.day_at_or_before(cutoff_date)) if runs else 0
+        if n == 0:
+            return {key: (dict(value) if isinstance(value, dict) else value) for key, value in _EMPTY_SUMMARY.items()}
+
+        dates = self.dates
+        n_runs = bisect_right(runs.starts, n - 1)
+        starts, labels = runs.starts[:n_runs], runs.labels[:n_runs]
+        ends = starts[1:] + [n]  # the last run is cut at the cutoff
+
+        counts: Counter = Counter()
+        for label, start, end in zip(labels, starts, ends):
+            counts[label] += end - start
+        most_frequent_label, most_frequent_count = counts.most_common(1)[0]
+
+        first_non_heart = next((start for label, start in zip(labels, starts) if label != HEART), None)
+        last_positive = next(
+            (end - 1 for label, end in zip(reversed(labels), reversed(ends)) if label in POSITIVE), None,
+        )
+        n_mutual = bisect_right(runs.mutual, runs.days[n - 1])
+
+        def _date(pos: int | None) -> str | None:
+            return dates[runs.days[pos]] if pos is not None else None
+
+        latest_label = labels[-1]
+        latest_date = _date(n - 1)
+        current = {
+            "label": latest_label,
+            "emoji": REACTION_EMOJI.get(latest_label, latest_label),
+            "length": n - starts[-1],
+            "start_date": _date(starts[-1]),
+            "end_date": latest_date,
+        }
+        best = runs.best[n_runs - 2] if n_runs > 1 else None
+        if best is None or current["length"] > ends[best] - starts[best]:
+            longest_streak = dict(current)
+        else:
+            longest_streak = {
+                "label": labels[best],
+                "emoji": REACTION_EMOJI.get(labels[best], labels[best]),
+                "length": ends[best] - starts[best],
+                "start_date": _date(starts[best]),
+                "end_date": _date(ends[best] - 1),
+            }
+
+        last_positive_date = _date(last_positive)
+        last_mutual_positive_date = dates[runs.mutual[n_mutual - 1]] if n_mutual else None
+
+        def _days_since(date_str: str | None) -> int | None:
+            if not date_str:
+                return None
+            return (date.fromisoformat(latest_date) - date.fromisoformat(date_str)).days
+
+        return {
+            "days_with_data": n,
+            "ever_sent_heart": HEART in counts,
+            "heart_days": counts.get(HEART, 0),
+            "mutual_heart_days": n_mutual,
+            "first_non_heart_date": _date(first_non_heart),
+            "last_positive_date": last_positive_date,
+            "days_since_last_positive": _days_since(last_positive_date),
+            "last_mutual_positive_date": last_mutual_positive_date,
+            "days_since_last_mutual_positive": _days_since(last_mutual_positive_date),
+            "latest_label": latest_label,
+            "latest_emoji": current["emoji"],
+            "most_frequent_label": most_frequent_label,
+            "most_frequent_emoji": REACTION_EMOJI.get(most_frequent_label, most_frequent_label),
+            "most_frequent_count": most_frequent_count,
+            "longest_streak": longest_streak,
+            "current_streak": current,
+        }
@@ -2,14 +2,16 @@
 from __future__ import annotations
 
 import json
+from bisect import bisect_right
 from collections import Counter, defaultdict
-from datetime import date
 from pathlib import Path
 
+from builders.pair_history import PairLabelHistory
+from builders.reaction_tensor import PairDayCounts
 from data_utils import (
     POSITIVE, MILD_NEGATIVE, STRONG_NEGATIVE,
     REACTION_EMOJI,
-    build_reaction_matrix, calc_sentiment, patch_missing_raio_x, resolve_leaders,
+    get_reaction_matrix, get_patched_reaction_matrices, calc_sentiment, resolve_leaders,
 )
 
 DERIVED_DIR = Path(__file__).parent.parent.parent / "data" / "derived"
@@ -326,172 +328,28 @@ def _resolve_matrix_at_or_before(
     target_date: str,
     daily_snapshots: list[dict],
     daily_matrices: list[dict],
+    pair_history: PairLabelHistory | None = None,
 ) -> tuple[str, dict[tuple[str, str], str] | None]:
     if not daily_snapshots or not daily_matrices:
         return "", None
 
-    chosen_idx = 0
-    for idx, snap in enumerate(daily_snapshots):
-        if snap["date"] <= target_date:
-            chosen_idx = idx
+    if pair_history is None:
+        pair_history = PairLabelHistory.from_snapshots(daily_snapshots, daily_matrices)
+    chosen_idx = max(pair_history.day_at_or_before(target_date), 0)
 
     return daily_snapshots[chosen_idx]["date"], daily_matrices[chosen_idx]
 
 
-def _collect_pair_secret_history(
-    actor: str,
-    target: str,
-    daily_snapshots: list[dict],
-    daily_matrices: list[dict],
-    cutoff_date: str,
-) -> list[dict]:
-    history: list[dict] = []
-    for snap, matrix in zip(daily_snapshots, daily_matrices):
-        snap_date = snap["date"]
-        if snap_date > cutoff_date:
-            break
-        label = matrix.get((actor, target), "")
-        if not label:
-            continue
-        reverse_label = matrix.get((target, actor), "")
-        history.append({
-            "date": snap_date,
-            "label": label,
-            "emoji": REACTION_EMOJI.get(label, label),
-            "reverse_label": reverse_label,
-            "reverse_emoji": REACTION_EMOJI.get(reverse_label, reverse_label) if reverse_label else "",
-        })
-    return history
-
-
-def _summarize_pair_secret_history(history: list[dict]) -> dict:
-    if not history:
-        return {
-            "days_with_data": 0,
-            "ever_sent_heart": False,
-            "heart_days": 0,
-            "mutual_heart_days": 0,
-            "first_non_heart_date": None,
-            "last_positive_date": None,
-            "days_since_last_positive": None,
-            "last_mutual_positive_date": None,
-            "days_since_last_mutual_positive": None,
-            "latest_label": "",
-            "latest_emoji": "",
-            "most_frequent_label": "",
-            "most_frequent_emoji": "",
-            "most_frequent_count": 0,
-            "longest_streak": {},
-            "current_streak": {},
-        }
-
-    counts = Counter(item["label"] for item in history)
-    most_frequent_label, most_frequent_count = counts.most_common(1)[0]
-    first_non_heart_date = next((item["date"] for item in history if item["label"] != "Coração"), None)
-    latest = history[-1]
-    cutoff_date = latest["date"]
-    last_positive_date = next((item["date"] for item in reversed(history) if item["label"] in POSITIVE), None)
-    last_mutual_positive_date = next(
-        (
-            item["date"]
-            for item in reversed(history)
-            if item["label"] in POSITIVE and item["reverse_label"] in POSITIVE
-        ),
-        None,
-    )
-    mutual_heart_days = sum(
-        1
-        for item in history
-        if item["label"] == "Coração" and item["reverse_label"] == "Coração"
-    )
-
-    best_streak = {"label": "", "emoji": "", "length": 0, "start_date": None, "end_date": None}
-    current_label = ""
-    current_start = None
-    current_length = 0
-    prev_date = None
-
-    for item in history:
-        label = item["label"]
-        if label == current_label:
-            current_length += 1
-        else:
-            if current_label and current_length > best_streak["length"]:
-                best_streak = {
-                    "label": current_label,
-                    "emoji": REACTION_EMOJI.get(current_label, current_label),
-                    "length": current_length,
-                    "start_date": current_start,
-                    "end_date": prev_date,
-                }
-            current_label = label
-            current_start = item["date"]
-            current_length = 1
-        prev_date = item["date"]
-
-    if current_label and current_length > best_streak["length"]:
-        best_streak = {
-            "label": current_label,
-            "emoji": REACTION_EMOJI.get(current_label, current_label),
-            "length": current_length,
-            "start_date": current_start,
-            "end_date": prev_date,
-        }
-
-    current_streak_length = 0
-    current_streak_start = latest["date"]
-    for item in reversed(history):
-        if item["label"] != latest["label"]:
-            break
-        current_streak_length += 1
-        current_streak_start = item["date"]
-
-    def _days_since(date_str: str | None) -> int | None:
-        if not date_str:
-            return None
-        return (date.fromisoformat(cutoff_date) - date.fromisoformat(date_str)).days
-
-    return {
-        "days_with_data": len(history),
-        "ever_sent_heart": "Coração" in counts,
-        "heart_days": counts.get("Coração", 0),
-        "mutual_heart_days": mutual_heart_days,
-        "first_non_heart_date": first_non_heart_date,
-        "last_positive_date": last_positive_date,
-        "days_since_last_positive": _days_since(last_positive_date),
-        "last_mutual_positive_date": last_mutual_positive_date,
-        "days_since_last_mutual_positive": _days_since(last_mutual_positive_date),
-        "latest_label": latest["label"],
-        "latest_emoji": latest["emoji"],
-        "most_frequent_label": most_frequent_label,
-        "most_frequent_emoji": REACTION_EMOJI.get(most_frequent_label, most_frequent_label),
-        "most_frequent_count": most_frequent_count,
-        "longest_streak": best_streak,
-        "current_streak": {
-            "label": latest["label"],
-            "emoji": latest["emoji"],
-            "length": current_streak_length,
-            "start_date": current_streak_start,
-            "end_date": latest["date"],
-        },
-    }
-
-
 def _build_secret_queridometro_story(
-    daily_snapshots: list[dict],
-    daily_matrices: list[dict],
+    pair_history: PairLabelHistory,
     cutoff_date: str,
     formation_day_reactions: dict[str, dict[str, str]],
 ) -> dict:
     pairs: dict[str, dict] = {}
     for actor in SPOTLIGHT_ACTORS:
         pairs[actor] = {
-            "to_target": _summarize_pair_secret_history(
-                _collect_pair_secret_history(actor, SPOTLIGHT_TARGET, daily_snapshots, daily_matrices, cutoff_date)
-            ),
-            "from_target": _summarize_pair_secret_history(
-                _collect_pair_secret_history(SPOTLIGHT_TARGET, actor, daily_snapshots, daily_matrices, cutoff_date)
-            ),
+            "to_target": pair_history.summary(actor, SPOTLIGHT_TARGET, cutoff_date),
+            "from_target": pair_history.summary(SPOTLIGHT_TARGET, actor, cutoff_date),
         }
 
     alberto = pairs["Alberto Cowboy"]
@@ -538,6 +396,7 @@ def _build_week8_featured_story(
     manual_events: dict | None,
     auto_events: list[dict] | None,
     sincerao_edges: dict | None,
+    pair_history: PairLabelHistory | None = None,
 ) -> dict | None:
     if par.get("numero") != 8:
         return None
@@ -547,10 +406,13 @@ def _build_week8_featured_story(
     if formacao.get("indicado_lider") != SPOTLIGHT_TARGET or set(leaders) != set(SPOTLIGHT_ACTORS):
         return None
 
+    if pair_history is None:
+        pair_history = PairLabelHistory.from_snapshots(daily_snapshots, daily_matrices)
     formation_day_date, formation_matrix = _resolve_matrix_at_or_before(
         par.get("data_formacao") or par.get("data", ""),
         daily_snapshots,
         daily_matrices,
+        pair_history,
     )
     if formation_matrix is None:
         formation_day_date = par.get("data_formacao") or par.get("data", "")
@@ -596,8 +458,7 @@ def _build_week8_featured_story(
         "past_leader_indications": _build_spotlight_past_indications(paredoes_list),
         "power_usage": _build_power_usage_story(par, manual_events, auto_events),
         "secret_queridometro": _build_secret_queridometro_story(
-            daily_snapshots,
-            daily_matrices,
+            pair_history,
             formation_day_date,
             formation_day_reactions,
         ),
@@ -613,55 +474,41 @@ def _compute_pair_relationship_history(
     daily_snapshots: list[dict],
     is_finalizado: bool,
     analysis_date: str,
+    day_counts: PairDayCounts | None = None,
 ) -> dict:
     """Compute relationship history between actor→target from daily matrices.
 
+    ``day_counts`` (built from ``daily_matrices``) answers the day counts up
+    to the analysis date by lookup; callers share one across paredões.
+
     Returns a dict with pattern, days_as_friends/enemies, change_date, narrative.
     """
-    all_neg = MILD_NEGATIVE | STRONG_NEGATIVE
-    history = []
-    days_positive = 0
-    days_negative = 0
-    days_mutual_positive = 0
-    change_date = None
-    prev_was_positive = None
-
-    for i, mat in enumerate(daily_matrices):
-        snap_date = daily_snapshots[i]["date"]
-        if is_finalizado and snap_date > analysis_date:
-            break
-        rxn_v = mat.get((actor, target), "")
-        if not rxn_v:
-            continue
-        rxn_a = mat.get((target, actor), "")
-        v_pos = rxn_v in POSITIVE
-        v_neg = rxn_v in all_neg
-        history.append((snap_date, rxn_v, rxn_a))
-        if v_pos:
-            days_positive += 1
-            if prev_was_positive is False:
-                change_date = snap_date
-        elif v_neg:
-            days_negative += 1
-            if prev_was_positive is True:
-                change_date = snap_date
-        if v_pos and rxn_a in POSITIVE:
-            days_mutual_positive += 1
-        prev_was_positive = v_pos
-
-    total_hist_days = len(history)
+    if day_counts is None:
+        day_counts = PairDayCounts.from_matrices(daily_matrices)
+    stop = len(daily_matrices)
+    if is_finalizado:
+        stop = bisect_right(daily_snapshots, analysis_date, hi=stop, key=lambda snap: snap["date"])
+
+    pair = day_counts.pair(actor, target, stop)
+    total_hist_days = pair["labelled"] if pair else 0
     if total_hist_days == 0:
         return {"pattern": "sem_dados", "days_as_friends": 0, "days_as_enemies": 0,
                 "days_mutual_friends": 0, "change_date": None,
                 "narrative": "Sem dados", "total_days": 0}
 
-    current_positive = history[-1][1] in POSITIVE
+    days_positive = pair["positive"]
+    days_negative = pair["negative"]
+    days_mutual_positive = pair["mutual"]
+    change_idx = pair["last_flip"]
+    change_date = daily_snapshots[change_idx]["date"] if change_idx >= 0 else None
+
+    current_positive = pair["last_positive"]
     if days_positive == total_hist_days:
         pattern, narrative = "sempre_amigos", f"Sempre deu ❤️ ({days_positive} dias)."
     elif days_negative == total_hist_days:
         pattern, narrative = "sempre_inimigos", f"Inimigos desde o início ({days_negative} dias)."
     elif days_positive > 0 and not current_positive and change_date:
-        days_since = sum(1 for d, _, _ in history if d >= change_date)
+        days_since = total_hist_days - day_counts.pair(actor, target, change_idx)["labelled"]
         if days_since <= 2:
             pattern, narrative = "recem_inimigos", f"Eram amigos por {days_positive} dias, mudou há {days_since} dia(s)!"
         else:
@@ -750,6 +597,7 @@ def _build_paredao_summary_stats(
     daily_snapshots: list[dict],
     is_finalizado: bool,
     analysis_date: str,
+    day_counts: PairDayCounts | None = None,
 ) -> dict:
     """Compute aggregate vote stats, per-nominee breakdowns, and indicator pair analysis.
 
@@ -803,13 +651,13 @@ def _build_paredao_summary_stats(
         key = f"{actor}→{target}"
         if key not in relationship_history and matrix_p:
             relationship_history[key] = _compute_pair_relationship_history(
-                actor, target, daily_matrices, daily_snapshots, is_finalizado, analysis_date)
+                actor, target, daily_matrices, daily_snapshots, is_finalizado, analysis_date, day_counts)
 
         # Also add reverse direction (target→actor)
         rev_key = f"{target}→{actor}"
         if rev_key not in relationship_history and matrix_p:
             relationship_history[rev_key] = _compute_pair_relationship_history(
-                target, actor, daily_matrices, daily_snapshots, is_finalizado, analysis_date)
+                target, actor, daily_matrices, daily_snapshots, is_finalizado, analysis_date, day_counts)
 
     # Add indicator reaction snapshots at analysis date
     indicator_reactions: list[dict] = []
@@ -855,9 +703,15 @@ def _analyze_single_paredao(
     manual_events: dict | None = None,
     auto_events: list[dict] | None = None,
     sincerao_edges: dict | None = None,
+    day_counts: PairDayCounts | None = None,
+    pair_history: PairLabelHistory | None = None,
+    daily_sentiment: list[tuple[str, dict[str, float]]] | None = None,
 ) -> dict | None:
     """Analyze a single paredão: nominee stats, relationship history, vote analysis.
 
+    ``pair_history`` and ``daily_sentiment`` are built from the whole season
+    when not given; ``build_paredao_analysis`` shares one of each across paredões.
+
     Returns a dict with the full analysis for this paredão, or None if skipped.
     """
     numero = par.get("numero")
@@ -871,16 +725,16 @@ def _analyze_single_paredao(
 
     is_finalizado = status == "finalizado"
     analysis_date = data_formacao
+    if pair_history is None:
+        pair_history = PairLabelHistory.from_snapshots(daily_snapshots, daily_matrices)
+    if daily_sentiment is None:
+        daily_sentiment = _daily_sentiment(daily_snapshots)
 
     # Find snapshot for analysis
     snap_for_analysis = None
     if is_finalizado:
-        for snap in reversed(daily_snapshots):
-            if snap["date"] <= analysis_date:
-                snap_for_analysis = snap
-                break
-        if snap_for_analysis is None and daily_snapshots:
-            snap_for_analysis = daily_snapshots[0]
+        if daily_snapshots:
+            snap_for_analysis = daily_snapshots[max(pair_history.day_at_or_before(analysis_date), 0)]
     else:
         snap_for_analysis = daily_snapshots[-1] if daily_snapshots else None
 
@@ -908,17 +762,9 @@ def _analyze_single_paredao(
     rank_map = {name: i + 1 for i, (name, _) in enumerate(ranking_paredao)}
 
     # Historical daily series (up to analysis_date for finalizado)
-    daily_sent: list[tuple[str, dict[str, float]]] = []
-    for snap in daily_snapshots:
-        date = snap["date"]
-        if is_finalizado and date > analysis_date:
-            continue
-        day_scores: dict[str, float] = {}
-        for p in snap["participants"]:
-            if p.get("characteristics", {}).get("eliminated"):
-                continue
-            day_scores[p["name"]] = calc_sentiment(p)
-        daily_sent.append((date, day_scores))
+    daily_sent = daily_sentiment
+    if is_finalizado:
+        daily_sent = daily_sentiment[:pair_history.day_at_or_before(analysis_date) + 1]
 
     # Top5/Bottom5 counts
     top5_counts: Counter = Counter()
@@ -953,16 +799,11 @@ def _analyze_single_paredao(
             continue
         key = f"{votante}→{alvo}"
         relationship_history[key] = _compute_pair_relationship_history(
-            votante, alvo, daily_matrices, daily_snapshots, is_finalizado, analysis_date)
+            votante, alvo, daily_matrices, daily_snapshots, is_finalizado, analysis_date, day_counts)
 
     # Find the matrix at the analysis date
-    matrix_p = None
-    for idx_snap in range(len(daily_snapshots) - 1, -1, -1):
-        if daily_snapshots[idx_snap]["date"] <= analysis_date:
-            matrix_p = daily_matrices[idx_snap]
-            break
-    if matrix_p is None and daily_matrices:
-        matrix_p = daily_matrices[0]
+    _matrix_date, matrix_p = _resolve_matrix_at_or_before(
+        analysis_date, daily_snapshots, daily_matrices, pair_history)
 
     # Vote classification
     vote_analysis, relationship_counts = _build_paredao_vote_analysis(
@@ -972,7 +813,7 @@ def _analyze_single_paredao(
     summary = _build_paredao_summary_stats(
         par, indicados, votos, vote_analysis, relationship_counts,
         relationship_history, matrix_p, daily_matrices, daily_snapshots,
-        is_finalizado, analysis_date)
+        is_finalizado, analysis_date, day_counts)
 
     return {
         "numero": numero,
@@ -996,11 +837,25 @@ def _analyze_single_paredao(
             manual_events,
             auto_events,
             sincerao_edges,
+            pair_history,
         ),
         **summary,
     }
 
 
+def _daily_sentiment(daily_snapshots: list[dict]) -> list[tuple[str, dict[str, float]]]:
+    """Per-day sentiment of the participants still in the house, in snapshot order."""
+    daily_sent: list[tuple[str, dict[str, float]]] = []
+    for snap in daily_snapshots:
+        day_scores: dict[str, float] = {}
+        for p in snap["participants"]:
+            if p.get("characteristics", {}).get("eliminated"):
+                continue
+            day_scores[p["name"]] = calc_sentiment(p)
+        daily_sent.append((snap["date"], day_scores))
+    return daily_sent
+
+
 def _analyze_nominees(
     indicados: list[str],
     daily_sent: list[tuple[str, dict[str, float]]],
@@ -1069,15 +924,12 @@ def build_paredao_analysis(
     paredoes_list = paredoes_data.get("paredoes", []) if paredoes_data else []
 
     # Build daily matrices once (with missing Raio-X patching)
-    daily_matrices = []
-    prev_matrix = {}
-    for snap in daily_snapshots:
-        active = [p for p in snap["participants"]
-                  if not p.get("characteristics", {}).get("eliminated")]
-        matrix = build_reaction_matrix(active)
-        matrix, _carried = patch_missing_raio_x(matrix, snap["participants"], prev_matrix)
-        daily_matrices.append(matrix)
-        prev_matrix = matrix
+    daily_matrices, _carried = get_patched_reaction_matrices(daily_snapshots, active_only=True)
+    # Per-pair day counts as prefix sums, shared by every relationship history
+    day_counts = PairDayCounts.from_matrices(daily_matrices)
+    # Per-pair label runs with a date index, and the daily sentiment series
+    pair_history = PairLabelHistory.from_snapshots(daily_snapshots, daily_matrices)
+    daily_sentiment = _daily_sentiment(daily_snapshots)
 
     _ = relations_scores
     for par in paredoes_list:
@@ -1089,6 +941,9 @@ def build_paredao_analysis(
             manual_events=manual_events,
             auto_events=auto_events,
             sincerao_edges=sincerao_edges,
+            day_counts=day_counts,
+            pair_history=pair_history,
+            daily_sentiment=daily_sentiment,
         )
         if result is not None:
             by_paredao[str(result["numero"])] = result
@@ -1140,7 +995,7 @@ def build_paredao_badges(daily_snapshots: list[dict], paredoes_data: dict | None
         active = [p for p in snap_found["participants"]
                   if not p.get("characteristics", {}).get("eliminated")]
         active_names = [p["name"] for p in active]
-        matrix = build_reaction_matrix(active)
+        matrix = get_reaction_matrix(snap_found, active_only=True)
 
         # Ineligible from paredão formation
         ineligible = set()
@@ -4,7 +4,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from data_utils import parse_roles, get_cycle_number
+from data_utils import CycleCalendar, get_cycle_calendar, parse_roles
 
 
 ROLES = ["Líder", "Anjo", "Monstro", "Imune", "Paredão"]
@@ -83,7 +83,8 @@ def build_daily_roles(daily_snapshots: list[dict]) -> list[dict]:
     return daily_roles
 
 
-def build_auto_events(daily_roles: list[dict]) -> list[dict]:
+def build_auto_events(daily_roles: list[dict], calendar: CycleCalendar | None = None) -> list[dict]:
+    cycle_of = (calendar or get_cycle_calendar()).cycle
     events = []
     prev = None
 
@@ -96,7 +97,7 @@ def build_auto_events(daily_roles: list[dict]) -> list[dict]:
 
     for entry in daily_roles:
         date = entry["date"]
-        week = get_cycle_number(date)
+        week = cycle_of(date)
         roles = entry["roles"]
         anjo_name = next(iter(roles.get("Anjo", [])), None)
 
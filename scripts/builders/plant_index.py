@@ -4,7 +4,7 @@ from __future__ import annotations
 from collections import defaultdict
 from datetime import datetime, timezone
 
-from data_utils import get_cycle_number
+from data_utils import CycleCalendar, get_cycle_calendar
 from builders.sincerao import split_names as _split_names
 
 # ── Plant Index constants ──
@@ -231,22 +231,24 @@ def _process_week_reactions(week_snaps: list[dict]) -> dict:
     }
 
 
-def build_plant_index(daily_snapshots: list[dict], manual_events: dict | None, auto_events: list[dict] | None, sincerao_edges: dict | None, paredoes: dict | None = None) -> dict:
+def build_plant_index(daily_snapshots: list[dict], manual_events: dict | None, auto_events: list[dict] | None, sincerao_edges: dict | None, paredoes: dict | None = None,
+                      calendar: CycleCalendar | None = None) -> dict:
+    cycle_of = (calendar or get_cycle_calendar()).cycle
     weekly = defaultdict(lambda: {"dates": [], "snapshots": []})
     for snap in daily_snapshots:
-        week = get_cycle_number(snap["date"])
+        week = cycle_of(snap["date"])
         weekly[week]["dates"].append(snap["date"])
         weekly[week]["snapshots"].append(snap)
 
     events_by_week = defaultdict(list)
     for ev in (manual_events.get("power_events", []) if manual_events else []):
         d = ev.get("date", "")
-        week = get_cycle_number(d) if d else (ev.get("cycle") or ev.get("week", 0))
+        week = cycle_of(d) if d else (ev.get("cycle") or ev.get("week", 0))
         if week:
             events_by_week[week].append(ev)
     for ev in auto_events or []:
         d = ev.get("date", "")
-        week = get_cycle_number(d) if d else (ev.get("cycle") or ev.get("week", 0))
+        week = cycle_of(d) if d else (ev.get("cycle") or ev.get("week", 0))
         if week:
             events_by_week[week].append(ev)
 
@@ -0,0 +1,315 @@
+"""Dense reaction tensor — days × givers × receivers of queridômetro label codes.
+
+The daily builders (hostility counts, vulnerability, day-over-day changes,
+streaks) used to walk ``{(giver, receiver): label}`` dicts pair by pair. This
+module packs a sequence of those matrices into one int8 tensor plus per-code
+lookup tables (sentiment weight, positive/negative flags, streak category),
+so each classification is a few array operations. Code 0 means "no
+reaction" (missing pair or empty label), matching ``matrix.get(key, "")``.
+
+Output assembly (dict/list construction, ordering) stays in the builders.
+"""
+from __future__ import annotations
+
+from itertools import chain
+from typing import Iterable
+
+import numpy as np
+
+from data_utils import (
+    REACTION_MATRIX_CACHE,
+    SENTIMENT_WEIGHTS,
+    POSITIVE,
+    MILD_NEGATIVE,
+    STRONG_NEGATIVE,
+    ReactionMatrixCache,
+)
+
+# Streak categories (see relations._classify_sentiment)
+CATEGORY_NAMES = ("positive", "mild_negative", "strong_negative")
+NO_CATEGORY = -1
+
+# Codes of the known labels, the same in every tensor. Labels outside
+# SENTIMENT_WEIGHTS get per-tensor codes after these (``from_matrices``).
+BASE_LABEL_CODES: dict[str, int] = {"": 0, **{label: i + 1 for i, label in enumerate(SENTIMENT_WEIGHTS)}}
+
+# Key of the ``for_snapshots`` memo in ``ReactionMatrixCache.memo``
+_MEMO_KEY = "reaction_tensor"
+
+
+def _category_code(label: str) -> int:
+    if label in POSITIVE:
+        return 0
+    if label in STRONG_NEGATIVE:
+        return 2
+    if label in MILD_NEGATIVE:
+        return 1
+    return NO_CATEGORY
+
+
+class ReactionTensor:
+    """Label codes for a sequence of reaction matrices over one name universe."""
+
+    def __init__(self, codes: np.ndarray, names: list[str], labels: list[str]) -> None:
+        self.codes = codes
+        self.names = names
+        self.labels = labels
+        self.index = {name: i for i, name in enumerate(names)}
+        self.weight = np.array([SENTIMENT_WEIGHTS.get(label, 0) for label in labels], dtype=np.float64)
+        self.positive = np.array([label in POSITIVE for label in labels], dtype=bool)
+        self.negative = np.array([label != "" and label not in POSITIVE for label in labels], dtype=bool)
+        self.category = np.array([_category_code(label) for label in labels], dtype=np.int8)
+
+    @classmethod
+    def from_matrices(cls, matrices: list[dict[tuple[str, str], str]], names: Iterable[str] = ()) -> ReactionTensor:
+        """Pack matrices into a tensor; ``names`` seeds the universe with participants
+        that may have no reactions at all."""
+        universe = dict.fromkeys(names)
+        label_codes = dict(BASE_LABEL_CODES)
+        for matrix in matrices:
+            universe.update(dict.fromkeys(chain.from_iterable(matrix)))
+            for label in matrix.values():
+                if label not in label_codes:
+                    label_codes[label] = len(label_codes)
+        if len(label_codes) > 127:
+            raise ValueError("Too many reaction labels for int8 codes")
+        index = {name: i for i, name in enumerate(universe)}
+
+        n = len(index)
+        tensor = np.zeros((len(matrices), n, n), dtype=np.int8)
+        for day, matrix in enumerate(matrices):
+            if matrix:
+                givers, receivers = zip(*matrix)
+                tensor[day, list(map(index.__getitem__, givers)), list(map(index.__getitem__, receivers))] = (
+                    list(map(label_codes.__getitem__, matrix.values()))
+                )
+        return cls(tensor, list(index), list(label_codes))
+
+    @classmethod
+    def from_codes(
+        cls, grids: list[tuple[list[str], np.ndarray, list[str]]], names: Iterable[str] = (),
+    ) -> ReactionTensor:
+        """Tensor from snapshot-archive grids (``ReactionMatrixCache.codes``): per day the
+        participants, their label-index grid (-1 = none) and the archive's labels table."""
+        universe = dict.fromkeys(names)
+        label_codes = dict(BASE_LABEL_CODES)
+        luts: dict[int, np.ndarray] = {}
+        for people, _grid, labels in grids:
+            universe.update(dict.fromkeys(people))
+            if id(labels) not in luts:
+                for label in labels:
+                    label_codes.setdefault(label, len(label_codes))
+                # Trailing 0 maps the archive's -1 ("no reaction") to code 0
+                luts[id(labels)] = [label_codes[label] for label in labels] + [0]
+        if len(label_codes) > 127:
+            raise ValueError("Too many reaction labels for int8 codes")
+        index = {name: i for i, name in enumerate(universe)}
+
+        n = len(index)
+        tensor = np.zeros((len(grids), n, n), dtype=np.int8)
+        for day, (people, grid, labels) in enumerate(grids):
+            idx = np.array([index[name] for name in people], dtype=np.intp)
+            tensor[day][np.ix_(idx, idx)] = np.array(luts[id(labels)], dtype=np.int8)[grid]
+        return cls(tensor, list(index), list(label_codes))
+
+    @classmethod
+    def for_snapshots(
+        cls,
+        snapshots: list[dict],
+        names: Iterable[str] = (),
+        cache: ReactionMatrixCache = REACTION_MATRIX_CACHE,
+    ) -> ReactionTensor:
+        """Tensor of the snapshots' raw reaction matrices, memoized (last call only).
+
+        Reads the codes straight from the snapshot archive when every
+        snapshot was loaded through it (``cache.codes``); otherwise packs
+        ``cache.raw`` matrices. The memo is keyed on the identity of the
+        snapshots' participant lists and stored in ``cache.memo``, so it
+        lives until ``cache.clear()`` (``clear_reaction_matrix_cache()`` at
+        the end of each derived build).
+        """
+        names = tuple(names)
+        key = [snap["participants"] for snap in snapshots]
+        memo = cache.memo.get(_MEMO_KEY)
+        if memo is not None:
+            (prev_key, prev_names), tensor = memo
+            if prev_names == names and len(prev_key) == len(key) and all(a is b for a, b in zip(prev_key, key)):
+                return tensor
+        grids = [cache.codes(snap) for snap in snapshots]
+        if all(grid is not None for grid in grids):
+            tensor = cls.from_codes(grids, names)
+        else:
+            tensor = cls.from_matrices([cache.raw(snap) for snap in snapshots], names)
+        cache.memo[_MEMO_KEY] = ((key, names), tensor)
+        return tensor
+
+    def indices(self, names: Iterable[str]) -> np.ndarray:
+        """Tensor indices for ``names`` (in the given order)."""
+        return np.array([self.index[name] for name in names], dtype=np.intp)
+
+    def day(self, day: int, idx: np.ndarray) -> np.ndarray:
+        """Square code sub-matrix of ``day`` restricted to ``idx`` (giver rows, receiver columns)."""
+        return self.codes[day][np.ix_(idx, idx)]
+
+
+def hostility_masks(tensor: ReactionTensor, codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Mutual hostility and blind-spot masks for a square code matrix.
+
+    mutual[a, b]: both give negative (symmetric).
+    blind[a, b]:  a gives negative to b, b gives ❤️ to a.
+    The diagonal is always False.
+    """
+    neg = tensor.negative[codes]
+    pos = tensor.positive[codes]
+    off_diag = ~np.eye(len(codes), dtype=bool)
+    mutual = neg & neg.T & off_diag
+    blind = neg & pos.T & off_diag
+    return mutual, blind
+
+
+def vulnerability_counts(tensor: ReactionTensor, codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-participant (false_friends, blind_attacks) for a square code matrix.
+
+    false_friends[i]: i gives ❤️ to people who give i a negative.
+    blind_attacks[i]: i gives a negative to people who give i ❤️.
+    """
+    neg = tensor.negative[codes]
+    pos = tensor.positive[codes]
+    off_diag = ~np.eye(len(codes), dtype=bool)
+    false_friends = (pos & neg.T & off_diag).sum(axis=1)
+    blind_attacks = (neg & pos.T & off_diag).sum(axis=1)
+    return false_friends, blind_attacks
+
+
+def changed_pairs(prev_codes: np.ndarray, curr_codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(giver, receiver) positions whose label changed, in row-major order."""
+    changed = (prev_codes != curr_codes) & ~np.eye(len(prev_codes), dtype=bool)
+    return np.nonzero(changed)
+
+
+def _last_true(mask: np.ndarray) -> np.ndarray:
+    """Index of the last True along axis 0 (-1 when none)."""
+    n = mask.shape[0]
+    last = n - 1 - np.argmax(mask[::-1], axis=0)
+    return np.where(mask.any(axis=0), last, -1)
+
+
+def streak_arrays(tensor: ReactionTensor, cutoff: np.ndarray) -> dict[str, np.ndarray]:
+    """Current/previous streaks per (giver, receiver) pair.
+
+    ``cutoff[g, r]`` is the last day index counted for the pair (days after it
+    are ignored). Days without a categorized label are skipped — they neither
+    extend nor break a streak. Returned arrays are giver × receiver:
+
+    total_days      days with any label up to the cutoff
+    current         category code of the latest categorized day (-1 = none)
+    streak_len      length of the current streak
+    previous        category code of the streak before it (-1 = none)
+    previous_len    length of that previous streak
+    break_day       first day index of the current streak
+    latest_day      last day index with any label (-1 = none)
+    """
+    days = np.arange(tensor.codes.shape[0])[:, None, None]
+    in_range = days <= cutoff[None]
+    labelled = (tensor.codes != 0) & in_range
+    category = tensor.category[tensor.codes]
+    valid = (category != NO_CATEGORY) & in_range
+
+    last_valid = _last_true(valid)
+    current = np.where(last_valid >= 0, np.take_along_axis(category, np.maximum(last_valid, 0)[None], 0)[0], NO_CATEGORY)
+    other = valid & (category != current[None])
+    last_other = _last_true(other)
+    streak_len = (valid & (days > last_other[None])).sum(axis=0)
+
+    previous = np.where(last_other >= 0, np.take_along_axis(category, np.maximum(last_other, 0)[None], 0)[0], NO_CATEGORY)
+    before_prev = valid & (category != previous[None]) & (days <= last_other[None])
+    last_before = _last_true(before_prev)
+    previous_len = np.where(
+        last_other >= 0,
+        (valid & (days > last_before[None]) & (days <= last_other[None])).sum(axis=0),
+        0,
+    )
+    after_other = valid & (days > last_other[None])
+    break_day = np.argmax(after_other, axis=0)
+
+    return {
+        "total_days": labelled.sum(axis=0),
+        "current": current,
+        "streak_len": streak_len,
+        "previous": previous,
+        "previous_len": previous_len,
+        "break_day": break_day,
+        "latest_day": _last_true(labelled),
+    }
+
+
+def _running_last(mask: np.ndarray) -> np.ndarray:
+    """``out[d]`` = last day index <= d where ``mask`` is True (-1 before any)."""
+    days = np.arange(mask.shape[0])[:, None, None]
+    return np.maximum.accumulate(np.where(mask, days, -1), axis=0)
+
+
+class PairDayCounts:
+    """Per-pair day counts over a reaction tensor, as prefix sums along the days.
+
+    Each count array has one more row than the tensor has days: row ``stop``
+    counts days ``[0, stop)``, so any prefix (e.g. up to a paredão formation)
+    is one row lookup and any day range is one subtraction.
+
+    labelled   days with any label
+    positive   days with ❤️
+    negative   days with a mild or strong negative label
+    mutual     days both directions were ❤️
+
+    ``last_labelled[d]`` / ``last_flip[d]`` are the last day <= d with a label /
+    with a flip (❤️ after a non-❤️ label, or a negative after ❤️; days
+    without a label are skipped).
+    """
+
+    COUNTS = ("labelled", "positive", "negative", "mutual")
+
+    def __init__(self, tensor: ReactionTensor) -> None:
+        self.tensor = tensor
+        codes = tensor.codes
+        labelled = codes != 0
+        positive = tensor.positive[codes]
+        negative = tensor.category[codes] > 0
+        masks = {
+            "labelled": labelled,
+            "positive": positive,
+            "negative": negative,
+            "mutual": positive & positive.transpose(0, 2, 1),
+        }
+        zeros = np.zeros((1,) + codes.shape[1:], dtype=np.int32)
+        self.cumulative = {
+            key: np.concatenate([zeros, np.cumsum(mask, axis=0, dtype=np.int32)]) for key, mask in masks.items()
+        }
+
+        self.last_labelled = _running_last(labelled)
+        prev = np.concatenate([np.full_like(self.last_labelled[:1], -1), self.last_labelled[:-1]])
+        prev_positive = (prev >= 0) & np.take_along_axis(positive, np.maximum(prev, 0), axis=0)
+        flips = labelled & (prev >= 0) & ((positive & ~prev_positive) | (negative & prev_positive))
+        self.last_flip = _running_last(flips)
+        self.positive = positive
+
+    @classmethod
+    def from_matrices(cls, matrices: list[dict[tuple[str, str], str]]) -> PairDayCounts:
+        return cls(ReactionTensor.from_matrices(matrices))
+
+    def counts(self, stop: int) -> dict[str, np.ndarray]:
+        """Giver × receiver counts over days ``[0, stop)``."""
+        return {key: values[stop] for key, values in self.cumulative.items()}
+
+    def pair(self, giver: str, receiver: str, stop: int) -> dict[str, int] | None:
+        """Counts for one pair over days ``[0, stop)`` plus its last labelled/flip
+        days (-1 when none) and whether the last label was ❤️; None when the
+        pair is outside the tensor."""
+        g, r = self.tensor.index.get(giver), self.tensor.index.get(receiver)
+        if g is None or r is None:
+            return None
+        out = {key: int(values[stop, g, r]) for key, values in self.cumulative.items()}
+        last = int(self.last_labelled[stop - 1, g, r]) if stop > 0 else -1
+        out["last_labelled"] = last
+        out["last_flip"] = int(self.last_flip[stop - 1, g, r]) if stop > 0 else -1
+        out["last_positive"] = last >= 0 and bool(self.positive[last, g, r])
+        return out
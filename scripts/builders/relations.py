@@ -6,22 +6,30 @@ Extracted from build_derived_data.py (lines 33–1188).
 """
 from __future__ import annotations
 
+from bisect import bisect_right
 from collections import defaultdict
+from itertools import chain
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+
+import numpy as np
 
 from data_utils import (
     SENTIMENT_WEIGHTS,
-    get_cycle_number,
-    build_reaction_matrix,
-    patch_missing_raio_x,
+    CycleCalendar,
+    get_cycle_calendar,
+    get_reaction_matrix,
+    get_patched_reaction_matrices,
     POSITIVE,
     MILD_NEGATIVE,
     STRONG_NEGATIVE,
     normalize_actors,
     get_all_snapshots_with_data,
+    SnapshotStore,
 )
+from builders.reaction_tensor import CATEGORY_NAMES, NO_CATEGORY, ReactionTensor, streak_arrays
+from builders.streak_state import StreakState
 
 # ── Path constants ──
 DATA_DIR = Path(__file__).parent.parent.parent / "data" / "snapshots"
@@ -110,6 +118,8 @@ RELATION_POWER_BACKLASH_FACTOR = {
 }
 
 SYSTEM_ACTORS = {"Prova do Líder", "Prova do Anjo", "Big Fone", "Dinâmica da casa", "Caixas-Surpresa", "Prova Bate e Volta"}
+# Left out of the relations graph (Henri Castelli — only 1 day of data)
+EXCLUDED_PARTICIPANTS = {"Henri Castelli"}
 
 # ── Streak blending constants (see docs/SCORING_AND_INDEXES.md) ──
 STREAK_REACTIVE_WEIGHT = 0.7
@@ -120,9 +130,9 @@ STREAK_MEMORY_MAX_LEN = 10
 REACTIVE_WINDOW_WEIGHTS = [0.6, 0.3, 0.1]
 
 
-def get_all_snapshots() -> list[dict]:
-    """Wrapper for backward-compatible call sites."""
-    return get_all_snapshots_with_data(DATA_DIR)
+def get_all_snapshots(store: SnapshotStore | None = None) -> list[dict]:
+    """Wrapper for backward-compatible call sites (optionally backed by a shared store)."""
+    return get_all_snapshots_with_data(DATA_DIR, store=store)
 
 
 def _classify_sentiment(label: str) -> str | None:
@@ -147,9 +157,13 @@ def _sentiment_value_for_category(cat: str) -> float:
     return 0.0
 
 
-def compute_streak_data(daily_snapshots: list[dict], eliminated_last_seen: dict[str, str | None] | None = None) -> tuple[dict, list[dict], list[dict]]:
+def compute_streak_data(daily_snapshots: list[dict], eliminated_last_seen: dict[str, str | None] | None = None,
+                        state: StreakState | None = None) -> tuple[dict, list[dict], list[dict]]:
     """Compute emoji streak info and detect alliance breaks for all pairs.
 
+    With ``state`` (a saved ``StreakState``) only the days it does not cover
+    yet are processed; the result is identical to the full recompute.
+
     Returns:
         streak_info: dict[actor][target] = {
             streak_len, streak_category, streak_sentiment,
@@ -161,74 +175,53 @@ def compute_streak_data(daily_snapshots: list[dict], eliminated_last_seen: dict[
     if not daily_snapshots:
         return {}, [], []
 
-    # Build per-pair emoji history in chronological order
-    pair_history = defaultdict(list)  # (actor, target) → [(date, label), ...]
+    if state is not None:
+        state = state.resumed(daily_snapshots, eliminated_last_seen)
+        streaks = {key: values.tolist() for key, values in state.arrays.items()}
+        return _streak_results(state.pairs, state.index, state.labels, streaks, state.dates,
+                               state.missing_raio_x_log)
+
     missing_raio_x_log = []
-    prev_matrix = {}
-    for snap in daily_snapshots:
-        date = snap["date"]
-        matrix = build_reaction_matrix(snap["participants"])
-        matrix, carried = patch_missing_raio_x(matrix, snap["participants"], prev_matrix)
+    patched_matrices, carried_by_day = get_patched_reaction_matrices(daily_snapshots)
+    for snap, carried in zip(daily_snapshots, carried_by_day):
         if carried:
-            missing_raio_x_log.append({"date": date, "participants": carried})
-        seen_pairs = set()
-        for (actor, target), label in matrix.items():
-            if label:
-                pair_history[(actor, target)].append((date, label))
-                seen_pairs.add((actor, target))
-        prev_matrix = matrix
-
+            missing_raio_x_log.append({"date": snap["date"], "participants": carried})
+
+    # Pairs in order of their first labelled day (drives streak_info ordering)
+    pairs = dict.fromkeys(key for matrix in patched_matrices for key, label in matrix.items() if label)
+    tensor = ReactionTensor.from_matrices(patched_matrices)
+    dates = [snap["date"] for snap in daily_snapshots]
+
+    # Last day index counted per pair: eliminated participants stop at their
+    # last_seen date (the earlier of actor/target when both are eliminated)
+    last_seen = eliminated_last_seen or {}
+    cut = np.full(len(tensor.names), len(dates) - 1)
+    for name, k in tensor.index.items():
+        if last_seen.get(name):
+            cut[k] = bisect_right(dates, last_seen[name]) - 1
+    cutoff = np.minimum(cut[:, None], cut[None, :])
+    arrays = streak_arrays(tensor, cutoff)
+    arrays["latest_code"] = np.take_along_axis(tensor.codes, np.maximum(arrays["latest_day"], 0)[None], 0)[0]
+    streaks = {key: values.tolist() for key, values in arrays.items()}
+    return _streak_results(pairs, tensor.index, tensor.labels, streaks, dates, missing_raio_x_log)
+
+
+def _streak_results(pairs: Iterable[tuple[str, str]], index: dict[str, int], labels: list[str],
+                    streaks: dict[str, list], dates: list[str],
+                    missing_raio_x_log: list[dict]) -> tuple[dict, list[dict], list[dict]]:
+    """Assemble ``compute_streak_data`` output from giver × receiver streak arrays."""
     streak_info = defaultdict(dict)
     streak_breaks = []
-    latest_date = daily_snapshots[-1]["date"] if daily_snapshots else None
-
-    for (actor, target), history in pair_history.items():
-        if not history:
-            continue
-
-        # Determine the reference date: use last_seen for eliminated participants
-        ref_date = latest_date
-        if eliminated_last_seen:
-            if actor in eliminated_last_seen and eliminated_last_seen[actor]:
-                ref_date = eliminated_last_seen[actor]
-            if target in eliminated_last_seen and eliminated_last_seen[target]:
-                t_date = eliminated_last_seen[target]
-                if t_date and (ref_date is None or t_date < ref_date):
-                    ref_date = t_date
-
-        # Filter history up to reference date
-        relevant = [(d, l) for d, l in history if d <= ref_date] if ref_date else history
-        if not relevant:
-            continue
-
-        total_days = len(relevant)
-
-        # Classify each day
-        categorized = [(d, _classify_sentiment(l)) for d, l in relevant]
-        categorized = [(d, c) for d, c in categorized if c is not None]
-        if not categorized:
+    for actor, target in pairs:
+        a, t = index[actor], index[target]
+        current = streaks["current"][a][t]
+        if current == NO_CATEGORY:
             continue
-
-        # Walk backwards to find current streak
-        current_cat = categorized[-1][1]
-        streak_len = 0
-        for _, c in reversed(categorized):
-            if c == current_cat:
-                streak_len += 1
-            else:
-                break
-
-        # Find previous streak (before current one)
-        previous_streak_len = 0
-        previous_category = None
-        remaining = categorized[:len(categorized) - streak_len]
-        if remaining:
-            previous_category = remaining[-1][1]
-            for _, c in reversed(remaining):
-                if c == previous_category:
-                    previous_streak_len += 1
-                else:
-                    break
+        current_cat = CATEGORY_NAMES[current]
+        streak_len = streaks["streak_len"][a][t]
+        previous = streaks["previous"][a][t]
+        previous_category = CATEGORY_NAMES[previous] if previous != NO_CATEGORY else None
+        previous_streak_len = streaks["previous_len"][a][t]
 
         # Detect break from positive
         break_from_positive = (
@@ -238,41 +231,47 @@ def compute_streak_data(daily_snapshots: list[dict], eliminated_last_seen: dict[
             and streak_len <= 3  # break is recent (within last 3 days)
         )
 
-        info = {
+        streak_info[actor][target] = {
             "streak_len": streak_len,
             "streak_category": current_cat,
             "streak_sentiment": _sentiment_value_for_category(current_cat),
             "previous_streak_len": previous_streak_len,
             "previous_category": previous_category,
             "break_from_positive": break_from_positive,
-            "total_days": total_days,
+            "total_days": streaks["total_days"][a][t],
         }
-        streak_info[actor][target] = info
 
-        if break_from_positive and ref_date:
+        if break_from_positive:
             severity = "strong" if current_cat == "strong_negative" else "mild"
-            latest_label = relevant[-1][1] if relevant else ""
-            # Use the actual transition date (first day of negative streak)
-            break_idx = len(categorized) - streak_len
-            break_date = categorized[break_idx][0] if break_idx < len(categorized) else ref_date
             streak_breaks.append({
                 "giver": actor,
                 "receiver": target,
                 "previous_streak": previous_streak_len,
                 "previous_category": "positive",
-                "new_emoji": latest_label,
+                "new_emoji": labels[streaks["latest_code"][a][t]],
                 "new_category": current_cat,
-                "date": break_date,
+                # Actual transition date (first day of the negative streak)
+                "date": dates[streaks["break_day"][a][t]],
                 "severity": severity,
             })
 
     # Sort breaks by severity (strong first) then by previous streak length (longest first)
     streak_breaks.sort(key=lambda x: (0 if x["severity"] == "strong" else 1, -x["previous_streak"]))
 
-    return dict(streak_info), streak_breaks, missing_raio_x_log
+    return dict(streak_info), streak_breaks, [dict(entry) for entry in missing_raio_x_log]
 
 
-def _resolve_participant_sets(latest_snapshot: dict, daily_snapshots: list[dict], participants_index: list[dict] | None) -> dict:
+def eliminated_last_seen_map(participants_index: list[dict] | None) -> dict[str, str | None]:
+    """``{name: last_seen}`` for eliminated participants (streaks stop counting after last_seen)."""
+    return {
+        p["name"]: p.get("last_seen")
+        for p in participants_index or []
+        if not p.get("active", True) and p.get("name") not in EXCLUDED_PARTICIPANTS
+    }
+
+
+def _resolve_participant_sets(latest_snapshot: dict, daily_snapshots: list[dict], participants_index: list[dict] | None,
+                              calendar: CycleCalendar, streak_state: StreakState | None = None) -> dict:
     """Derive active/all name sets, eliminated tracking, streak data, and latest reaction matrix.
 
     Returns dict with: latest_date, current_cycle, participants, active_names, active_set,
@@ -280,13 +279,12 @@ def _resolve_participant_sets(latest_snapshot: dict, daily_snapshots: list[dict]
     missing_raio_x_log, reaction_matrix_latest.
     """
     latest_date = latest_snapshot["date"]
-    current_cycle = get_cycle_number(latest_date)
+    current_cycle = calendar.cycle(latest_date)
     participants = latest_snapshot["participants"]
     active_names = sorted({p.get("name", "").strip() for p in participants if p.get("name", "").strip()})
     active_set = set(active_names)
 
-    # Build all_names from participants_index (includes eliminated, excludes Henri Castelli — only 1 day of data)
-    EXCLUDED_PARTICIPANTS = {"Henri Castelli"}
+    # Build all_names from participants_index (includes eliminated, excludes EXCLUDED_PARTICIPANTS)
     if participants_index:
         all_names = sorted({
             p["name"] for p in participants_index
@@ -297,16 +295,14 @@ def _resolve_participant_sets(latest_snapshot: dict, daily_snapshots: list[dict]
     all_names_set = set(all_names)
 
     # Build last_seen map for eliminated participants
-    eliminated_last_seen = {}
-    if participants_index:
-        for p in participants_index:
-            if not p.get("active", True) and p.get("name") not in EXCLUDED_PARTICIPANTS:
-                eliminated_last_seen[p["name"]] = p.get("last_seen")
+    eliminated_last_seen = eliminated_last_seen_map(participants_index)
 
     # Compute streak data for all pairs (streak length, break detection)
-    streak_info, streak_breaks, missing_raio_x_log = compute_streak_data(daily_snapshots, eliminated_last_seen)
+    streak_info, streak_breaks, missing_raio_x_log = compute_streak_data(
+        daily_snapshots, eliminated_last_seen, state=streak_state,
+    )
 
-    reaction_matrix_latest = build_reaction_matrix(participants)
+    reaction_matrix_latest = get_reaction_matrix(latest_snapshot)
 
     return {
         "latest_date": latest_date,
@@ -324,13 +320,15 @@ def _resolve_participant_sets(latest_snapshot: dict, daily_snapshots: list[dict]
     }
 
 
-def _compute_vote_multipliers(par: dict, power_events: list[dict], week: int | None) -> dict:
+def _compute_vote_multipliers(par: dict, power_events: list[dict], week: int | None,
+                              calendar: CycleCalendar | None = None) -> dict:
     """Build per-voter multiplier dict for a single paredao entry.
 
     Handles votos_anulados, impedidos_votar, voto_duplo, and voto_anulado power events.
     Returns a defaultdict(lambda: 1) with overrides for affected voters.
     """
     multiplier: dict = defaultdict(lambda: 1)
+    cycle_of = (calendar or get_cycle_calendar()).cycle
 
     for voter in par.get("votos_anulados", []) or []:
         multiplier[voter] = 0
@@ -338,7 +336,7 @@ def _compute_vote_multipliers(par: dict, power_events: list[dict], week: int | N
         multiplier[voter] = 0
 
     for ev in power_events:
-        ev_week = get_cycle_number(ev["date"]) if ev.get("date") else (ev.get("cycle") or ev.get("week", 0))
+        ev_week = cycle_of(ev["date"]) if ev.get("date") else (ev.get("cycle") or ev.get("week", 0))
         if week and ev_week == week:
             if ev.get("type") == "voto_duplo":
                 for a in normalize_actors(ev):
@@ -352,7 +350,7 @@ def _compute_vote_multipliers(par: dict, power_events: list[dict], week: int | N
     return multiplier
 
 
-def _build_vote_data(paredoes: dict | None, manual_events: dict) -> dict:
+def _build_vote_data(paredoes: dict | None, manual_events: dict, calendar: CycleCalendar | None = None) -> dict:
     """Parse paredao votes, revealed votes, open vote weeks.
 
     Returns dict with: votes_received_by_week, revealed_votes, vote_week_to_date,
@@ -362,6 +360,7 @@ def _build_vote_data(paredoes: dict | None, manual_events: dict) -> dict:
     votes_received_by_week = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
     revealed_votes = defaultdict(set)
     vote_week_to_date = {}
+    calendar = calendar or get_cycle_calendar()
 
     for par in paredoes.get("paredoes", []) if paredoes else []:
         votos = par.get("votos_casa", {}) or {}
@@ -372,7 +371,7 @@ def _build_vote_data(paredoes: dict | None, manual_events: dict) -> dict:
         if week and vote_date:
             vote_week_to_date[week] = vote_date
         power_events = manual_events.get("power_events", []) if manual_events else []
-        multiplier = _compute_vote_multipliers(par, power_events, week)
+        multiplier = _compute_vote_multipliers(par, power_events, week, calendar)
 
         for voter, target in votos.items():
             v = voter.strip()
@@ -425,8 +424,10 @@ def _build_vote_data(paredoes: dict | None, manual_events: dict) -> dict:
     }
 
 
-def _build_power_event_edges(power_events: list[dict], effective_week_daily: int, add_edge_raw: Any) -> None:
+def _build_power_event_edges(power_events: list[dict], effective_week_daily: int, add_edge_raw: Any,
+                             calendar: CycleCalendar | None = None) -> None:
     """Generate power event edges (actor→target + backlash)."""
+    cycle_of = (calendar or get_cycle_calendar()).cycle
     for ev in power_events:
         ev_type = ev.get("type")
         base_weight = RELATION_POWER_WEIGHTS.get(ev_type, 0.0)
@@ -443,7 +444,7 @@ def _build_power_event_edges(power_events: list[dict], effective_week_daily: int
         visibility = ev.get("visibility", "public")
         vis_factor = RELATION_VISIBILITY_FACTOR.get(visibility, 1.0)
         weight = base_weight * vis_factor
-        ev_week = get_cycle_number(ev["date"]) if ev.get("date") else effective_week_daily
+        ev_week = cycle_of(ev["date"]) if ev.get("date") else effective_week_daily
         for actor in actors:
             if actor in SYSTEM_ACTORS:
                 continue
@@ -554,7 +555,8 @@ def _build_vote_edges(votes_received_by_week: dict, open_vote_weeks: set, reveal
 
 
 def _build_raw_edges(paredoes: dict | None, manual_events: dict, auto_events: list[dict] | None, sincerao_edges: dict | None,
-                     daily_roles: list[dict], all_names_set: set[str], current_cycle: int, latest_date: str, vote_data: dict) -> dict:
+                     daily_roles: list[dict], all_names_set: set[str], current_cycle: int, latest_date: str, vote_data: dict,
+                     calendar: CycleCalendar) -> dict:
     """Generate all relationship edges (power, Sincerao, VIP, Anjo, votes).
 
     Returns dict with: edges_raw, effective_week_daily, effective_week_paredao,
@@ -586,7 +588,7 @@ def _build_raw_edges(paredoes: dict | None, manual_events: dict, auto_events: li
         for ev in power_events:
             d = ev.get("date", "")
             if d:
-                candidate_weeks.append(get_cycle_number(d))
+                candidate_weeks.append(calendar.cycle(d))
         for edge in (sincerao_edges or {}).get("edges", []):
             w = edge.get("cycle")
             if w:
@@ -602,7 +604,7 @@ def _build_raw_edges(paredoes: dict | None, manual_events: dict, auto_events: li
     for ev in power_events:
         d = ev.get("date", "")
         if d:
-            candidate_weeks_daily.append(get_cycle_number(d))
+            candidate_weeks_daily.append(calendar.cycle(d))
     for edge in (sincerao_edges or {}).get("edges", []):
         w = edge.get("cycle")
         if w:
@@ -671,7 +673,7 @@ def _build_raw_edges(paredoes: dict | None, manual_events: dict, auto_events: li
             "cycle": par.get("cycle"),
         })
 
-    _build_power_event_edges(power_events, effective_week_daily, add_edge_raw)
+    _build_power_event_edges(power_events, effective_week_daily, add_edge_raw, calendar)
     _build_sincerao_edges_section(sincerao_edges, add_edge_raw)
 
     # VIP edges — one set per leader reign
@@ -691,7 +693,7 @@ def _build_raw_edges(paredoes: dict | None, manual_events: dict, auto_events: li
                     seen_leaders.add(leader)
                     vip_names = entry.get("vip", [])
                     entry_date = entry.get("date")
-                    entry_week = get_cycle_number(entry_date) if entry_date else effective_week_daily
+                    entry_week = calendar.cycle(entry_date) if entry_date else effective_week_daily
                     # New entrants = participants today that weren't in the previous snapshot
                     new_entrants = current_participants - prev_participants if prev_participants else set()
                     for vip_name in vip_names:
@@ -808,103 +810,280 @@ def _blend_streak(q_reactive: float, actor: str, target: str, streak_info: dict)
     return STREAK_REACTIVE_WEIGHT * q_reactive + STREAK_MEMORY_WEIGHT * q_memory + break_pen
 
 
+def _streak_blend_arrays(streak_info: dict, index: dict[str, int]) -> dict[str, np.ndarray]:
+    """``_blend_streak`` inputs as name × name arrays (pairs outside ``index`` are dropped).
+
+    has_streak     pair has a streak entry (otherwise the reactive score is kept as is)
+    q_memory       consistency × streak sentiment
+    break_penalty  scaled STREAK_BREAK_PENALTY for breaks from positive (else 0.0)
+    streak_len, break  raw streak metadata copied into each pair entry
+    """
+    n = len(index)
+    rows, cols, lengths, sentiments, breaks, prev_lens = [], [], [], [], [], []
+    for actor, targets in streak_info.items():
+        a = index.get(actor)
+        if a is None:
+            continue
+        for target, streak in targets.items():
+            t = index.get(target)
+            if t is None or not streak:
+                continue
+            rows.append(a)
+            cols.append(t)
+            lengths.append(streak.get("streak_len", 0))
+            sentiments.append(streak.get("streak_sentiment", 0.0))
+            breaks.append(bool(streak.get("break_from_positive")))
+            prev_lens.append(streak.get("previous_streak_len", 0))
+
+    lengths_arr = np.array(lengths, dtype=np.int64)
+    breaks_arr = np.array(breaks, dtype=bool)
+    q_memory = np.minimum(lengths_arr, STREAK_MEMORY_MAX_LEN) / STREAK_MEMORY_MAX_LEN * np.array(sentiments, dtype=np.float64)
+    break_penalty = np.where(
+        breaks_arr,
+        STREAK_BREAK_PENALTY * np.minimum(np.array(prev_lens, dtype=np.int64), STREAK_BREAK_MAX_LEN) / STREAK_BREAK_MAX_LEN,
+        0.0,
+    )
+
+    arrays = {
+        "has_streak": np.zeros((n, n), dtype=bool),
+        "q_memory": np.zeros((n, n)),
+        "break_penalty": np.zeros((n, n)),
+        "streak_len": np.zeros((n, n), dtype=np.int64),
+        "break": np.zeros((n, n), dtype=bool),
+    }
+    arrays["has_streak"][rows, cols] = True
+    arrays["q_memory"][rows, cols] = q_memory
+    arrays["break_penalty"][rows, cols] = break_penalty
+    arrays["streak_len"][rows, cols] = lengths_arr
+    arrays["break"][rows, cols] = breaks_arr
+    return arrays
+
+
+def _blend_streak_grid(q_reactive: np.ndarray, streaks: dict[str, np.ndarray]) -> np.ndarray:
+    """Array form of ``_blend_streak`` (same float operations, pair by pair)."""
+    blended = STREAK_REACTIVE_WEIGHT * q_reactive + STREAK_MEMORY_WEIGHT * streaks["q_memory"] + streaks["break_penalty"]
+    return np.where(streaks["has_streak"], blended, q_reactive)
+
+
+def _label_weight_grid(matrix: dict[tuple[str, str], str], index: dict[str, int]) -> np.ndarray:
+    """SENTIMENT_WEIGHTS of each pair's label in ``matrix`` (0.0 when absent)."""
+    grid = np.zeros((len(index), len(index)))
+    for (actor, target), label in matrix.items():
+        a, t = index.get(actor), index.get(target)
+        if a is not None and t is not None:
+            grid[a, t] = SENTIMENT_WEIGHTS.get(label, 0.0)
+    return grid
+
+
+def _reactive_window(ref_date: str, daily_snapshots: list[dict]) -> tuple[list[float], list[dict]] | None:
+    """Normalized weights and Raio-X patched matrices of the (up to) 3-day window ending at ``ref_date``.
+
+    None when no snapshot is on or before ``ref_date``.
+    """
+    candidates = [s for s in daily_snapshots if s.get("date") <= ref_date]
+    if not candidates:
+        return None
+    selected = candidates[-3:]
+    weights = REACTIVE_WINDOW_WEIGHTS[-len(selected):]
+    total_w = sum(weights)
+    weights = [w / total_w for w in weights]
+    # Patch missing Raio-X: carry forward from predecessor
+    # For the first matrix, look back one more in candidates
+    fallback_idx = len(candidates) - len(selected) - 1
+    prev_mat = get_reaction_matrix(candidates[fallback_idx]) if fallback_idx >= 0 else {}
+    matrices, _ = get_patched_reaction_matrices(selected, prev_matrix=prev_mat)
+    return weights, matrices
+
+
+def _window_scores(window: tuple[list[float], list[dict]], givers: list[str],
+                   receivers: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Weighted reactive scores and the window weight actually used, giver × receiver.
+
+    Each day adds its weight only where the pair has a label, like the
+    per-pair loop it replaces (same float operations, same order).
+    """
+    weights, matrices = window
+    shape = (len(givers), len(receivers))
+    weighted = np.zeros(shape)
+    used = np.zeros(shape)
+    for w, matrix in zip(weights, matrices):
+        labels = [matrix.get((g, r), "") for g in givers for r in receivers]
+        labelled = np.array([label != "" for label in labels], dtype=bool).reshape(shape)
+        day = np.array([SENTIMENT_WEIGHTS.get(label, 0.0) for label in labels], dtype=np.float64).reshape(shape)
+        weighted[labelled] += day[labelled] * w
+        used[labelled] += w
+    return weighted, used
+
+
+def _base_weight_grid(ref_date: str, name_list: list[str], daily_snapshots: list[dict], latest_weights: np.ndarray,
+                      streaks: dict[str, np.ndarray], index: dict[str, int]) -> tuple[np.ndarray, np.ndarray]:
+    """``(values, defined)`` base weights over ``index`` for pairs within ``name_list``.
+
+    Pairs without any label in the window fall back to the latest matrix.
+    """
+    n = len(index)
+    values, defined = np.zeros((n, n)), np.zeros((n, n), dtype=bool)
+    window = _reactive_window(ref_date, daily_snapshots) if daily_snapshots else None
+    if window is None:
+        return values, defined
+    weighted, used = _window_scores(window, name_list, name_list)
+    cells = np.ix_(*[[index[name] for name in name_list]] * 2)
+    reactive = np.where(used == 0.0, latest_weights[cells], weighted)
+    values[cells] = _blend_streak_grid(reactive, {key: grid[cells] for key, grid in streaks.items()})
+    defined[cells] = True
+    np.fill_diagonal(defined, False)
+    return values, defined
+
+
+def _base_weight_grid_all(ref_date: str, active_names: list[str], all_names: list[str], daily_snapshots: list[dict],
+                          latest_weights: np.ndarray, streaks: dict[str, np.ndarray], index: dict[str, int],
+                          eliminated_last_seen: dict[str, str | None]) -> tuple[np.ndarray, np.ndarray]:
+    """``_base_weight_grid`` for active pairs, plus every pair involving an eliminated participant
+    scored from that participant's last_seen window (later participants overwrite shared pairs)."""
+    values, defined = _base_weight_grid(ref_date, active_names, daily_snapshots, latest_weights, streaks, index)
+    others = [index[name] for name in all_names]
+    for elim_name, last_seen in eliminated_last_seen.items():
+        if not last_seen:
+            continue
+        window = _reactive_window(last_seen, daily_snapshots)
+        if window is None:
+            continue
+        e = index[elim_name]
+        for givers, receivers, cells in (
+            ([elim_name], all_names, (e, others)),
+            (all_names, [elim_name], (others, e)),
+        ):
+            weighted, used = _window_scores(window, givers, receivers)
+            reactive = np.where(used == 0.0, 0.0, weighted).ravel()
+            values[cells] = _blend_streak_grid(reactive, {key: grid[cells] for key, grid in streaks.items()})
+            defined[cells] = True
+        defined[e, e] = False
+    return values, defined
+
+
+def _grid_to_dict(values: np.ndarray, defined: np.ndarray, names: list[str]) -> dict:
+    base: dict[str, dict[str, float]] = {}
+    for a, t in zip(*np.nonzero(defined)):
+        base.setdefault(names[a], {})[names[t]] = float(values[a, t])
+    return base
+
+
+def _name_index(*groups: Iterable[str]) -> dict[str, int]:
+    return {name: i for i, name in enumerate(dict.fromkeys(chain.from_iterable(groups)))}
+
+
 def _compute_base_weights(ref_date: str, name_list: list[str], daily_snapshots: list[dict], reaction_matrix_latest: dict, streak_info: dict) -> dict:
     """Compute base emoji weights using a short rolling window (3 days) + streak memory + break penalty."""
-    base = {}
-    if daily_snapshots:
-        candidates = [s for s in daily_snapshots if s.get("date") <= ref_date]
-        if candidates:
-            selected = candidates[-3:]
-            weights = REACTIVE_WINDOW_WEIGHTS[-len(selected):]
-            total_w = sum(weights)
-            weights = [w / total_w for w in weights]
-            matrices = [build_reaction_matrix(s["participants"]) for s in selected]
-            # Patch missing Raio-X: carry forward from predecessor
-            # For the first matrix, look back one more in candidates
-            fallback_idx = len(candidates) - len(selected) - 1
-            prev_mat = build_reaction_matrix(candidates[fallback_idx]["participants"]) if fallback_idx >= 0 else {}
-            for i in range(len(matrices)):
-                matrices[i], _ = patch_missing_raio_x(matrices[i], selected[i]["participants"], prev_mat)
-                prev_mat = matrices[i]
-            for actor in name_list:
-                if actor in base:
-                    continue
-                base[actor] = {}
-                for target in name_list:
-                    if actor == target:
-                        continue
-                    weighted = 0.0
-                    used = 0.0
-                    for w, mat in zip(weights, matrices):
-                        label = mat.get((actor, target), "")
-                        if label:
-                            weighted += SENTIMENT_WEIGHTS.get(label, 0.0) * w
-                            used += w
-                    if used == 0.0:
-                        label = reaction_matrix_latest.get((actor, target), "")
-                        weighted = SENTIMENT_WEIGHTS.get(label, 0.0)
-                    base[actor][target] = _blend_streak(weighted, actor, target, streak_info)
-    return base
+    index = _name_index(name_list)
+    values, defined = _base_weight_grid(
+        ref_date, name_list, daily_snapshots, _label_weight_grid(reaction_matrix_latest, index),
+        _streak_blend_arrays(streak_info, index), index,
+    )
+    return _grid_to_dict(values, defined, list(index))
 
 
 def _compute_base_weights_all(ref_date: str, active_names: list[str], all_names: list[str], daily_snapshots: list[dict],
                               reaction_matrix_latest: dict, streak_info: dict, eliminated_last_seen: dict[str, str | None]) -> dict:
     """Compute base weights for all participants, using last_seen snapshots for eliminated ones."""
-    base = _compute_base_weights(ref_date, active_names, daily_snapshots, reaction_matrix_latest, streak_info)
+    index = _name_index(active_names, all_names, eliminated_last_seen)
+    values, defined = _base_weight_grid_all(
+        ref_date, active_names, all_names, daily_snapshots, _label_weight_grid(reaction_matrix_latest, index),
+        _streak_blend_arrays(streak_info, index), index, eliminated_last_seen,
+    )
+    return _grid_to_dict(values, defined, list(index))
 
-    # For eliminated participants, compute Q_base from their last known snapshot
-    for elim_name, last_seen in eliminated_last_seen.items():
-        if not last_seen:
-            continue
-        elim_ref = last_seen
-        elim_candidates = [s for s in daily_snapshots if s.get("date") <= elim_ref]
-        if not elim_candidates:
+
+def _edge_arrays(edges: list[dict], index: dict[str, int]) -> dict[str, Any]:
+    """Context edges with both ends in ``index`` (and actor != target) as parallel arrays.
+
+    ``kinds`` lists edge types in order of first appearance; ``order`` is each
+    edge's position in ``edges``.
+    """
+    kinds: dict[str, int] = {}
+    rows, cols, kind_idx, weights, order = [], [], [], [], []
+    for i, edge in enumerate(edges):
+        a, t = index.get(edge["actor"]), index.get(edge["target"])
+        if a is None or t is None or a == t:
             continue
-        selected = elim_candidates[-3:]
-        weights = REACTIVE_WINDOW_WEIGHTS[-len(selected):]
-        total_w = sum(weights)
-        weights = [w / total_w for w in weights]
-        matrices = [build_reaction_matrix(s["participants"]) for s in selected]
-        # Patch missing Raio-X for eliminated participants' window
-        fb_idx = len(elim_candidates) - len(selected) - 1
-        prev_mat = build_reaction_matrix(elim_candidates[fb_idx]["participants"]) if fb_idx >= 0 else {}
-        for mi in range(len(matrices)):
-            matrices[mi], _ = patch_missing_raio_x(matrices[mi], selected[mi]["participants"], prev_mat)
-            prev_mat = matrices[mi]
-
-        base[elim_name] = {}
-        for target in all_names:
-            if elim_name == target:
-                continue
-            weighted = 0.0
-            used = 0.0
-            for w, mat in zip(weights, matrices):
-                label = mat.get((elim_name, target), "")
-                if label:
-                    weighted += SENTIMENT_WEIGHTS.get(label, 0.0) * w
-                    used += w
-            if used == 0.0:
-                weighted = 0.0
-            base[elim_name][target] = _blend_streak(weighted, elim_name, target, streak_info)
-
-        # Also compute what active participants gave the eliminated participant
-        for actor in all_names:
-            if actor == elim_name:
-                continue
-            if actor not in base:
-                base[actor] = {}
-            weighted = 0.0
-            used = 0.0
-            for w, mat in zip(weights, matrices):
-                label = mat.get((actor, elim_name), "")
-                if label:
-                    weighted += SENTIMENT_WEIGHTS.get(label, 0.0) * w
-                    used += w
-            if used == 0.0:
-                weighted = 0.0
-            base[actor][elim_name] = _blend_streak(weighted, actor, elim_name, streak_info)
+        rows.append(a)
+        cols.append(t)
+        kind_idx.append(kinds.setdefault(edge["type"], len(kinds)))
+        weights.append(edge["weight"])
+        order.append(i)
+    return {
+        "kinds": list(kinds),
+        "actor": np.array(rows, dtype=np.intp),
+        "target": np.array(cols, dtype=np.intp),
+        "kind": np.array(kind_idx, dtype=np.intp),
+        "weight": np.array(weights, dtype=np.float64),
+        "order": np.array(order, dtype=np.intp),
+    }
 
-    return base
+
+def _score_pairs(name_list: list[str], index: dict[str, int], base_values: np.ndarray, base_defined: np.ndarray,
+                 latest_weights: np.ndarray, streaks: dict[str, np.ndarray], edges: dict[str, Any],
+                 active_set: set[str] | None = None) -> dict:
+    """Pairwise scores from queridômetro base + context edges, as ``{a: {b: entry}}``.
+
+    Output per pair: { "score": float, "components": { type: float }, "streak_len", "break" }
+    (plus "active_pair" when ``active_set`` is given). All events accumulate at
+    full weight (no decay, no week filtering); components are listed in
+    order of the pair's first edge of each type.
+    """
+    n = len(index)
+    idx = [index[name] for name in name_list]
+    base = np.where(base_defined, base_values, latest_weights).tolist()
+    # Python round() per pair, as the stored values always were
+    base4 = np.zeros((n, n))
+    for a in idx:
+        for t in idx:
+            base4[a, t] = round(base[a][t], 4)
+
+    kinds = edges["kinds"]
+    in_list = np.zeros(n, dtype=bool)
+    in_list[idx] = True
+    keep = in_list[edges["actor"]] & in_list[edges["target"]]
+    actor, target, kind, weight = (edges[key][keep] for key in ("actor", "target", "kind", "weight"))
+    score = base4.copy()
+    np.add.at(score, (actor, target), weight)
+    comp_sum = np.zeros((len(kinds), n, n))
+    np.add.at(comp_sum, (kind, actor, target), weight)
+    comp_first = np.full((len(kinds), n, n), len(edges["order"]), dtype=np.intp)
+    np.minimum.at(comp_first, (kind, actor, target), np.arange(len(edges["order"]))[keep])
+    if "queridometro" in kinds:
+        comp_sum[kinds.index("queridometro")] += base4
+
+    present = np.nonzero(comp_first < len(edges["order"]))
+    pair_kinds: dict[tuple[int, int], list[int]] = defaultdict(list)
+    present_kind, present_actor, present_target = (values.tolist() for values in present)
+    for p in np.argsort(comp_first[present], kind="stable").tolist():
+        pair_kinds[(present_actor[p], present_target[p])].append(present_kind[p])
+
+    names = list(index)
+    score, comp_sum, base4 = score.tolist(), comp_sum.tolist(), base4.tolist()
+    streak_len = streaks["streak_len"].tolist()
+    has_break = streaks["break"].tolist()
+    pairs = {}
+    for a in idx:
+        a_name = names[a]
+        row = pairs[a_name] = {}
+        for t in idx:
+            if a == t:
+                continue
+            t_name = names[t]
+            components = {"queridometro": base4[a][t]}
+            for k in pair_kinds.get((a, t), ()):
+                components[kinds[k]] = round(comp_sum[k][a][t], 4)
+            entry = {
+                "score": round(score[a][t], 4) if (a, t) in pair_kinds else base4[a][t],
+                "components": components,
+                "streak_len": streak_len[a][t],
+                "break": has_break[a][t],
+            }
+            if active_set is not None:
+                entry["active_pair"] = (a_name in active_set and t_name in active_set)
+            row[t_name] = entry
+    return pairs
 
 
 def _compute_pair_scores(daily_snapshots: list[dict], reaction_matrix_latest: dict, streak_info: dict, eliminated_last_seen: dict,
@@ -914,10 +1093,13 @@ def _compute_pair_scores(daily_snapshots: list[dict], reaction_matrix_latest: di
 
     Returns dict with: pairs_daily, pairs_paredao, pairs_all, contradictions, edges.
     """
-    base_weights_daily = _compute_base_weights(reference_date_daily, active_names, daily_snapshots, reaction_matrix_latest, streak_info)
-    base_weights_paredao = _compute_base_weights(reference_date_paredao, active_names, daily_snapshots, reaction_matrix_latest, streak_info)
-    base_weights_all = _compute_base_weights_all(reference_date_daily, active_names, all_names, daily_snapshots,
-                                                  reaction_matrix_latest, streak_info, eliminated_last_seen)
+    index = _name_index(active_names, all_names, eliminated_last_seen)
+    latest_weights = _label_weight_grid(reaction_matrix_latest, index)
+    streaks = _streak_blend_arrays(streak_info, index)
+    base_daily = _base_weight_grid(reference_date_daily, active_names, daily_snapshots, latest_weights, streaks, index)
+    base_paredao = _base_weight_grid(reference_date_paredao, active_names, daily_snapshots, latest_weights, streaks, index)
+    base_all = _base_weight_grid_all(reference_date_daily, active_names, all_names, daily_snapshots,
+                                     latest_weights, streaks, index, eliminated_last_seen)
 
     def apply_context_edges(edges_in):
         """Prepare context edges with accumulated weights (no decay).
@@ -942,58 +1124,11 @@ def _compute_pair_scores(daily_snapshots: list[dict], reaction_matrix_latest: di
             edges_out.append(out)
         return edges_out
 
-    def build_pairs(base_weights, edges_ctx, name_list=None, include_active_flag=False):
-        """Build pairwise scores from queridômetro base + context edges.
-
-        Output per pair: { "score": float, "components": { type: float } }
-        All events accumulate at full weight (no decay, no week filtering).
-        """
-        if name_list is None:
-            name_list = active_names
-        pairs = {}
-        for a in name_list:
-            pairs[a] = {}
-            for b in name_list:
-                if a == b:
-                    continue
-                base = base_weights.get(a, {}).get(b)
-                if base is None:
-                    label = reaction_matrix_latest.get((a, b), "")
-                    base = SENTIMENT_WEIGHTS.get(label, 0.0)
-                # Add streak metadata to components
-                streak = streak_info.get(a, {}).get(b)
-                s_len = streak.get("streak_len", 0) if streak else 0
-                has_break = bool(streak.get("break_from_positive")) if streak else False
-
-                pair_entry = {
-                    "score": round(base, 4),
-                    "components": {"queridometro": round(base, 4)},
-                    "streak_len": s_len,
-                    "break": has_break,
-                }
-                if include_active_flag:
-                    pair_entry["active_pair"] = (a in active_set and b in active_set)
-                pairs[a][b] = pair_entry
-
-        for edge in edges_ctx:
-            actor = edge["actor"]
-            target = edge["target"]
-            if actor not in pairs or target not in pairs[actor]:
-                continue
-            kind = edge["type"]
-            w = edge["weight"]
-
-            pairs[actor][target]["score"] = round(pairs[actor][target]["score"] + w, 4)
-
-            comps = pairs[actor][target]["components"]
-            comps[kind] = round(comps.get(kind, 0.0) + w, 4)
-
-        return pairs
-
     edges = apply_context_edges(edges_raw)
-    pairs_daily = build_pairs(base_weights_daily, edges)
-    pairs_paredao = build_pairs(base_weights_paredao, edges)
-    pairs_all = build_pairs(base_weights_all, edges, name_list=all_names, include_active_flag=True)
+    edge_arrays = _edge_arrays(edges, index)
+    pairs_daily = _score_pairs(active_names, index, *base_daily, latest_weights, streaks, edge_arrays)
+    pairs_paredao = _score_pairs(active_names, index, *base_paredao, latest_weights, streaks, edge_arrays)
+    pairs_all = _score_pairs(all_names, index, *base_all, latest_weights, streaks, edge_arrays, active_set=active_set)
 
     # --- GAP 2: Contradiction detection (vote vs queridômetro) ---
     vote_edges = [e for e in edges if e["type"] == "vote" and not e.get("backlash") and "backlash" not in e.get("vote_kind", "")]
@@ -1060,16 +1195,29 @@ def _compute_derived_metrics(edges: list[dict], paredoes: dict | None, all_names
             })
 
     # --- GAP 5: Received impact aggregation ---
+    # One pass over the edges: np.add.at accumulates in edge order, like sum()
+    index = {name: i for i, name in enumerate(all_names)}
+    targets = np.array([index.get(e["target"], -1) for e in edges], dtype=np.intp)
+    weights = np.array([e["weight"] for e in edges], dtype=np.float64)
+    known = targets >= 0
+    targets, weights = targets[known], weights[known]
+    n = len(all_names)
+    count = np.bincount(targets, minlength=n).tolist()
+    sums = {}
+    for sign, selected in (("positive", weights > 0), ("negative", weights < 0)):
+        total = np.zeros(n)
+        np.add.at(total, targets[selected], weights[selected])
+        # sum() of no edges is the int 0
+        any_edge = np.bincount(targets[selected], minlength=n).tolist()
+        sums[sign] = [value if any_edge[i] else 0 for i, value in enumerate(total.tolist())]
     received_impact = {}
-    for name in all_names:
-        incoming = [e for e in edges if e["target"] == name]
-        pos = sum(e["weight"] for e in incoming if e["weight"] > 0)
-        neg = sum(e["weight"] for e in incoming if e["weight"] < 0)
+    for i, name in enumerate(all_names):
+        pos, neg = sums["positive"][i], sums["negative"][i]
         received_impact[name] = {
             "positive": round(pos, 4),
             "negative": round(neg, 4),
             "total": round(pos + neg, 4),
-            "count": len(incoming),
+            "count": count[i],
         }
 
     # --- GAP 7: Bloc voting detection ---
@@ -1094,18 +1242,24 @@ def _compute_derived_metrics(edges: list[dict], paredoes: dict | None, all_names
     }
 
 
-def build_relations_scores(latest_snapshot: dict, daily_snapshots: list[dict], manual_events: dict, auto_events: list[dict] | None, sincerao_edges: dict | None, paredoes: dict | None, daily_roles: list[dict], participants_index: list[dict] | None = None) -> dict:
-    """Build pairwise sentiment scores (A -> B) combining queridômetro + events."""
+def build_relations_scores(latest_snapshot: dict, daily_snapshots: list[dict], manual_events: dict, auto_events: list[dict] | None, sincerao_edges: dict | None, paredoes: dict | None, daily_roles: list[dict], participants_index: list[dict] | None = None,
+                           calendar: CycleCalendar | None = None, streak_state: StreakState | None = None) -> dict:
+    """Build pairwise sentiment scores (A -> B) combining queridômetro + events.
+
+    ``streak_state`` resumes the streak computation from a saved state (see
+    ``compute_streak_data``).
+    """
+    calendar = calendar or get_cycle_calendar()
     # 1. Resolve participant sets, streak data, reaction matrix
-    psets = _resolve_participant_sets(latest_snapshot, daily_snapshots, participants_index)
+    psets = _resolve_participant_sets(latest_snapshot, daily_snapshots, participants_index, calendar, streak_state)
 
     # 2. Parse vote data structures
-    vote_data = _build_vote_data(paredoes, manual_events)
+    vote_data = _build_vote_data(paredoes, manual_events, calendar)
 
     # 3. Generate all relationship edges
     edge_result = _build_raw_edges(
         paredoes, manual_events, auto_events, sincerao_edges,
-        daily_roles, psets["all_names_set"], psets["current_cycle"], psets["latest_date"], vote_data,
+        daily_roles, psets["all_names_set"], psets["current_cycle"], psets["latest_date"], vote_data, calendar,
     )
 
     # 4. Compute pair scores, contradictions
@@ -0,0 +1,214 @@
+"""Persisted per-pair streak state — advances ``compute_streak_data`` one day at a time.
+
+``reaction_tensor.streak_arrays`` recomputes every pair's streak from the
+whole season on each build. ``StreakState`` holds the same per-(giver,
+receiver) values as of a given day (current/previous streak, last label,
+``total_days``) together with what the next day needs to continue: the
+last Raio-X carried-forward matrix and the ``missing_raio_x_log`` so far.
+``advance()`` folds in one daily snapshot with a few O(pairs) array
+operations, so a build only pays for the days added since the saved state.
+
+A saved state is resumed only when the days it covers are a prefix of the
+current daily snapshots (same dates and capture files) and no elimination
+cutoff falls inside them that it did not apply; otherwise it is rebuilt
+from day one. ``derived_pipeline --verify-streaks`` cross-checks the result
+against the full recompute.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from builders.reaction_tensor import NO_CATEGORY, _category_code
+from data_utils import get_patched_reaction_matrices, write_json_artifact
+
+STREAK_STATE_VERSION = 1
+
+# Per-pair arrays (giver × receiver), with the value of a pair never seen
+ARRAY_DEFAULTS = {
+    "total_days": 0,       # days with any label
+    "current": NO_CATEGORY,  # category code of the latest categorized day
+    "streak_len": 0,       # length of the current streak
+    "previous": NO_CATEGORY,  # category code of the streak before it
+    "previous_len": 0,     # length of that previous streak
+    "break_day": 0,        # first day index of the current streak
+    "latest_day": -1,      # last day index with any label
+    "latest_code": 0,      # label code (into ``labels``) on latest_day
+}
+
+
+def _cuts_before(last_seen: dict[str, str | None], date: str | None) -> dict[str, str]:
+    """Elimination cutoffs that exclude at least one day up to ``date``."""
+    if date is None:
+        return {}
+    return {name: seen for name, seen in sorted(last_seen.items()) if seen and seen < date}
+
+
+class StreakState:
+    """Streak values for every pair after ``days`` (one ``(date, file)`` per daily snapshot)."""
+
+    def __init__(self, names: list[str] | None = None, labels: list[str] | None = None,
+                 arrays: dict[str, np.ndarray] | None = None, pairs: list[tuple[str, str]] | None = None,
+                 days: list[tuple[str, str | None]] | None = None,
+                 prev_matrix: dict[tuple[str, str], str] | None = None,
+                 missing_raio_x_log: list[dict] | None = None, cuts: dict[str, str] | None = None) -> None:
+        self.names = list(names or [])
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.labels = list(labels or [""])
+        self.label_index = {label: i for i, label in enumerate(self.labels)}
+        self.category = np.array([_category_code(label) for label in self.labels], dtype=np.int8)
+        n = len(self.names)
+        self.arrays = arrays or {key: np.full((n, n), value, dtype=np.int32) for key, value in ARRAY_DEFAULTS.items()}
+        # Pairs in order of their first labelled day (drives streak_info ordering)
+        self.pairs = dict.fromkeys(pairs or ())
+        self.days = list(days or [])
+        self.prev_matrix = prev_matrix or {}
+        self.missing_raio_x_log = list(missing_raio_x_log or [])
+        # Cutoffs applied to the covered days (see ``_cuts_before``)
+        self.cuts = dict(cuts or {})
+
+    @property
+    def dates(self) -> list[str]:
+        return [date for date, _ in self.days]
+
+    def copy(self) -> StreakState:
+        return StreakState(
+            self.names, self.labels, {key: values.copy() for key, values in self.arrays.items()}, list(self.pairs),
+            self.days, dict(self.prev_matrix), [dict(entry) for entry in self.missing_raio_x_log], self.cuts,
+        )
+
+    def _grow(self, names: list[str]) -> None:
+        self.names.extend(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        n, old = len(self.names), len(self.names) - len(names)
+        for key, values in self.arrays.items():
+            grown = np.full((n, n), ARRAY_DEFAULTS[key], dtype=np.int32)
+            grown[:old, :old] = values
+            self.arrays[key] = grown
+
+    def _code(self, label: str) -> int:
+        code = self.label_index.get(label)
+        if code is None:
+            code = self.label_index[label] = len(self.labels)
+            self.labels.append(label)
+            self.category = np.append(self.category, np.int8(_category_code(label)))
+        return code
+
+    def advance(self, matrix: dict[tuple[str, str], str], date: str, file: str | None = None,
+                carried: list[str] | None = None, eliminated_last_seen: dict[str, str | None] | None = None) -> None:
+        """Fold in one day's (Raio-X patched) reaction matrix.
+
+        ``carried`` lists the participants whose reactions were carried
+        forward into ``matrix``; days after a participant's ``last_seen``
+        are not counted for their pairs (as in ``compute_streak_data``).
+        """
+        last_seen = eliminated_last_seen or {}
+        new_names = dict.fromkeys(name for key in matrix for name in key if name not in self.index)
+        if new_names:
+            self._grow(list(new_names))
+        day = len(self.days)
+        n = len(self.names)
+
+        codes = np.zeros((n, n), dtype=np.int32)
+        if matrix:
+            givers, receivers = zip(*matrix)
+            codes[[self.index[g] for g in givers], [self.index[r] for r in receivers]] = [
+                self._code(label) for label in matrix.values()
+            ]
+        counted = np.array([not last_seen.get(name) or date <= last_seen[name] for name in self.names], dtype=bool)
+        in_range = counted[:, None] & counted[None, :]
+        labelled = (codes != 0) & in_range
+        category = self.category[codes].astype(np.int32)
+        valid = (category != NO_CATEGORY) & in_range
+
+        a = self.arrays
+        a["total_days"] += labelled
+        a["latest_day"][labelled] = day
+        a["latest_code"][labelled] = codes[labelled]
+
+        same = valid & (category == a["current"])
+        switched = valid & (a["current"] != NO_CATEGORY) & ~same
+        started = valid & (a["current"] == NO_CATEGORY)
+        a["previous"][switched] = a["current"][switched]
+        a["previous_len"][switched] = a["streak_len"][switched]
+        a["streak_len"][same] += 1
+        a["streak_len"][switched | started] = 1
+        a["current"][switched | started] = category[switched | started]
+        a["break_day"][switched | started] = day
+
+        self.pairs.update(dict.fromkeys(key for key, label in matrix.items() if label))
+        self.days.append((date, file))
+        self.prev_matrix = matrix
+        if carried:
+            self.missing_raio_x_log.append({"date": date, "participants": list(carried)})
+        self.cuts = _cuts_before(last_seen, date)
+
+    def covers_prefix_of(self, daily_snapshots: list[dict], eliminated_last_seen: dict[str, str | None]) -> bool:
+        """True when this state's days start ``daily_snapshots`` and its cutoffs still hold."""
+        if len(self.days) > len(daily_snapshots):
+            return False
+        if any((snap["date"], snap.get("file")) != tuple(day) for snap, day in zip(daily_snapshots, self.days)):
+            return False
+        last_date = self.days[-1][0] if self.days else None
+        return _cuts_before(eliminated_last_seen, last_date) == self.cuts
+
+    def resumed(self, daily_snapshots: list[dict], eliminated_last_seen: dict[str, str | None] | None = None) -> StreakState:
+        """State covering all of ``daily_snapshots``: this one advanced, or a rebuild."""
+        last_seen = eliminated_last_seen or {}
+        if self.covers_prefix_of(daily_snapshots, last_seen):
+            state, remaining = self.copy(), daily_snapshots[len(self.days):]
+        else:
+            state, remaining = StreakState(), daily_snapshots
+        if remaining:
+            matrices, carried_by_day = get_patched_reaction_matrices(remaining, prev_matrix=state.prev_matrix)
+            for snap, matrix, carried in zip(remaining, matrices, carried_by_day):
+                state.advance(matrix, snap["date"], snap.get("file"), carried, last_seen)
+        return state
+
+    @classmethod
+    def build(cls, daily_snapshots: list[dict], eliminated_last_seen: dict[str, str | None] | None = None) -> StreakState:
+        return cls().resumed(daily_snapshots, eliminated_last_seen)
+
+    def to_dict(self) -> dict:
+        return {
+            "_metadata": {"version": STREAK_STATE_VERSION},
+            "names": self.names,
+            "labels": self.labels,
+            "days": [list(day) for day in self.days],
+            "cuts": self.cuts,
+            "pairs": [[self.index[g], self.index[r]] for g, r in self.pairs],
+            "arrays": {key: values.tolist() for key, values in self.arrays.items()},
+            "prev_matrix": [[self.index[g], self.index[r], label] for (g, r), label in self.prev_matrix.items()],
+            "missing_raio_x_log": self.missing_raio_x_log,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> StreakState:
+        names = data["names"]
+        return cls(
+            names,
+            data["labels"],
+            {key: np.array(data["arrays"][key], dtype=np.int32).reshape(len(names), len(names)) for key in ARRAY_DEFAULTS},
+            [(names[g], names[r]) for g, r in data["pairs"]],
+            [tuple(day) for day in data["days"]],
+            {(names[g], names[r]): label for g, r, label in data["prev_matrix"]},
+            data["missing_raio_x_log"],
+            data["cuts"],
+        )
+
+
+def load_streak_state(path: Path) -> StreakState | None:
+    """Saved state, or None when missing, unreadable or from another version."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("_metadata", {}).get("version") != STREAK_STATE_VERSION:
+            return None
+        return StreakState.from_dict(data)
+    except (FileNotFoundError, ValueError, KeyError, TypeError, IndexError):
+        return None
+
+
+def save_streak_state(state: StreakState, path: Path) -> bool:
+    return write_json_artifact(path, state.to_dict())
@@ -5,10 +5,10 @@ from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 
 from data_utils import (
+    CycleCalendar,
     genero,
+    get_cycle_calendar,
     get_effective_cycle_end_dates,
-    get_cycle_number,
-    get_cycle_start_date,
     normalize_actors,
     utc_to_game_date,
     POWER_EVENT_LABELS,
@@ -159,9 +159,10 @@ def _generate_weekly_scaffolds(
     cap_end = ref_dt + timedelta(days=7)
 
     out: list[dict] = []
+    calendar = CycleCalendar(cycle_end_dates)
     num_weeks = len(cycle_end_dates) + 1  # include open week
     for week_num in range(1, num_weeks + 1):
-        start_str = get_cycle_start_date(week_num, cycle_end_dates)
+        start_str = calendar.start(week_num)
         try:
             start_dt = datetime.strptime(start_str, "%Y-%m-%d").date()
         except ValueError:
@@ -192,7 +193,7 @@ def _generate_weekly_scaffolds(
                 status = "" if day < ref_dt else "scheduled"
                 out.append({
                     "date": day_str,
-                    "cycle": get_cycle_number(day_str, cycle_end_dates),
+                    "cycle": calendar.cycle(day_str),
                     "category": cat,
                     "emoji": tpl["emoji"],
                     "title": tpl["title"],
@@ -210,6 +211,7 @@ def _collect_timeline_auto_events(
     eliminations_detected: list[dict],
     auto_events: list[dict],
     manual_events: dict,
+    calendar: CycleCalendar,
 ) -> list[dict]:
     """Collect timeline events from eliminations_detected and auto_events.
 
@@ -239,7 +241,7 @@ def _collect_timeline_auto_events(
     for rec in eliminations_detected:
         det_date = rec["date"]
         for name in rec.get("added", []):
-            week = get_cycle_number(det_date)
+            week = calendar.cycle(det_date)
             events.append({
                 "date": det_date, "cycle": week, "category": "entrada",
                 "emoji": "✅", "title": f"{name} entrou",
@@ -254,7 +256,7 @@ def _collect_timeline_auto_events(
             # Use paredão date or manual exit_date when available.
             date = _paredao_exit_date.get(name, det_date)
             # Use paredão's explicit cycle (handles same-day cross-cycle events)
-            week = _paredao_exit_cycle.get(name) or get_cycle_number(date)
+            week = _paredao_exit_cycle.get(name) or calendar.cycle(date)
             reason = info.get("exit_reason", "")
             status_emoji = {"desistente": "🚪", "eliminada": "❌", "eliminado": "❌", "desclassificado": "⛔"}.get(status, "❌")
             detail = f"{status.capitalize()}" + (f" — {reason}" if reason else "")
@@ -274,7 +276,7 @@ def _collect_timeline_auto_events(
         cat, emoji = type_map.get(t, ("poder", "⚡"))
         date = ev.get("date", "")
         # Always compute week from date (ignore stored week)
-        week = get_cycle_number(date) if date else 0
+        week = calendar.cycle(date) if date else 0
         target = ev.get("target", "")
         events.append({
             "date": date, "cycle": week, "category": cat,
@@ -308,7 +310,8 @@ def _extract_prova_winners(prova: dict) -> list[str]:
 def _collect_timeline_provas_fallback_events(
     auto_events: list[dict],
     provas_data: dict | list | None,
-    manual_events: dict | None = None,
+    manual_events: dict | None,
+    calendar: CycleCalendar,
 ) -> list[dict]:
     """Add fallback Líder/Anjo/Monstro timeline events from provas/manual_events when API auto-events lag."""
     events: list[dict] = []
@@ -326,7 +329,7 @@ def _collect_timeline_provas_fallback_events(
         date = ev.get("date", "")
         if not target:
             continue
-        week = get_cycle_number(date) if date else int(ev.get("cycle") or ev.get("week", 0) or 0)
+        week = calendar.cycle(date) if date else int(ev.get("cycle") or ev.get("week", 0) or 0)
         if week > 0:
             auto_by_type_week[t][week].add(target)
 
@@ -336,12 +339,12 @@ def _collect_timeline_provas_fallback_events(
         if not date:
             continue
         # Use stored week from provas.json (operational week) when available.
-        # Fall back to get_cycle_number(date) only if missing.
+        # Fall back to calendar.cycle(date) only if missing.
         # Reason: Anjo prova can happen on the same day as the next Líder prova,
-        # making get_cycle_number(date) return the NEW week, but the Anjo belongs
+        # making calendar.cycle(date) return the NEW week, but the Anjo belongs
         # to the PREVIOUS week operationally (e.g., W2 Anjo on Jan 29 = W3 by date).
         stored_week = prova.get("cycle")
-        week = int(stored_week) if stored_week else get_cycle_number(date)
+        week = int(stored_week) if stored_week else calendar.cycle(date)
         winners = _extract_prova_winners(prova)
 
         if tipo == "lider":
@@ -403,7 +406,7 @@ def _collect_timeline_provas_fallback_events(
     return events
 
 
-def _collect_timeline_manual_events(manual_events: dict) -> list[dict]:
+def _collect_timeline_manual_events(manual_events: dict, calendar: CycleCalendar) -> list[dict]:
     """Collect timeline events from manual power events, weekly events, and special events.
 
     Handles power events (section 3), weekly events (section 4), and
@@ -439,7 +442,7 @@ def _collect_timeline_manual_events(manual_events: dict) -> list[dict]:
         if isinstance(stored_cycle, int) and stored_cycle > 0:
             week = stored_cycle
         else:
-            week = get_cycle_number(date) if date else 0
+            week = calendar.cycle(date) if date else 0
         actor = ev.get("actor", "")
         target = ev.get("target", "")
         emoji = power_emoji.get(t, "⚡")
@@ -467,7 +470,7 @@ def _collect_timeline_manual_events(manual_events: dict) -> list[dict]:
         # Big Fone
         for bf in (we.get("big_fone") or []):
             date = bf.get("date", we.get("start_date", ""))
-            w = get_cycle_number(date) if date else week
+            w = calendar.cycle(date) if date else week
             atendeu = bf.get("atendeu", "")
             events.append({
                 "date": date, "cycle": w, "category": "big_fone",
@@ -480,7 +483,7 @@ def _collect_timeline_manual_events(manual_events: dict) -> list[dict]:
         sinc_list = sinc_raw if isinstance(sinc_raw, list) else [sinc_raw] if isinstance(sinc_raw, dict) else []
         for sinc in sinc_list:
             date = sinc.get("date", "")
-            w = get_cycle_number(date) if date else week
+            w = calendar.cycle(date) if date else week
             fmt = sinc.get("format", "")
             events.append({
                 "date": date, "cycle": w, "category": "sincerao",
@@ -492,7 +495,7 @@ def _collect_timeline_manual_events(manual_events: dict) -> list[dict]:
         gg_list = gg_raw if isinstance(gg_raw, list) else [gg_raw] if isinstance(gg_raw, dict) else []
         for gg in gg_list:
             date = gg.get("date", we.get("start_date", ""))
-            w = get_cycle_number(date) if date else week
+            w = calendar.cycle(date) if date else week
             # Build detail from structured fields if 'resultado' not set
             gg_detail = gg.get("resultado", "")
             if not gg_detail:
@@ -515,7 +518,7 @@ def _collect_timeline_manual_events(manual_events: dict) -> list[dict]:
         anjo = we.get("anjo")
         if anjo and isinstance(anjo, dict) and anjo.get("escolha"):
             almoco_date = anjo.get("almoco_date", "")
-            w = get_cycle_number(almoco_date) if almoco_date else week
+            w = calendar.cycle(almoco_date) if almoco_date else week
             vencedor = anjo.get("vencedor", "")
             escolha = anjo.get("escolha", "")
             convidados = anjo.get("almoco_convidados", [])
@@ -538,7 +541,7 @@ def _collect_timeline_manual_events(manual_events: dict) -> list[dict]:
         tcn = we.get("ta_com_nada")
         if tcn and isinstance(tcn, dict):
             date = tcn.get("date", we.get("start_date", ""))
-            w = get_cycle_number(date) if date else week
+            w = calendar.cycle(date) if date else week
             instigadores = tcn.get("instigadores", [])
             title = f"Tá Com Nada — {' e '.join(instigadores)}" if instigadores else "Tá Com Nada"
             events.append({
@@ -551,7 +554,7 @@ def _collect_timeline_manual_events(manual_events: dict) -> list[dict]:
     # --- 6. Special events (dinâmicas, new entrants) ---
     for se in manual_events.get("special_events", []):
         date = se.get("date", "")
-        week = get_cycle_number(date) if date else 0
+        week = calendar.cycle(date) if date else 0
         name = se.get("name", se.get("description", "Evento especial"))
         participants = se.get("participants", se.get("participants_affected", []))
         events.append({
@@ -585,7 +588,8 @@ def _lookup_provas_winner(provas_data: dict | list | None, tipo: str, week: int)
 
 def _collect_timeline_paredao_events(
     paredoes_data: dict | list | None,
-    provas_data: dict | list | None = None,
+    provas_data: dict | list | None,
+    calendar: CycleCalendar,
 ) -> list[dict]:
     """Collect timeline events from paredão formation and results.
 
@@ -609,7 +613,7 @@ def _collect_timeline_paredao_events(
         data_form = p.get("data_formacao", "")
         if not data_form:
             continue
-        week = get_cycle_number(data_form)
+        week = calendar.cycle(data_form)
         formacao = p.get("formacao", {})
         indicados = [i.get("nome", "") for i in p.get("indicados_finais", [])]
         paredao_falso = p.get("paredao_falso", False)
@@ -832,7 +836,7 @@ def _collect_timeline_paredao_events(
         data_elim = p.get("data", "")
         if resultado and data_elim:
             # Use paredão's explicit cycle (handles same-day cross-cycle events)
-            r_week = p.get("cycle") or get_cycle_number(data_elim)
+            r_week = p.get("cycle") or calendar.cycle(data_elim)
             eliminado = resultado.get("eliminado", "")
             votos = resultado.get("votos", {})
             pct = ""
@@ -862,6 +866,7 @@ def _collect_timeline_paredao_events(
 def _merge_and_dedup_timeline(
     events: list[dict],
     manual_events: dict,
+    calendar: CycleCalendar,
     *,
     reference_date: str | None = None,
     scaffold_events: list[dict] | None = None,
@@ -898,7 +903,7 @@ def _merge_and_dedup_timeline(
     existing_date_cat = {(e["date"], e["category"]) for e in events}
     for se in manual_events.get("scheduled_events", []):
         date = se.get("date") or ""
-        week = _get_event_cycle(se, fallback=get_cycle_number(date) if date else 0)
+        week = _get_event_cycle(se, fallback=calendar.cycle(date) if date else 0)
         cat = se.get("category", "dinamica")
         key = (date, cat)
         time_field = se.get("time") or ""
@@ -1014,30 +1019,33 @@ def build_game_timeline(
     provas_data: dict | list | None = None,
     *,
     reference_date: str | None = None,
+    calendar: CycleCalendar | None = None,
 ) -> list[dict]:
     """Build a unified chronological timeline merging all event sources.
 
     Args:
         reference_date: ISO date for scheduled-event lifecycle (default: today).
+        calendar: Cycle calendar for dated events (default: ``get_cycle_calendar()``).
     """
     if reference_date is None:
         reference_date = utc_to_game_date(datetime.now(timezone.utc))
     paredoes_dict = paredoes_data if isinstance(paredoes_data, dict) else {}
     provas_dict = provas_data if isinstance(provas_data, dict) else {}
     cycle_end_dates = get_effective_cycle_end_dates(manual_events, paredoes_dict, provas_dict)
+    calendar = calendar or get_cycle_calendar()
 
     # Inject paredoes data so _collect_timeline_auto_events can use paredão dates for saida events.
     manual_events_with_paredoes = dict(manual_events)
     manual_events_with_paredoes["_paredoes_raw"] = paredoes_dict
 
     events: list[dict] = []
-    events.extend(_collect_timeline_auto_events(eliminations_detected, auto_events, manual_events_with_paredoes))
-    events.extend(_collect_timeline_provas_fallback_events(auto_events, provas_data, manual_events))
-    events.extend(_collect_timeline_manual_events(manual_events))
-    events.extend(_collect_timeline_paredao_events(paredoes_data, provas_data))
+    events.extend(_collect_timeline_auto_events(eliminations_detected, auto_events, manual_events_with_paredoes, calendar))
+    events.extend(_collect_timeline_provas_fallback_events(auto_events, provas_data, manual_events, calendar))
+    events.extend(_collect_timeline_manual_events(manual_events, calendar))
+    events.extend(_collect_timeline_paredao_events(paredoes_data, provas_data, calendar))
     scaffold_events = _generate_weekly_scaffolds(cycle_end_dates, reference_date, manual_events)
     return _merge_and_dedup_timeline(
-        events, manual_events,
+        events, manual_events, calendar,
         reference_date=reference_date,
         scaffold_events=scaffold_events,
     )
@@ -1,15 +1,16 @@
 """Vote prediction: two-pass model for house vote forecasting."""
 from __future__ import annotations
 
+from bisect import bisect_right
 from collections import defaultdict
 from datetime import datetime, timezone
 import unicodedata
 from typing import Any
 
+from builders.reaction_tensor import PairDayCounts
 from data_utils import (
-    MILD_NEGATIVE, STRONG_NEGATIVE,
     SENTIMENT_WEIGHTS,
-    build_reaction_matrix, patch_missing_raio_x,
+    get_patched_reaction_matrices,
     resolve_leaders,
 )
 
@@ -185,41 +186,28 @@ def _compute_formation_pair_scores(
     formation_date: str,
     pairs_daily: dict,
     pairs_all: dict,
+    day_counts: PairDayCounts | None = None,
 ) -> dict:
     """Compute pairwise sentiment scores anchored to a specific formation date.
 
     Uses the reaction matrix at the formation date for the queridômetro component,
     combined with historical reaction consistency. Falls back to events from
-    pairs_daily/pairs_all for the non-queridômetro signal.
+    pairs_daily/pairs_all for the non-queridômetro signal. ``day_counts``
+    (built from ``daily_matrices``) is shared across paredões by the caller.
 
     Returns dict: {voter: {target: score, ...}, ...}
     """
-    all_neg = MILD_NEGATIVE | STRONG_NEGATIVE
-
-    # Find the matrix index at or before formation_date
-    mat_idx = None
-    for i in range(len(daily_dates) - 1, -1, -1):
-        if daily_dates[i] <= formation_date:
-            mat_idx = i
-            break
-    if mat_idx is None:
-        mat_idx = 0
-
+    # Matrix index at or before formation_date
+    mat_idx = max(bisect_right(daily_dates, formation_date) - 1, 0)
     matrix_at_date = daily_matrices[mat_idx]
 
-    # Build historical reaction counts up to formation date
-    # pair_history[(a,b)] = [rxn_label, rxn_label, ...]
-    pair_neg_days = defaultdict(int)
-    pair_total_days = defaultdict(int)
-    for i in range(mat_idx + 1):
-        mat = daily_matrices[i]
-        seen_givers = set()
-        for (a, b), rxn in mat.items():
-            if rxn:
-                pair_total_days[(a, b)] += 1
-                if rxn in all_neg:
-                    pair_neg_days[(a, b)] += 1
-                seen_givers.add(a)
+    # Historical reaction counts up to formation date (inclusive)
+    if day_counts is None:
+        day_counts = PairDayCounts.from_matrices(daily_matrices)
+    counts = day_counts.counts(mat_idx + 1)
+    pair_total_days = counts["labelled"].tolist()
+    pair_neg_days = counts["negative"].tolist()
+    index = day_counts.tensor.index
 
     # Compute scores
     scores = defaultdict(dict)
@@ -240,8 +228,8 @@ def _compute_formation_pair_scores(
             t2v_weight = SENTIMENT_WEIGHTS.get(rxn_t2v, 0.0)
 
             # Historical negative ratio (how consistently negative)
-            total_d = pair_total_days.get((voter, target), 0)
-            neg_d = pair_neg_days.get((voter, target), 0)
+            total_d = pair_total_days[index[voter]][index[target]]
+            neg_d = pair_neg_days[index[voter]][index[target]]
             neg_ratio = neg_d / total_d if total_d > 0 else 0.0
 
             # Queridômetro component: current reaction + history + reciprocity
@@ -397,6 +385,7 @@ def _predict_single_paredao(
     cluster_members: dict[Any, set[str]],
     all_voting_blocs: list[dict],
     cfg: dict[str, Any],
+    day_counts: PairDayCounts | None = None,
 ) -> tuple[str, dict] | None:
     """Process a single paredão: base predictions + boosts + retrospective.
 
@@ -430,7 +419,7 @@ def _predict_single_paredao(
 
     # Compute formation-date-specific pairwise scores
     pair_scores = _compute_formation_pair_scores(
-        daily_matrices, daily_dates, formation_date, pairs_d, pairs_all,
+        daily_matrices, daily_dates, formation_date, pairs_d, pairs_all, day_counts,
     )
 
     # --- PASS 1: Base predictions ---
@@ -598,17 +587,10 @@ def build_vote_prediction(
         return {"_metadata": {"model_version": "enhanced_v2"}, "by_paredao": {}}
 
     # Build patched daily matrices (with missing Raio-X carry-forward)
-    daily_matrices = []
-    daily_dates = []
-    prev_matrix = {}
-    for snap in daily_snapshots:
-        active = [p for p in snap["participants"]
-                  if not p.get("characteristics", {}).get("eliminated")]
-        matrix = build_reaction_matrix(active)
-        matrix, _carried = patch_missing_raio_x(matrix, snap["participants"], prev_matrix)
-        daily_matrices.append(matrix)
-        daily_dates.append(snap["date"])
-        prev_matrix = matrix
+    daily_matrices, _carried = get_patched_reaction_matrices(daily_snapshots, active_only=True)
+    daily_dates = [snap["date"] for snap in daily_snapshots]
+    # Per-pair day counts as prefix sums: each formation date is one lookup
+    day_counts = PairDayCounts.from_matrices(daily_matrices)
 
     pairs_d = relations_scores.get("pairs_daily", {})
     pairs_all = relations_scores.get("pairs_all", {})
@@ -631,7 +613,7 @@ def build_vote_prediction(
         result = _predict_single_paredao(
             par, daily_snapshots, daily_matrices, daily_dates,
             pairs_d, pairs_all, cluster_map, cluster_members,
-            all_voting_blocs, cfg)
+            all_voting_blocs, cfg, day_counts)
         if result:
             by_paredao[result[0]] = result[1]
 
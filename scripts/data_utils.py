@@ -16,6 +16,7 @@ from __future__ import annotations
 import json
 import math
 from bisect import bisect_left
+from collections import OrderedDict
 from decimal import Decimal, ROUND_HALF_UP
 from functools import lru_cache
 from datetime import datetime, timedelta, timezone
@@ -671,6 +672,83 @@ def get_cycle_start_date(cycle_num: int, cycle_end_dates: list[str] | None = Non
     return (d + timedelta(days=1)).isoformat()
 
 
+class CycleCalendar:
+    """Game-cycle lookups for one set of cycle-end boundaries.
+
+    Same answers as ``get_cycle_number`` / ``get_cycle_start_date``, but the
+    boundaries are resolved once: every season date maps to its cycle through
+    a dict, so per-item lookups in builders cost a dict hit instead of three
+    ``stat`` calls plus a bisect. Build one per pipeline run with
+    ``get_cycle_calendar()`` and pass it to the builders.
+    """
+
+    # Dates this far past the last boundary are still served from the dict
+    _TAIL_DAYS = 180
+
+    def __init__(self, cycle_end_dates: list[str] | tuple[str, ...]) -> None:
+        self.boundaries = tuple(cycle_end_dates)
+        self._by_date: dict[str, int] = {}
+        day = datetime.strptime(BBB26_PREMIERE, "%Y-%m-%d").date()
+        last = datetime.strptime(max(self.boundaries, default=BBB26_PREMIERE), "%Y-%m-%d").date()
+        cycle = 1
+        while day <= last + timedelta(days=self._TAIL_DAYS):
+            iso = day.isoformat()
+            while cycle <= len(self.boundaries) and self.boundaries[cycle - 1] < iso:
+                cycle += 1
+            self._by_date[iso] = cycle
+            day += timedelta(days=1)
+
+    def __reduce__(self):
+        return (CycleCalendar, (self.boundaries,))
+
+    @property
+    def n_cycles(self) -> int:
+        """Number of cycles with a known end, plus the open one."""
+        return len(self.boundaries) + 1
+
+    def cycle(self, date_str: str) -> int:
+        """Cycle number for a YYYY-MM-DD date (see ``get_cycle_number``)."""
+        cycle = self._by_date.get(date_str)
+        if cycle is None:
+            cycle = 1 if date_str < BBB26_PREMIERE else bisect_left(self.boundaries, date_str) + 1
+        return cycle
+
+    def cycles_for(self, dates: list[str]) -> list[int]:
+        """Cycle numbers for many dates at once."""
+        import numpy as np
+
+        if not dates:
+            return []
+        values = np.asarray(dates, dtype=str)
+        cycles = np.searchsorted(np.asarray(self.boundaries, dtype=str), values, side="left") + 1
+        cycles[values < BBB26_PREMIERE] = 1
+        return cycles.tolist()
+
+    def start(self, cycle_num: int) -> str:
+        """First date of a cycle (see ``get_cycle_start_date``)."""
+        return get_cycle_start_date(cycle_num, list(self.boundaries))
+
+    def end(self, cycle_num: int) -> str | None:
+        """Last date of a cycle, or None while it is still open."""
+        if 1 <= cycle_num <= len(self.boundaries):
+            return self.boundaries[cycle_num - 1]
+        return None
+
+
+@lru_cache(maxsize=8)
+def _cycle_calendar_for(boundaries: tuple[str, ...]) -> CycleCalendar:
+    return CycleCalendar(boundaries)
+
+
+def get_cycle_calendar(
+    manual_events: dict[str, Any] | None = None,
+    paredoes_data: dict[str, Any] | None = None,
+    provas_data: dict[str, Any] | None = None,
+) -> CycleCalendar:
+    """Calendar for the effective cycle boundaries (arguments as in ``get_effective_cycle_end_dates``)."""
+    return _cycle_calendar_for(tuple(get_effective_cycle_end_dates(manual_events, paredoes_data, provas_data)))
+
+
 def calc_sentiment(participant: dict) -> float:
     """Calculate sentiment score for a participant from their received reactions.
 
@@ -711,13 +789,115 @@ def load_snapshot(filepath: str | Path) -> tuple[list[dict], dict]:
 # Centralized Data Loaders (derived + manual JSON files)
 # ══════════════════════════════════════════════════════════════
 
+def _read_only(*_args, **_kwargs):
+    raise TypeError("cached JSON data is read-only; copy.deepcopy() it to modify")
+
+
+class ReadOnlyDict(dict):
+    """dict returned by the cached loaders: every mutator raises TypeError.
+
+    Still a ``dict`` for ``isinstance``/``json.dumps``; ``dict(d)``, ``d.copy()``
+    and ``copy.deepcopy(d)`` return plain, mutable copies.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (ReadOnlyDict, (dict(self),))
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        import copy
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+
+class ReadOnlyList(list):
+    """list counterpart of ``ReadOnlyDict``."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (ReadOnlyList, (list(self),))
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        import copy
+        return [copy.deepcopy(v, memo) for v in self]
+
+
+def _read_only_list(values: list) -> ReadOnlyList:
+    return ReadOnlyList([_read_only_list(v) if type(v) is list else v for v in values])
+
+
+def _read_only_object(obj: dict) -> ReadOnlyDict:
+    # json object_hook: nested objects arrive already converted, only lists remain
+    for key, value in obj.items():
+        if type(value) is list:
+            obj[key] = _read_only_list(value)
+    return ReadOnlyDict(obj)
+
+
+def _read_only_json(text: str) -> Any:
+    value = json.loads(text, object_hook=_read_only_object)
+    return _read_only_list(value) if type(value) is list else value
+
+
+class JsonFileCache:
+    """Process-level cache of parsed JSON files, LRU-bounded by file bytes.
+
+    Entries are keyed by resolved path and validated against the file's
+    (mtime_ns, ctime_ns, size, inode) on every lookup, so an edited or
+    replaced file is re-read and stale data is never served. Values are
+    ``ReadOnlyDict``/``ReadOnlyList`` trees shared between callers.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.loads = 0
+        self._bytes = 0
+        self._entries: OrderedDict[Path, tuple[tuple[int, ...], int, Any]] = OrderedDict()
+
+    def get(self, path: Path) -> Any:
+        """Parsed, read-only contents of ``path`` (FileNotFoundError when missing)."""
+        key = path.resolve()
+        st = key.stat()
+        stamp = (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+        hit = self._entries.get(key)
+        if hit is not None and hit[0] == stamp:
+            self._entries.move_to_end(key)
+            return hit[2]
+        value = _read_only_json(key.read_text(encoding="utf-8"))
+        self.loads += 1
+        if hit is not None:
+            self._bytes -= hit[1]
+        self._entries[key] = (stamp, st.st_size, value)
+        self._entries.move_to_end(key)
+        self._bytes += st.st_size
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _key, (_stamp, size, _value) = self._entries.popitem(last=False)
+            self._bytes -= size
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+
+JSON_FILE_CACHE = JsonFileCache()
+
+
 def _load_json_file(path: str | Path, default: Any) -> Any:
-    """Load JSON file or return default when file is missing."""
-    file_path = Path(path)
-    if not file_path.exists():
+    """Load JSON file (cached, read-only; see ``JsonFileCache``) or return default when missing."""
+    try:
+        return JSON_FILE_CACHE.get(Path(path))
+    except FileNotFoundError:
         return default
-    with open(file_path, encoding="utf-8") as f:
-        return json.load(f)
 
 
 def get_bv_winners(paredao_entry: dict) -> set[str]:
@@ -940,6 +1120,133 @@ def deserialize_matrix(serialized: dict[str, str]) -> dict[tuple[str, str], str]
     return result
 
 
+# Compact reaction_matrices.json: one names table and one labels table for the
+# season, and per day the indexes of the day's participants plus a base64
+# participants × participants grid of bytes (giver rows, receiver columns;
+# 0 = no reaction, otherwise 1 + label index). ``order`` lists the grid cells
+# (uint16, little-endian) in the snapshot's own order, which the pages' tie
+# breaks depend on.
+REACTION_MATRICES_FORMAT = "grid-v1"
+
+
+def encode_reaction_matrices(by_date: dict[str, dict[str, str]]) -> dict:
+    """Compact form of ``{date: {"giver|receiver": label}}`` (dates keep their order)."""
+    import base64
+
+    pairs_by_date = {
+        date: [(key.split("|", 1), label) for key, label in serialized.items() if "|" in key]
+        for date, serialized in by_date.items()
+    }
+    names = sorted({name for pairs in pairs_by_date.values() for pair, _label in pairs for name in pair})
+    labels = sorted({label for pairs in pairs_by_date.values() for _pair, label in pairs})
+    name_idx = {name: i for i, name in enumerate(names)}
+    label_code = {label: i + 1 for i, label in enumerate(labels)}
+    if len(label_code) > 255:
+        raise ValueError("Too many reaction labels for the grid encoding")
+
+    encoded = {}
+    for date, pairs in pairs_by_date.items():
+        present = sorted({name_idx[name] for pair, _label in pairs for name in pair})
+        pos = {idx: i for i, idx in enumerate(present)}
+        n = len(present)
+        if n > 255:
+            raise ValueError(f"Too many participants on {date} for the grid encoding")
+        grid = bytearray(n * n)
+        order = bytearray()
+        for (giver, receiver), label in pairs:
+            cell = pos[name_idx[giver]] * n + pos[name_idx[receiver]]
+            grid[cell] = label_code[label]
+            order += cell.to_bytes(2, "little")
+        encoded[date] = {
+            "participants": present,
+            "grid": base64.b64encode(bytes(grid)).decode("ascii"),
+            "order": base64.b64encode(bytes(order)).decode("ascii"),
+        }
+    return {
+        "format": REACTION_MATRICES_FORMAT,
+        "names": names,
+        "labels": labels,
+        "by_date": encoded,
+        "all_dates": sorted(encoded),
+    }
+
+
+class ReactionMatrices:
+    """Lazy per-date decoder for reaction_matrices.json.
+
+    Reads both the compact grid format and the legacy ``"giver|receiver"``
+    dicts. Each date is decoded on first access: ``codes()`` returns the
+    participants and a NumPy code grid, ``matrix()`` the dict view used by
+    the pages (shared between callers, must not be mutated).
+    """
+
+    def __init__(self, payload: dict) -> None:
+        self.compact = payload.get("format") == REACTION_MATRICES_FORMAT
+        self.names: list[str] = payload.get("names", [])
+        self.labels: list[str] = payload.get("labels", [])
+        self._by_date: dict = payload.get("by_date", {})
+        self._matrices: dict[str, dict[tuple[str, str], str]] = {}
+        if not self.compact:
+            self.labels = sorted({label for day in self._by_date.values() for label in day.values()})
+
+    @property
+    def dates(self) -> list[str]:
+        return list(self._by_date)
+
+    def __contains__(self, date_str: str) -> bool:
+        return date_str in self._by_date
+
+    def _grid(self, date_str: str) -> tuple[list[str], bytes]:
+        import base64
+
+        entry = self._by_date[date_str]
+        return [self.names[i] for i in entry["participants"]], base64.b64decode(entry["grid"])
+
+    def codes(self, date_str: str):
+        """``(participants, grid)``: int16 array, ``grid[g, r]`` = label index or -1 for no reaction."""
+        import numpy as np
+
+        if self.compact:
+            people, raw = self._grid(date_str)
+            grid = np.frombuffer(raw, dtype=np.uint8).reshape(len(people), len(people)).astype(np.int16) - 1
+            return people, grid
+        matrix = self.matrix(date_str)
+        people = sorted({name for pair in matrix for name in pair})
+        pos = {name: i for i, name in enumerate(people)}
+        label_idx = {label: i for i, label in enumerate(self.labels)}
+        grid = np.full((len(people), len(people)), -1, dtype=np.int16)
+        for (giver, receiver), label in matrix.items():
+            grid[pos[giver], pos[receiver]] = label_idx[label]
+        return people, grid
+
+    def matrix(self, date_str: str) -> dict[tuple[str, str], str]:
+        """``{(giver, receiver): label}`` for one date."""
+        cached = self._matrices.get(date_str)
+        if cached is not None:
+            return cached
+        if not self.compact:
+            matrix = deserialize_matrix(self._by_date[date_str])
+        else:
+            import base64
+
+            people, raw = self._grid(date_str)
+            n = len(people)
+            order = base64.b64decode(self._by_date[date_str]["order"])
+            labels = self.labels
+            matrix = {}
+            for i in range(0, len(order), 2):
+                cell = order[i] | order[i + 1] << 8
+                matrix[(people[cell // n], people[cell % n])] = labels[raw[cell] - 1]
+        self._matrices[date_str] = matrix
+        return matrix
+
+    def serialized(self, date_str: str) -> dict[str, str]:
+        """The legacy ``{"giver|receiver": label}`` dict for one date."""
+        if not self.compact:
+            return self._by_date[date_str]
+        return {f"{giver}|{receiver}": label for (giver, receiver), label in self.matrix(date_str).items()}
+
+
 def utc_to_game_date(utc_dt: datetime) -> str:
     """Convert a UTC datetime to the BBB game date (BRT-based).
 
@@ -1032,29 +1339,179 @@ def patch_missing_raio_x(matrix: dict[tuple[str, str], str], participants: list[
     return matrix, carried
 
 
+def _active_participants(participants: list[dict]) -> list[dict]:
+    return [p for p in participants if not p.get("characteristics", {}).get("eliminated")]
+
+
+class ReactionMatrixCache:
+    """Memoized reaction matrices keyed by snapshot identity.
+
+    Entries are keyed by snapshot file/date and validated against the
+    identity of the snapshot's ``participants`` list, so a different snapshot
+    that happens to share a date never receives a stale matrix. Patched
+    (Raio-X carried-forward) variants are additionally keyed by the previous
+    matrix they were patched against.
+
+    Returned matrices are shared between callers and must not be mutated.
+    Values derived from them (e.g. ``ReactionTensor.cached``) go in ``memo``,
+    which ``clear()`` empties along with the matrices.
+
+    Snapshots loaded through the packed archive also register the archive's
+    reaction-code grids (``add_archive``), which ``codes()`` serves to
+    vectorized consumers without going through the dict matrices.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.builds = 0
+        self.memo: dict[str, Any] = {}
+        self._raw: OrderedDict[tuple, tuple[list, dict]] = OrderedDict()
+        self._patched: OrderedDict[tuple, tuple[list, dict, dict, list[str]]] = OrderedDict()
+        self._codes: dict[tuple, tuple[list, list[str], Any, list[str]]] = {}
+
+    @staticmethod
+    def _snap_key(snap: dict, active_only: bool) -> tuple:
+        return (snap.get("file") or snap.get("filepath") or "", snap.get("date"), active_only)
+
+    def _remember(self, table: OrderedDict, key: tuple, value: tuple) -> None:
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.maxsize:
+            table.popitem(last=False)
+
+    def raw(self, snap: dict, *, active_only: bool = False) -> dict[tuple[str, str], str]:
+        """Return ``build_reaction_matrix`` for the snapshot (optionally active receivers only)."""
+        participants = snap["participants"]
+        key = self._snap_key(snap, active_only)
+        hit = self._raw.get(key)
+        if hit is not None and hit[0] is participants:
+            self._raw.move_to_end(key)
+            return hit[1]
+        source = _active_participants(participants) if active_only else participants
+        matrix = build_reaction_matrix(source)
+        self.builds += 1
+        self._remember(self._raw, key, (participants, matrix))
+        return matrix
+
+    def patched(
+        self,
+        snap: dict,
+        prev_matrix: dict[tuple[str, str], str],
+        *,
+        active_only: bool = False,
+    ) -> tuple[dict[tuple[str, str], str], list[str]]:
+        """Return the snapshot matrix with Raio-X carry-forward from ``prev_matrix``.
+
+        Equivalent to ``patch_missing_raio_x(build_reaction_matrix(...), participants, prev_matrix)``.
+        """
+        matrix = self.raw(snap, active_only=active_only)
+        if not prev_matrix:
+            return matrix, []
+        participants = snap["participants"]
+        key = self._snap_key(snap, active_only) + (id(prev_matrix),)
+        hit = self._patched.get(key)
+        if hit is not None and hit[0] is participants and hit[1] is prev_matrix:
+            self._patched.move_to_end(key)
+            return hit[2], hit[3]
+        patched, carried = patch_missing_raio_x(dict(matrix), participants, prev_matrix)
+        if not carried:
+            patched = matrix
+        self._remember(self._patched, key, (participants, prev_matrix, patched, carried))
+        return patched, carried
+
+    def patched_series(
+        self,
+        snapshots: list[dict],
+        *,
+        active_only: bool = False,
+        prev_matrix: dict[tuple[str, str], str] | None = None,
+    ) -> tuple[list[dict[tuple[str, str], str]], list[list[str]]]:
+        """Chain ``patched`` over consecutive snapshots (each day patched against the previous result)."""
+        matrices = []
+        carried_by_day = []
+        prev = prev_matrix or {}
+        for snap in snapshots:
+            matrix, carried = self.patched(snap, prev, active_only=active_only)
+            matrices.append(matrix)
+            carried_by_day.append(carried)
+            prev = matrix
+        return matrices, carried_by_day
+
+    def add_archive(self, snapshots: list[dict], arrays: dict) -> None:
+        """Register the archive's reaction grids for ``snapshots`` (its first captures, in order)."""
+        tables = json.loads(arrays["tables"].tobytes().decode("utf-8"))
+        labels, extras = tables["labels"], tables["reaction_extras"]
+        reactions, exact = arrays["reactions"], arrays["reactions_exact"]
+        for c, snap in enumerate(snapshots[:len(exact)]):
+            if exact[c]:
+                names = [p["name"] for p in snap["participants"]] + extras[c]
+                n = len(names)
+                self._codes[self._snap_key(snap, False)] = (snap["participants"], names, reactions[c, :n, :n], labels)
+
+    def codes(self, snap: dict):
+        """``(names, grid, labels)`` from the snapshot archive, or None when not registered.
+
+        ``names`` are the participants followed by givers who are not
+        participants; ``grid[g, r]`` (int8) indexes ``labels``, -1 for no
+        reaction. It holds the same pairs as ``raw(snap)``.
+        """
+        hit = self._codes.get(self._snap_key(snap, False))
+        if hit is None or hit[0] is not snap["participants"]:
+            return None
+        return hit[1:]
+
+    def clear(self) -> None:
+        self._raw.clear()
+        self._patched.clear()
+        self._codes.clear()
+        self.memo.clear()
+
+
+REACTION_MATRIX_CACHE = ReactionMatrixCache()
+
+
+def get_reaction_matrix(snap: dict, *, active_only: bool = False) -> dict[tuple[str, str], str]:
+    """Cached ``build_reaction_matrix`` for a snapshot dict (read-only result)."""
+    return REACTION_MATRIX_CACHE.raw(snap, active_only=active_only)
+
+
+def get_patched_reaction_matrix(
+    snap: dict,
+    prev_matrix: dict[tuple[str, str], str],
+    *,
+    active_only: bool = False,
+) -> tuple[dict[tuple[str, str], str], list[str]]:
+    """Cached Raio-X carried-forward matrix (see ``patch_missing_raio_x``)."""
+    return REACTION_MATRIX_CACHE.patched(snap, prev_matrix, active_only=active_only)
+
+
+def get_patched_reaction_matrices(
+    snapshots: list[dict],
+    *,
+    active_only: bool = False,
+    prev_matrix: dict[tuple[str, str], str] | None = None,
+) -> tuple[list[dict[tuple[str, str], str]], list[list[str]]]:
+    """Cached chain of carried-forward matrices, one per snapshot."""
+    return REACTION_MATRIX_CACHE.patched_series(snapshots, active_only=active_only, prev_matrix=prev_matrix)
+
+
+def clear_reaction_matrix_cache() -> None:
+    REACTION_MATRIX_CACHE.clear()
+
+
 def load_votalhada_polls(filepath: str | Path | None = None) -> dict:
     """Load Votalhada poll aggregation data.
 
     Returns dict with 'paredoes' list, or empty structure if file missing.
     """
     filepath = Path(filepath) if filepath is not None else Path("data/votalhada/polls.json")
-
-    if not filepath.exists():
-        return {"paredoes": []}
-
-    with open(filepath, encoding="utf-8") as f:
-        return json.load(f)
+    return _load_json_file(filepath, {"paredoes": []})
 
 
 def load_sincerao_edges(filepath: str | Path | None = None) -> dict:
     """Load derived Sincerão edges/aggregates."""
     filepath = Path(filepath) if filepath is not None else Path("data/derived/sincerao_edges.json")
-
-    if not filepath.exists():
-        return {"weeks": [], "edges": [], "aggregates": []}
-
-    with open(filepath, encoding="utf-8") as f:
-        return json.load(f)
+    return _load_json_file(filepath, {"weeks": [], "edges": [], "aggregates": []})
 
 
 def get_poll_for_paredao(polls_data: dict, numero: int) -> dict | None:
@@ -1107,57 +1564,68 @@ def calculate_poll_accuracy(poll_data: dict | None) -> dict | None:
 # Polls compress extremes (organized fanbases dilute frontrunner leads).
 # γ > 1 stretches predictions back toward reality.
 # Validated: LOO MAE 4.00 → 3.56 (−11%), forward-only 4.31 → 3.81 (−12%).
+# calibration_grid_search() re-scores the γ grid on every build (see the methodology text).
 CALIBRATION_GAMMA: float = 1.15
 
+PRECISION_PLATFORMS = ("sites", "youtube", "twitter", "instagram")
 
-def calculate_precision_weights(polls_data: dict) -> dict:
-    """Calculate precision-based platform weights from historical poll accuracy.
+# Settings scored by calibration_grid_search(): the γ exponent, and the power
+# of the inverse-RMSE platform weights (the model uses 2, inverse RMSE²).
+CALIBRATION_GAMMA_GRID = tuple(round(0.5 + 0.01 * i, 2) for i in range(201))
+PRECISION_WEIGHT_POWER_GRID = tuple(0.25 * i for i in range(17))
 
-    Weights are inversely proportional to each platform's RMSE² across
-    all finalized paredões. More accurate platforms get higher weight.
 
-    Args:
-        polls_data: Full polls.json dict with 'paredoes' array.
+def _platform_error_stats(finalized: list[dict]) -> list[dict[str, tuple[float, int]]]:
+    """Per finalized paredão: ``{platform: (sum of squared errors, n pairs)}``.
 
-    Returns:
-        Dict with 'weights', 'rmse', 'n_paredoes', 'sufficient' keys.
+    These are the sufficient statistics of the platform RMSEs: the stats of
+    any set of paredões are the sums of its rows, so backtest folds subtract
+    or accumulate rows instead of re-reading every poll.
     """
-    all_polls = polls_data.get("paredoes", [])
-    finalized = [p for p in all_polls if p.get("resultado_real")]
-
-    platforms = ["sites", "youtube", "twitter", "instagram"]
-
-    if len(finalized) < 2:
-        equal_w = {p: 0.25 for p in platforms}
-        return {"weights": equal_w, "rmse": {}, "n_paredoes": len(finalized), "sufficient": False}
-
-    # Collect (predicted, actual) pairs per platform
-    platform_errors = {p: [] for p in platforms}
+    rows = []
     for poll in finalized:
         resultado = poll["resultado_real"]
         participantes = poll.get("participantes", [])
         plataformas = poll.get("plataformas", {})
-        for plat in platforms:
+        row = {}
+        for plat in PRECISION_PLATFORMS:
             if plat not in plataformas:
                 continue
             pdata = plataformas[plat]
-            for nome in participantes:
-                pred = pdata.get(nome, 0)
-                real = resultado.get(nome, 0)
-                platform_errors[plat].append((pred, real))
+            row[plat] = (
+                sum((pdata.get(nome, 0) - resultado.get(nome, 0)) ** 2 for nome in participantes),
+                len(participantes),
+            )
+        rows.append(row)
+    return rows
+
+
+def _sum_error_stats(rows: list[dict[str, tuple[float, int]]]) -> dict[str, list]:
+    totals = {plat: [0.0, 0] for plat in PRECISION_PLATFORMS}
+    for row in rows:
+        for plat, (sse, n) in row.items():
+            totals[plat][0] += sse
+            totals[plat][1] += n
+    return totals
+
 
-    # Calculate RMSE per platform
+def _precision_from_stats(totals: dict[str, list], n_paredoes: int) -> dict:
+    """``calculate_precision_weights`` result from summed error statistics."""
+    if n_paredoes < 2:
+        equal_w = {p: 0.25 for p in PRECISION_PLATFORMS}
+        return {"weights": equal_w, "rmse": {}, "n_paredoes": n_paredoes, "sufficient": False}
+
+    # RMSE per platform (folds built by subtraction can leave -0.0-ish residue)
     rmse = {}
-    for plat in platforms:
-        pairs = platform_errors[plat]
-        if not pairs:
+    for plat in PRECISION_PLATFORMS:
+        sse, n = totals[plat]
+        if not n:
             continue
-        mse = sum((p - r) ** 2 for p, r in pairs) / len(pairs)
-        rmse[plat] = math.sqrt(mse)
+        rmse[plat] = math.sqrt(max(sse, 0.0) / n)
 
     if not rmse:
-        equal_w = {p: 0.25 for p in platforms}
-        return {"weights": equal_w, "rmse": {}, "n_paredoes": len(finalized), "sufficient": False}
+        equal_w = {p: 0.25 for p in PRECISION_PLATFORMS}
+        return {"weights": equal_w, "rmse": {}, "n_paredoes": n_paredoes, "sufficient": False}
 
     # Inverse-RMSE² weights
     inv_sq = {}
@@ -1173,11 +1641,54 @@ def calculate_precision_weights(polls_data: dict) -> dict:
     return {
         "weights": weights,
         "rmse": {p: round(r, 2) for p, r in rmse.items()},
-        "n_paredoes": len(finalized),
+        "n_paredoes": n_paredoes,
         "sufficient": True,
     }
 
 
+def _precision_folds(finalized: list[dict], forward: bool = False):
+    """Yield ``(held-out index, training error stats, n training paredões)`` per backtest fold.
+
+    Leave-one-out folds subtract the held-out paredão's row from the season
+    totals; forward folds keep running sums of the paredões before it.
+    """
+    rows = _platform_error_stats(finalized)
+    if forward:
+        running = _sum_error_stats(rows[:2])
+        for i in range(2, len(finalized)):
+            yield i, running, i
+            for plat, (sse, n) in rows[i].items():
+                running[plat][0] += sse
+                running[plat][1] += n
+        return
+    totals = _sum_error_stats(rows)
+    for i, row in enumerate(rows):
+        loo = {plat: list(stats) for plat, stats in totals.items()}
+        for plat, (sse, n) in row.items():
+            loo[plat][0] -= sse
+            loo[plat][1] -= n
+        yield i, loo, len(finalized) - 1
+
+
+def calculate_precision_weights(polls_data: dict) -> dict:
+    """Calculate precision-based platform weights from historical poll accuracy.
+
+    Weights are inversely proportional to each platform's RMSE² across
+    all finalized paredões. More accurate platforms get higher weight.
+
+    Args:
+        polls_data: Full polls.json dict with 'paredoes' array.
+
+    Returns:
+        Dict with 'weights', 'rmse', 'n_paredoes', 'sufficient' keys.
+    """
+    all_polls = polls_data.get("paredoes", [])
+    finalized = [p for p in all_polls if p.get("resultado_real")]
+    if len(finalized) < 2:
+        return _precision_from_stats({}, len(finalized))
+    return _precision_from_stats(_sum_error_stats(_platform_error_stats(finalized)), len(finalized))
+
+
 def predict_precision_weighted(
     poll_data: dict,
     precision_result: dict,
@@ -1265,10 +1776,10 @@ def backtest_precision_model(polls_data: dict) -> dict | None:
         return None
 
     results = []
-    for i, target_poll in enumerate(finalized):
-        # Build LOO dataset (all except target)
-        loo_data = {"paredoes": [p for j, p in enumerate(finalized) if j != i]}
-        precision = calculate_precision_weights(loo_data)
+    for i, stats, n_train in _precision_folds(finalized):
+        # Weights from all paredões except the target
+        precision = _precision_from_stats(stats, n_train)
+        target_poll = finalized[i]
 
         # Skip if not enough data for weights
         if not precision.get("sufficient"):
@@ -1357,10 +1868,10 @@ def backtest_forward_only(polls_data: dict) -> dict | None:
         return None
 
     results = []
-    for i in range(2, len(finalized)):
+    for i, stats, n_train in _precision_folds(finalized, forward=True):
+        # Weights from the paredões before the target only
+        precision = _precision_from_stats(stats, n_train)
         target_poll = finalized[i]
-        prior_data = {"paredoes": finalized[:i]}
-        precision = calculate_precision_weights(prior_data)
 
         if not precision.get("sufficient"):
             continue
@@ -1420,6 +1931,90 @@ def backtest_forward_only(polls_data: dict) -> dict | None:
     }
 
 
+def calibration_grid_search(
+    polls_data: dict,
+    gammas: list[float] | tuple[float, ...] = CALIBRATION_GAMMA_GRID,
+    powers: list[float] | tuple[float, ...] = PRECISION_WEIGHT_POWER_GRID,
+    forward: bool = False,
+) -> dict | None:
+    """Backtest MAE of every (γ, weight power) setting in one NumPy pass.
+
+    Platform weights are ``RMSE^-power`` (the model uses power 2) and the
+    blended prediction is raised to ``γ`` and renormalized, as in
+    ``predict_precision_weighted``. Each setting is scored on the same
+    folds as ``backtest_precision_model`` (or ``backtest_forward_only``
+    with ``forward=True``), without the 2-decimal rounding of the published
+    predictions, and γ = 1 is scored as a plain renormalization.
+
+    Returns:
+        Dict with 'gammas', 'powers', 'mae' (len(gammas) × len(powers)),
+        'best' ({'gamma', 'power', 'mae'}) and 'n_paredoes', or None when
+        no fold can be scored.
+    """
+    import numpy as np
+
+    all_polls = polls_data.get("paredoes", [])
+    finalized = [p for p in all_polls if p.get("resultado_real")]
+    if len(finalized) < 3:
+        return None
+
+    # Fold × platform RMSEs (nan: no training data, or fewer than 2 paredões)
+    folds = []
+    for i, stats, n_train in _precision_folds(finalized, forward):
+        folds.append((i, [
+            math.sqrt(max(sse, 0.0) / n) if n and n_train >= 2 else math.nan
+            for sse, n in (stats[plat] for plat in PRECISION_PLATFORMS)
+        ]))
+    n_folds, n_plat = len(folds), len(PRECISION_PLATFORMS)
+    n_max = max((len(finalized[i].get("participantes", [])) for i, _ in folds), default=0)
+    if not n_max:
+        return None
+
+    # The held-out polls, padded to n_max participants
+    rmse = np.array([fold_rmse for _, fold_rmse in folds])
+    votes = np.zeros((n_folds, n_plat, n_max))
+    offered = np.zeros((n_folds, n_plat), dtype=bool)
+    real = np.zeros((n_folds, n_max))
+    member = np.zeros((n_folds, n_max), dtype=bool)
+    for f, (i, _fold_rmse) in enumerate(folds):
+        poll = finalized[i]
+        participantes = poll.get("participantes", [])
+        plataformas = poll.get("plataformas", {})
+        member[f, :len(participantes)] = True
+        real[f, :len(participantes)] = [poll["resultado_real"].get(n, 0) for n in participantes]
+        for k, plat in enumerate(PRECISION_PLATFORMS):
+            if plat in plataformas:
+                offered[f, k] = True
+                votes[f, k, :len(participantes)] = [plataformas[plat].get(n, 0) for n in participantes]
+
+    usable = offered & ~np.isnan(rmse)
+    scored = usable.any(axis=1) & member.any(axis=1)
+    if not scored.any():
+        return None
+
+    gamma_arr = np.asarray(gammas, dtype=float)
+    power_arr = np.asarray(powers, dtype=float)
+    safe = np.where(rmse > 0, rmse, 1.0)
+    # A perfect platform gets weight 1000, as in calculate_precision_weights
+    inv = np.where(rmse > 0, safe[None] ** -power_arr[:, None, None], 1000.0)
+    inv = np.where(usable[None], inv, 0.0)                                  # power × fold × platform
+    weights = inv / np.maximum(inv.sum(axis=2, keepdims=True), 1e-300)
+    blend = np.maximum(np.einsum("pfk,fkm->pfm", weights, votes), 0.01)     # power × fold × participant
+    calibrated = np.where(member, blend[None] ** gamma_arr[:, None, None, None], 0.0)
+    prediction = 100.0 * calibrated / np.maximum(calibrated.sum(axis=3, keepdims=True), 1e-300)
+    fold_mae = (np.abs(prediction - real) * member).sum(axis=3) / np.maximum(member.sum(axis=1), 1)
+    mae = fold_mae[..., scored].mean(axis=2)                                # gamma × power
+
+    g, p = np.unravel_index(np.argmin(mae), mae.shape)
+    return {
+        "gammas": gamma_arr.tolist(),
+        "powers": power_arr.tolist(),
+        "mae": mae.tolist(),
+        "best": {"gamma": float(gamma_arr[g]), "power": float(power_arr[p]), "mae": round(float(mae[g, p]), 2)},
+        "n_paredoes": int(scored.sum()),
+    }
+
+
 def build_precision_methodology_text(polls_data: dict) -> str:
     """Build the methodology explanation with live numbers from the model."""
     prec = calculate_precision_weights(polls_data)
@@ -1461,6 +2056,13 @@ def build_precision_methodology_text(polls_data: dict) -> str:
             "como enquetes comprimem os extremos (fanbases organizadas diluem a liderança), "
             "elevamos cada previsão a γ e renormalizamos. Isso estica as previsões para mais perto da realidade."
         )
+        # Re-fit γ on every build (LOO, model weights 1/RMSE²) and report it next to the fixed value
+        grid = calibration_grid_search(polls_data, powers=(2.0,))
+        if grid:
+            gamma_text += (
+                f" Uma busca em grade de γ ({CALIBRATION_GAMMA_GRID[0]:.2f}–{CALIBRATION_GAMMA_GRID[-1]:.2f}, LOO) "
+                f"indica hoje γ={grid['best']['gamma']:.2f} (MAE {grid['best']['mae']:.2f} p.p.)."
+            )
 
     return (
         "**Como funciona?** O Votalhada pondera as plataformas pelo **volume de votos** — "
@@ -2625,6 +3227,47 @@ def read_json_if_exists(path: Path) -> dict | None:
     return None
 
 
+def _without_stamps(payload: object) -> object:
+    """``payload`` without its ``generated_at`` stamps (top level and ``_metadata``)."""
+    if not isinstance(payload, dict):
+        return payload
+    content = {k: v for k, v in payload.items() if k != "generated_at"}
+    if isinstance(content.get("_metadata"), dict):
+        content["_metadata"] = {k: v for k, v in content["_metadata"].items() if k != "generated_at"}
+    return content
+
+
+def artifact_content_hash(payload: object) -> str:
+    """``stable_json_hash`` of an artifact's content, ignoring its ``generated_at`` stamps."""
+    return stable_json_hash(_without_stamps(payload))
+
+
+def write_json_artifact(path: str | Path, payload: dict | list) -> bool:
+    """Write a derived JSON artifact unless its content is unchanged.
+
+    Content is compared with ``artifact_content_hash`` (sorted keys, no
+    ``generated_at``), so a rebuild that only moves timestamps or reorders
+    keys leaves the file, its mtime and its ``generated_at`` marking the
+    last real change. Otherwise the file is written atomically (temp file
+    + rename). Returns True when the file was written.
+    """
+    path = Path(path)
+    text = json.dumps(payload, indent=2, ensure_ascii=False)
+    try:
+        previous = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        previous = None
+    # Hash the payload as it reads back (int keys become strings, tuples lists)
+    if previous is not None and artifact_content_hash(previous) == artifact_content_hash(json.loads(text)):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    tmp.replace(path)
+    return True
+
+
 def get_daily_snapshots(snapshots: list[dict]) -> list[dict]:
     """Filter snapshot list to one per date (last capture wins).
 
@@ -2640,27 +3283,583 @@ def get_daily_snapshots(snapshots: list[dict]) -> list[dict]:
     return [by_date[d] for d in sorted(by_date.keys())]
 
 
-def get_all_snapshots_with_data(data_dir: str | Path = Path("data/snapshots")) -> list[dict]:
+class SnapshotStore:
+    """Parsed snapshots shared by every builder of one pipeline run.
+
+    ``get_all_snapshots_with_data(store=...)`` fills the store on first use
+    and serves later calls from memory, so each snapshot file is parsed once
+    per run. Builders must treat the snapshot dicts as read-only.
+    With ``use_archive=True`` the store loads through the packed snapshot
+    archive (``load_snapshots_archived``).
+    """
+
+    def __init__(self, data_dir: str | Path = Path("data/snapshots"), use_archive: bool = False) -> None:
+        self.data_dir = Path(data_dir)
+        self.use_archive = use_archive
+        self.snapshots: list[dict] | None = None
+        self.files_parsed = 0
+        self._daily: list[dict] | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.snapshots is not None
+
+    def all(self) -> list[dict]:
+        """Return every capture (loads on first call)."""
+        return get_all_snapshots_with_data(self.data_dir, store=self)
+
+    def daily(self) -> list[dict]:
+        """Return one snapshot per game date (last capture wins)."""
+        if self._daily is None:
+            self._daily = get_daily_snapshots(self.all())
+        return self._daily
+
+    def populate(self, snapshots: list[dict]) -> None:
+        self.snapshots = snapshots
+        self._daily = None
+
+
+def get_all_snapshots_with_data(
+    data_dir: str | Path = Path("data/snapshots"),
+    store: SnapshotStore | None = None,
+    use_archive: bool = False,
+) -> list[dict]:
     """Load all snapshots with participant data (for build scripts).
 
+    When ``store`` is given and already loaded, its snapshots are returned
+    without touching the disk; otherwise the files are parsed and the store
+    (if any) is populated. With ``use_archive`` (or ``store.use_archive``)
+    the packed snapshot archive is read instead, and only JSON files it does
+    not cover yet are parsed (see ``load_snapshots_archived``).
+
     Returns list of dicts: [{"file": str, "date": str, "participants": list, "metadata": dict}]
     """
-    raw = get_all_snapshots(data_dir)
+    if store is not None and store.loaded:
+        return store.snapshots
+    if use_archive or (store is not None and store.use_archive):
+        items, parsed, arrays = _load_snapshots_archived(Path(data_dir))
+        if arrays is not None:
+            REACTION_MATRIX_CACHE.add_archive(items, arrays)
+    else:
+        items = []
+        for fp, date_str in get_all_snapshots(Path(data_dir)):
+            participants, meta = load_snapshot(fp)
+            items.append({
+                "file": str(fp),
+                "date": date_str,
+                "participants": participants,
+                "metadata": meta,
+            })
+        parsed = len(items)
+    if store is not None:
+        store.files_parsed += parsed
+        store.populate(items)
+    return items
+
+
+# ══════════════════════════════════════════════════════════════
+# Packed snapshot archive (data/snapshots.npz)
+# ══════════════════════════════════════════════════════════════
+#
+# One uncompressed .npz per season, rebuilt from data/snapshots/*.json
+# whenever a file is added or changed (it is a local cache — gitignored).
+# Every string (people, avatars, icons, roles, metadata) is interned once
+# into the ``tables`` JSON blob; captures, participants, reaction entries
+# and givers are flat integer columns with offset arrays, so the original
+# participant dicts can be rebuilt exactly (same keys, order and values).
+#
+# ``reactions`` additionally holds one N×N int8 matrix per capture
+# (giver slot × receiver slot → index into ``tables["labels"]``, -1 = none)
+# for vectorized consumers; slots follow participant order in the capture,
+# then givers who are not participants (``tables["reaction_extras"]``).
+# ``reactions_exact[c]`` is False when a participant has no name or shares
+# it with another; only exact captures are served to
+# ``ReactionMatrixCache.codes``.
+
+SNAPSHOT_ARCHIVE_VERSION = 3
+_ARCHIVE_FIELDS = ("job", "group", "memberOf", "roles", "mainRole")
+_ARCHIVE_CHAR_SPECIAL = frozenset(_ARCHIVE_FIELDS) | {"balance", "eliminated", "receivedReactions"}
+_ARCHIVE_COLUMNS = (
+    "cap_offsets", "p_person", "p_layout", "p_char_layout", "p_fields", "p_balance", "p_eliminated",
+    "rx_offsets", "rx_header", "rx_amount", "giver_offsets", "givers",
+)
+
+
+def snapshot_archive_path(data_dir: str | Path = Path("data/snapshots")) -> Path:
+    """Archive location for a snapshots directory (``data/snapshots`` → ``data/snapshots.npz``)."""
+    data_dir = Path(data_dir)
+    return data_dir.with_name(f"{data_dir.name}.npz")
+
+
+def _file_stat(fp: Path) -> tuple[int, int]:
+    st = fp.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def _archive_key(value: Any) -> Any:
+    """Interning key: a tuple for strings/None and flat records of strings, JSON text otherwise."""
+    if type(value) is dict:
+        items = tuple(value.items())
+        if all(v is None or type(v) is str for _k, v in items):
+            return items
+    elif value is None or type(value) is str:
+        return (value,)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _archive_intern(table: tuple[dict, list], value: Any) -> int:
+    index, values = table
+    # Fast probe with the tuple form. Stored tuple keys only ever hold
+    # strings/None, so a probe containing any other type cannot collide.
+    try:
+        idx = index.get(tuple(value.items()) if type(value) is dict else (value,))
+    except TypeError:  # nested lists/dicts
+        idx = None
+    if idx is None:
+        key = _archive_key(value)
+        idx = index.get(key)
+        if idx is None:
+            idx = index[key] = len(values)
+            values.append(value)
+    return idx
+
+
+def pack_snapshots(snapshots: list[dict], file_stats: list[tuple[int, int]], base: dict | None = None) -> dict:
+    """Pack ``get_all_snapshots_with_data``-style dicts into archive arrays.
+
+    ``file_stats`` holds (size, mtime_ns) per snapshot file and is stored so
+    the loader can tell which captures are still current. With ``base`` (the
+    arrays of an existing archive) the snapshots are appended after the
+    captures already in it, and ``file_stats`` covers only the new ones.
+
+    Raises:
+        ValueError: if a participant cannot be represented losslessly
+            (non-int balance or reaction amount, non-bool eliminated).
+    """
+    import numpy as np
+
+    table_names = ("people", "values", "headers", "layouts", "char_layouts")
+    if base is not None:
+        tables = json.loads(base["tables"].tobytes().decode("utf-8"))
+        cols = {key: base[key].tolist() for key in _ARCHIVE_COLUMNS}
+        stats = base["file_stats"].tolist() + [list(st) for st in file_stats]
+        exact = base["reactions_exact"].tolist()
+    else:
+        tables = {
+            "files": [], "dates": [], "metadata": [], "labels": [], "reaction_extras": [],
+            **{name: [] for name in table_names},
+        }
+        cols = {key: [0] if key.endswith("_offsets") else [] for key in _ARCHIVE_COLUMNS}
+        stats = [list(st) for st in file_stats]
+        exact = []
+    interned = {name: ({_archive_key(v): i for i, v in enumerate(tables[name])}, tables[name]) for name in table_names}
+    labels = {label: i for i, label in enumerate(tables["labels"])}
+    people, values, headers = interned["people"], interned["values"], interned["headers"]
+    intern = _archive_intern
+
+    slot_rows: list[list[tuple[int, int, int]]] = []  # per new capture: (giver_slot, receiver_slot, label)
+    for snap in snapshots:
+        participants = snap["participants"]
+        slots = {p.get("name"): i for i, p in enumerate(participants)}
+        cells = []
+        complete = None not in slots and "" not in slots and len(slots) == len(participants)
+        extras: list[str] = []
+        for r_slot, p in enumerate(participants):
+            chars = p.get("characteristics", {})
+            balance, eliminated = chars.get("balance", 0), chars.get("eliminated", False)
+            if type(balance) is not int or type(eliminated) is not bool:
+                raise ValueError(f"Cannot pack participant {p.get('name')!r} in {snap.get('file')}")
+            cols["p_person"].append(intern(people, {k: v for k, v in p.items() if k != "characteristics"}))
+            cols["p_layout"].append(intern(interned["layouts"], list(p.keys())))
+            cols["p_char_layout"].append(intern(interned["char_layouts"], list(chars.keys())))
+            extra = {k: v for k, v in chars.items() if k not in _ARCHIVE_CHAR_SPECIAL}
+            cols["p_fields"].append([intern(values, chars.get(f)) for f in _ARCHIVE_FIELDS] + [intern(values, extra)])
+            cols["p_balance"].append(balance)
+            cols["p_eliminated"].append(eliminated)
+            for rxn in chars.get("receivedReactions", []):
+                if type(rxn.get("amount")) is not int:
+                    raise ValueError(f"Cannot pack reaction amount for {p.get('name')!r} in {snap.get('file')}")
+                cols["rx_header"].append(intern(headers, {**rxn, "amount": None, "participants": None}))
+                cols["rx_amount"].append(rxn["amount"])
+                label = labels.setdefault(rxn.get("label", ""), len(labels))
+                for giver in rxn.get("participants", []):
+                    cols["givers"].append(intern(people, giver))
+                    g_name = giver.get("name")
+                    if g_name:
+                        g_slot = slots.get(g_name)
+                        if g_slot is None:
+                            g_slot = slots[g_name] = len(participants) + len(extras)
+                            extras.append(g_name)
+                        cells.append((g_slot, r_slot, label))
+                cols["giver_offsets"].append(len(cols["givers"]))
+            cols["rx_offsets"].append(len(cols["rx_header"]))
+        slot_rows.append(cells)
+        exact.append(complete)
+        tables["reaction_extras"].append(extras)
+        cols["cap_offsets"].append(len(cols["p_person"]))
+        tables["files"].append(Path(snap["file"]).name)
+        tables["dates"].append(snap["date"])
+        tables["metadata"].append(snap.get("metadata", {}))
+
+    if len(labels) > 127:
+        raise ValueError("Too many reaction labels for int8 codes")
+    tables["labels"] = list(labels)
+    n_caps = len(tables["files"])
+    offsets = cols["cap_offsets"]
+    extras_per_cap = tables["reaction_extras"]
+    n_max = max((offsets[i + 1] - offsets[i] + len(extras_per_cap[i]) for i in range(n_caps)), default=0)
+    reactions = np.full((n_caps, n_max, n_max), -1, dtype=np.int8)
+    n_base = n_caps - len(snapshots)
+    if base is not None and n_base:
+        prev = base["reactions"]
+        reactions[:n_base, :prev.shape[1], :prev.shape[2]] = prev
+    for c, cells in enumerate(slot_rows, start=n_base):
+        for g_slot, r_slot, label in cells:
+            reactions[c, g_slot, r_slot] = label
+
+    dtypes = {"p_balance": np.int64, "rx_amount": np.int64, "p_eliminated": np.bool_}
+    arrays = {
+        key: np.array(col, dtype=np.int64 if key.endswith("_offsets") else dtypes.get(key, np.int32))
+        for key, col in cols.items()
+    }
+    arrays["p_fields"] = arrays["p_fields"].reshape(len(cols["p_person"]), len(_ARCHIVE_FIELDS) + 1)
+    return {
+        "version": np.array(SNAPSHOT_ARCHIVE_VERSION),
+        "tables": np.frombuffer(json.dumps(tables, ensure_ascii=False).encode("utf-8"), dtype=np.uint8),
+        "file_stats": np.array(stats, dtype=np.int64).reshape(n_caps, 2),
+        **arrays,
+        "reactions": reactions,
+        "reactions_exact": np.array(exact, dtype=np.bool_),
+    }
+
+
+def unpack_snapshots(arrays: dict, data_dir: str | Path = Path("data/snapshots"), captures: list[int] | None = None) -> list[dict]:
+    """Rebuild ``get_all_snapshots_with_data``-style dicts from archive arrays.
+
+    Nested values that repeat across captures (roles, metadata, giver
+    records) are shared between the returned dicts — treat them as read-only.
+    """
+    tables = json.loads(arrays["tables"].tobytes().decode("utf-8"))
+    people, values, headers = tables["people"], tables["values"], tables["headers"]
+    layouts, char_layouts = tables["layouts"], tables["char_layouts"]
+    cap_offsets = arrays["cap_offsets"].tolist()
+    p_person = arrays["p_person"].tolist()
+    p_layout = arrays["p_layout"].tolist()
+    p_char_layout = arrays["p_char_layout"].tolist()
+    p_fields = arrays["p_fields"].tolist()
+    p_balance = arrays["p_balance"].tolist()
+    p_eliminated = arrays["p_eliminated"].tolist()
+    rx_offsets = arrays["rx_offsets"].tolist()
+    rx_header = arrays["rx_header"].tolist()
+    rx_amount = arrays["rx_amount"].tolist()
+    giver_offsets = arrays["giver_offsets"].tolist()
+    givers = arrays["givers"].tolist()
+
+    data_dir = Path(data_dir)
+    n_fields = len(_ARCHIVE_FIELDS)
     items = []
-    for fp, date_str in raw:
-        participants, meta = load_snapshot(fp)
+    for c in (range(len(tables["files"])) if captures is None else captures):
+        participants = []
+        for i in range(cap_offsets[c], cap_offsets[c + 1]):
+            fields = p_fields[i]
+            known = dict(zip(_ARCHIVE_FIELDS, (values[f] for f in fields[:n_fields])))
+            extra = values[fields[n_fields]]
+            received = []
+            for e in range(rx_offsets[i], rx_offsets[i + 1]):
+                entry = dict(headers[rx_header[e]])
+                entry["amount"] = rx_amount[e]
+                entry["participants"] = [people[g] for g in givers[giver_offsets[e]:giver_offsets[e + 1]]]
+                received.append(entry)
+            special = {**known, "balance": p_balance[i], "eliminated": p_eliminated[i], "receivedReactions": received}
+            chars = {k: special[k] if k in special else extra[k] for k in char_layouts[p_char_layout[i]]}
+            person = people[p_person[i]]
+            participants.append({k: chars if k == "characteristics" else person[k] for k in layouts[p_layout[i]]})
         items.append({
-            "file": str(fp),
-            "date": date_str,
+            "file": str(data_dir / tables["files"][c]),
+            "date": tables["dates"][c],
             "participants": participants,
-            "metadata": meta,
+            "metadata": tables["metadata"][c],
         })
     return items
 
 
+def read_snapshot_archive(path: str | Path) -> dict | None:
+    """Read archive arrays, or None when missing/unreadable/another version."""
+    import numpy as np
+
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            arrays = {key: npz[key] for key in npz.files}
+    except (OSError, ValueError):
+        return None
+    if int(arrays.get("version", -1)) != SNAPSHOT_ARCHIVE_VERSION:
+        return None
+    return arrays
+
+
+def write_snapshot_archive(
+    path: str | Path,
+    snapshots: list[dict],
+    file_stats: list[tuple[int, int]],
+    base: dict | None = None,
+) -> dict:
+    """Pack and atomically write the archive (temp file + rename); returns the arrays."""
+    import numpy as np
+
+    path = Path(path)
+    arrays = pack_snapshots(snapshots, file_stats, base=base)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    tmp.replace(path)
+    return arrays
+
+
+def _load_snapshots_archived(data_dir: Path) -> tuple[list[dict], int, dict | None]:
+    """Archive-backed load.
+
+    Returns (snapshots, number of JSON files parsed, archive arrays covering
+    every returned snapshot — None when the archive could not be written).
+    """
+    files = get_all_snapshots(data_dir)
+    stats = [_file_stat(fp) for fp, _date in files]
+    archive_path = snapshot_archive_path(data_dir)
+    arrays = read_snapshot_archive(archive_path)
+
+    # Captures are append-only: reuse the longest prefix whose file name,
+    # size and mtime still match the archive.
+    n_archived = n_valid = 0
+    if arrays is not None:
+        archived_files = json.loads(arrays["tables"].tobytes().decode("utf-8"))["files"]
+        archived_stats = arrays["file_stats"].tolist()
+        n_archived = len(archived_files)
+        for (fp, _date), st, name, archived in zip(files, stats, archived_files, archived_stats):
+            if fp.name != name or list(st) != archived:
+                break
+            n_valid += 1
+
+    items = unpack_snapshots(arrays, data_dir, list(range(n_valid))) if n_valid else []
+    if n_valid == n_archived == len(files):
+        return items, 0, arrays
+
+    new_items = []
+    for fp, date_str in files[n_valid:]:
+        participants, meta = load_snapshot(fp)
+        new_items.append({"file": str(fp), "date": date_str, "participants": participants, "metadata": meta})
+    try:
+        if n_valid == n_archived:
+            arrays = write_snapshot_archive(archive_path, new_items, stats[n_valid:], base=arrays)
+        else:
+            arrays = write_snapshot_archive(archive_path, items + new_items, stats)
+    except (OSError, ValueError) as e:
+        print(f"Warning: snapshot archive not written ({e})")
+        arrays = None
+    return items + new_items, len(new_items), arrays
+
+
+def load_snapshots_archived(data_dir: str | Path = Path("data/snapshots")) -> list[dict]:
+    """Load all snapshots through the packed archive, refreshing it if stale.
+
+    Returns the same dicts as ``get_all_snapshots_with_data``. Captures whose
+    file size and mtime match the archive are rebuilt from it; new captures
+    are parsed from JSON and appended to the archive (an edited or removed
+    file triggers a repack from that point).
+    """
+    return _load_snapshots_archived(Path(data_dir))[0]
+
+
+# ══════════════════════════════════════════════════════════════
+# Page bundle (data/derived/_page_bundle.json)
+# ══════════════════════════════════════════════════════════════
+#
+# What the QMD pages read from the raw captures, in one JSON file written by
+# the derived pipeline (a local cache — gitignored). Participants keep their
+# name and characteristics, with reactions cut down to label, amount and
+# giver names (no icons or avatars; avatars live in the ``avatars`` map).
+# Most captures of a day repeat the same records apart from balances, so
+# each distinct record is stored once and captures refer to it by index.
+
+PAGE_BUNDLE_VERSION = 1
+
+
+def page_bundle_path(data_dir: str | Path = Path("data/snapshots")) -> Path:
+    """Bundle location for a snapshots directory (``data/snapshots`` → ``data/derived/_page_bundle.json``)."""
+    return Path(data_dir).parent / "derived" / "_page_bundle.json"
+
+
+def _page_record(participant: dict) -> dict:
+    chars = participant.get("characteristics", {})
+    compact = {k: v for k, v in chars.items() if k not in ("balance", "receivedReactions")}
+    compact["receivedReactions"] = [
+        {
+            "label": rxn.get("label", ""),
+            "amount": rxn.get("amount", 0),
+            "participants": [{"name": g.get("name")} for g in rxn.get("participants", [])],
+        }
+        for rxn in chars.get("receivedReactions", [])
+    ]
+    return {"name": participant.get("name"), "characteristics": compact}
+
+
+def _snapshot_lookups(snapshots: list[dict]) -> tuple[dict[str, str], dict[str, str], dict[str, str]]:
+    """member_of, avatars and late entrants ({name: first_seen_date}) across captures."""
+    member_of: dict[str, str] = {}
+    avatars: dict[str, str] = {}
+    for snap in snapshots:
+        for p in snap['participants']:
+            name = p['name']
+            if name not in member_of:
+                member_of[name] = p.get('characteristics', {}).get('memberOf', '?')
+            if name not in avatars and p.get('avatar'):
+                avatars[name] = p['avatar']
+
+    late_entrants: dict[str, str] = {}
+    if snapshots:
+        seen = {p['name'] for p in snapshots[0]['participants']}
+        for snap in snapshots[1:]:
+            cur = {p['name'] for p in snap['participants']}
+            for name in cur - seen:
+                if name not in late_entrants:
+                    late_entrants[name] = snap['date']
+            seen |= cur
+    return member_of, avatars, late_entrants
+
+
+def _extend_page_bundle(bundle: dict, snapshots: list[dict]) -> dict:
+    """Append ``snapshots`` to ``bundle`` as its next captures (in place)."""
+    member_of, avatars, late_entrants = bundle["member_of"], bundle["avatars"], bundle["late_entrants"]
+    records, captures = bundle["records"], bundle["captures"]
+    # Captures mostly repeat the previous capture's records, so the index
+    # starts from those and covers every record only after a miss
+    previous = captures[-1]["participants"] if captures else []
+    index = {json.dumps(records[idx], ensure_ascii=False): idx for idx, _ in previous}
+    complete = len(index) == len(records)
+    for snap in snapshots:
+        first = not captures
+        rows = []
+        for p in snap["participants"]:
+            name = p["name"]
+            if name not in member_of:
+                # member_of holds every name seen so far, so a new name past the first capture is a late entrant
+                member_of[name] = p.get("characteristics", {}).get("memberOf", "?")
+                if not first:
+                    late_entrants[name] = snap["date"]
+            if name not in avatars and p.get("avatar"):
+                avatars[name] = p["avatar"]
+            record = _page_record(p)
+            key = json.dumps(record, ensure_ascii=False)
+            idx = index.get(key)
+            if idx is None and not complete:
+                index = {json.dumps(r, ensure_ascii=False): i for i, r in enumerate(records)}
+                complete = True
+                idx = index.get(key)
+            if idx is None:
+                idx = index[key] = len(records)
+                records.append(record)
+            rows.append([idx, p.get("characteristics", {}).get("balance", 0)])
+        fp = Path(snap["file"])
+        captures.append({
+            "file": fp.name,
+            "stat": list(_file_stat(fp)),
+            "date": snap["date"],
+            "metadata": snap.get("metadata", {}),
+            "participants": rows,
+        })
+    return bundle
+
+
+def build_page_bundle(snapshots: list[dict]) -> dict:
+    """Bundle ``get_all_snapshots_with_data``-style dicts for ``load_snapshots_full``."""
+    return _extend_page_bundle({
+        "version": PAGE_BUNDLE_VERSION,
+        "member_of": {},
+        "avatars": {},
+        "late_entrants": {},
+        "records": [],
+        "captures": [],
+    }, snapshots)
+
+
+def _saved_page_bundle(path: Path, snapshots: list[dict]) -> dict | None:
+    """The bundle at ``path`` if it covers the first captures of ``snapshots`` (same size and mtime)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            bundle = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if bundle.get("version") != PAGE_BUNDLE_VERSION:
+        return None
+    captures = bundle.get("captures", [])
+    if len(captures) > len(snapshots):
+        return None
+    for cap, snap in zip(captures, snapshots):
+        fp = Path(snap["file"])
+        try:
+            if cap["file"] != fp.name or cap["stat"] != list(_file_stat(fp)):
+                return None
+        except OSError:
+            return None
+    return bundle
+
+
+def write_page_bundle(snapshots: list[dict], path: str | Path, reuse: bool = False) -> None:
+    """Build and atomically write the page bundle (temp file + rename).
+
+    With ``reuse``, a bundle already at ``path`` that covers the first
+    captures of ``snapshots`` is extended with the remaining ones instead
+    of being rebuilt.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    saved = _saved_page_bundle(path, snapshots) if reuse else None
+    if saved is not None:
+        bundle = _extend_page_bundle(saved, snapshots[len(saved["captures"]):])
+    else:
+        bundle = build_page_bundle(snapshots)
+    tmp = path.with_name(f".{path.name}.tmp")
+    # json.dumps (not json.dump) so the whole document goes through the C encoder
+    text = json.dumps(bundle, ensure_ascii=False, separators=(",", ":"))
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    tmp.replace(path)
+
+
+def read_page_bundle(data_dir: str | Path, files: list[tuple[Path, str]] | None = None) -> dict | None:
+    """The bundle for ``data_dir``, or None if missing or not matching the capture files.
+
+    ``files`` is ``get_all_snapshots(data_dir)`` when the caller already has it.
+    The bundle is current only if it covers exactly these files with the same
+    size and mtime.
+    """
+    path = page_bundle_path(data_dir)
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            bundle = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if bundle.get("version") != PAGE_BUNDLE_VERSION:
+        return None
+    if files is None:
+        files = get_all_snapshots(Path(data_dir))
+    captures = bundle.get("captures", [])
+    if len(captures) != len(files):
+        return None
+    for cap, (fp, _date) in zip(captures, files):
+        if cap["file"] != fp.name or cap["stat"] != list(_file_stat(fp)):
+            return None
+    return bundle
+
+
 def load_snapshots_full(data_dir: str | Path = Path("data/snapshots")) -> tuple[list[dict], dict[str, str], dict[str, str], list[dict], dict[str, str]]:
     """Load all snapshots with metadata for QMD pages.
 
+    Served from the page bundle (``build_derived_data.py`` writes it) when it
+    matches the capture files; otherwise every snapshot file is parsed. From
+    the bundle, participants carry name and characteristics only, reactions
+    without icons or giver avatars — use ``avatars`` for pictures.
+
     Returns:
         snapshots: list of dicts with keys: filepath, date, timestamp, participants, metadata, label, synthetic
         member_of: dict {name: group}
@@ -2668,25 +3867,34 @@ def load_snapshots_full(data_dir: str | Path = Path("data/snapshots")) -> tuple[
         daily_snapshots: list (one per date, last capture wins)
         late_entrants: dict {name: first_seen_date}
     """
+    data_dir = Path(data_dir)
     all_files = get_all_snapshots(data_dir)
     snapshots = []
-    member_of = {}
-    avatars = {}
-
-    for fp, date_str in all_files:
-        participants, metadata = load_snapshot(fp)
-        snapshots.append({
-            'filepath': fp, 'date': date_str, 'timestamp': fp.stem,
-            'participants': participants, 'metadata': metadata,
-        })
 
-    for snap in snapshots:
-        for p in snap['participants']:
-            name = p['name']
-            if name not in member_of:
-                member_of[name] = p.get('characteristics', {}).get('memberOf', '?')
-            if name not in avatars and p.get('avatar'):
-                avatars[name] = p['avatar']
+    bundle = read_page_bundle(data_dir, all_files)
+    if bundle is not None:
+        records = bundle["records"]
+        for (fp, _date), cap in zip(all_files, bundle["captures"]):
+            participants = []
+            for idx, balance in cap["participants"]:
+                record = records[idx]
+                participants.append({
+                    "name": record["name"],
+                    "characteristics": {**record["characteristics"], "balance": balance},
+                })
+            snapshots.append({
+                'filepath': fp, 'date': cap["date"], 'timestamp': fp.stem,
+                'participants': participants, 'metadata': cap["metadata"],
+            })
+        member_of, avatars, late_entrants = bundle["member_of"], bundle["avatars"], bundle["late_entrants"]
+    else:
+        for fp, date_str in all_files:
+            participants, metadata = load_snapshot(fp)
+            snapshots.append({
+                'filepath': fp, 'date': date_str, 'timestamp': fp.stem,
+                'participants': participants, 'metadata': metadata,
+            })
+        member_of, avatars, late_entrants = _snapshot_lookups(snapshots)
 
     for snap in snapshots:
         meta = snap.get('metadata') or {}
@@ -2700,21 +3908,27 @@ def load_snapshots_full(data_dir: str | Path = Path("data/snapshots")) -> tuple[
     daily_indices = sorted(by_date.values())
     daily_snapshots = [snapshots[i] for i in daily_indices]
 
-    # Late entrants
-    late_entrants = {}
-    if snapshots:
-        first_names = {p['name'] for p in snapshots[0]['participants']}
-        seen = set(first_names)
-        for snap in snapshots[1:]:
-            cur = {p['name'] for p in snap['participants']}
-            for name in cur - seen:
-                if name not in late_entrants:
-                    late_entrants[name] = snap['date']
-            seen |= cur
-
     return snapshots, member_of, avatars, daily_snapshots, late_entrants
 
 
+def load_capture_matrices(snapshots: list[dict]) -> list[dict[tuple[str, str], str]]:
+    """Reaction matrix for every capture in ``snapshots`` (from ``load_snapshots_full``).
+
+    Uses the precomputed daily matrices in reaction_matrices.json, decoded once
+    per date and shared by that date's captures; dates missing there are built
+    from the capture's participants.
+    """
+    precomputed = ReactionMatrices(load_reaction_matrices())
+    matrices = []
+    for snap in snapshots:
+        date_key = snap.get("date", "")
+        if date_key in precomputed:
+            matrices.append(precomputed.matrix(date_key))
+        else:
+            matrices.append(build_reaction_matrix(snap["participants"]))
+    return matrices
+
+
 # ── Avatar HTML helpers ────────────────────────────────────────────────────────
 
 def avatar_html(name: str, avatars: dict[str, str], size: int = 24, show_name: bool = True, link: str | None = None,
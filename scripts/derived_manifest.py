@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Build manifest for incremental derived-data rebuilds.
+
+The manifest (``data/derived/_build_manifest.json``) records a fingerprint of
+every input the derived pipeline read — each snapshot file plus the manual
+JSON sources — and, per derived artifact, a digest of the inputs it depends
+on. ``plan_rebuild()`` compares the stored manifest with the current inputs
+and tells ``derived_pipeline.build_derived_data(incremental=True)`` how much
+work is needed:
+
+- ``noop``   — nothing changed since the last build.
+- ``light``  — only balance/poll-dependent artifacts are stale (a new capture
+  that changed balances only, or a polls.json edit).
+- ``append`` — new captures changed the game state; per-day artifacts reuse
+  their persisted rows before ``first_changed_date``.
+- ``full``   — manual data changed, snapshots were edited/removed, or there is
+  no usable manifest.
+
+The manifest is a gitignored local cache: a fresh checkout (CI) has none and
+always plans ``full``; ``schedule_data_fetch.py --build`` runs incrementally.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from data_utils import SnapshotStore, get_all_snapshots, load_snapshot, read_json_if_exists
+
+_ROOT = Path(__file__).parent.parent
+SNAPSHOTS_DIR = _ROOT / "data" / "snapshots"
+DERIVED_DIR = _ROOT / "data" / "derived"
+MANIFEST_FILE = DERIVED_DIR / "_build_manifest.json"
+
+# Bump when a builder change makes previously persisted artifacts unusable
+# as an incremental base (forces the next --incremental run to go full).
+MANIFEST_VERSION = 1
+
+MANUAL_INPUTS: dict[str, Path] = {
+    "manual_events": _ROOT / "data" / "manual_events.json",
+    "paredoes": _ROOT / "data" / "paredoes.json",
+    "provas": _ROOT / "data" / "provas.json",
+    "polls": _ROOT / "data" / "votalhada" / "polls.json",
+}
+
+# Manual files that feed cycle boundaries and game events — nearly every
+# artifact depends on them.
+CORE_INPUTS = ("manual_events", "paredoes", "provas")
+
+# Snapshot scopes an artifact can depend on:
+#   state       — game state per capture (everything except balances)
+#   daily_files — which capture file represents each game date
+#   captures    — every capture byte-for-byte (balances included)
+_CORE = {"inputs": CORE_INPUTS, "snapshots": "state"}
+ARTIFACT_DEPENDENCIES: dict[str, dict[str, Any]] = {
+    "participants_index.json": _CORE,
+    "roles_daily.json": _CORE,
+    "auto_events.json": _CORE,
+    "daily_metrics.json": _CORE,
+    "eliminations_detected.json": _CORE,
+    "sincerao_edges.json": {"inputs": ("manual_events",), "snapshots": None},
+    "plant_index.json": _CORE,
+    "relations_scores.json": _CORE,
+    "prova_rankings.json": _CORE,
+    "game_timeline.json": _CORE,
+    "clusters_data.json": _CORE,
+    "cluster_evolution.json": _CORE,
+    "vote_prediction.json": _CORE,
+    "paredao_analysis.json": _CORE,
+    "paredao_badges.json": _CORE,
+    "validation.json": _CORE,
+    "cartola_data.json": _CORE,
+    "reaction_matrices.json": _CORE,
+    "snapshots_index.json": {"inputs": CORE_INPUTS, "snapshots": "daily_files"},
+    "balance_events.json": {"inputs": CORE_INPUTS, "snapshots": "captures"},
+    "index_data.json": {"inputs": CORE_INPUTS + ("polls",), "snapshots": "captures"},
+    "paredao_exposure_stats.json": {"inputs": CORE_INPUTS + ("polls",), "snapshots": "captures"},
+}
+
+# Artifacts the pipeline can rebuild on their own without re-running the
+# relations/cluster/paredão stages.
+LIGHT_ARTIFACTS = frozenset({
+    "snapshots_index.json",
+    "balance_events.json",
+    "index_data.json",
+    "paredao_exposure_stats.json",
+})
+
+
+def file_digest(path: Path) -> str:
+    """SHA-1 of the file bytes ('' when the file is missing)."""
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return ""
+
+
+def snapshot_state_hash(participants: list[dict]) -> str:
+    """Hash of a capture's game state, ignoring balances."""
+    state = []
+    for p in participants:
+        chars = {k: v for k, v in (p.get("characteristics") or {}).items() if k != "balance"}
+        state.append({**p, "characteristics": chars})
+    payload = json.dumps(state, sort_keys=True, ensure_ascii=False).encode()
+    return hashlib.sha1(payload).hexdigest()
+
+
+def fingerprint_inputs(
+    previous: dict | None = None,
+    snapshots_dir: Path = SNAPSHOTS_DIR,
+    manual_inputs: dict[str, Path] | None = None,
+    store: SnapshotStore | None = None,
+) -> dict[str, Any]:
+    """Fingerprint snapshot files and manual inputs.
+
+    Snapshot files are hashed byte-wise; only files whose hash is not in the
+    previous manifest are parsed to compute their state hash (taken from
+    ``store`` when it is already loaded).
+    """
+    known = (previous or {}).get("snapshots", {})
+    parsed = {}
+    if store is not None and store.loaded:
+        parsed = {Path(s["file"]).name: s["participants"] for s in store.snapshots}
+    snapshots: dict[str, dict[str, str]] = {}
+    for fp, date_str in get_all_snapshots(Path(snapshots_dir)):
+        sha = file_digest(fp)
+        prev = known.get(fp.name)
+        if prev and prev.get("sha1") == sha and prev.get("date") == date_str:
+            snapshots[fp.name] = prev
+            continue
+        participants = parsed.get(fp.name)
+        if participants is None:
+            participants, _meta = load_snapshot(fp)
+        snapshots[fp.name] = {"sha1": sha, "date": date_str, "state": snapshot_state_hash(participants)}
+
+    inputs = {key: file_digest(path) for key, path in (manual_inputs or MANUAL_INPUTS).items()}
+    return {"inputs": inputs, "snapshots": snapshots}
+
+
+def _daily_state(snapshots: dict[str, dict]) -> dict[str, str]:
+    """game date → state hash of the capture that represents it (last wins)."""
+    by_date: dict[str, str] = {}
+    for name in sorted(snapshots):
+        entry = snapshots[name]
+        by_date[entry["date"]] = entry["state"]
+    return by_date
+
+
+def _scope_digest(scope: str | None, snapshots: dict[str, dict]) -> str:
+    if scope is None:
+        return ""
+    names = sorted(snapshots)
+    if scope == "captures":
+        items: list = [(n, snapshots[n]["sha1"]) for n in names]
+    elif scope == "daily_files":
+        last_by_date = {snapshots[n]["date"]: n for n in names}
+        items = sorted(last_by_date.items())
+    elif scope == "state":
+        # Consecutive duplicates collapse: a capture that repeats the previous
+        # state on the same game date leaves state-derived artifacts untouched.
+        items = []
+        for n in names:
+            item = (snapshots[n]["date"], snapshots[n]["state"])
+            if not items or items[-1] != item:
+                items.append(item)
+    else:
+        raise ValueError(f"Unknown snapshot scope: {scope}")
+    return hashlib.sha1(json.dumps(items).encode()).hexdigest()
+
+
+def artifact_digests(fingerprint: dict[str, Any]) -> dict[str, str]:
+    """Digest of the inputs each artifact depends on."""
+    digests = {}
+    for artifact, deps in ARTIFACT_DEPENDENCIES.items():
+        parts = [fingerprint["inputs"].get(key, "") for key in deps["inputs"]]
+        parts.append(_scope_digest(deps["snapshots"], fingerprint["snapshots"]))
+        digests[artifact] = hashlib.sha1("|".join(parts).encode()).hexdigest()
+    return digests
+
+
+def plan_rebuild(previous: dict | None, fingerprint: dict[str, Any], derived_dir: Path = DERIVED_DIR) -> dict[str, Any]:
+    """Decide how much of the pipeline an incremental run must redo."""
+    def full(reason: str) -> dict[str, Any]:
+        return {"mode": "full", "stale": sorted(ARTIFACT_DEPENDENCIES), "first_changed_date": None, "reason": reason}
+
+    if not previous or previous.get("_metadata", {}).get("version") != MANIFEST_VERSION:
+        return full("no compatible manifest")
+
+    current = artifact_digests(fingerprint)
+    recorded = previous.get("artifacts", {})
+    stale = sorted(a for a, digest in current.items() if recorded.get(a) != digest)
+    missing = sorted(a for a in ARTIFACT_DEPENDENCIES if a not in stale and not (derived_dir / a).exists())
+    if missing:
+        return full(f"missing artifacts: {', '.join(missing)}")
+    if not stale:
+        return {"mode": "noop", "stale": [], "first_changed_date": None, "reason": "inputs unchanged"}
+
+    prev_inputs = previous.get("inputs", {})
+    changed_core = [k for k in CORE_INPUTS if prev_inputs.get(k) != fingerprint["inputs"].get(k)]
+    if changed_core:
+        return full(f"manual inputs changed: {', '.join(changed_core)}")
+
+    prev_snaps = previous.get("snapshots", {})
+    curr_snaps = fingerprint["snapshots"]
+    for name, entry in prev_snaps.items():
+        if curr_snaps.get(name, {}).get("sha1") != entry.get("sha1"):
+            return full(f"snapshot edited or removed: {name}")
+    new_files = sorted(set(curr_snaps) - set(prev_snaps))
+    if prev_snaps and new_files and new_files[0] < max(prev_snaps):
+        return full(f"snapshot inserted before the latest capture: {new_files[0]}")
+
+    if set(stale) <= LIGHT_ARTIFACTS:
+        return {"mode": "light", "stale": stale, "first_changed_date": None,
+                "reason": "only balance/poll-dependent artifacts changed"}
+
+    prev_daily = _daily_state(prev_snaps)
+    curr_daily = _daily_state(curr_snaps)
+    changed_dates = sorted(d for d, state in curr_daily.items() if prev_daily.get(d) != state)
+    return {
+        "mode": "append",
+        "stale": stale,
+        "first_changed_date": changed_dates[0] if changed_dates else None,
+        "reason": f"{len(new_files)} new capture(s)",
+    }
+
+
+def reusable_prefix(rows: list[dict], expected_dates: list[str], first_changed_date: str | None) -> list[dict] | None:
+    """Persisted per-day rows dated before ``first_changed_date``.
+
+    Returns None when the kept rows do not line up one-to-one with
+    ``expected_dates`` (the caller then recomputes the whole section).
+    """
+    def before(date: str) -> bool:
+        return first_changed_date is None or date < first_changed_date
+
+    kept = [row for row in rows if before(row.get("date", ""))]
+    if [row.get("date") for row in kept] != [d for d in expected_dates if before(d)]:
+        return None
+    return kept
+
+
+def load_manifest(path: Path = MANIFEST_FILE) -> dict | None:
+    try:
+        return read_json_if_exists(path)
+    except json.JSONDecodeError:
+        return None
+
+
+def _content(manifest: dict) -> dict:
+    meta = {k: v for k, v in manifest.get("_metadata", {}).items() if k not in ("generated_at", "mode")}
+    return {**manifest, "_metadata": meta}
+
+
+def write_manifest(fingerprint: dict[str, Any], mode: str, path: Path = MANIFEST_FILE) -> bool:
+    """Write the manifest unless its content is unchanged. Returns True if written."""
+    manifest = build_manifest(fingerprint, mode)
+    previous = load_manifest(path)
+    if previous is not None and _content(previous) == _content(manifest):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return True
+
+
+def build_manifest(fingerprint: dict[str, Any], mode: str) -> dict[str, Any]:
+    return {
+        "_metadata": {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "version": MANIFEST_VERSION,
+            "mode": mode,
+        },
+        "inputs": fingerprint["inputs"],
+        "artifacts": artifact_digests(fingerprint),
+        "dependencies": {
+            a: {"inputs": list(d["inputs"]), "snapshots": d["snapshots"]}
+            for a, d in ARTIFACT_DEPENDENCIES.items()
+        },
+        "snapshots": fingerprint["snapshots"],
+    }
@@ -7,7 +7,10 @@ Domain logic lives in scripts/builders/ — this file is the orchestrator.
 """
 from __future__ import annotations
 
+import argparse
 import json
+import time
+import tracemalloc
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -16,13 +19,23 @@ import re
 
 from data_utils import (
     SENTIMENT_WEIGHTS, POSITIVE,
-    build_reaction_matrix, get_cycle_number,
+    build_reaction_matrix, get_reaction_matrix, clear_reaction_matrix_cache, CycleCalendar, get_cycle_calendar,
     get_daily_snapshots,
+    SnapshotStore,
     normalize_route_label,
     stable_json_hash,
     read_json_if_exists,
+    write_page_bundle,
+    ReactionMatrices, encode_reaction_matrices,
+    write_json_artifact,
 )
 from schemas import validate_input_files
+from derived_manifest import fingerprint_inputs, load_manifest, plan_rebuild, reusable_prefix, write_manifest
+from pipeline_dag import Stage, StageGraph, format_critical_path_report
+from pipeline_profile import (
+    PROFILE_BASIC, PROFILE_FILE, PROFILE_MEMORY, PROFILE_OFF,
+    collect_sections, format_profile_table, start_sections, write_profile,
+)
 
 # Re-export everything from builders for backwards compatibility
 # (tests and other scripts may import from build_derived_data directly)
@@ -70,13 +83,20 @@ from builders import (  # noqa: F401 — re-exports
     build_balance_events,
 )
 
-from builders.relations import get_all_snapshots  # noqa: F401
+from builders.balance import BalanceSeries, load_balance_series, save_balance_series
+from builders.relations import eliminated_last_seen_map, get_all_snapshots  # noqa: F401
+from builders.streak_state import StreakState, load_streak_state, save_streak_state
 
 # ── Path constants ──────────────────────────────────────────────────────────
 
 DATA_DIR = Path(__file__).parent.parent / "data" / "snapshots"
 MANUAL_EVENTS_FILE = Path(__file__).parent.parent / "data" / "manual_events.json"
 DERIVED_DIR = Path(__file__).parent.parent / "data" / "derived"
+PAGE_BUNDLE_FILE = DERIVED_DIR / "_page_bundle.json"
+STREAK_STATE_FILE = DERIVED_DIR / "_streak_state.json"
+BALANCE_SERIES_FILE = DERIVED_DIR / "_balance_series.json"
+INDEX_SECTIONS_FILE = DERIVED_DIR / "_index_sections.pkl"
+ARTIFACT_CHANGES_FILE = DERIVED_DIR / "_artifact_changes.json"
 PAREDOES_FILE = Path(__file__).parent.parent / "data" / "paredoes.json"
 PROVAS_FILE = Path(__file__).parent.parent / "data" / "provas.json"
 DOCS_SCORING_FILE = Path(__file__).parent.parent / "docs" / "SCORING_AND_INDEXES.md"
@@ -87,10 +107,9 @@ _MARKER_END = "<!-- PAREDAO_EXPOSURE:END -->"
 
 # ── Small utilities (not worth a separate module) ───────────────────────────
 
-def write_json(path: Path, payload: dict | list) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2, ensure_ascii=False)
+def write_json(path: Path, payload: dict | list) -> bool:
+    """Hash-gated atomic artifact write (see ``write_json_artifact``); True when the file changed."""
+    return write_json_artifact(path, payload)
 
 
 # ── Paredão exposure docs renderer + updater ─────────────────────────────
@@ -221,12 +240,14 @@ def render_paredao_exposure_docs_markdown(stats: dict, paredoes_list: list[dict]
 def update_paredao_docs_section(
     stats: dict,
     paredoes_list: list[dict],
-    doc_path: Path = DOCS_SCORING_FILE,
+    doc_path: Path | None = None,
 ) -> bool:
     """Update the managed marker section in the scoring docs file.
 
     Returns True if the file was written (content changed or markers were missing).
     """
+    if doc_path is None:
+        doc_path = DOCS_SCORING_FILE
     new_block = render_paredao_exposure_docs_markdown(stats, paredoes_list)
     marker_block = f"{_MARKER_START}\n{new_block}\n{_MARKER_END}"
 
@@ -272,7 +293,9 @@ def update_paredao_docs_section(
     return True
 
 
-def build_snapshots_manifest(daily_snapshots: list[dict], daily_metrics: list[dict]) -> dict:
+def build_snapshots_manifest(daily_snapshots: list[dict], daily_metrics: list[dict],
+                             calendar: CycleCalendar | None = None) -> dict:
+    calendar = calendar or get_cycle_calendar()
     repo_root = Path(__file__).parent.parent.resolve()
     metrics_dates = {d.get("date") for d in daily_metrics if d.get("date")}
     items = []
@@ -291,7 +314,7 @@ def build_snapshots_manifest(daily_snapshots: list[dict], daily_metrics: list[di
             "label": format_date_label(date),
             "file": rel_path,
             "participants": len(snap.get("participants", [])),
-            "cycle": get_cycle_number(date),
+            "cycle": calendar.cycle(date),
             "has_metrics": date in metrics_dates,
         })
     items = sorted(items, key=lambda x: x["date"])
@@ -329,7 +352,7 @@ def build_reaction_matrices(daily_snapshots: list[dict]) -> dict:
     by_date: dict[str, dict[str, str]] = {}
     for snap in daily_snapshots:
         date_str = snap["date"]
-        matrix = build_reaction_matrix(snap["participants"])
+        matrix = get_reaction_matrix(snap)
         serialized = {}
         for (giver, receiver), label in matrix.items():
             serialized[f"{giver}|{receiver}"] = label
@@ -340,48 +363,196 @@ def build_reaction_matrices(daily_snapshots: list[dict]) -> dict:
     }
 
 
-# ── Main pipeline ───────────────────────────────────────────────────────────
+def build_daily_sections(daily_snapshots: list[dict], plan: dict | None = None) -> tuple[dict, dict]:
+    """Per-day sections of daily_metrics.json plus the reaction matrices.
 
-def build_derived_data() -> None:
-    validate_input_files()
-    snapshots = get_all_snapshots()
-    if not snapshots:
-        print("No snapshots found. Skipping derived data.")
-        return
+    With an ``append`` plan, rows dated before ``plan["first_changed_date"]``
+    are reused from the persisted artifacts and only the remaining days are
+    recomputed. Any mismatch between the persisted rows and the current daily
+    snapshots falls back to a full recompute of that artifact.
+    """
+    dates = [snap["date"] for snap in daily_snapshots]
+    cutoff = plan.get("first_changed_date") if plan else None
+    prev_metrics = read_json_if_exists(DERIVED_DIR / "daily_metrics.json") if plan else None
+    prev_matrices = read_json_if_exists(DERIVED_DIR / "reaction_matrices.json") if plan else None
+
+    kept = None
+    if plan and plan["mode"] == "append" and prev_metrics:
+        kept = {
+            "daily": reusable_prefix(prev_metrics.get("daily", []), dates, cutoff),
+            "daily_changes": reusable_prefix(prev_metrics.get("daily_changes", []), dates[1:], cutoff),
+            "hostility_counts": reusable_prefix(prev_metrics.get("hostility_counts", []), dates, cutoff),
+            "vulnerability_history": reusable_prefix(prev_metrics.get("vulnerability_history", []), dates, cutoff),
+        }
+        if any(rows is None for rows in kept.values()):
+            kept = None
+
+    if kept is None:
+        sections = {
+            "daily": build_daily_metrics(daily_snapshots),
+            "daily_changes": build_daily_changes_summary(daily_snapshots),
+            "hostility_counts": build_hostility_daily_counts(daily_snapshots),
+            "vulnerability_history": build_vulnerability_history(daily_snapshots),
+        }
+    else:
+        n_keep = len(kept["daily"])
+        tail = daily_snapshots[n_keep:]
+        # The latest-day streak-break annotation is re-applied after relations run
+        for row in kept["daily_changes"]:
+            row.pop("new_streak_breaks", None)
+        sections = {
+            "daily": kept["daily"] + build_daily_metrics(tail),
+            "daily_changes": kept["daily_changes"] + build_daily_changes_summary(daily_snapshots[max(n_keep - 1, 0):]),
+            "hostility_counts": kept["hostility_counts"] + build_hostility_daily_counts(tail),
+            "vulnerability_history": kept["vulnerability_history"] + build_vulnerability_history(tail),
+        }
+
+    kept_matrices = None
+    if plan and plan["mode"] == "append" and prev_matrices:
+        persisted = ReactionMatrices(prev_matrices)
+        kept_dates = reusable_prefix([{"date": d} for d in persisted.dates], dates, cutoff)
+        if kept_dates is not None:
+            kept_matrices = {row["date"]: persisted.serialized(row["date"]) for row in kept_dates}
+
+    if kept_matrices is None:
+        reaction_matrices = build_reaction_matrices(daily_snapshots)
+    else:
+        fresh = build_reaction_matrices(daily_snapshots[len(kept_matrices):])
+        by_date = {**kept_matrices, **fresh["by_date"]}
+        reaction_matrices = {"by_date": by_date, "all_dates": sorted(by_date.keys())}
+
+    return sections, reaction_matrices
+
+
+def _write_index_outputs(
+    store: SnapshotStore, paredoes: dict, now: str, calendar: CycleCalendar | None = None,
+) -> dict[str, bool]:
+    """Build index_data.json, the hash-gated exposure stats and the docs section.
+
+    Returns ``{artifact: changed}`` for the files it considered.
+    """
+    from build_index_data import build_index_data
+    index_payload = build_index_data(store=store, calendar=calendar, section_cache=INDEX_SECTIONS_FILE)
+    if not index_payload:
+        return {}
+    changes = {"index_data.json": write_json(DERIVED_DIR / "index_data.json", index_payload)}
+
+    # Extract exposure stats (already computed by build_index_data)
+    exposure_stats = (index_payload.get("paredao_exposure") or {}).get("stats")
+    if not exposure_stats:
+        raise RuntimeError("Missing paredao_exposure.stats in index payload")
+
+    # Hash-gate JSON write — no churn when stats unchanged.
+    # generated_at intentionally stays stale when content is unchanged,
+    # since it represents when the content last changed, not when the pipeline ran.
+    stats_path = DERIVED_DIR / "paredao_exposure_stats.json"
+    content_hash = stable_json_hash(exposure_stats)
+    prev = read_json_if_exists(stats_path)
+    prev_hash = (prev or {}).get("_metadata", {}).get("content_hash")
+    changes["paredao_exposure_stats.json"] = content_hash != prev_hash
+    if content_hash != prev_hash:
+        write_json(stats_path, {
+            "_metadata": {"generated_at": now, "content_hash": content_hash},
+            "stats": exposure_stats,
+        })
 
-    daily_snapshots = get_daily_snapshots(snapshots)
+    # Always run docs updater (content-compared, self-healing)
+    paredoes_list = (paredoes or {}).get("paredoes", []) if isinstance(paredoes, dict) else (paredoes or [])
+    update_paredao_docs_section(exposure_stats, paredoes_list)
+    return changes
 
-    manual_events: dict[str, Any] = {}
-    if MANUAL_EVENTS_FILE.exists():
-        with open(MANUAL_EVENTS_FILE, encoding="utf-8") as f:
-            manual_events = json.load(f)
 
-    participants_index = build_participants_index(snapshots, manual_events)
-    daily_roles = build_daily_roles(daily_snapshots)
-    auto_events = build_auto_events(daily_roles)
-    auto_events = apply_big_fone_context(auto_events, manual_events)
-    daily_metrics = build_daily_metrics(daily_snapshots)
-    daily_changes_summary = build_daily_changes_summary(daily_snapshots)
-    hostility_daily_counts = build_hostility_daily_counts(daily_snapshots)
-    vulnerability_history = build_vulnerability_history(daily_snapshots)
-    snapshots_manifest = build_snapshots_manifest(daily_snapshots, daily_metrics)
-    eliminations_detected = detect_eliminations(daily_snapshots)
-    warnings = validate_manual_events(participants_index, manual_events)
-    sincerao_edges = build_sincerao_edges(manual_events)
-    paredoes: dict[str, Any] = {}
-    if PAREDOES_FILE.exists():
-        with open(PAREDOES_FILE, encoding="utf-8") as f:
-            paredoes = json.load(f)
-    # Build prova rankings
-    provas_data: dict[str, Any] = {}
-    if PROVAS_FILE.exists():
-        with open(PROVAS_FILE, encoding="utf-8") as f:
-            provas_data = json.load(f)
+def _build_light(store: SnapshotStore, stale: list[str]) -> dict[str, bool]:
+    """Rebuild only the balance/poll-dependent artifacts.
+
+    Used by ``--incremental`` when manual inputs and the game state are
+    unchanged (e.g. a capture that only moved balances, or a polls.json edit):
+    every other artifact on disk is still current. Returns ``{artifact: changed}``.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    paredoes = read_json_if_exists(PAREDOES_FILE) or {}
+    changes: dict[str, bool] = {}
+
+    if "snapshots_index.json" in stale:
+        prev_metrics = read_json_if_exists(DERIVED_DIR / "daily_metrics.json") or {}
+        changes["snapshots_index.json"] = write_json(DERIVED_DIR / "snapshots_index.json", {
+            "_metadata": {"generated_at": now, "source": "snapshots+daily_metrics"},
+            **build_snapshots_manifest(store.daily(), prev_metrics.get("daily", [])),
+        })
+    # The saved balance series and page bundle only take the new captures
+    snapshots = store.all()
+    if "balance_events.json" in stale:
+        series = _update_balance_series(snapshots)
+        changes["balance_events.json"] = write_json(DERIVED_DIR / "balance_events.json",
+                                                    build_balance_events(snapshots, series=series))
+    write_page_bundle(snapshots, PAGE_BUNDLE_FILE, reuse=True)
+    if "index_data.json" in stale or "paredao_exposure_stats.json" in stale:
+        changes.update(_write_index_outputs(store, paredoes, now))
+    return changes
+
+
+# ── Pipeline stages ─────────────────────────────────────────────────────────
+#
+# build_derived_data() runs these as a DAG (see pipeline_dag.py). Compute
+# stages only return values, so they can run in a process pool; the artifact
+# writes happen in the local "write" stage, after schema validation passed.
+
+
+def _validate_inputs(plan: dict | None) -> None:
+    # Manual inputs are unchanged in the append mode — already validated.
+    if plan is None:
+        validate_input_files()
+
+
+def _build_auto_events(daily_roles: list[dict], manual_events: dict, calendar: CycleCalendar) -> list[dict]:
+    return apply_big_fone_context(build_auto_events(daily_roles, calendar), manual_events)
+
+
+def _update_streak_state(daily_snapshots: list[dict], participants_index: list[dict],
+                         verify_streaks: bool = False) -> StreakState:
+    """Advance the saved streak state to the latest day and save it again.
+
+    The saved state stops one day short of the latest: later captures can
+    still replace the latest game date's snapshot, which would invalidate a
+    state that covered it.
+    """
+    last_seen = eliminated_last_seen_map(participants_index)
+    saved = load_streak_state(STREAK_STATE_FILE) or StreakState()
+    checkpoint = saved.resumed(daily_snapshots[:-1], last_seen)
+    save_streak_state(checkpoint, STREAK_STATE_FILE)
+    if verify_streaks:
+        _verify_streaks(daily_snapshots, last_seen, checkpoint)
+    return checkpoint.resumed(daily_snapshots, last_seen)
+
+
+def _update_balance_series(snapshots: list[dict]) -> BalanceSeries:
+    """Extend the saved balance series with the new captures and save it again."""
+    series = (load_balance_series(BALANCE_SERIES_FILE) or BalanceSeries()).resumed(snapshots)
+    save_balance_series(series, BALANCE_SERIES_FILE)
+    return series
+
+
+def _verify_streaks(daily_snapshots: list[dict], last_seen: dict[str, str | None], state: StreakState) -> None:
+    """Fail unless the incremental streak result equals the full recompute."""
+    full = compute_streak_data(daily_snapshots, last_seen)
+    resumed = compute_streak_data(daily_snapshots, last_seen, state=state)
+    if resumed != full:
+        info_full, info_resumed = full[0], resumed[0]
+        pairs = sorted(
+            (actor, target)
+            for actor in info_full.keys() | info_resumed.keys()
+            for target in info_full.get(actor, {}).keys() | info_resumed.get(actor, {}).keys()
+            if info_full.get(actor, {}).get(target) != info_resumed.get(actor, {}).get(target)
+        )
+        sample = ", ".join(f"{actor}->{target}" for actor, target in pairs[:5]) or "breaks/Raio-X log"
+        raise RuntimeError(f"Incremental streak state disagrees with the full recompute: {sample}")
+    print(f"Streak state verified ({len(state.days)} saved days, {sum(map(len, full[0].values()))} pairs)")
 
-    prova_rankings = build_prova_rankings(provas_data, participants_index)
 
-    plant_index = build_plant_index(daily_snapshots, manual_events, auto_events, sincerao_edges, paredoes)
-    relations_scores = build_relations_scores(
+def _build_relations(daily_snapshots: list[dict], manual_events: dict, auto_events: list[dict],
+                     sincerao_edges: dict, paredoes: dict, daily_roles: list[dict],
+                     participants_index: list[dict], calendar: CycleCalendar, streak_state: StreakState) -> dict:
+    return build_relations_scores(
         daily_snapshots[-1],
         daily_snapshots,
         manual_events,
@@ -390,28 +561,24 @@ def build_derived_data() -> None:
         paredoes,
         daily_roles,
         participants_index=participants_index,
+        calendar=calendar,
+        streak_state=streak_state,
     )
 
-    now = datetime.now(timezone.utc).isoformat()
 
-    write_json(DERIVED_DIR / "participants_index.json", {
-        "_metadata": {"generated_at": now, "source": "snapshots+manual_events"},
-        "participants": participants_index,
-    })
+def _build_game_timeline(eliminations_detected: list[dict], auto_events: list[dict], manual_events: dict,
+                         paredoes: dict, provas_data: dict, calendar: CycleCalendar) -> list[dict]:
+    return build_game_timeline(eliminations_detected, auto_events, manual_events, paredoes, provas_data,
+                               calendar=calendar)
 
-    write_json(DERIVED_DIR / "roles_daily.json", {
-        "_metadata": {"generated_at": now, "source": "snapshots"},
-        "daily": daily_roles,
-    })
 
-    power_summary = build_power_summary(manual_events, auto_events)
-    write_json(DERIVED_DIR / "auto_events.json", {
-        "_metadata": {"generated_at": now, "source": "roles_daily"},
-        "events": auto_events,
-        "power_summary": power_summary,
-    })
+def _build_snapshots_manifest(daily_snapshots: list[dict], daily_sections: dict, calendar: CycleCalendar) -> dict:
+    return build_snapshots_manifest(daily_snapshots, daily_sections["daily"], calendar)
+
 
-    impact_history = build_impact_history(relations_scores)
+def _build_daily_metrics(daily_sections: dict, relations_scores: dict) -> dict:
+    """daily_metrics.json sections plus impact history and today's streak breaks."""
+    daily_changes_summary = daily_sections["daily_changes"]
 
     # Cross-reference streak breaks with today's pair changes
     streak_breaks = relations_scores.get("streak_breaks", [])
@@ -435,133 +602,371 @@ def build_derived_data() -> None:
                 })
         latest_dc["new_streak_breaks"] = new_streak_breaks
 
-    write_json(DERIVED_DIR / "daily_metrics.json", {
-        "_metadata": {"generated_at": now, "source": "snapshots", "sentiment_weights": SENTIMENT_WEIGHTS},
-        "daily": daily_metrics,
+    return {
+        "daily": daily_sections["daily"],
         "daily_changes": daily_changes_summary,
-        "hostility_counts": hostility_daily_counts,
-        "vulnerability_history": vulnerability_history,
-        "impact_history": impact_history,
-    })
+        "hostility_counts": daily_sections["hostility_counts"],
+        "vulnerability_history": daily_sections["vulnerability_history"],
+        "impact_history": build_impact_history(relations_scores),
+    }
+
+
+def _write_artifacts(
+    now: str,
+    participants_index: list[dict],
+    daily_roles: list[dict],
+    auto_events: list[dict],
+    power_summary: dict,
+    daily_metrics: dict,
+    snapshots_manifest: dict,
+    eliminations_detected: list[dict],
+    sincerao_edges: dict,
+    plant_index: dict,
+    relations_scores: dict,
+    prova_rankings: dict,
+    game_timeline: list[dict],
+    clusters_data: dict | None,
+    cluster_evolution: dict | None,
+    vote_prediction: dict,
+    paredao_analysis: dict,
+    paredao_badges: dict,
+    warnings: list[dict],
+    cartola_data: dict,
+    reaction_matrices: dict,
+    balance_events: dict,
+) -> dict[str, bool]:
+    """Write every pipeline artifact; returns ``{artifact: changed}``."""
+    files: dict[str, dict | list] = {}
+    files["participants_index.json"] = {
+        "_metadata": {"generated_at": now, "source": "snapshots+manual_events"},
+        "participants": participants_index,
+    }
+
+    files["roles_daily.json"] = {
+        "_metadata": {"generated_at": now, "source": "snapshots"},
+        "daily": daily_roles,
+    }
+
+    files["auto_events.json"] = {
+        "_metadata": {"generated_at": now, "source": "roles_daily"},
+        "events": auto_events,
+        "power_summary": power_summary,
+    }
+
+    files["daily_metrics.json"] = {
+        "_metadata": {"generated_at": now, "source": "snapshots", "sentiment_weights": SENTIMENT_WEIGHTS},
+        **daily_metrics,
+    }
 
-    write_json(DERIVED_DIR / "snapshots_index.json", {
+    files["snapshots_index.json"] = {
         "_metadata": {"generated_at": now, "source": "snapshots+daily_metrics"},
         **snapshots_manifest,
-    })
+    }
 
-    write_json(DERIVED_DIR / "eliminations_detected.json", {
+    files["eliminations_detected.json"] = {
         "_metadata": {"generated_at": now, "source": "snapshots"},
         "events": eliminations_detected,
-    })
+    }
 
-    write_json(DERIVED_DIR / "sincerao_edges.json", sincerao_edges)
-    write_json(DERIVED_DIR / "plant_index.json", plant_index)
-    write_json(DERIVED_DIR / "relations_scores.json", relations_scores)
-    write_json(DERIVED_DIR / "prova_rankings.json", prova_rankings)
+    files["sincerao_edges.json"] = sincerao_edges
+    files["plant_index.json"] = plant_index
+    files["relations_scores.json"] = relations_scores
+    files["prova_rankings.json"] = prova_rankings
 
-    game_timeline = build_game_timeline(eliminations_detected, auto_events, manual_events, paredoes, provas_data)
-    write_json(DERIVED_DIR / "game_timeline.json", {
+    files["game_timeline.json"] = {
         "_metadata": {"generated_at": now, "source": "all_events"},
         "events": game_timeline,
-    })
+    }
 
-    clusters_data = build_clusters_data(relations_scores, participants_index, paredoes)
     if clusters_data:
-        write_json(DERIVED_DIR / "clusters_data.json", clusters_data)
-
-    # Build cluster evolution (temporal tracking)
-    cluster_evolution = build_cluster_evolution(daily_snapshots, participants_index, paredoes)
+        files["clusters_data.json"] = clusters_data
     if cluster_evolution:
-        write_json(DERIVED_DIR / "cluster_evolution.json", cluster_evolution)
+        files["cluster_evolution.json"] = cluster_evolution
 
-    # Build vote predictions (after clusters_data is available)
-    vote_prediction = build_vote_prediction(
-        daily_snapshots, paredoes, clusters_data, relations_scores,
-    )
-    write_json(DERIVED_DIR / "vote_prediction.json", vote_prediction)
+    files["vote_prediction.json"] = vote_prediction
 
-    # Build paredão analysis + badges
-    paredao_analysis = build_paredao_analysis(
-        daily_snapshots,
-        paredoes,
-        manual_events,
-        auto_events,
-        sincerao_edges,
-        relations_scores,
-    )
-    write_json(DERIVED_DIR / "paredao_analysis.json", {
+    files["paredao_analysis.json"] = {
         "_metadata": {"generated_at": now, "source": "snapshots+paredoes+manual_events"},
         **paredao_analysis,
-    })
+    }
 
-    paredao_badges = build_paredao_badges(daily_snapshots, paredoes)
-    write_json(DERIVED_DIR / "paredao_badges.json", {
+    files["paredao_badges.json"] = {
         "_metadata": {"generated_at": now, "source": "snapshots+paredoes+relations"},
         **paredao_badges,
-    })
+    }
 
-    write_json(DERIVED_DIR / "validation.json", {
+    files["validation.json"] = {
         "_metadata": {"generated_at": now, "source": "manual_events"},
         "warnings": warnings,
-    })
+    }
 
-    # Build Cartola data
-    cartola_data = build_cartola_data(
-        daily_snapshots,
-        manual_events,
-        paredoes,
-        participants_index,
-        provas_data=provas_data,
-    )
-    write_json(DERIVED_DIR / "cartola_data.json", cartola_data)
+    files["cartola_data.json"] = cartola_data
 
-    # Build precomputed reaction matrices
-    reaction_matrices = build_reaction_matrices(daily_snapshots)
-    write_json(DERIVED_DIR / "reaction_matrices.json", {
+    files["reaction_matrices.json"] = {
         "_metadata": {"generated_at": now, "source": "snapshots"},
-        **reaction_matrices,
-    })
+        **encode_reaction_matrices(reaction_matrices["by_date"]),
+    }
 
-    # Build balance events (uses ALL snapshots, not daily-only)
-    balance_events = build_balance_events(snapshots)
-    write_json(DERIVED_DIR / "balance_events.json", balance_events)
+    files["balance_events.json"] = balance_events
 
-    # Build index data (for index.qmd)
-    from build_index_data import build_index_data
-    index_payload = build_index_data()
-    if index_payload:
-        write_json(DERIVED_DIR / "index_data.json", index_payload)
-
-        # Extract exposure stats (already computed by build_index_data)
-        exposure_stats = (index_payload.get("paredao_exposure") or {}).get("stats")
-        if not exposure_stats:
-            raise RuntimeError("Missing paredao_exposure.stats in index payload")
-
-        # Hash-gate JSON write — no churn when stats unchanged.
-        # generated_at intentionally stays stale when content is unchanged,
-        # since it represents when the content last changed, not when the pipeline ran.
-        stats_path = DERIVED_DIR / "paredao_exposure_stats.json"
-        content_hash = stable_json_hash(exposure_stats)
-        prev = read_json_if_exists(stats_path)
-        prev_hash = (prev or {}).get("_metadata", {}).get("content_hash")
-        if content_hash != prev_hash:
-            write_json(stats_path, {
-                "_metadata": {"generated_at": now, "content_hash": content_hash},
-                "stats": exposure_stats,
-            })
-
-        # Always run docs updater (content-compared, self-healing)
-        paredoes_list = (paredoes or {}).get("paredoes", []) if isinstance(paredoes, dict) else (paredoes or [])
-        update_paredao_docs_section(exposure_stats, paredoes_list)
-
-    # Run audit report for manual events (hard fail on issues)
+    return {name: write_json(DERIVED_DIR / name, payload) for name, payload in files.items()}
+
+
+def _write_page_bundle(snapshots: list[dict], plan: dict | None) -> None:
+    # Incremental runs extend the saved bundle; a full build rewrites it
+    write_page_bundle(snapshots, PAGE_BUNDLE_FILE, reuse=plan is not None)
+
+
+def _run_manual_events_audit() -> None:
+    """Audit report for manual events (hard fail on issues)."""
     from audit_manual_events import run_audit
     issues_count = run_audit()
     if issues_count:
         raise RuntimeError(f"Manual events audit failed with {issues_count} issue(s). See docs/MANUAL_EVENTS_AUDIT.md")
 
+
+DERIVED_STAGES = (
+    Stage("validate", _validate_inputs, ("plan",)),
+    Stage("participants_index", build_participants_index, ("snapshots", "manual_events"), ("participants_index",)),
+    Stage("daily_roles", build_daily_roles, ("daily_snapshots",), ("daily_roles",)),
+    Stage("auto_events", _build_auto_events, ("daily_roles", "manual_events", "calendar"), ("auto_events",)),
+    Stage("daily_sections", build_daily_sections, ("daily_snapshots", "plan"), ("daily_sections", "reaction_matrices")),
+    Stage("snapshots_manifest", _build_snapshots_manifest, ("daily_snapshots", "daily_sections", "calendar"),
+          ("snapshots_manifest",)),
+    Stage("eliminations", detect_eliminations, ("daily_snapshots",), ("eliminations_detected",)),
+    Stage("manual_validation", validate_manual_events, ("participants_index", "manual_events"), ("warnings",)),
+    Stage("sincerao_edges", build_sincerao_edges, ("manual_events",), ("sincerao_edges",)),
+    Stage("prova_rankings", build_prova_rankings, ("provas_data", "participants_index"), ("prova_rankings",)),
+    Stage("plant_index", build_plant_index,
+          ("daily_snapshots", "manual_events", "auto_events", "sincerao_edges", "paredoes", "calendar"),
+          ("plant_index",)),
+    # Writes the streak state cache (gitignored, not an artifact)
+    Stage("streak_state", _update_streak_state, ("daily_snapshots", "participants_index", "verify_streaks"),
+          ("streak_state",), local=True),
+    Stage("relations_scores", _build_relations,
+          ("daily_snapshots", "manual_events", "auto_events", "sincerao_edges", "paredoes", "daily_roles",
+           "participants_index", "calendar", "streak_state"), ("relations_scores",)),
+    Stage("daily_metrics", _build_daily_metrics, ("daily_sections", "relations_scores"), ("daily_metrics",)),
+    Stage("power_summary", build_power_summary, ("manual_events", "auto_events"), ("power_summary",)),
+    Stage("game_timeline", _build_game_timeline,
+          ("eliminations_detected", "auto_events", "manual_events", "paredoes", "provas_data", "calendar"),
+          ("game_timeline",)),
+    # Local: the cluster builders fan out over their own process pool of ``jobs``
+    # workers, which must not be nested inside a pool worker
+    Stage("clusters_data", build_clusters_data,
+          ("relations_scores", "participants_index", "paredoes", "jobs"), ("clusters_data",), local=True),
+    Stage("cluster_evolution", build_cluster_evolution,
+          ("daily_snapshots", "participants_index", "paredoes", "calendar", "jobs"), ("cluster_evolution",),
+          local=True),
+    Stage("vote_prediction", build_vote_prediction,
+          ("daily_snapshots", "paredoes", "clusters_data", "relations_scores"), ("vote_prediction",)),
+    Stage("paredao_analysis", build_paredao_analysis,
+          ("daily_snapshots", "paredoes", "manual_events", "auto_events", "sincerao_edges", "relations_scores"),
+          ("paredao_analysis",)),
+    Stage("paredao_badges", build_paredao_badges, ("daily_snapshots", "paredoes"), ("paredao_badges",)),
+    Stage("cartola_data", build_cartola_data,
+          ("daily_snapshots", "manual_events", "paredoes", "participants_index", "provas_data", "calendar"),
+          ("cartola_data",)),
+    # Writes the balance series cache (gitignored, not an artifact)
+    Stage("balance_series", _update_balance_series, ("snapshots",), ("balance_series",), local=True),
+    Stage("balance_events", build_balance_events, ("snapshots", "calendar", "balance_series"), ("balance_events",)),
+    Stage("write", _write_artifacts, (
+        "now", "participants_index", "daily_roles", "auto_events", "power_summary", "daily_metrics",
+        "snapshots_manifest", "eliminations_detected", "sincerao_edges", "plant_index", "relations_scores",
+        "prova_rankings", "game_timeline", "clusters_data", "cluster_evolution", "vote_prediction",
+        "paredao_analysis", "paredao_badges", "warnings", "cartola_data", "reaction_matrices", "balance_events",
+    ), ("artifact_changes",), after=("validate",), local=True),
+    # index_data and the audit read the artifacts back from data/derived/
+    Stage("index_data", _write_index_outputs, ("store", "paredoes", "now", "calendar"), ("index_changes",),
+          after=("write",), local=True),
+    Stage("audit", _run_manual_events_audit, after=("write",)),
+    # Render-time cache for load_snapshots_full (gitignored, not an artifact)
+    Stage("page_bundle", _write_page_bundle, ("snapshots", "plan"), after=("validate",), local=True),
+)
+DERIVED_GRAPH = StageGraph(DERIVED_STAGES)
+
+# Optional heavy imports used by the cluster stages (imported once before forking)
+_POOL_PRELOAD = ("networkx.algorithms.community", "sklearn.metrics")
+
+
+def _write_profile(stats: dict[str, dict], sections: list[dict], timings: dict[str, float],
+                   wall: float, jobs: int, plan: dict | None, level: int) -> None:
+    """Print the profile table and write data/derived/_pipeline_profile.json."""
+    print(format_profile_table(stats, sections))
+    length, path = DERIVED_GRAPH.critical_path(timings)
+    write_profile({
+        "_metadata": {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "mode": plan["mode"] if plan else "full",
+            "jobs": jobs,
+            "memory_tracing": level >= PROFILE_MEMORY,
+            "wall_s": round(wall, 3),
+        },
+        "critical_path": {"seconds": round(length, 3), "stages": path},
+        "stages": [
+            {"name": name, **{k: round(v, 3) if isinstance(v, float) else v for k, v in s.items()}}
+            for name, s in stats.items()
+        ],
+        "index_data_sections": [
+            {**s, "wall_s": round(s["wall_s"], 3), "cpu_s": round(s["cpu_s"], 3)} for s in sections
+        ],
+    })
+    print(f"Profile written to {PROFILE_FILE}")
+
+
+# ── Main pipeline ───────────────────────────────────────────────────────────
+
+def _report_changes(changes: dict[str, bool], mode: str) -> dict[str, bool]:
+    """Print the ``{artifact: changed}`` report, save it to ``ARTIFACT_CHANGES_FILE`` and return it.
+
+    The saved copy lets callers that run the build as a subprocess
+    (``schedule_data_fetch.py``) skip work when nothing changed.
+    """
+    changed = sorted(name for name, was_written in changes.items() if was_written)
+    print(f"Artifacts changed: {', '.join(changed) or 'none'} ({len(changes) - len(changed)} unchanged)")
+    report = {
+        "_metadata": {"generated_at": datetime.now(timezone.utc).isoformat(), "mode": mode},
+        "changed": changed,
+        "unchanged": sorted(name for name, was_written in changes.items() if not was_written),
+    }
+    ARTIFACT_CHANGES_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = ARTIFACT_CHANGES_FILE.with_name(f".{ARTIFACT_CHANGES_FILE.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    tmp.replace(ARTIFACT_CHANGES_FILE)
+    return changes
+
+
+def build_derived_data(incremental: bool = False, jobs: int = 1, profile: int = PROFILE_OFF,
+                       verify_streaks: bool = False) -> dict[str, bool]:
+    """Rebuild ``data/derived/``.
+
+    With ``incremental=True`` the build manifest decides how much work is
+    needed (see ``derived_manifest.plan_rebuild``); otherwise every artifact
+    is recomputed. Both modes refresh the manifest. ``jobs > 1`` runs
+    independent stages of ``DERIVED_GRAPH`` in a process pool; a ``profile``
+    level records per-stage time/memory/output size (see ``pipeline_profile``).
+    ``verify_streaks`` checks the incremental streak state against a full
+    recompute and fails the build on any difference.
+
+    Artifacts whose content is unchanged are not rewritten (see
+    ``write_json_artifact``). Returns ``{artifact: changed}`` for every
+    artifact the run produced, also saved to ``ARTIFACT_CHANGES_FILE``.
+    """
+    plan = None
+    fingerprint = None
+    if incremental:
+        previous = load_manifest()
+        fingerprint = fingerprint_inputs(previous, DATA_DIR)
+        plan = plan_rebuild(previous, fingerprint, DERIVED_DIR)
+        print(f"Incremental build: {plan['mode']} ({plan['reason']})")
+        if plan["mode"] == "noop":
+            return _report_changes({}, "noop")
+        if plan["mode"] == "full":
+            plan = None
+
+    # One store per run: every builder below (relations, clusters, balance,
+    # index) reads the same parsed snapshots instead of reloading the files,
+    # and the reaction-matrix cache builds each daily matrix only once.
+    # Snapshots come from the packed archive (data/snapshots.npz); only
+    # captures it does not hold yet are parsed from JSON.
+    store = SnapshotStore(DATA_DIR, use_archive=True)
+    clear_reaction_matrix_cache()
+    snapshots = get_all_snapshots(store)
+    if not snapshots:
+        print("No snapshots found. Skipping derived data.")
+        return _report_changes({}, "skipped")
+
+    if plan is not None and plan["mode"] == "light":
+        changes = _build_light(store, plan["stale"])
+        write_manifest(fingerprint, "light")
+        clear_reaction_matrix_cache()
+        print(f"Derived data written to {DERIVED_DIR} ({', '.join(plan['stale'])})")
+        return _report_changes(changes, "light")
+
+    daily_snapshots = store.daily()
+
+    manual_events: dict[str, Any] = {}
+    if MANUAL_EVENTS_FILE.exists():
+        with open(MANUAL_EVENTS_FILE, encoding="utf-8") as f:
+            manual_events = json.load(f)
+    paredoes: dict[str, Any] = {}
+    if PAREDOES_FILE.exists():
+        with open(PAREDOES_FILE, encoding="utf-8") as f:
+            paredoes = json.load(f)
+    provas_data: dict[str, Any] = {}
+    if PROVAS_FILE.exists():
+        with open(PROVAS_FILE, encoding="utf-8") as f:
+            provas_data = json.load(f)
+
+    context: dict[str, Any] = {
+        "plan": plan,
+        "store": store,
+        "snapshots": snapshots,
+        "daily_snapshots": daily_snapshots,
+        "manual_events": manual_events,
+        "paredoes": paredoes,
+        "provas_data": provas_data,
+        # Cycle boundaries resolved once for every stage
+        "calendar": get_cycle_calendar(manual_events, paredoes, provas_data),
+        "now": datetime.now(timezone.utc).isoformat(),
+        "verify_streaks": verify_streaks,
+        # Process-pool width for builders that fan out internally (clusters)
+        "jobs": jobs,
+    }
+    if profile:
+        start_sections()
+    started = time.perf_counter()
+    stats = DERIVED_GRAPH.run(context, jobs=jobs, preload=_POOL_PRELOAD, profile=profile)
+    wall = time.perf_counter() - started
+    timings = {name: s["wall_s"] for name, s in stats.items()}
+    print(format_critical_path_report(DERIVED_GRAPH, timings, wall, jobs))
+    if profile:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        _write_profile(stats, collect_sections(), timings, wall, jobs, plan, profile)
+
+    if fingerprint is None:
+        fingerprint = fingerprint_inputs(load_manifest(), DATA_DIR, store=store)
+    write_manifest(fingerprint, "append" if plan else "full")
+    clear_reaction_matrix_cache()
     print(f"Derived data written to {DERIVED_DIR}")
+    return _report_changes({**context["artifact_changes"], **context["index_changes"]}, "append" if plan else "full")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Build data/derived/ from snapshots + manual data.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Rebuild only what changed since the last build (uses data/derived/_build_manifest.json)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Run independent pipeline stages in N worker processes (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record per-stage wall/CPU time, peak RSS and output size (writes data/derived/_pipeline_profile.json)",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Like --profile, plus tracemalloc allocation peaks (several times slower)",
+    )
+    parser.add_argument(
+        "--verify-streaks",
+        action="store_true",
+        help="Cross-check the incremental streak state (data/derived/_streak_state.json) against a full recompute",
+    )
+    args = parser.parse_args(argv)
+    profile = PROFILE_MEMORY if args.profile_memory else PROFILE_BASIC if args.profile else PROFILE_OFF
+    build_derived_data(incremental=args.incremental, jobs=args.jobs, profile=profile,
+                       verify_streaks=args.verify_streaks)
 
 
 if __name__ == "__main__":
-    build_derived_data()
+    main()
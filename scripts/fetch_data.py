@@ -9,6 +9,9 @@ Key behaviors:
 - Uses content hash to detect changes
 - Records capture timestamp in filename
 - Detects what type of change occurred (reactions, balance, roles)
+- Keeps a small fetch state (data/fetch_state.json: latest file, its hashes,
+  ETag/Last-Modified) so a no-change poll is one conditional HTTP request
+  plus one hash — no directory sort, no re-reading the latest snapshot
 
 Data Update Patterns (BRT = UTC-3):
 - Reactions (Queridômetro): update window can vary; track with timing probes
@@ -23,6 +26,7 @@ Current permanent capture schedule in GitHub Actions:
 """
 
 import argparse
+import os
 import requests
 import json
 import hashlib
@@ -32,6 +36,7 @@ from pathlib import Path
 API_URL = "https://apis-globoplay.globo.com/mve-api/globo-play/realities/bbb/participants/"
 DATA_DIR = Path(__file__).parent.parent / "data" / "snapshots"
 LATEST_FILE = Path(__file__).parent.parent / "data" / "latest.json"
+FETCH_STATE_FILE = Path(__file__).parent.parent / "data" / "fetch_state.json"
 
 
 def get_data_hash(data):
@@ -66,25 +71,31 @@ def get_roles_hash(participants):
 
 def detect_change_type(old_participants, new_participants):
     """Detect what type of change occurred between snapshots."""
+    return detect_change_type_from_hashes(
+        len(old_participants),
+        get_reactions_hash(old_participants),
+        get_roles_hash(old_participants),
+        new_participants,
+    )
+
+
+def detect_change_type_from_hashes(old_count, old_rxn_hash, old_roles_hash, new_participants):
+    """Same as detect_change_type, given the previous snapshot's count and hashes."""
     changes = []
 
     # Check participant count
-    if len(old_participants) != len(new_participants):
-        if len(new_participants) > len(old_participants):
+    if old_count != len(new_participants):
+        if len(new_participants) > old_count:
             changes.append("new_entrants")
         else:
             changes.append("elimination")
 
     # Check reactions
-    old_rxn_hash = get_reactions_hash(old_participants)
-    new_rxn_hash = get_reactions_hash(new_participants)
-    if old_rxn_hash != new_rxn_hash:
+    if old_rxn_hash != get_reactions_hash(new_participants):
         changes.append("reactions")
 
     # Check roles
-    old_roles_hash = get_roles_hash(old_participants)
-    new_roles_hash = get_roles_hash(new_participants)
-    if old_roles_hash != new_roles_hash:
+    if old_roles_hash != get_roles_hash(new_participants):
         changes.append("roles")
 
     # Check balance (if reactions and roles are same but data changed, it's balance)
@@ -108,14 +119,116 @@ def get_latest_snapshot():
     return latest, data.get("participants", data)
 
 
-def fetch_and_save():
-    """Fetch data from API and save snapshot only if data changed."""
+def _snapshot_state(path, participants, metadata=None):
+    """Fetch-state entry describing a saved snapshot (reuses hashes stored in its metadata)."""
+    metadata = metadata or {}
+    return {
+        "file": path.name,
+        "data_hash": metadata.get("data_hash") or get_data_hash(participants),
+        "reactions_hash": metadata.get("reactions_hash") or get_reactions_hash(participants),
+        "roles_hash": metadata.get("roles_hash") or get_roles_hash(participants),
+        "participant_count": len(participants),
+    }
+
+
+def load_fetch_state():
+    """Return the saved fetch state if it still describes the newest snapshot, else None.
+
+    The state is trusted only while its file exists and no snapshot sorts
+    after it (e.g. one added by hand or by a backfill script).
+    """
+    try:
+        with open(FETCH_STATE_FILE, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    name = state.get("file") if isinstance(state, dict) else None
+    if not name or not state.get("data_hash"):
+        return None
+    try:
+        newest = max(n for n in os.listdir(DATA_DIR) if n.endswith(".json"))
+    except (OSError, ValueError):
+        return None
+    return state if newest == name else None
+
+
+def save_fetch_state(state):
+    FETCH_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(FETCH_STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def _state_from_latest_snapshot():
+    """Slow path: build the fetch state by reading the newest snapshot."""
+    snapshots = sorted(DATA_DIR.glob("*.json"))
+    if not snapshots:
+        return None
+    with open(snapshots[-1], encoding="utf-8") as f:
+        data = json.load(f)
+    # Handle both old format (array) and new format (with _metadata)
+    if isinstance(data, list):
+        return _snapshot_state(snapshots[-1], data)
+    return _snapshot_state(snapshots[-1], data.get("participants", data), data.get("_metadata"))
+
+
+def _conditional_headers(state):
+    """If-None-Match / If-Modified-Since from the last response's validators."""
+    headers = {}
+    if state and state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state and state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    return headers
+
+
+def _validators(response):
+    return {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+
+def poll_for_change(session=None, state=None):
+    """Ask the API whether anything changed since ``state`` (default: the saved fetch state).
+
+    Writes nothing — callers decide whether a full ``fetch_and_save()`` is
+    worth it. Returns ``(changed, state)``; the returned state carries the
+    latest validators and can be passed back in on the next poll.
+    """
+    if state is None:
+        state = load_fetch_state() or _state_from_latest_snapshot()
+    if state is None:
+        return True, None
+    response = (session or requests).get(API_URL, headers=_conditional_headers(state), timeout=30)
+    if response.status_code == 304:
+        return False, state
+    response.raise_for_status()
+    changed = get_data_hash(response.json()) != state["data_hash"]
+    return changed, {**state, **_validators(response)}
+
+
+def fetch_and_save(session=None):
+    """Fetch data from API and save snapshot only if data changed.
 
-    # Fetch from API
+    ``session`` (a ``requests.Session``) lets long-running pollers reuse
+    one connection across calls.
+    """
+    state = load_fetch_state()
+    state_stale = state is None
+    if state_stale:
+        state = _state_from_latest_snapshot()
+
+    # Fetch from API (conditional when the last response carried validators)
     print("Fetching from API...")
-    response = requests.get(API_URL, timeout=30)
+    response = (session or requests).get(API_URL, headers=_conditional_headers(state), timeout=30)
+    if response.status_code == 304 and state is not None:
+        print(f"No changes detected (HTTP 304, hash: {state['data_hash'][:8]}...)")
+        print(f"Latest snapshot: {DATA_DIR / state['file']}")
+        return str(DATA_DIR / state["file"]), False
     response.raise_for_status()
     new_data = response.json()
+    validators = _validators(response)
 
     # M-15: Structural validation of API response
     if not isinstance(new_data, list) or len(new_data) == 0:
@@ -133,18 +246,20 @@ def fetch_and_save():
     )
     print(f"  Total reactions: {total_reactions}")
 
-    # Compare with latest snapshot
-    latest_file, latest_data = get_latest_snapshot()
-
-    if latest_data:
-        latest_hash = get_data_hash(latest_data)
+    # Compare with latest snapshot (via its stored hashes)
+    if state is not None:
+        latest_hash = state["data_hash"]
         if new_hash == latest_hash:
             print(f"No changes detected (hash: {new_hash[:8]}...)")
-            print(f"Latest snapshot: {latest_file}")
-            return str(latest_file), False
+            print(f"Latest snapshot: {DATA_DIR / state['file']}")
+            if state_stale or any(state.get(k) != v for k, v in validators.items()):
+                save_fetch_state({**state, **validators})
+            return str(DATA_DIR / state["file"]), False
         else:
             # Detect what changed
-            change_types = detect_change_type(latest_data, new_data)
+            change_types = detect_change_type_from_hashes(
+                state["participant_count"], state["reactions_hash"], state["roles_hash"], new_data,
+            )
             print(f"Data changed! Types: {', '.join(change_types)}")
             print(f"  Old hash: {latest_hash[:8]}..., New hash: {new_hash[:8]}...")
     else:
@@ -179,6 +294,8 @@ def fetch_and_save():
     with open(LATEST_FILE, "w", encoding="utf-8") as f:
         json.dump(save_data, f, indent=2, ensure_ascii=False)
 
+    save_fetch_state({**_snapshot_state(snapshot_path, new_data, save_data["_metadata"]), **validators})
+
     print(f"Saved new snapshot: {snapshot_path}")
 
     return str(snapshot_path), True
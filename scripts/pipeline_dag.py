@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Declared stage graph for the derived-data pipeline.
+
+A ``Stage`` names the context values it reads (``inputs``, passed
+positionally to ``func``) and the values it produces (``outputs``: the return
+value, or a tuple in declaration order when there are several). Ordering that
+is not carried by a value — e.g. "write the artifacts before building the
+index page data, which reads them back from disk" — goes in ``after``.
+
+``StageGraph.run(context, jobs=N)`` executes stages as soon as their
+dependencies are done and returns per-stage stats (``wall_s``, ``cpu_s``;
+memory and output size too at higher ``profile`` levels, see
+``pipeline_profile``). With ``jobs > 1`` independent stages run in a process
+pool (inputs and outputs are pickled); ``local`` stages always run in the
+orchestrating process, for side effects or unpicklable inputs. Results are
+identical to a sequential run because every stage only sees its inputs.
+"""
+from __future__ import annotations
+
+import importlib
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from pipeline_profile import PROFILE_OFF, measure
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    func: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+    local: bool = False
+
+
+def pool_context() -> multiprocessing.context.BaseContext:
+    """Start method for process pools: fork where available.
+
+    fork keeps warm module state (imports, caches) and skips re-importing builders.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+class StageGraph:
+    """A validated DAG of stages, kept in declaration order."""
+
+    def __init__(self, stages: list[Stage] | tuple[Stage, ...]) -> None:
+        self.stages = list(stages)
+        self.by_name = {s.name: s for s in self.stages}
+        if len(self.by_name) != len(self.stages):
+            raise ValueError("Duplicate stage names")
+
+        producer: dict[str, str] = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in producer:
+                    raise ValueError(f"Output {output!r} produced by both {producer[output]} and {stage.name}")
+                producer[output] = stage.name
+        self.producer = producer
+
+        self.deps: dict[str, set[str]] = {}
+        for stage in self.stages:
+            unknown = [a for a in stage.after if a not in self.by_name]
+            if unknown:
+                raise ValueError(f"Stage {stage.name} runs after unknown stage(s): {', '.join(unknown)}")
+            self.deps[stage.name] = {producer[i] for i in stage.inputs if i in producer} | set(stage.after)
+        self.order = self._toposort()
+
+    def _toposort(self) -> list[str]:
+        order: list[str] = []
+        state: dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Stage cycle: {' → '.join(path + (name,))}")
+            state[name] = 1
+            for dep in sorted(self.deps[name], key=[s.name for s in self.stages].index):
+                visit(dep, path + (name,))
+            state[name] = 2
+            order.append(name)
+
+        for stage in self.stages:
+            visit(stage.name, ())
+        return order
+
+    def missing_inputs(self, context: dict[str, Any]) -> list[str]:
+        """Inputs neither produced by a stage nor present in ``context``."""
+        return sorted({
+            i for s in self.stages for i in s.inputs if i not in self.producer and i not in context
+        })
+
+    def _store(self, stage: Stage, result: Any, context: dict[str, Any]) -> None:
+        if len(stage.outputs) == 1:
+            context[stage.outputs[0]] = result
+        elif stage.outputs:
+            context.update(zip(stage.outputs, result))
+
+    def run(
+        self,
+        context: dict[str, Any],
+        jobs: int = 1,
+        preload: tuple[str, ...] = (),
+        profile: int = PROFILE_OFF,
+    ) -> dict[str, dict[str, Any]]:
+        """Execute every stage, adding outputs to ``context``. Returns stats per stage.
+
+        ``preload`` names modules to import before the pool forks, so slow
+        optional imports happen once instead of once per worker.
+        """
+        missing = self.missing_inputs(context)
+        if missing:
+            raise KeyError(f"Missing stage inputs: {', '.join(missing)}")
+
+        stats: dict[str, dict[str, Any]] = {}
+
+        def run_local(stage: Stage) -> None:
+            result, stats[stage.name] = measure(stage.func, tuple(context[i] for i in stage.inputs), profile)
+            self._store(stage, result, context)
+
+        if jobs <= 1:
+            for name in self.order:
+                run_local(self.by_name[name])
+            return stats
+
+        for module in preload:
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                pass
+
+        pending = list(self.order)
+        done: set[str] = set()
+        running: dict[Any, Stage] = {}
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=pool_context()) as pool:
+            try:
+                while pending or running:
+                    ready = [self.by_name[n] for n in pending if self.deps[n] <= done]
+                    for stage in ready:
+                        if not stage.local:
+                            pending.remove(stage.name)
+                            args = tuple(context[i] for i in stage.inputs)
+                            running[pool.submit(measure, stage.func, args, profile)] = stage
+                    local = [s for s in ready if s.local]
+                    if local:
+                        pending.remove(local[0].name)
+                        run_local(local[0])
+                        done.add(local[0].name)
+                        continue
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        stage = running.pop(future)
+                        result, stats[stage.name] = future.result()
+                        self._store(stage, result, context)
+                        done.add(stage.name)
+            except BaseException:
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+        return stats
+
+    def critical_path(self, timings: dict[str, float]) -> tuple[float, list[str]]:
+        """Longest dependency chain by measured time (the floor for any --jobs)."""
+        finish: dict[str, float] = {}
+        via: dict[str, str | None] = {}
+        for name in self.order:
+            prev = max(self.deps[name], key=lambda d: finish[d], default=None)
+            finish[name] = (finish[prev] if prev is not None else 0.0) + timings.get(name, 0.0)
+            via[name] = prev
+        if not finish:
+            return 0.0, []
+        end: str | None = max(finish, key=finish.__getitem__)
+        length = finish[end]
+        path = []
+        while end is not None:
+            path.append(end)
+            end = via[end]
+        return length, path[::-1]
+
+
+def format_critical_path_report(graph: StageGraph, timings: dict[str, float], wall: float, jobs: int, top: int = 5) -> str:
+    """Human-readable summary: wall vs serial time, the critical path, slowest stages."""
+    length, path = graph.critical_path(timings)
+    lines = [
+        f"Stage timings (jobs={jobs}): wall {wall:.2f}s, "
+        f"serial sum {sum(timings.values()):.2f}s, critical path {length:.2f}s",
+        "  critical path: " + " → ".join(f"{name} ({timings.get(name, 0.0):.2f}s)" for name in path),
+        "  slowest: " + ", ".join(
+            f"{name} {seconds:.2f}s" for name, seconds in sorted(timings.items(), key=lambda x: -x[1])[:top]
+        ),
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Opt-in instrumentation for the derived pipeline (``--profile``).
+
+Per DAG stage (see ``pipeline_dag``): wall time and CPU time always; with
+``PROFILE_BASIC`` also the peak RSS of the process that ran it (and how much
+the stage raised it) and the JSON-encoded size of what it returned; with
+``PROFILE_MEMORY`` also the tracemalloc peak above the stage's starting
+allocation. ``section()`` adds finer timings inside a stage
+(``build_index_data`` uses it); it is a no-op unless profiling was enabled
+with ``start_sections()``.
+
+``build_derived_data(profile=...)`` prints ``format_profile_table()`` and
+writes ``data/derived/_pipeline_profile.json``. tracemalloc slows
+allocation-heavy code several-fold, so ``PROFILE_MEMORY`` wall times are only
+comparable with other memory-profiled runs.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_FILE = Path(__file__).parent.parent / "data" / "derived" / "_pipeline_profile.json"
+
+_MB = 1024 * 1024
+
+# Profile levels: timings only (always recorded), + RSS/output size, + tracemalloc
+PROFILE_OFF = 0
+PROFILE_BASIC = 1
+PROFILE_MEMORY = 2
+
+# Section records while profiling is on; None means disabled.
+_sections: list[dict[str, Any]] | None = None
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process so far (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (_MB if sys.platform == "darwin" else 1024), 1)
+
+
+def output_bytes(value: Any) -> int:
+    """Size of ``value`` as UTF-8 JSON (0 for None)."""
+    if value is None:
+        return 0
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def measure(func: Callable[..., Any], args: tuple, level: int = PROFILE_OFF) -> tuple[Any, dict[str, Any]]:
+    """Call ``func(*args)``; return its result and stats for the given profile level."""
+    trace = level >= PROFILE_MEMORY
+    if trace:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        alloc_start = tracemalloc.get_traced_memory()[0]
+    rss_start = peak_rss_mb() if level else None
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = func(*args)
+    stats: dict[str, Any] = {
+        "wall_s": time.perf_counter() - wall_start,
+        "cpu_s": time.process_time() - cpu_start,
+    }
+    if level:
+        rss_peak = peak_rss_mb()
+        stats["rss_peak_mb"] = rss_peak
+        stats["rss_growth_mb"] = round(rss_peak - rss_start, 1) if rss_peak is not None else None
+        stats["output_bytes"] = output_bytes(result)
+    if trace:
+        stats["alloc_peak_mb"] = round((tracemalloc.get_traced_memory()[1] - alloc_start) / _MB, 2)
+    return result, stats
+
+
+def start_sections() -> None:
+    global _sections
+    _sections = []
+
+
+def collect_sections() -> list[dict[str, Any]]:
+    """Return recorded sections and disable section profiling."""
+    global _sections
+    records, _sections = _sections or [], None
+    return records
+
+
+@contextmanager
+def section(name: str) -> Iterator[None]:
+    """Time a block inside a stage (only while profiling)."""
+    if _sections is None:
+        yield
+        return
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield
+    finally:
+        _sections.append({
+            "name": name,
+            "wall_s": time.perf_counter() - wall_start,
+            "cpu_s": time.process_time() - cpu_start,
+        })
+
+
+def format_profile_table(stages: dict[str, dict[str, Any]], sections: list[dict[str, Any]] | None = None) -> str:
+    """Terminal table, slowest stage first."""
+    def cell(value: Any, fmt: str) -> str:
+        return "-" if value is None else format(value, fmt)
+
+    header = f"{'stage':<28}{'wall s':>8}{'cpu s':>8}{'alloc MB':>10}{'rss MB':>9}{'+rss MB':>9}{'out KB':>9}"
+    lines = [header, "-" * len(header)]
+    for name, s in sorted(stages.items(), key=lambda x: -x[1]["wall_s"]):
+        out = s.get("output_bytes")
+        lines.append(
+            f"{name:<28}{s['wall_s']:>8.3f}{s['cpu_s']:>8.3f}"
+            f"{cell(s.get('alloc_peak_mb'), '.1f'):>10}{cell(s.get('rss_peak_mb'), '.0f'):>9}"
+            f"{cell(s.get('rss_growth_mb'), '.0f'):>9}"
+            f"{cell(out / 1024 if out is not None else None, '.0f'):>9}"
+        )
+    if sections:
+        lines.append("")
+        lines.append(f"{'index_data section':<28}{'wall s':>8}{'cpu s':>8}")
+        for s in sorted(sections, key=lambda x: -x["wall_s"]):
+            lines.append(f"{s['name']:<28}{s['wall_s']:>8.3f}{s['cpu_s']:>8.3f}")
+    return "\n".join(lines)
+
+
+def write_profile(payload: dict[str, Any], path: Path = PROFILE_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
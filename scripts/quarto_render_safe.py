@@ -1,13 +1,36 @@
 #!/usr/bin/env python3
-"""Serialize Quarto renders within a project to avoid cache/output races."""
+"""Serialize Quarto renders within a project to avoid cache/output races.
+
+With ``--jobs N`` the targets (default: the project's render list) are
+executed concurrently, each in its own scratch copy of the project under
+``.quarto/parallel/`` (top-level files copied, directories symlinked) with
+the ``parallel`` profile (``_quarto-parallel.yml``, ``freeze: auto``). Their
+fresh ``_freeze/`` results are merged into the project, and a final render
+with the same profile assembles the site from them without running any
+kernel. The project lock is held for the whole run.
+
+With ``--changed-only`` only pages whose input fingerprint changed since
+their last successful render are rendered (see ``render_plan.py``); the rest
+keep their existing ``_site`` output, and the project resources are synced
+into ``_site`` directly.
+"""
 
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import os
 from pathlib import Path
+import shutil
 import subprocess
 import sys
+import time
+
+import render_plan
+
+PARALLEL_PROFILE = "parallel"
+# Project entries a scratch copy must not share with the real project
+_SCRATCH_SKIP = frozenset({".git", ".quarto", "_site", "_freeze"})
 
 
 def _parse_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
@@ -29,6 +52,17 @@ def _parse_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
         default="quarto",
         help="Quarto executable to invoke (default: quarto).",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Execute up to N targets concurrently, then assemble the site from their frozen results (default: 1).",
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Skip targets whose declared render-inputs are unchanged since their last successful render.",
+    )
     return parser.parse_known_args(argv)
 
 
@@ -87,6 +121,160 @@ def _run_one(quarto_bin: str, project_root: Path, target: str | None, extra_args
     return int(proc.returncode)
 
 
+def _project_config(project_root: Path) -> dict[str, str | list[str]]:
+    """Scalars and lists of the ``project`` section of ``_quarto.yml`` (plain line scan, no YAML dependency)."""
+    config: dict[str, str | list[str]] = {}
+    section = None
+    key = None
+    for line in (project_root / "_quarto.yml").read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip())
+        if indent == 0:
+            section = line.rstrip().rstrip(":")
+            key = None
+        elif section != "project":
+            continue
+        elif key is not None and line.lstrip().startswith("- "):
+            config[key].append(line.strip()[2:].strip().strip("\"'"))
+        elif indent == 2 and ":" in line:
+            name, _, value = line.strip().partition(":")
+            value = value.strip().strip("\"'")
+            key = None if value else name
+            config[name] = value if value else []
+        else:
+            key = None
+    return config
+
+
+def _project_render_targets(project_root: Path) -> list[str]:
+    """The ``project.render`` list of ``_quarto.yml``."""
+    return list(_project_config(project_root).get("render", []))
+
+
+def _sync_resources(project_root: Path, output_dir: Path, patterns: list[str]) -> int:
+    """Copy project resources that differ from their ``output_dir`` copy; returns the count."""
+    copied = 0
+    for pattern in patterns:
+        for path in sorted(project_root.glob(pattern)):
+            if not path.is_file():
+                continue
+            target = output_dir / path.relative_to(project_root)
+            if target.exists() and target.read_bytes() == path.read_bytes():
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target)
+            copied += 1
+    return copied
+
+
+def _make_scratch_project(project_root: Path, scratch: Path) -> None:
+    """Fresh copy of the project: top-level files copied, directories symlinked."""
+    if scratch.exists():
+        shutil.rmtree(scratch)
+    scratch.mkdir(parents=True)
+    for entry in project_root.iterdir():
+        if entry.name in _SCRATCH_SKIP:
+            continue
+        if entry.is_dir():
+            (scratch / entry.name).symlink_to(entry, target_is_directory=True)
+        else:
+            shutil.copy2(entry, scratch / entry.name)
+
+
+def _merge_tree(src: Path, dst: Path) -> None:
+    for path in src.rglob("*"):
+        target = dst / path.relative_to(src)
+        if path.is_dir():
+            target.mkdir(parents=True, exist_ok=True)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target)
+
+
+def _execute_in_scratch(
+    quarto_bin: str, project_root: Path, scratch: Path, target: str, extra_args: list[str],
+) -> tuple[int, float]:
+    """Render ``target`` in a scratch project; output goes to ``scratch/render.log``."""
+    started = time.perf_counter()
+    _make_scratch_project(project_root, scratch)
+    cmd = [quarto_bin, "render", target, "--profile", PARALLEL_PROFILE, *extra_args]
+    with open(scratch / "render.log", "w", encoding="utf-8") as log:
+        proc = subprocess.run(cmd, cwd=scratch, stdout=log, stderr=subprocess.STDOUT)
+    return int(proc.returncode), time.perf_counter() - started
+
+
+def _render_parallel(
+    quarto_bin: str, project_root: Path, targets: list[str], jobs: int, extra_args: list[str],
+) -> int:
+    """Execute targets concurrently in scratch projects, then assemble from ``_freeze/``."""
+    scratch_root = project_root / ".quarto" / "parallel"
+    scratches = {target: scratch_root / Path(target).with_suffix("").as_posix().replace("/", "__")
+                 for target in targets}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            target: pool.submit(_execute_in_scratch, quarto_bin, project_root, scratches[target], target, extra_args)
+            for target in targets
+        }
+        results = {target: future.result() for target, future in futures.items()}
+
+    failed = [target for target, (code, _s) in results.items() if code != 0]
+    for target, (code, seconds) in results.items():
+        print(f"[quarto_render_safe] {target}: {'ok' if code == 0 else f'exit {code}'} in {seconds:.1f}s")
+    for target in failed:
+        log = scratches[target] / "render.log"
+        print(f"[quarto_render_safe] --- {log} ---\n{log.read_text(encoding='utf-8', errors='replace')}",
+              file=sys.stderr)
+    if failed:
+        return results[failed[0]][0]
+
+    freeze_dir = project_root / "_freeze"
+    for target in targets:
+        fresh = scratches[target] / "_freeze"
+        stem = Path(target).with_suffix("")
+        if (freeze_dir / stem).exists():
+            shutil.rmtree(freeze_dir / stem)
+        if fresh.exists():
+            _merge_tree(fresh, freeze_dir)
+
+    # Assembly: every page is frozen and unchanged since execution, so no kernel runs
+    assemble = [None] if targets == _project_render_targets(project_root) else targets
+    for target in assemble:
+        code = _run_one(quarto_bin, project_root, target, ["--profile", PARALLEL_PROFILE, *extra_args])
+        if code != 0:
+            return code
+    shutil.rmtree(scratch_root, ignore_errors=True)
+    return 0
+
+
+def _render_changed(args: argparse.Namespace, project_root: Path, extra_args: list[str]) -> int:
+    """Render only the stale targets, recording fingerprints of the ones that succeed."""
+    config = _project_config(project_root)
+    output_dir = str(config.get("output-dir") or "_site")
+    targets = args.targets or list(config.get("render", []))
+    stale, fresh, fingerprints = render_plan.plan_render(project_root, targets, output_dir)
+    for target in fresh:
+        print(f"[quarto_render_safe] {target}: unchanged, skipped")
+
+    code = 0
+    if len(stale) > 1 and args.jobs > 1:
+        code = _render_parallel(args.quarto_bin, project_root, stale, args.jobs, extra_args)
+        if code == 0:
+            render_plan.record_rendered(project_root, {t: fingerprints[t] for t in stale})
+    else:
+        for target in stale:
+            code = _run_one(args.quarto_bin, project_root, target, extra_args)
+            if code != 0:
+                break
+            render_plan.record_rendered(project_root, {target: fingerprints[target]})
+    if code != 0:
+        return code
+
+    copied = _sync_resources(project_root, project_root / output_dir, list(config.get("resources", [])))
+    print(f"[quarto_render_safe] rendered {len(stale)}, skipped {len(fresh)}, synced {copied} resource(s)")
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     args, extra_args = _parse_args(argv or sys.argv[1:])
     cwd = Path.cwd().resolve()
@@ -94,6 +282,11 @@ def main(argv: list[str] | None = None) -> int:
     lock = _RenderLock(project_root / ".quarto" / "render.lock")
 
     with lock:
+        if args.changed_only:
+            return _render_changed(args, project_root, extra_args)
+        if args.jobs > 1:
+            targets = args.targets or _project_render_targets(project_root)
+            return _render_parallel(args.quarto_bin, project_root, targets, args.jobs, extra_args)
         targets = args.targets or [None]
         for target in targets:
             code = _run_one(args.quarto_bin, project_root, target, extra_args)
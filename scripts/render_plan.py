@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Input fingerprints for skipping Quarto pages whose data did not change.
+
+Each page declares the files it reads in a ``render-inputs`` front-matter
+list (repo-relative paths or globs)::
+
+    render-inputs:
+      - data/derived/cartola_data.json
+      - data/snapshots/*.json
+
+A page's fingerprint hashes the page itself, those declared inputs and the
+``SHARED_INPUTS`` every page depends on (project config, ``scripts/``,
+``assets/``, filters, the manual JSON sources behind the cycle calendar and the
+manual-events audit every page checks).
+``plan_render()`` compares it with the fingerprint recorded after the page's
+last successful render (``.quarto/render-plan.json``): a page is fresh when
+they match and its ``_site`` output still exists, otherwise it is stale.
+Pages without a ``render-inputs`` declaration are always stale.
+
+Pages that read the clock (the open paredão's countdown and vote projection,
+rounded to 15 minutes) also declare ``render-clock: 15``: the current
+15-minute bucket is part of their fingerprint, so they go stale when it
+turns over even if no input file changed.
+
+Derived JSON files are hashed without their ``generated_at`` stamps: the
+pipeline rewrites them on every build, and a page whose data is otherwise
+identical has nothing new to show.
+
+    python scripts/render_plan.py            # list stale/fresh pages
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+PLAN_FILE = Path(".quarto") / "render-plan.json"
+PLAN_VERSION = 1
+INPUTS_KEY = "render-inputs"
+CLOCK_KEY = "render-clock"
+
+SHARED_INPUTS = (
+    "_quarto.yml",
+    "_quarto-*.yml",
+    "_metadata.yml",
+    "scripts/*.py",
+    "assets/**/*",
+    "filters/*",
+    "data/manual_events.json",
+    "data/paredoes.json",
+    "data/provas.json",
+    "data/derived/manual_events_audit.json",
+)
+# Files under these directories are hashed with their generated_at stamps removed
+VOLATILE_DIRS = ("data/derived",)
+
+
+def _front_matter(page: Path) -> list[str]:
+    """Non-blank, non-comment front-matter lines of a page ([] without front matter)."""
+    lines = page.read_text(encoding="utf-8").splitlines()
+    if not lines or lines[0].strip() != "---":
+        return []
+    front: list[str] = []
+    for line in lines[1:]:
+        if line.strip() == "---":
+            break
+        if line.strip() and not line.lstrip().startswith("#"):
+            front.append(line)
+    return front
+
+
+def page_inputs(page: Path) -> list[str] | None:
+    """The page's ``render-inputs`` list (plain front-matter line scan), or None if undeclared."""
+    inputs: list[str] | None = None
+    in_list = False
+    for line in _front_matter(page):
+        if line.startswith(f"{INPUTS_KEY}:"):
+            inputs, in_list = [], True
+        elif in_list and line.startswith((" ", "\t")) and line.lstrip().startswith("- "):
+            inputs.append(line.strip()[2:].strip().strip("\"'"))
+        else:
+            in_list = False
+    return inputs
+
+
+def page_clock_minutes(page: Path) -> int | None:
+    """The page's ``render-clock`` bucket size in minutes, or None when it does not read the clock."""
+    for line in _front_matter(page):
+        if line.startswith(f"{CLOCK_KEY}:"):
+            value = line.split(":", 1)[1].strip()
+            return int(value) if value.isdigit() and int(value) > 0 else None
+    return None
+
+
+def _expand(project_root: Path, patterns: list[str] | tuple[str, ...]) -> list[Path]:
+    files: set[Path] = set()
+    for pattern in patterns:
+        files.update(p for p in project_root.glob(pattern) if p.is_file())
+    return sorted(files)
+
+
+def _file_digest(project_root: Path, path: Path) -> bytes:
+    data = path.read_bytes()
+    rel = path.relative_to(project_root).as_posix()
+    if path.suffix == ".json" and rel.startswith(VOLATILE_DIRS):
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict):
+            payload.pop("generated_at", None)
+            if isinstance(payload.get("_metadata"), dict):
+                payload["_metadata"].pop("generated_at", None)
+            data = json.dumps(payload, ensure_ascii=False).encode()
+    return hashlib.sha1(data).digest()
+
+
+def _digest(project_root: Path, files: list[Path], cache: dict[Path, bytes] | None = None) -> str:
+    cache = {} if cache is None else cache
+    h = hashlib.sha1()
+    for path in files:
+        if path not in cache:
+            cache[path] = _file_digest(project_root, path)
+        h.update(path.relative_to(project_root).as_posix().encode())
+        h.update(b"\0")
+        h.update(cache[path])
+    return h.hexdigest()
+
+
+def shared_digest(project_root: Path) -> str:
+    """Digest of the inputs every page depends on."""
+    return _digest(project_root, _expand(project_root, SHARED_INPUTS))
+
+
+def page_fingerprint(
+    project_root: Path, target: str, shared: str | None = None, cache: dict[Path, bytes] | None = None,
+    now: datetime | None = None,
+) -> str | None:
+    """Fingerprint of a page and everything it reads; None when its inputs are undeclared.
+
+    ``now`` (default: the current UTC time) picks the clock bucket of
+    ``render-clock`` pages.
+    """
+    page = project_root / target
+    declared = page_inputs(page)
+    if declared is None:
+        return None
+    own = _digest(project_root, sorted({page, *_expand(project_root, declared)}), cache)
+    if shared is None:
+        shared = shared_digest(project_root)
+    minutes = page_clock_minutes(page)
+    if minutes is not None:
+        now = now or datetime.now(timezone.utc)
+        own += f"|clock:{int(now.timestamp()) // (minutes * 60)}"
+    return hashlib.sha1(f"{shared}|{own}".encode()).hexdigest()
+
+
+def output_path(project_root: Path, target: str, output_dir: str = "_site") -> Path:
+    return project_root / output_dir / Path(target).with_suffix(".html")
+
+
+def load_plan(project_root: Path) -> dict[str, str]:
+    """Fingerprints recorded after each page's last successful render."""
+    try:
+        data = json.loads((project_root / PLAN_FILE).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != PLAN_VERSION:
+        return {}
+    return data.get("pages", {})
+
+
+def record_rendered(project_root: Path, fingerprints: dict[str, str | None]) -> None:
+    """Record the fingerprints of successfully rendered pages (undeclared pages are dropped)."""
+    pages = load_plan(project_root)
+    for target, fingerprint in fingerprints.items():
+        if fingerprint is None:
+            pages.pop(target, None)
+        else:
+            pages[target] = fingerprint
+    path = project_root / PLAN_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps({"version": PLAN_VERSION, "pages": dict(sorted(pages.items()))}, indent=2) + "\n",
+                   encoding="utf-8")
+    tmp.replace(path)
+
+
+def plan_render(
+    project_root: Path, targets: list[str], output_dir: str = "_site", now: datetime | None = None,
+) -> tuple[list[str], list[str], dict[str, str | None]]:
+    """Split targets into ``(stale, fresh, fingerprints)``."""
+    recorded = load_plan(project_root)
+    shared = shared_digest(project_root)
+    cache: dict[Path, bytes] = {}
+    now = now or datetime.now(timezone.utc)
+    fingerprints = {target: page_fingerprint(project_root, target, shared, cache, now) for target in targets}
+    stale, fresh = [], []
+    for target in targets:
+        fingerprint = fingerprints[target]
+        if (fingerprint is not None and recorded.get(target) == fingerprint
+                and output_path(project_root, target, output_dir).exists()):
+            fresh.append(target)
+        else:
+            stale.append(target)
+    return stale, fresh, fingerprints
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="List Quarto pages whose inputs changed since their last render.")
+    parser.add_argument("targets", nargs="*", help="Pages to check (default: the project's render list).")
+    parser.add_argument("--project-root", type=Path, default=Path(__file__).resolve().parent.parent)
+    args = parser.parse_args(argv)
+
+    from quarto_render_safe import _project_render_targets
+
+    root = args.project_root.resolve()
+    targets = args.targets or _project_render_targets(root)
+    stale, fresh, _fingerprints = plan_render(root, targets)
+    for target in targets:
+        print(f"{'stale' if target in stale else 'fresh'}  {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -20,6 +20,12 @@ Usage:
 
     # Called by systemd timer (single shot)
     python scripts/schedule_data_fetch.py --once --build --trigger-deploy
+
+Each poll first asks the API in-process (one conditional request on a
+long-lived ``requests.Session``, compared against data/fetch_state.json).
+When nothing changed and no Votalhada work is due, the poll ends there —
+no git pull, no subprocesses, no build. ``--no-fast-path`` restores the
+old always-full cycle.
 """
 
 from __future__ import annotations
@@ -29,14 +35,18 @@ import json
 import subprocess
 import sys
 import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Any
 
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 FETCH_SCRIPT = REPO_ROOT / "scripts" / "fetch_data.py"
 VOTALHADA_SCRIPT = REPO_ROOT / "scripts" / "fetch_votalhada_images.py"
 PAREDOES_JSON = REPO_ROOT / "data" / "paredoes.json"
+# {artifact: changed} report of the last build_derived_data.py run
+ARTIFACT_CHANGES_JSON = REPO_ROOT / "data" / "derived" / "_artifact_changes.json"
 VOTALHADA_CODEX_EXTRACT = REPO_ROOT / "deploy" / "votalhada_codex_extract.sh"
 VOTALHADA_VALIDATE_APPLY = REPO_ROOT / "scripts" / "votalhada_validate_apply.py"
 VOTALHADA_CLAUDE_VERIFY = REPO_ROOT / "deploy" / "votalhada_claude_verify.sh"
@@ -45,6 +55,18 @@ VOTALHADA_CLAUDE_SCRIPT = REPO_ROOT / "deploy" / "votalhada_claude_update.sh"
 LAST_APPLIED = REPO_ROOT / "tmp" / "votalhada_last_applied.json"
 
 
+@dataclass
+class _ApiPoller:
+    """In-process API access kept across polls: one HTTP session and the last fetch state."""
+    session: Any
+    state: dict | None = None
+
+
+def _make_api_poller() -> _ApiPoller:
+    import requests
+    return _ApiPoller(requests.Session())
+
+
 def _format_dt(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%d %H:%M:%S %Z")
 
@@ -74,6 +96,15 @@ def _has_git_changes(*paths: str) -> bool:
     return bool(result.stdout.strip())
 
 
+def _changed_artifacts() -> list[str] | None:
+    """Derived artifacts the last build rewrote, or None when its report is missing/unreadable."""
+    try:
+        changed = json.loads(ARTIFACT_CHANGES_JSON.read_text(encoding="utf-8"))["changed"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return changed if isinstance(changed, list) else None
+
+
 def _run_cmd(cmd: list[str], label: str) -> int:
     """Run a command, log output, return exit code."""
     now = datetime.now(timezone.utc).astimezone()
@@ -302,11 +333,56 @@ def _fetch_votalhada(paredao_num: int) -> bool:
     return _has_git_changes("data/votalhada/")
 
 
-def _poll_once(args: argparse.Namespace) -> dict:
-    """Run one poll cycle. Returns status dict."""
+def _votalhada_work_due(args: argparse.Namespace) -> bool:
+    """True when this cycle has Votalhada work to do whether or not the API changed."""
+    if not (args.votalhada or args.votalhada_auto_update):
+        return False
+    paredao_num = _get_active_paredao()
+    if not paredao_num:
+        return False
+    if args.votalhada and not _votalhada_capture_complete(paredao_num):
+        return True
+    return bool(args.votalhada_auto_update and _should_extract(paredao_num))
+
+
+def _fetch_in_process(poller: _ApiPoller) -> bool:
+    """Run fetch_data.fetch_and_save() on the poller's session. Returns True on success."""
+    import fetch_data
+
+    print(f"\n[{_format_dt(datetime.now(timezone.utc).astimezone())}] fetch (in-process):")
+    try:
+        fetch_data.fetch_and_save(session=poller.session)
+    except Exception as e:
+        print(f"  [fetch] FAILED ({e})")
+        return False
+    return True
+
+
+def _poll_once(args: argparse.Namespace, poller: _ApiPoller | None = None) -> dict:
+    """Run one poll cycle. Returns status dict.
+
+    With a ``poller``, the API is asked first (in-process, nothing written);
+    an unchanged API with no Votalhada work due ends the cycle right there.
+    """
     result = {"fetched": False, "data_changed": False, "built": False, "pushed": False, "deployed": False,
               "votalhada_fetched": False}
 
+    # Fast path — idle polls cost one conditional request, no git or subprocesses
+    if poller is not None and not _votalhada_work_due(args):
+        import fetch_data
+
+        try:
+            changed, poller.state = fetch_data.poll_for_change(poller.session, poller.state)
+        except Exception as e:  # let the full cycle retry and report it
+            print(f"[poll] Fast change check failed ({e}) — running full cycle.")
+            changed = True
+        if not changed:
+            result["fetched"] = True
+            print("[poll] No API data changes — hash unchanged (fast path).")
+            return result
+    if poller is not None:
+        poller.state = None  # the pull below may bring in new snapshots
+
     # 0. Pull first — clean state, no conflicts possible
     pull_rc = _run_cmd(["git", "pull", "--rebase", "origin", "main"], "git-pull")
     if pull_rc != 0:
@@ -317,9 +393,12 @@ def _poll_once(args: argparse.Namespace) -> dict:
         _run_cmd(["git", "reset", "--hard", "origin/main"], "git-reset-hard")
 
     # 1. Fetch
-    rc = _run_cmd([sys.executable, str(FETCH_SCRIPT), "--fetch-only"], "fetch")
-    result["fetched"] = rc == 0
-    if rc != 0:
+    if poller is not None:
+        result["fetched"] = _fetch_in_process(poller)
+    else:
+        rc = _run_cmd([sys.executable, str(FETCH_SCRIPT), "--fetch-only"], "fetch")
+        result["fetched"] = rc == 0
+    if not result["fetched"]:
         print("[poll] Fetch failed, skipping rest of cycle.")
         return result
 
@@ -329,6 +408,10 @@ def _poll_once(args: argparse.Namespace) -> dict:
         print("[poll] New API data detected!")
     else:
         print("[poll] No API data changes — hash unchanged.")
+        # A refreshed fetch state alone is not worth a commit; keep the tree
+        # clean so the next cycle's pull --rebase succeeds
+        if _has_git_changes("data/fetch_state.json"):
+            _run_cmd(["git", "checkout", "--", "data/fetch_state.json"], "git-restore-fetch-state")
 
     # 2b. Votalhada image fetch (optional, only when paredão is active)
     if args.votalhada:
@@ -422,12 +505,18 @@ def _poll_once(args: argparse.Namespace) -> dict:
     # 3. Build derived data (optional)
     if args.build:
         rc = _run_cmd(
-            [sys.executable, str(REPO_ROOT / "scripts" / "build_derived_data.py")],
+            [sys.executable, str(REPO_ROOT / "scripts" / "build_derived_data.py"), "--incremental"],
             "build",
         )
         result["built"] = rc == 0
         if rc != 0:
             print("[poll] Build failed — committing snapshot only.")
+        elif _changed_artifacts() == []:
+            # Same site as before: commit only the new inputs, no re-render
+            result["derived_unchanged"] = True
+            print("[poll] No derived artifact changed — skipping derived commit and deploy.")
+            _run_cmd(["git", "checkout", "--", "data/derived/", "docs/MANUAL_EVENTS_AUDIT.md",
+                      "docs/SCORING_AND_INDEXES.md"], "git-restore-derived")
 
     # 4. Git commit + push (pull already happened at top of cycle)
     # Validate critical JSON files before staging
@@ -440,8 +529,8 @@ def _poll_once(args: argparse.Namespace) -> dict:
                 _heal_corrupt_json(critical_json, critical_json.name)
 
     # Stage files
-    add_paths = ["data/snapshots/", "data/latest.json"]
-    if result["built"]:
+    add_paths = ["data/snapshots/", "data/latest.json", "data/fetch_state.json"]
+    if result["built"] and not result.get("derived_unchanged"):
         add_paths.extend(["data/derived/", "docs/MANUAL_EVENTS_AUDIT.md", "docs/SCORING_AND_INDEXES.md"])
     if result["votalhada_fetched"]:
         add_paths.append("data/votalhada/")
@@ -475,7 +564,7 @@ def _poll_once(args: argparse.Namespace) -> dict:
         result["pushed"] = rc == 0
 
     # 5. Trigger deploy (optional)
-    if result["pushed"] and args.trigger_deploy:
+    if result["pushed"] and args.trigger_deploy and not result.get("derived_unchanged"):
         rc = _run_cmd(["gh", "workflow", "run", "daily-update.yml"], "deploy")
         result["deployed"] = rc == 0
 
@@ -506,6 +595,10 @@ def _parse_args() -> argparse.Namespace:
         "--votalhada-auto-update", action="store_true",
         help="Auto-update polls.json via Claude Code headless when new images are found.",
     )
+    parser.add_argument(
+        "--no-fast-path", action="store_true",
+        help="Always run the full cycle (git pull + fetch subprocess), even when the API is unchanged.",
+    )
     parser.add_argument(
         "--dry-run", action="store_true",
         help="Print schedule without executing.",
@@ -529,6 +622,7 @@ def main() -> int:
     print(f"  build: {args.build}")
     print(f"  votalhada: {args.votalhada}")
     print(f"  trigger-deploy: {args.trigger_deploy}")
+    print(f"  fast path: {not args.no_fast_path}")
     print(f"  repo: {REPO_ROOT}")
     print(f"  now (UTC): {_format_dt(datetime.now(timezone.utc))}")
     print()
@@ -543,6 +637,7 @@ def main() -> int:
         print("\n(dry-run — no polling executed)")
         return 0
 
+    poller = None if args.no_fast_path else _make_api_poller()
     cycle = 0
     while True:
         if not args.run_now or cycle > 0:
@@ -558,12 +653,12 @@ def main() -> int:
         print(f"[scheduler] Poll cycle {cycle} at {_format_dt(now)}")
         print(f"{'='*60}")
 
-        result = _poll_once(args)
+        result = _poll_once(args, poller)
         status_parts = []
         if result["data_changed"]:
             status_parts.append("NEW DATA")
             if result["built"]:
-                status_parts.append("built")
+                status_parts.append("built (no derived changes)" if result.get("derived_unchanged") else "built")
             if result["pushed"]:
                 status_parts.append("pushed")
             if result["deployed"]:
@@ -7,6 +7,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
 
 from builders.balance import (
+    BalanceSeries,
     build_balance_events,
     build_compras_fairness,
     _classify_event,
@@ -26,7 +27,10 @@ from builders.balance import (
     MESADA_TOLERANCE,
     MESADA_MIN_MATCH_RATIO,
     MESADA_NEAR_UNIFORM_RATIO,
+    load_balance_series,
+    save_balance_series,
 )
+from data_utils import CycleCalendar
 
 
 # ─── Helpers ────────────────────────────────────────────────────────────────
@@ -255,6 +259,86 @@ class TestMergeEvents:
         merged = _merge_events(events)
         assert len(merged) == 2  # Different people, no overlap
 
+    def test_merge_skips_closed_events(self):
+        from datetime import datetime, timedelta, timezone
+        t0 = datetime(2026, 2, 1, 12, 0, tzinfo=timezone.utc)
+        events = [
+            {"type": "punicao", "changes": {"Alice": -50}, "_timestamp": t0 + timedelta(hours=h),
+             "from_snapshot": f"s{h}", "to_snapshot": f"s{h + 1}"}
+            for h in (0, 1, 2, 5, 6)
+        ]
+        merged = _merge_events(events)
+        # 12h, 13h and 14h chain into one (each within 2h of the latest); 17h reopens
+        assert [m["changes"]["Alice"] for m in merged] == [-150, -100]
+        assert [m["to_snapshot"] for m in merged] == ["s3", "s7"]
+
+
+# ─── BalanceSeries ──────────────────────────────────────────────────────────
+
+
+def _series_season():
+    """Captures with an entry, an exit, a transition to zero and an unchanged capture."""
+    rows = [
+        {"Alice": 500, "Bob": 500, "Caio": 100},
+        {"Alice": 500, "Bob": 500, "Caio": 100},
+        {"Alice": 1500, "Bob": 1000, "Caio": 0, "Duda": 300},
+        {"Alice": 1450, "Caio": 0, "Duda": 300},
+        {"Alice": 1450, "Bob": 900, "Caio": 50, "Duda": 0},
+    ]
+    return [
+        _make_snap("2026-02-01", [_make_participant(n, b) for n, b in row.items()], f"2026-02-01_{h:02d}-00-00")
+        for h, row in enumerate(rows)
+    ]
+
+
+class TestBalanceSeries:
+    def test_matrix_and_mask(self):
+        series = BalanceSeries.build(_series_season())
+        assert series.names == ["Alice", "Bob", "Caio", "Duda"]
+        assert series.balances.dtype.name == "int32" and series.balances.shape == (5, 4)
+        assert series.present[3].tolist() == [True, False, True, True]
+        assert series.balances[2].tolist() == [1500, 1000, 0, 300]
+
+    def test_transitions_match_dict_walk(self):
+        snaps = _series_season()
+        deltas, new_zeros, n_active = BalanceSeries.build(snaps).transitions()
+        for t, (prev, cur) in enumerate(zip(snaps, snaps[1:])):
+            before, after = _get_balances(prev["participants"]), _get_balances(cur["participants"])
+            common = before.keys() & after.keys()
+            assert n_active[t] == len(common)
+            assert {n: after[n] - before[n] for n in common if after[n] != before[n]} == {
+                name: int(d) for name, d in zip(["Alice", "Bob", "Caio", "Duda"], deltas[t]) if d
+            }
+            assert {n for n in common if after[n] == 0 and before[n] > 0} == {
+                name for name, z in zip(["Alice", "Bob", "Caio", "Duda"], new_zeros[t]) if z
+            }
+
+    def test_appended_series_matches_build(self, tmp_path):
+        snaps = _series_season()
+        path = tmp_path / "_balance_series.json"
+        save_balance_series(BalanceSeries.build(snaps[:2]), path)
+        saved = load_balance_series(path)
+        resumed = saved.resumed(snaps)
+        full = BalanceSeries.build(snaps)
+        assert len(saved.stems) == 2  # resumed() does not modify the saved series
+        assert resumed.names == full.names and resumed.stems == full.stems
+        assert (resumed.balances == full.balances).all() and (resumed.present == full.present).all()
+        assert build_balance_events(snaps, series=saved)["events"] == build_balance_events(snaps)["events"]
+        assert build_balance_events(snaps, series=full)["events"] == build_balance_events(snaps)["events"]
+
+    def test_replaced_capture_forces_rebuild(self):
+        snaps = _series_season()
+        series = BalanceSeries.build(snaps[:3])
+        snaps[1] = {**snaps[1], "file": "data/snapshots/2026-02-01_01-30-00.json"}
+        assert not series.covers_prefix_of(snaps)
+        assert series.resumed(snaps).stems == BalanceSeries.build(snaps).stems
+
+    def test_unreadable_or_old_series_is_ignored(self, tmp_path):
+        path = tmp_path / "_balance_series.json"
+        assert load_balance_series(path) is None
+        path.write_text('{"_metadata": {"version": 0}}', encoding="utf-8")
+        assert load_balance_series(path) is None
+
 
 # ─── build_balance_events (integration) ─────────────────────────────────────
 
@@ -842,13 +926,10 @@ class TestPunishmentDeepDive:
     def test_ta_com_nada_cycles(self, monkeypatch):
         """ta_com_nada_analysis must compute cycle gaps for participants with 2+ zeros."""
         monkeypatch.setattr("data_utils.load_roles_daily", lambda: {"daily": []})
-        # Mock get_cycle_number to return simple values
-        import builders.balance as bal_mod
-        orig_gcn = bal_mod.get_cycle_number
-        cycle_map = {"2026-01-20": 2, "2026-02-05": 4, "2026-03-10": 7}
-        monkeypatch.setattr(bal_mod, "get_cycle_number", lambda d: cycle_map.get(d, orig_gcn(d)))
+        # Boundaries that put 2026-01-20 / 02-05 / 03-10 in cycles 2 / 4 / 7
+        calendar = CycleCalendar(["2026-01-19", "2026-01-25", "2026-02-01", "2026-02-10", "2026-02-20", "2026-03-01"])
 
-        result = _build_punishment_deep_dive(self._make_events(), self._make_by_participant())
+        result = _build_punishment_deep_dive(self._make_events(), self._make_by_participant(), calendar)
         tcn = result["ta_com_nada_analysis"]
         # Alice has 3 dates → 2 gaps
         assert "Alice" in tcn
@@ -36,6 +36,7 @@ from build_derived_data import (
     RELATION_SINC_BACKLASH_FACTOR,
     RELATION_VISIBILITY_FACTOR,
 )
+from builders.relations import _compute_pair_scores
 from data_utils import build_reaction_matrix, SENTIMENT_WEIGHTS
 
 
@@ -582,6 +583,69 @@ class TestComputeBaseWeightsAll:
         assert "Bob" in base.get("Alice", {})
 
 
+class TestComputePairScores:
+    """_compute_pair_scores() array core against the per-pair/per-edge reference."""
+
+    @staticmethod
+    def _reference_pairs(base_weights, edges, names, latest, streak_info):
+        pairs = {}
+        for a in names:
+            pairs[a] = {}
+            for b in names:
+                if a == b:
+                    continue
+                base = base_weights.get(a, {}).get(b)
+                if base is None:
+                    base = SENTIMENT_WEIGHTS.get(latest.get((a, b), ""), 0.0)
+                streak = streak_info.get(a, {}).get(b) or {}
+                pairs[a][b] = {
+                    "score": round(base, 4),
+                    "components": {"queridometro": round(base, 4)},
+                    "streak_len": streak.get("streak_len", 0),
+                    "break": bool(streak.get("break_from_positive")),
+                }
+        for edge in edges:
+            rec = pairs.get(edge["actor"], {}).get(edge["target"])
+            if rec is None:
+                continue
+            rec["score"] = round(rec["score"] + edge["weight"], 4)
+            rec["components"][edge["type"]] = round(rec["components"].get(edge["type"], 0.0) + edge["weight"], 4)
+        return pairs
+
+    def test_matches_reference(self, three_person_snapshots):
+        import random
+
+        rng = random.Random(7)
+        snaps = three_person_snapshots
+        names = ["Alice", "Bob", "Carol"]
+        latest = build_reaction_matrix(snaps[-1]["participants"])
+        streak_info, _, _ = compute_streak_data(snaps)
+        edges_raw = [
+            {"actor": rng.choice(names + ["Prova do Líder"]), "target": rng.choice(names),
+             "type": rng.choice(["vote", "sincerao", "power_event", "vip"]),
+             "weight_raw": rng.choice([-1.0, -0.35, 0.2, 0.15]) * rng.choice([1, 1.5, 0.5])}
+            for _ in range(60)
+        ]
+        result = _compute_pair_scores(snaps, latest, streak_info, {}, names, set(names), names, edges_raw,
+                                      "2026-01-24", "2026-01-22")
+
+        edges = result["edges"]
+        base_daily = _compute_base_weights("2026-01-24", names, snaps, latest, streak_info)
+        base_paredao = _compute_base_weights("2026-01-22", names, snaps, latest, streak_info)
+        expected_daily = self._reference_pairs(base_daily, edges, names, latest, streak_info)
+        expected_paredao = self._reference_pairs(base_paredao, edges, names, latest, streak_info)
+
+        strip = {"vote_contradiction", "active_pair"}
+        for got, expected in ((result["pairs_daily"], expected_daily), (result["pairs_paredao"], expected_paredao)):
+            for a, targets in expected.items():
+                for b, rec in targets.items():
+                    actual = {k: v for k, v in got[a][b].items() if k not in strip}
+                    assert actual == rec
+                    # Component order follows each pair's first edge of that type
+                    assert list(actual["components"]) == list(rec["components"])
+        assert result["pairs_all"]["Alice"]["Bob"]["active_pair"] is True
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Priority 2: Edge Builders
 # ═══════════════════════════════════════════════════════════════════════════════
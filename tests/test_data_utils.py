@@ -10,6 +10,8 @@ from data_utils import (
     get_cycle_number,
     get_cycle_start_date,
     get_effective_cycle_end_dates,
+    get_cycle_calendar,
+    CycleCalendar,
     CYCLE_END_DATES,
     parse_roles,
     build_reaction_matrix,
@@ -246,6 +248,36 @@ class TestGetCycleStartDate:
         assert get_cycle_start_date(0) == "2026-01-13"
 
 
+class TestCycleCalendar:
+    """Test CycleCalendar — precomputed lookups matching the cycle helpers."""
+
+    def test_matches_cycle_helpers(self):
+        ends = ["2026-01-21", "2026-01-28", "2026-02-04"]
+        calendar = CycleCalendar(ends)
+        day = datetime(2026, 1, 1)
+        dates = [(day + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(300)]
+        assert [calendar.cycle(d) for d in dates] == [get_cycle_number(d, ends) for d in dates]
+        assert calendar.cycles_for(dates) == [get_cycle_number(d, ends) for d in dates]
+        assert [calendar.start(c) for c in range(5)] == [get_cycle_start_date(c, ends) for c in range(5)]
+
+    def test_dates_outside_the_table(self):
+        calendar = CycleCalendar(["2026-01-21"])
+        assert calendar.cycle("2025-12-31") == 1
+        assert calendar.cycle("2030-01-01") == 2
+        assert calendar.cycles_for([]) == []
+
+    def test_end_and_cycle_count(self):
+        calendar = CycleCalendar(["2026-01-21", "2026-01-28"])
+        assert calendar.n_cycles == 3
+        assert calendar.end(2) == "2026-01-28"
+        assert calendar.end(3) is None
+
+    def test_default_calendar_uses_effective_boundaries(self):
+        calendar = get_cycle_calendar()
+        assert list(calendar.boundaries) == get_effective_cycle_end_dates()
+        assert calendar is get_cycle_calendar()
+
+
 class TestCycleCompatibility:
     """Test cycle aliases and bridge behavior."""
 
@@ -3,6 +3,7 @@
 Covers: data loaders, helper functions, poll/prediction functions, viz helpers,
 snapshot utilities, and timeline rendering.
 """
+import copy
 import json
 import math
 import subprocess
@@ -31,11 +32,20 @@ from data_utils import (
     load_paredao_analysis,
     load_reaction_matrices,
     deserialize_matrix,
+    encode_reaction_matrices,
+    ReactionMatrices,
+    write_json_artifact,
+    JsonFileCache,
     load_votalhada_polls,
     load_sincerao_edges,
     get_all_snapshots,
     get_daily_snapshots,
     get_all_snapshots_with_data,
+    SnapshotStore,
+    load_snapshots_archived,
+    pack_snapshots,
+    read_snapshot_archive,
+    snapshot_archive_path,
     # Helpers
     genero,
     artigo,
@@ -48,15 +58,28 @@ from data_utils import (
     render_cronologia_variant,
     normalize_actors,
     patch_missing_raio_x,
+    build_reaction_matrix,
+    ReactionMatrixCache,
+    REACTION_MATRIX_CACHE,
+    clear_reaction_matrix_cache,
+    get_reaction_matrix,
     # Poll/prediction
     get_poll_for_paredao,
     calculate_poll_accuracy,
     calculate_precision_weights,
     predict_precision_weighted,
     backtest_precision_model,
+    backtest_forward_only,
+    calibration_grid_search,
+    CALIBRATION_GAMMA,
     parse_votalhada_hora,
     # Snapshot helpers
     load_snapshots_full,
+    load_capture_matrices,
+    calc_sentiment,
+    page_bundle_path,
+    read_page_bundle,
+    write_page_bundle,
     # Other
     require_clean_manual_events,
     setup_bbb_dark_theme,
@@ -590,6 +613,127 @@ class TestLoadReactionMatricesAndDeserialize:
         assert roundtripped == original
 
 
+class TestCompactReactionMatrices:
+    """Test encode_reaction_matrices() and ReactionMatrices."""
+
+    BY_DATE = {
+        "2026-01-21": {"Carol|Alice": "Cobra", "Bob|Alice": "Coração", "Alice|Bob": "Planta", "Alice|Carol": "Coração"},
+        "2026-01-20": {"Bob|Alice": "Coração", "Alice|Bob": "Coração"},
+    }
+
+    def test_roundtrip_keeps_dates_and_pair_order(self):
+        payload = json.loads(json.dumps(encode_reaction_matrices(self.BY_DATE)))
+        assert payload["names"] == ["Alice", "Bob", "Carol"]
+        assert payload["all_dates"] == ["2026-01-20", "2026-01-21"]
+        decoded = ReactionMatrices(payload)
+        assert decoded.dates == ["2026-01-21", "2026-01-20"]
+        for date, serialized in self.BY_DATE.items():
+            assert list(decoded.serialized(date).items()) == list(serialized.items())
+            assert list(decoded.matrix(date).items()) == list(deserialize_matrix(serialized).items())
+
+    def test_codes_grid(self):
+        for payload in (encode_reaction_matrices(self.BY_DATE), {"by_date": self.BY_DATE}):
+            decoded = ReactionMatrices(payload)
+            people, grid = decoded.codes("2026-01-21")
+            assert people == ["Alice", "Bob", "Carol"]
+            assert grid.tolist() == [
+                [-1, decoded.labels.index("Planta"), decoded.labels.index("Coração")],
+                [decoded.labels.index("Coração"), -1, -1],
+                [decoded.labels.index("Cobra"), -1, -1],
+            ]
+
+    def test_codes_roundtrip_with_more_than_127_labels(self):
+        labels = [f"label{i:03d}" for i in range(200)]
+        names = [f"P{i:02d}" for i in range(15)]
+        pairs = [(g, r) for g in names for r in names if g != r]
+        by_date = {"2026-01-20": {f"{g}|{r}": labels[i % len(labels)] for i, (g, r) in enumerate(pairs)}}
+        decoded = ReactionMatrices(json.loads(json.dumps(encode_reaction_matrices(by_date))))
+        people, grid = decoded.codes("2026-01-20")
+        assert int(grid.max()) == len(labels) - 1
+        assert {
+            (people[g], people[r]): decoded.labels[code]
+            for g, row in enumerate(grid.tolist()) for r, code in enumerate(row) if code >= 0
+        } == deserialize_matrix(by_date["2026-01-20"])
+        assert decoded.serialized("2026-01-20") == by_date["2026-01-20"]
+
+    def test_legacy_payload_and_missing_dates(self):
+        decoded = ReactionMatrices({"by_date": self.BY_DATE})
+        assert not decoded.compact
+        assert "2026-01-22" not in decoded
+        assert decoded.matrix("2026-01-20") == {("Bob", "Alice"): "Coração", ("Alice", "Bob"): "Coração"}
+        assert decoded.matrix("2026-01-20") is decoded.matrix("2026-01-20")
+
+
+class TestWriteJsonArtifact:
+    """Test write_json_artifact() hash gating."""
+
+    def test_skips_stamp_and_key_order_only_changes(self, tmp_path):
+        path = tmp_path / "a.json"
+        assert write_json_artifact(path, {"_metadata": {"generated_at": "t1", "source": "x"}, "rows": {1: "a", 2: "b"}})
+        before = path.read_text(encoding="utf-8")
+        assert not write_json_artifact(path, {"rows": {2: "b", 1: "a"}, "_metadata": {"source": "x", "generated_at": "t2"}})
+        assert path.read_text(encoding="utf-8") == before
+        assert not list(tmp_path.glob(".*.tmp"))
+
+    def test_writes_changed_content(self, tmp_path):
+        path = tmp_path / "a.json"
+        write_json_artifact(path, {"_metadata": {"generated_at": "t1"}, "rows": [1, 2]})
+        assert write_json_artifact(path, {"_metadata": {"generated_at": "t2"}, "rows": [2, 1]})
+        assert json.loads(path.read_text(encoding="utf-8")) == {"_metadata": {"generated_at": "t2"}, "rows": [2, 1]}
+
+    def test_rewrites_unreadable_file(self, tmp_path):
+        path = tmp_path / "a.json"
+        path.write_text("{truncated", encoding="utf-8")
+        assert write_json_artifact(path, [("a", 1)])
+        assert json.loads(path.read_text(encoding="utf-8")) == [["a", 1]]
+        assert not write_json_artifact(path, [["a", 1]])
+
+
+class TestJsonFileCache:
+    """Test the mtime/size-keyed JSON cache behind the load_* helpers."""
+
+    def test_repeated_loads_share_one_read_only_parse(self, tmp_path, monkeypatch):
+        derived = tmp_path / "data" / "derived"
+        derived.mkdir(parents=True)
+        (derived / "daily_metrics.json").write_text(json.dumps({"daily": [{"date": "2026-01-20"}]}), encoding="utf-8")
+        monkeypatch.chdir(tmp_path)
+
+        first = load_daily_metrics()
+        assert load_daily_metrics() is first
+        with pytest.raises(TypeError):
+            first["daily"].append({})
+        with pytest.raises(TypeError):
+            first["daily"][0]["date"] = "x"
+        mutable = copy.deepcopy(first)
+        mutable["daily"].append({})
+        assert type(mutable) is dict and len(first["daily"]) == 1
+
+    def test_edited_file_is_reloaded(self, tmp_path):
+        cache = JsonFileCache()
+        path = tmp_path / "a.json"
+        path.write_text('{"v": 1}', encoding="utf-8")
+        assert cache.get(path) == {"v": 1}
+        path.write_text('{"v": 2}', encoding="utf-8")
+        assert cache.get(path) == {"v": 2}
+        assert cache.loads == 2
+
+    def test_evicts_least_recently_used_by_bytes(self, tmp_path):
+        cache = JsonFileCache(max_bytes=25)
+        paths = []
+        for name in "abc":
+            paths.append(tmp_path / f"{name}.json")
+            paths[-1].write_text(json.dumps({"k": name * 5}), encoding="utf-8")  # 14 bytes each
+        a, b, c = paths
+        cache.get(a)
+        cache.get(b)  # over budget: a is evicted
+        cache.get(b)
+        assert cache.loads == 2
+        cache.get(a)  # reloaded, b evicted
+        cache.get(c)  # a evicted
+        cache.get(c)
+        assert cache.loads == 4
+
+
 class TestLoadVotalhadaPolls:
     """Test load_votalhada_polls()."""
 
@@ -708,6 +852,101 @@ class TestGetAllSnapshotsWithData:
         assert "Bob" in names
 
 
+class TestSnapshotStore:
+    """Test SnapshotStore sharing parsed snapshots across callers."""
+
+    def test_parses_each_file_once(self, snapshot_dir):
+        store = SnapshotStore(snapshot_dir)
+        first = get_all_snapshots_with_data(snapshot_dir, store=store)
+        second = get_all_snapshots_with_data(snapshot_dir, store=store)
+        assert first is second
+        assert store.files_parsed == 3
+
+    def test_daily_view_is_cached(self, snapshot_dir):
+        store = SnapshotStore(snapshot_dir)
+        daily = store.daily()
+        assert [s["date"] for s in daily] == ["2026-01-20", "2026-01-21"]
+        assert store.daily() is daily
+        assert store.files_parsed == 3
+
+    def test_matches_uncached_loader(self, snapshot_dir):
+        store = SnapshotStore(snapshot_dir)
+        assert store.all() == get_all_snapshots_with_data(snapshot_dir)
+
+
+class TestSnapshotArchive:
+    """Test the packed snapshot archive (data/snapshots.npz)."""
+
+    def test_round_trip_is_exact(self, snapshot_dir):
+        expected = get_all_snapshots_with_data(snapshot_dir)
+        first = load_snapshots_archived(snapshot_dir)
+        second = load_snapshots_archived(snapshot_dir)
+        assert snapshot_archive_path(snapshot_dir).exists()
+        assert json.dumps(first) == json.dumps(expected)
+        assert json.dumps(second) == json.dumps(expected)
+
+    def test_reaction_codes_match_get_reaction_matrix_per_capture(self, snapshot_dir):
+        np = pytest.importorskip("numpy")
+        for _load in range(2):  # the first load writes the archive, the second reads it
+            clear_reaction_matrix_cache()
+            snapshots = SnapshotStore(snapshot_dir, use_archive=True).all()
+            for snap in snapshots:
+                names, grid, labels = REACTION_MATRIX_CACHE.codes(snap)
+                assert names[:len(snap["participants"])] == [p["name"] for p in snap["participants"]]
+                decoded = {
+                    (names[g], names[r]): labels[code] for (g, r), code in np.ndenumerate(grid) if code >= 0
+                }
+                assert decoded == get_reaction_matrix(snap)
+        clear_reaction_matrix_cache()
+
+    def test_reaction_codes_cover_givers_outside_the_capture(self, snapshot_dir):
+        snapshots = get_all_snapshots_with_data(snapshot_dir)
+        rxn = snapshots[0]["participants"][0]["characteristics"]["receivedReactions"][0]
+        rxn["participants"] = rxn["participants"] + [{"name": "Zed"}]
+        snapshots[1]["participants"][0]["name"] = ""
+        cache = ReactionMatrixCache()
+        cache.add_archive(snapshots, pack_snapshots(snapshots, [(0, 0)] * len(snapshots)))
+        names, grid, labels = cache.codes(snapshots[0])
+        assert names[-1] == "Zed"
+        assert labels[grid[-1, 0]] == rxn["label"]
+        assert cache.codes(snapshots[1]) is None  # unnamed participant: dict matrices only
+        assert cache.codes(copy.deepcopy(snapshots[0])) is None
+
+    def test_appends_new_captures_without_reparsing(self, snapshot_dir, monkeypatch):
+        import data_utils
+
+        newest = sorted(snapshot_dir.glob("*.json"))[-1]
+        held = newest.read_text(encoding="utf-8")
+        newest.unlink()
+        load_snapshots_archived(snapshot_dir)
+        newest.write_text(held, encoding="utf-8")
+
+        parsed = []
+        original = data_utils.load_snapshot
+        monkeypatch.setattr(data_utils, "load_snapshot", lambda fp: parsed.append(fp.name) or original(fp))
+        store = SnapshotStore(snapshot_dir, use_archive=True)
+        assert json.dumps(store.all()) == json.dumps(get_all_snapshots_with_data(snapshot_dir))
+        assert parsed[0] == newest.name and store.files_parsed == 1
+        arrays = read_snapshot_archive(snapshot_archive_path(snapshot_dir))
+        assert json.loads(arrays["tables"].tobytes())["files"][-1] == newest.name
+
+    def test_edited_capture_is_reloaded(self, snapshot_dir):
+        load_snapshots_archived(snapshot_dir)
+        first = sorted(snapshot_dir.glob("*.json"))[0]
+        data = json.loads(first.read_text(encoding="utf-8"))
+        data["participants"][0]["characteristics"]["balance"] = 12345
+        first.write_text(json.dumps(data), encoding="utf-8")
+        reloaded = load_snapshots_archived(snapshot_dir)
+        assert reloaded[0]["participants"][0]["characteristics"]["balance"] == 12345
+        assert json.dumps(reloaded) == json.dumps(get_all_snapshots_with_data(snapshot_dir))
+
+    def test_unpackable_balance_is_rejected(self, snapshot_dir):
+        snapshots = get_all_snapshots_with_data(snapshot_dir)
+        snapshots[0]["participants"][0]["characteristics"]["balance"] = "500"
+        with pytest.raises(ValueError):
+            pack_snapshots(snapshots, [(0, 0)] * len(snapshots))
+
+
 class TestLoadSnapshotsFull:
     """Test load_snapshots_full()."""
 
@@ -760,6 +999,67 @@ class TestLoadSnapshotsFull:
         assert late == {}
 
 
+class TestPageBundle:
+    """Test the page bundle behind load_snapshots_full()."""
+
+    def test_bundle_matches_raw_load(self, snapshot_dir, monkeypatch):
+        import data_utils
+
+        raw = load_snapshots_full(snapshot_dir)
+        write_page_bundle(get_all_snapshots_with_data(snapshot_dir), page_bundle_path(snapshot_dir))
+        monkeypatch.setattr(data_utils, "load_snapshot", lambda fp: pytest.fail("bundle should be used"))
+
+        bundled = load_snapshots_full(snapshot_dir)
+        assert bundled[1:3] == raw[1:3] and bundled[4] == raw[4]
+        assert [s["label"] for s in bundled[3]] == [s["label"] for s in raw[3]]
+        for b, r in zip(bundled[0], raw[0]):
+            assert (b["filepath"], b["date"], b["metadata"]) == (r["filepath"], r["date"], r["metadata"])
+            assert build_reaction_matrix(b["participants"]) == build_reaction_matrix(r["participants"])
+            for pb, pr in zip(b["participants"], r["participants"]):
+                assert pb["characteristics"]["balance"] == pr["characteristics"]["balance"]
+                assert calc_sentiment(pb) == calc_sentiment(pr)
+
+    def test_new_capture_invalidates_bundle(self, snapshot_dir):
+        write_page_bundle(get_all_snapshots_with_data(snapshot_dir), page_bundle_path(snapshot_dir))
+        assert read_page_bundle(snapshot_dir) is not None
+        newest = sorted(snapshot_dir.glob("*.json"))[-1]
+        (snapshot_dir / "2026-01-22_15-00-00.json").write_text(newest.read_text(encoding="utf-8"), encoding="utf-8")
+        assert read_page_bundle(snapshot_dir) is None
+        assert len(load_snapshots_full(snapshot_dir)[0]) == 4
+
+    def test_reused_bundle_matches_rebuild(self, snapshot_dir, tmp_path):
+        snapshots = get_all_snapshots_with_data(snapshot_dir)
+        path = page_bundle_path(snapshot_dir)
+        write_page_bundle(snapshots[:2], path)
+        write_page_bundle(snapshots, path, reuse=True)
+        write_page_bundle(snapshots, tmp_path / "rebuilt.json")
+        assert path.read_text(encoding="utf-8") == (tmp_path / "rebuilt.json").read_text(encoding="utf-8")
+        assert json.loads(path.read_text(encoding="utf-8"))["late_entrants"] == {"Carol": "2026-01-21"}
+
+    def test_reuse_rebuilds_bundle_after_capture_edit(self, snapshot_dir, tmp_path):
+        snapshots = get_all_snapshots_with_data(snapshot_dir)
+        path = page_bundle_path(snapshot_dir)
+        write_page_bundle(snapshots, path)
+        first = Path(snapshots[0]["file"])
+        first.write_text(first.read_text(encoding="utf-8").replace("500", "501"), encoding="utf-8")
+        snapshots = get_all_snapshots_with_data(snapshot_dir)
+        write_page_bundle(snapshots, path, reuse=True)
+        write_page_bundle(snapshots, tmp_path / "rebuilt.json")
+        assert path.read_text(encoding="utf-8") == (tmp_path / "rebuilt.json").read_text(encoding="utf-8")
+
+    def test_capture_matrices_share_daily_matrix(self, snapshot_dir, monkeypatch):
+        import data_utils
+
+        snapshots = load_snapshots_full(snapshot_dir)[0]
+        monkeypatch.setattr(data_utils, "load_reaction_matrices", lambda: {
+            "by_date": {"2026-01-20": {"Alice|Bob": "Coração"}},
+        })
+        matrices = load_capture_matrices(snapshots)
+        first_day = [m for s, m in zip(snapshots, matrices) if s["date"] == "2026-01-20"]
+        assert all(m is first_day[0] for m in first_day) and first_day[0] == {("Alice", "Bob"): "Coração"}
+        assert matrices[-1] == build_reaction_matrix(snapshots[-1]["participants"])
+
+
 # ══════════════════════════════════════════════════════════════
 # Priority 2: Helper Functions
 # ══════════════════════════════════════════════════════════════
@@ -1261,6 +1561,63 @@ class TestPatchMissingRaioX:
         assert result[("Bob", "Alice")] == "Planta"  # Not overwritten
 
 
+def _rx_participant(name, given_by=None, eliminated=False):
+    """Participant who received a Coração from each name in given_by."""
+    reactions = []
+    if given_by:
+        reactions.append({"label": "Coração", "amount": len(given_by),
+                          "participants": [{"name": g} for g in given_by]})
+    return {"name": name, "characteristics": {"eliminated": eliminated, "receivedReactions": reactions}}
+
+
+class TestReactionMatrixCache:
+    """Test ReactionMatrixCache memoization and Raio-X variants."""
+
+    def test_raw_matches_builder_and_is_memoized(self, sample_participants):
+        cache = ReactionMatrixCache()
+        snap = {"file": "a.json", "date": "2026-01-20", "participants": sample_participants}
+        first = cache.raw(snap)
+        assert first == build_reaction_matrix(sample_participants)
+        assert cache.raw(snap) is first
+        assert cache.builds == 1
+
+    def test_same_key_different_participants_is_rebuilt(self, sample_participants):
+        cache = ReactionMatrixCache()
+        snap_a = {"file": "a.json", "date": "2026-01-20", "participants": sample_participants}
+        snap_b = {"file": "a.json", "date": "2026-01-20", "participants": sample_participants[:1]}
+        assert cache.raw(snap_a) != cache.raw(snap_b)
+        assert cache.builds == 2
+
+    def test_active_only_variant(self):
+        cache = ReactionMatrixCache()
+        parts = [_rx_participant("Alice", ["Bob"]), _rx_participant("Bob", ["Alice"], eliminated=True)]
+        snap = {"date": "2026-01-20", "participants": parts}
+        assert cache.raw(snap) == {("Bob", "Alice"): "Coração", ("Alice", "Bob"): "Coração"}
+        assert cache.raw(snap, active_only=True) == {("Bob", "Alice"): "Coração"}
+
+    def test_patched_matches_patch_missing_raio_x_without_mutating_raw(self):
+        cache = ReactionMatrixCache()
+        prev = {"date": "2026-01-20", "participants": [_rx_participant("Alice", ["Bob"]), _rx_participant("Bob", ["Alice"])]}
+        curr = {"date": "2026-01-21", "participants": [_rx_participant("Alice"), _rx_participant("Bob", ["Alice"])]}
+        prev_matrix = cache.raw(prev)
+        expected, expected_carried = patch_missing_raio_x(
+            build_reaction_matrix(curr["participants"]), curr["participants"], dict(prev_matrix))
+        patched, carried = cache.patched(curr, prev_matrix)
+        assert patched == expected
+        assert carried == expected_carried == ["Bob"]
+        assert ("Bob", "Alice") not in cache.raw(curr)
+        assert cache.patched(curr, prev_matrix)[0] is patched
+
+    def test_series_chains_carry_forward(self):
+        cache = ReactionMatrixCache()
+        day1 = {"date": "2026-01-20", "participants": [_rx_participant("Alice", ["Bob"]), _rx_participant("Bob", ["Alice"])]}
+        day2 = {"date": "2026-01-21", "participants": [_rx_participant("Alice"), _rx_participant("Bob", ["Alice"])]}
+        day3 = {"date": "2026-01-22", "participants": [_rx_participant("Alice"), _rx_participant("Bob", ["Alice"])]}
+        matrices, carried = cache.patched_series([day1, day2, day3])
+        assert carried == [[], ["Bob"], ["Bob"]]
+        assert matrices[2][("Bob", "Alice")] == "Coração"
+
+
 # ══════════════════════════════════════════════════════════════
 # Priority 3: Poll/Prediction Functions
 # ══════════════════════════════════════════════════════════════
@@ -1392,6 +1749,43 @@ class TestBacktestPrecisionModel:
         result = backtest_precision_model({"paredoes": []})
         assert result is None
 
+    def test_folds_match_weights_recomputed_per_fold(self, polls_json_data):
+        # Drop a platform from one poll so its fold stats differ per platform
+        data = json.loads(json.dumps(polls_json_data))
+        del data["paredoes"][1]["plataformas"]["twitter"]
+        finalized = data["paredoes"]
+        result = backtest_precision_model(data)
+        for i, row in enumerate(result["per_paredao"]):
+            loo = calculate_precision_weights({"paredoes": finalized[:i] + finalized[i + 1:]})
+            expected = predict_precision_weighted(finalized[i], loo)
+            assert row["model_prediction"] == pytest.approx(expected["prediction"], abs=1e-9)
+        forward = backtest_forward_only(data)["per_paredao"][0]
+        expected = predict_precision_weighted(finalized[2], calculate_precision_weights({"paredoes": finalized[:2]}))
+        assert forward["model_correct"] == (expected["predicao_eliminado"] == finalized[2]["resultado_real"]["eliminado"])
+
+
+class TestCalibrationGridSearch:
+    """Test calibration_grid_search()."""
+
+    def test_current_setting_matches_backtest(self, polls_json_data):
+        grid = calibration_grid_search(polls_json_data, gammas=(1.0, CALIBRATION_GAMMA, 2.0), powers=(1.0, 2.0))
+        assert len(grid["mae"]) == 3 and len(grid["mae"][0]) == 2
+        backtest = backtest_precision_model(polls_json_data)
+        maes = [row["model_mae"] for row in backtest["per_paredao"]]
+        # The backtest rounds its predictions to 2 decimals
+        assert grid["mae"][1][1] == pytest.approx(sum(maes) / len(maes), abs=0.02)
+        assert grid["best"]["mae"] == pytest.approx(min(min(row) for row in grid["mae"]), abs=0.005)
+        assert grid["n_paredoes"] == backtest["aggregate"]["n_paredoes"]
+
+    def test_forward_folds(self, polls_json_data):
+        grid = calibration_grid_search(polls_json_data, gammas=(CALIBRATION_GAMMA,), powers=(2.0,), forward=True)
+        forward = backtest_forward_only(polls_json_data)
+        assert grid["n_paredoes"] == forward["aggregate"]["n_paredoes"]
+        assert grid["mae"][0][0] == pytest.approx(forward["per_paredao"][0]["model_mae"], abs=0.02)
+
+    def test_insufficient_data(self):
+        assert calibration_grid_search({"paredoes": []}) is None
+
 
 class TestPlatformLabel:
     """Test platform_label() helper."""
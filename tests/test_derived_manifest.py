@@ -0,0 +1,225 @@
+"""Tests for derived_manifest.py — incremental rebuild planning."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import derived_manifest
+import derived_pipeline
+from derived_manifest import (
+    ARTIFACT_DEPENDENCIES,
+    build_manifest,
+    fingerprint_inputs,
+    plan_rebuild,
+    reusable_prefix,
+    snapshot_state_hash,
+    write_manifest,
+)
+from data_utils import encode_reaction_matrices
+
+
+# ─── Fixtures ────────────────────────────────────────────────────────────────
+
+
+def _participant(name, balance=500, hearts_from=()):
+    reactions = []
+    if hearts_from:
+        reactions.append({
+            "label": "Coração",
+            "amount": len(hearts_from),
+            "participants": [{"name": g} for g in hearts_from],
+        })
+    return {
+        "name": name,
+        "characteristics": {"balance": balance, "roles": [], "receivedReactions": reactions},
+    }
+
+
+def _write_snapshot(snap_dir, stem, participants):
+    path = snap_dir / f"{stem}.json"
+    path.write_text(json.dumps({"_metadata": {}, "participants": participants}), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    """Snapshot dir, manual inputs and a derived dir with every artifact present."""
+    snap_dir = tmp_path / "snapshots"
+    snap_dir.mkdir()
+    _write_snapshot(snap_dir, "2026-01-13_15-00-00", [_participant("A", hearts_from=["B"]), _participant("B")])
+    _write_snapshot(snap_dir, "2026-01-14_15-00-00", [_participant("A"), _participant("B", hearts_from=["A"])])
+
+    manual = {}
+    for key in derived_manifest.MANUAL_INPUTS:
+        path = tmp_path / f"{key}.json"
+        path.write_text("{}", encoding="utf-8")
+        manual[key] = path
+
+    derived = tmp_path / "derived"
+    derived.mkdir()
+    for artifact in ARTIFACT_DEPENDENCIES:
+        (derived / artifact).write_text("{}", encoding="utf-8")
+    return snap_dir, manual, derived
+
+
+def _fingerprint(inputs, previous=None):
+    snap_dir, manual, _derived = inputs
+    return fingerprint_inputs(previous, snap_dir, manual)
+
+
+# ─── Fingerprints ────────────────────────────────────────────────────────────
+
+
+class TestFingerprint:
+    def test_state_hash_ignores_balance(self):
+        assert snapshot_state_hash([_participant("A", balance=1)]) == snapshot_state_hash([_participant("A", balance=9)])
+        assert snapshot_state_hash([_participant("A")]) != snapshot_state_hash([_participant("A", hearts_from=["B"])])
+
+    def test_known_snapshots_are_not_reparsed(self, inputs, monkeypatch):
+        first = _fingerprint(inputs)
+
+        def fail(_path):
+            raise AssertionError("snapshot parsed again")
+
+        monkeypatch.setattr(derived_manifest, "load_snapshot", fail)
+        assert _fingerprint(inputs, build_manifest(first, "full")) == first
+
+
+# ─── Planning ────────────────────────────────────────────────────────────────
+
+
+class TestPlanRebuild:
+    def _previous(self, inputs):
+        return build_manifest(_fingerprint(inputs), "full")
+
+    def test_no_manifest_is_full(self, inputs):
+        assert plan_rebuild(None, _fingerprint(inputs), inputs[2])["mode"] == "full"
+
+    def test_version_mismatch_is_full(self, inputs):
+        previous = self._previous(inputs)
+        previous["_metadata"]["version"] = -1
+        assert plan_rebuild(previous, _fingerprint(inputs), inputs[2])["mode"] == "full"
+
+    def test_unchanged_is_noop(self, inputs):
+        previous = self._previous(inputs)
+        assert plan_rebuild(previous, _fingerprint(inputs, previous), inputs[2])["mode"] == "noop"
+
+    def test_missing_artifact_is_full(self, inputs):
+        previous = self._previous(inputs)
+        (inputs[2] / "cartola_data.json").unlink()
+        assert plan_rebuild(previous, _fingerprint(inputs, previous), inputs[2])["mode"] == "full"
+
+    def test_balance_only_capture_is_light(self, inputs):
+        previous = self._previous(inputs)
+        _write_snapshot(inputs[0], "2026-01-14_20-00-00",
+                        [_participant("A", balance=900), _participant("B", hearts_from=["A"])])
+        plan = plan_rebuild(previous, _fingerprint(inputs, previous), inputs[2])
+        assert plan["mode"] == "light"
+        assert set(plan["stale"]) == {
+            "snapshots_index.json", "balance_events.json", "index_data.json", "paredao_exposure_stats.json",
+        }
+
+    def test_polls_change_is_light(self, inputs):
+        previous = self._previous(inputs)
+        inputs[1]["polls"].write_text('{"paredoes": []}', encoding="utf-8")
+        plan = plan_rebuild(previous, _fingerprint(inputs, previous), inputs[2])
+        assert plan["mode"] == "light"
+        assert plan["stale"] == ["index_data.json", "paredao_exposure_stats.json"]
+
+    def test_new_game_day_is_append(self, inputs):
+        previous = self._previous(inputs)
+        _write_snapshot(inputs[0], "2026-01-15_15-00-00", [_participant("A", hearts_from=["B"]), _participant("B")])
+        plan = plan_rebuild(previous, _fingerprint(inputs, previous), inputs[2])
+        assert plan["mode"] == "append"
+        assert plan["first_changed_date"] == "2026-01-15"
+        assert "relations_scores.json" in plan["stale"]
+
+    def test_state_change_on_latest_day_restarts_that_day(self, inputs):
+        previous = self._previous(inputs)
+        _write_snapshot(inputs[0], "2026-01-14_20-00-00", [_participant("A"), _participant("B")])
+        plan = plan_rebuild(previous, _fingerprint(inputs, previous), inputs[2])
+        assert plan["mode"] == "append"
+        assert plan["first_changed_date"] == "2026-01-14"
+
+    def test_manual_change_is_full(self, inputs):
+        previous = self._previous(inputs)
+        inputs[1]["paredoes"].write_text('{"paredoes": []}', encoding="utf-8")
+        plan = plan_rebuild(previous, _fingerprint(inputs, previous), inputs[2])
+        assert plan["mode"] == "full"
+        assert "paredoes" in plan["reason"]
+
+    def test_edited_snapshot_is_full(self, inputs):
+        previous = self._previous(inputs)
+        _write_snapshot(inputs[0], "2026-01-13_15-00-00", [_participant("A")])
+        assert plan_rebuild(previous, _fingerprint(inputs, previous), inputs[2])["mode"] == "full"
+
+    def test_backfilled_snapshot_is_full(self, inputs):
+        previous = self._previous(inputs)
+        _write_snapshot(inputs[0], "2026-01-13_20-00-00", [_participant("A"), _participant("B")])
+        assert plan_rebuild(previous, _fingerprint(inputs, previous), inputs[2])["mode"] == "full"
+
+
+# ─── Prefix reuse ────────────────────────────────────────────────────────────
+
+
+class TestReusablePrefix:
+    def test_keeps_rows_before_cutoff(self):
+        rows = [{"date": "2026-01-13"}, {"date": "2026-01-14"}, {"date": "2026-01-15"}]
+        dates = ["2026-01-13", "2026-01-14", "2026-01-15", "2026-01-16"]
+        assert reusable_prefix(rows, dates, "2026-01-15") == rows[:2]
+
+    def test_no_cutoff_requires_every_date(self):
+        rows = [{"date": "2026-01-13"}, {"date": "2026-01-14"}]
+        assert reusable_prefix(rows, ["2026-01-13", "2026-01-14"], None) == rows
+        assert reusable_prefix(rows[:1], ["2026-01-13", "2026-01-14"], None) is None
+
+    def test_misaligned_rows_are_rejected(self):
+        rows = [{"date": "2026-01-13"}, {"date": "2026-01-15"}]
+        assert reusable_prefix(rows, ["2026-01-13", "2026-01-14", "2026-01-15"], "2026-01-16") is None
+
+
+class TestBuildDailySections:
+    def test_append_matches_full_rebuild(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(derived_pipeline, "DERIVED_DIR", tmp_path)
+        days = [
+            [_participant("A", hearts_from=["B"]), _participant("B", hearts_from=["A"]), _participant("C")],
+            [_participant("A"), _participant("B", hearts_from=["A", "C"]), _participant("C", hearts_from=["B"])],
+            [_participant("A", hearts_from=["C"]), _participant("B"), _participant("C", hearts_from=["A"])],
+        ]
+        daily = [
+            {"file": f"2026-01-1{3 + i}_15-00-00.json", "date": f"2026-01-1{3 + i}", "participants": p}
+            for i, p in enumerate(days)
+        ]
+
+        sections, matrices = derived_pipeline.build_daily_sections(daily[:2])
+        # Persist as the pipeline would, including the latest-day annotation
+        sections["daily_changes"][-1]["new_streak_breaks"] = []
+        derived_pipeline.write_json(tmp_path / "daily_metrics.json", sections)
+        derived_pipeline.write_json(tmp_path / "reaction_matrices.json", encode_reaction_matrices(matrices["by_date"]))
+
+        plan = {"mode": "append", "first_changed_date": "2026-01-15"}
+        appended = derived_pipeline.build_daily_sections(daily, plan)
+        full = derived_pipeline.build_daily_sections(daily)
+        assert json.dumps(appended, sort_keys=True) == json.dumps(full, sort_keys=True)
+
+
+def test_write_manifest_skips_unchanged_content(inputs, tmp_path):
+    path = tmp_path / "_build_manifest.json"
+    fingerprint = _fingerprint(inputs)
+    assert write_manifest(fingerprint, "full", path) is True
+    assert write_manifest(fingerprint, "light", path) is False
+
+
+def test_report_changes_saves_the_change_report(tmp_path, monkeypatch):
+    path = tmp_path / "_artifact_changes.json"
+    monkeypatch.setattr(derived_pipeline, "ARTIFACT_CHANGES_FILE", path)
+    changes = {"index_data.json": True, "clusters_data.json": False}
+    assert derived_pipeline._report_changes(changes, "light") == changes
+    report = json.loads(path.read_text(encoding="utf-8"))
+    assert report["_metadata"]["mode"] == "light"
+    assert report["changed"] == ["index_data.json"]
+    assert report["unchanged"] == ["clusters_data.json"]
+    assert not list(tmp_path.glob(".*.tmp"))
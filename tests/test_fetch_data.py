@@ -0,0 +1,163 @@
+"""Tests for fetch_data.py — change detection via the persisted fetch state."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import fetch_data
+
+
+def _participants(label="Coração", role=None):
+    return [
+        {
+            "name": name,
+            "characteristics": {
+                "roles": [{"label": role}] if role and name == "Ana" else [],
+                "receivedReactions": [{"label": label, "amount": 1, "participants": [{"name": other}]}],
+                "balance": 100,
+            },
+        }
+        for name, other in (("Ana", "Bia"), ("Bia", "Ana"))
+    ]
+
+
+class FakeResponse:
+    def __init__(self, payload=None, status_code=200, headers=None):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def fetch_env(tmp_path, monkeypatch):
+    snapshots = tmp_path / "snapshots"
+    snapshots.mkdir()
+    monkeypatch.setattr(fetch_data, "DATA_DIR", snapshots)
+    monkeypatch.setattr(fetch_data, "LATEST_FILE", tmp_path / "latest.json")
+    monkeypatch.setattr(fetch_data, "FETCH_STATE_FILE", tmp_path / "fetch_state.json")
+    calls = []
+
+    def serve(*responses):
+        queue = list(responses)
+
+        def fake_get(url, headers=None, timeout=None):
+            calls.append(headers or {})
+            return queue.pop(0)
+
+        monkeypatch.setattr(fetch_data.requests, "get", fake_get)
+
+    return snapshots, calls, serve
+
+
+def test_first_fetch_saves_snapshot_and_state(fetch_env):
+    snapshots, calls, serve = fetch_env
+    serve(FakeResponse(_participants(), headers={"ETag": '"v1"'}))
+    path, changed = fetch_data.fetch_and_save()
+
+    assert changed
+    state = json.loads(fetch_data.FETCH_STATE_FILE.read_text(encoding="utf-8"))
+    assert state["file"] == Path(path).name
+    assert state["etag"] == '"v1"'
+    assert state["data_hash"] == fetch_data.get_data_hash(_participants())
+    assert calls == [{}]
+
+
+def test_unchanged_poll_does_not_read_snapshots(fetch_env, monkeypatch):
+    snapshots, calls, serve = fetch_env
+    serve(FakeResponse(_participants(), headers={"ETag": '"v1"'}), FakeResponse(_participants()))
+    first, _ = fetch_data.fetch_and_save()
+
+    def no_snapshot_reads():
+        raise AssertionError("latest snapshot should come from the fetch state")
+
+    monkeypatch.setattr(fetch_data, "_state_from_latest_snapshot", no_snapshot_reads)
+    path, changed = fetch_data.fetch_and_save()
+    assert (path, changed) == (first, False)
+    assert calls[1] == {"If-None-Match": '"v1"'}
+
+
+def test_not_modified_response_skips_parsing(fetch_env):
+    snapshots, calls, serve = fetch_env
+    serve(
+        FakeResponse(_participants(), headers={"ETag": '"v1"', "Last-Modified": "Mon, 20 Apr 2026 12:00:00 GMT"}),
+        FakeResponse(status_code=304),
+    )
+    first, _ = fetch_data.fetch_and_save()
+    assert fetch_data.fetch_and_save() == (first, False)
+    assert calls[1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 20 Apr 2026 12:00:00 GMT"}
+    assert len(list(snapshots.glob("*.json"))) == 1
+
+
+def test_change_types_come_from_stored_hashes(fetch_env, capsys):
+    snapshots, calls, serve = fetch_env
+    serve(FakeResponse(_participants()), FakeResponse(_participants(label="Cobra", role="Líder")))
+    first, _ = fetch_data.fetch_and_save()
+    # A second capture within the same second would reuse the file name
+    Path(first).rename(snapshots / "2026-01-01_00-00-00.json")
+    state = json.loads(fetch_data.FETCH_STATE_FILE.read_text(encoding="utf-8"))
+    fetch_data.save_fetch_state({**state, "file": "2026-01-01_00-00-00.json"})
+
+    _, changed = fetch_data.fetch_and_save()
+    assert changed
+    assert "Types: reactions, roles" in capsys.readouterr().out
+
+
+def test_state_for_an_older_snapshot_is_ignored(fetch_env):
+    snapshots, calls, serve = fetch_env
+    (snapshots / "2026-01-01_00-00-00.json").write_text("[]", encoding="utf-8")
+    (snapshots / "2026-01-02_00-00-00.json").write_text(
+        json.dumps({"_metadata": {}, "participants": _participants()}), encoding="utf-8"
+    )
+    fetch_data.save_fetch_state({"file": "2026-01-01_00-00-00.json", "data_hash": "stale"})
+    assert fetch_data.load_fetch_state() is None
+
+    serve(FakeResponse(_participants()))
+    path, changed = fetch_data.fetch_and_save()
+    assert (Path(path).name, changed) == ("2026-01-02_00-00-00.json", False)
+    assert fetch_data.load_fetch_state()["file"] == "2026-01-02_00-00-00.json"
+
+
+class TestPollForChange:
+    def test_unchanged_poll_writes_nothing(self, fetch_env):
+        snapshots, calls, serve = fetch_env
+        serve(FakeResponse(_participants(), headers={"ETag": '"v1"'}), FakeResponse(_participants(), headers={"ETag": '"v2"'}))
+        fetch_data.fetch_and_save()
+        before = fetch_data.FETCH_STATE_FILE.read_text(encoding="utf-8")
+
+        changed, state = fetch_data.poll_for_change()
+        assert not changed
+        assert state["etag"] == '"v2"'
+        assert fetch_data.FETCH_STATE_FILE.read_text(encoding="utf-8") == before
+        assert len(list(snapshots.glob("*.json"))) == 1
+
+    def test_uses_session_and_passed_state(self, fetch_env):
+        state = {"file": "x.json", "data_hash": "old", "etag": '"v1"'}
+
+        class Session:
+            def __init__(self):
+                self.headers = []
+
+            def get(self, url, headers=None, timeout=None):
+                self.headers.append(headers)
+                return FakeResponse(status_code=304)
+
+        session = Session()
+        assert fetch_data.poll_for_change(session, state) == (False, state)
+        assert session.headers == [{"If-None-Match": '"v1"'}]
+
+    def test_changed_data(self, fetch_env):
+        snapshots, calls, serve = fetch_env
+        serve(FakeResponse(_participants()), FakeResponse(_participants(label="Cobra")))
+        fetch_data.fetch_and_save()
+        changed, _ = fetch_data.poll_for_change()
+        assert changed
@@ -9,11 +9,10 @@ from builders.index_data_builder import (
     _aggregate_latest_state,
     _compute_breaks_and_context_cards,
 )
+from data_utils import CycleCalendar
 
 
-def test_current_cycle_prefers_manual_open_cycle_when_snapshots_lag(monkeypatch):
-    monkeypatch.setattr("builders.index_data_builder.get_effective_cycle_end_dates", lambda: ["2026-01-21"])
-
+def test_current_cycle_prefers_manual_open_cycle_when_snapshots_lag():
     latest = {
         "date": "2026-01-21",
         "participants": [
@@ -38,7 +37,7 @@ def test_current_cycle_prefers_manual_open_cycle_when_snapshots_lag(monkeypatch)
         },
     }
 
-    aggregated = _aggregate_latest_state(parsed, [latest])
+    aggregated = _aggregate_latest_state(parsed, [latest], CycleCalendar(["2026-01-21"]))
 
     assert aggregated["current_cycle"] == 2
 
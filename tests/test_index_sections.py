@@ -0,0 +1,100 @@
+"""Tests for the build_index_data section cache (IndexSectionCache)."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import builders.index_data_builder as idb
+from builders.index_data_builder import (
+    INDEX_SECTION_INPUTS,
+    IndexSectionCache,
+    build_index_data,
+)
+
+
+def _strip(payload: dict) -> dict:
+    payload = json.loads(json.dumps(payload, default=str))
+    payload.pop("_metadata", None)
+    return payload
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    """Every declared input file redirected to a small copy under tmp_path."""
+    for source, path in idb._index_input_files().items():
+        copy = tmp_path / path.name
+        copy.write_text(json.dumps({"source": source}), encoding="utf-8")
+        attr = next(name for name, value in vars(idb).items() if name.endswith("_FILE") and value == path)
+        monkeypatch.setattr(idb, attr, copy)
+    return tmp_path
+
+
+def _keys(path: Path) -> dict[str, str]:
+    cache = IndexSectionCache(path, [{"date": "2026-01-13", "participants": []}])
+    return {name: cache.key(name) for name in INDEX_SECTION_INPUTS}
+
+
+def test_declared_inputs_are_known_sources():
+    known = set(idb._index_input_files()) | {"code", "snapshots"}
+    assert "polls" not in known
+    for name, inputs in INDEX_SECTION_INPUTS.items():
+        assert set(inputs) <= known, name
+        assert {"code", "snapshots", "manual_events"} <= set(inputs), name
+
+
+def test_only_dependent_sections_are_invalidated(sources, tmp_path):
+    before = _keys(tmp_path / "cache.pkl")
+    (sources / idb.RELATIONS_FILE.name).write_text('{"pairs_all": {}}', encoding="utf-8")
+    after = _keys(tmp_path / "cache.pkl")
+    changed = {name for name in INDEX_SECTION_INPUTS if before[name] != after[name]}
+    assert changed == {name for name, inputs in INDEX_SECTION_INPUTS.items() if "relations_scores" in inputs}
+    assert "overview_stats" not in changed and "ranking_tables" in changed
+
+
+def test_hit_returns_a_fresh_copy(tmp_path):
+    path = tmp_path / "cache.pkl"
+    cache = IndexSectionCache(path, [])
+    first = cache.get("overview_stats", lambda: {"cards": [1]})
+    first["cards"].append(2)  # the orchestrator edits results after the section runs
+    cache.save()
+
+    reloaded = IndexSectionCache(path, [])
+    assert reloaded.get("overview_stats", lambda: pytest.fail("recomputed")) == {"cards": [1]}
+    assert reloaded.hits == ["overview_stats"] and not reloaded.misses
+
+
+def test_unreadable_cache_is_ignored(tmp_path):
+    path = tmp_path / "cache.pkl"
+    path.write_bytes(b"not a pickle")
+    assert IndexSectionCache(path, []).get("cross_table", lambda: 7) == 7
+
+
+def test_cached_payload_matches_uncached(tmp_path, monkeypatch):
+    cache_file = tmp_path / "_index_sections.pkl"
+    reference = build_index_data()
+    if reference is None:
+        pytest.skip("no snapshots")
+    cold = build_index_data(section_cache=cache_file)
+    assert cache_file.exists()
+
+    # polls.json is no section's input: with the other sources unchanged every
+    # section is reused and only the (uncached) paredão card is rebuilt
+    built = []
+    real_get = IndexSectionCache.get
+
+    def tracking_get(self, name, compute):
+        def wrapped():
+            built.append(name)
+            return compute()
+        return real_get(self, name, wrapped)
+
+    monkeypatch.setattr(IndexSectionCache, "get", tracking_get)
+    warm = build_index_data(section_cache=cache_file)
+    assert built == []
+    assert _strip(reference) == _strip(cold) == _strip(warm)
@@ -1,4 +1,4 @@
-"""Integration tests for build_paredao_analysis, build_clusters_data, and build_vote_prediction.
+"""Integration tests for build_paredao_analysis, build_clusters_data, build_cluster_evolution and build_vote_prediction.
 
 These functions depend on complex upstream data. We create synthetic data
 for 5 participants over 10 days with 1 paredao, then run the real pipeline
@@ -15,6 +15,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
 from build_derived_data import (
     build_paredao_analysis,
     build_clusters_data,
+    build_cluster_evolution,
     build_vote_prediction,
     build_relations_scores,
     build_daily_roles,
@@ -23,6 +24,7 @@ from build_derived_data import (
     get_all_snapshots,
     get_daily_snapshots,
 )
+from builders.clusters import _distance_matrix, _run_cluster_detection, _silhouette
 from data_utils import POSITIVE, MILD_NEGATIVE, STRONG_NEGATIVE
 from paredao_viz import render_featured_story
 
@@ -578,6 +580,73 @@ class TestBuildClustersData:
         assert "silhouette_coefficient" in meta
 
 
+class TestClusterSweep:
+    """The NumPy silhouette and the pooled resolution sweep match the serial/sklearn results."""
+
+    @staticmethod
+    def _season_scores(n=18, seed=5):
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        groups = rng.integers(0, 3, n)
+        score = rng.choice([1.0, -0.5, -1.0], size=(n, n), p=[0.4, 0.3, 0.3])
+        score = np.where((groups[:, None] == groups[None, :]) & (rng.random((n, n)) < 0.8), 1.0, score)
+        np.fill_diagonal(score, 0.0)
+        return [f"P{i:02d}" for i in range(n)], (score + score.T) / 2
+
+    def test_silhouette_matches_sklearn(self):
+        metrics = pytest.importorskip("sklearn.metrics")
+        names, sym = self._season_scores()
+        communities = [set(names[:6]), set(names[6:11]), set(names[11:])]
+        labels = [0] * 6 + [1] * 5 + [2] * 7
+        expected = metrics.silhouette_score(sym, labels, metric="euclidean")
+        assert _silhouette(_distance_matrix(sym), names, communities) == pytest.approx(expected, abs=1e-12)
+        assert _silhouette(_distance_matrix(sym), names, [set(names[:-1]), {names[-1]}]) is None
+
+    def test_pooled_sweep_matches_serial(self):
+        nx = pytest.importorskip("networkx")
+        names, sym = self._season_scores()
+        info = {name: {"grupo": "Pipoca"} for name in names}
+        serial = _run_cluster_detection(names, sym, info, nx)
+        assert serial["n_clusters"] >= 2
+        assert _run_cluster_detection(names, sym, info, nx, jobs=3) == serial
+
+
+class TestBuildClusterEvolution:
+    """Tests for build_cluster_evolution (daily cadence)."""
+
+    @pytest.fixture(scope="class")
+    def evolution(self, synthetic_snapshots, participants_index, paredoes_data):
+        result = build_cluster_evolution(synthetic_snapshots, participants_index, paredoes_data)
+        if result is None:
+            pytest.skip("networkx not installed — cannot test cluster evolution")
+        return result
+
+    def test_every_daily_snapshot_is_sampled(self, evolution):
+        assert [entry["date"] for entry in evolution["timeline"]] == DATES
+        assert evolution["_metadata"]["n_snapshots"] == len(DATES)
+        assert evolution["_metadata"]["cadence_days"] == 1
+
+    def test_communities_follow_reactions(self, evolution):
+        """Alice/Bob/Carol exchange hearts and Dave/Eve are allies: two clusters, not singletons."""
+        first = evolution["timeline"][0]
+        members = sorted(sorted(c["members"]) for c in first["communities"])
+        assert members == [["Alice", "Bob", "Carol"], ["Dave", "Eve"]]
+        assert all(c["cohesion"] > 0 for c in first["communities"])
+        assert first["silhouette"] is not None
+
+    def test_cadence_counts_back_from_latest(self, synthetic_snapshots, participants_index, paredoes_data, evolution):
+        sparse = build_cluster_evolution(synthetic_snapshots, participants_index, paredoes_data, cadence_days=3)
+        assert [entry["date"] for entry in sparse["timeline"]] == DATES[::-3][::-1]
+        by_date = {entry["date"]: entry for entry in evolution["timeline"]}
+        for entry in sparse["timeline"]:
+            assert entry["communities"] == by_date[entry["date"]]["communities"]
+
+    def test_pooled_matches_serial(self, synthetic_snapshots, participants_index, paredoes_data, evolution):
+        pooled = build_cluster_evolution(synthetic_snapshots, participants_index, paredoes_data, jobs=2)
+        assert pooled["timeline"] == evolution["timeline"]
+
+
 # ─── TestBuildVotePrediction ──────────────────────────────────────────────────
 
 
@@ -0,0 +1,116 @@
+"""Tests for builders/pair_history.py — RLE summaries match the day-by-day walk."""
+import sys
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from builders.pair_history import PairLabelHistory
+from data_utils import REACTION_EMOJI
+
+NAMES = ["Ana", "Bia", "Caio"]
+LABELS = ["Coração", "Coração", "Coração", "Planta", "Cobra", "Biscoito", ""]
+
+
+def _season(days=30, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = [f"2026-01-{day + 1:02d}" for day in range(days)]
+    matrices = []
+    for _ in dates:
+        matrix = {}
+        for giver in NAMES:
+            for receiver in NAMES:
+                if giver != receiver and rng.random() < 0.9:
+                    matrix[(giver, receiver)] = LABELS[rng.integers(len(LABELS))]
+        matrices.append(matrix)
+    return dates, matrices
+
+
+def _walk(actor, target, dates, matrices, cutoff_date):
+    """Reference: walk the labelled days up to the cutoff one by one."""
+    history = [
+        (day, matrix[(actor, target)], matrix.get((target, actor), ""))
+        for day, matrix in zip(dates, matrices)
+        if day <= cutoff_date and matrix.get((actor, target))
+    ]
+    if not history:
+        return None
+    runs = []  # [label, start_date, end_date, length]
+    for day, label, _reverse in history:
+        if runs and runs[-1][0] == label:
+            runs[-1][2:] = [day, runs[-1][3] + 1]
+        else:
+            runs.append([label, day, day, 1])
+    best = runs[0]
+    for run in runs[1:]:
+        if run[3] > best[3]:
+            best = run
+    latest = history[-1][0]
+    positive = [day for day, label, _ in history if label == "Coração"]
+    mutual = [day for day, label, reverse in history if label == reverse == "Coração"]
+    counts = Counter(label for _, label, _ in history)
+
+    def _since(day):
+        return (date.fromisoformat(latest) - date.fromisoformat(day)).days if day else None
+
+    def _streak(run):
+        return {"label": run[0], "emoji": REACTION_EMOJI.get(run[0], run[0]), "length": run[3],
+                "start_date": run[1], "end_date": run[2]}
+
+    return {
+        "days_with_data": len(history),
+        "ever_sent_heart": "Coração" in counts,
+        "heart_days": counts["Coração"],
+        "mutual_heart_days": len(mutual),
+        "first_non_heart_date": next((day for day, label, _ in history if label != "Coração"), None),
+        "last_positive_date": positive[-1] if positive else None,
+        "days_since_last_positive": _since(positive[-1] if positive else None),
+        "last_mutual_positive_date": mutual[-1] if mutual else None,
+        "days_since_last_mutual_positive": _since(mutual[-1] if mutual else None),
+        "latest_label": runs[-1][0],
+        "latest_emoji": REACTION_EMOJI.get(runs[-1][0], runs[-1][0]),
+        "most_frequent_label": counts.most_common(1)[0][0],
+        "most_frequent_emoji": REACTION_EMOJI.get(counts.most_common(1)[0][0]),
+        "most_frequent_count": counts.most_common(1)[0][1],
+        "longest_streak": _streak(best),
+        "current_streak": _streak(runs[-1]),
+    }
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_summary_matches_day_walk(seed):
+    dates, matrices = _season(seed=seed)
+    history = PairLabelHistory(dates, matrices)
+    for actor in NAMES:
+        for target in NAMES:
+            if actor == target:
+                continue
+            for cutoff in ["2025-12-31", *dates[::3], "2026-01-15T", "2026-02-28"]:
+                expected = _walk(actor, target, dates, matrices, cutoff)
+                summary = history.summary(actor, target, cutoff)
+                if expected is None:
+                    assert summary["days_with_data"] == 0 and summary["longest_streak"] == {}
+                else:
+                    assert summary == expected, (actor, target, cutoff)
+
+
+def test_longest_streak_tie_keeps_earlier_run_and_gaps_do_not_break_runs():
+    dates = [f"2026-01-0{day}" for day in range(1, 8)]
+    labels = ["Cobra", "Cobra", "", "Coração", "Coração", "", "Cobra"]
+    matrices = [{("Ana", "Bia"): label} for label in labels]
+    summary = PairLabelHistory(dates, matrices).summary("Ana", "Bia", "2026-01-07")
+    assert summary["longest_streak"]["start_date"] == "2026-01-01"
+    assert summary["current_streak"] == {
+        "label": "Cobra", "emoji": REACTION_EMOJI["Cobra"], "length": 1,
+        "start_date": "2026-01-07", "end_date": "2026-01-07",
+    }
+    assert summary["days_since_last_positive"] == 2
+
+
+def test_day_at_or_before():
+    history = PairLabelHistory(["2026-01-02", "2026-01-04"], [{}, {}])
+    assert [history.day_at_or_before(d) for d in ("2026-01-01", "2026-01-02", "2026-01-03", "2026-01-09")] == [-1, 0, 0, 1]
@@ -191,14 +191,10 @@ class TestCycleOnlyBuildersWork:
             assert "cycle" in edge, f"Sincerao edge missing 'cycle': {edge}"
             assert "week" not in edge, f"Sincerao edge has legacy 'week': {edge}"
 
-    def test_cartola_awards_big_fone_with_cycle_only_fixtures(self, monkeypatch):
+    def test_cartola_awards_big_fone_with_cycle_only_fixtures(self):
         """Cartola builder must award Big Fone points from cycle-only fixtures."""
         from builders.cartola import build_cartola_data
-
-        monkeypatch.setattr(
-            "builders.cartola.get_cycle_number",
-            lambda d, *a, **kw: 1,
-        )
+        from data_utils import CycleCalendar
 
         result = build_cartola_data(
             daily_snapshots=[{
@@ -212,6 +208,8 @@ class TestCycleOnlyBuildersWork:
             manual_events=CYCLE_ONLY_MANUAL_EVENTS,
             participants_index=_participants_index(["Chaiany", "Babu Santana"]),
             provas_data=CYCLE_ONLY_PROVAS,
+            # No boundaries: every date falls in cycle 1
+            calendar=CycleCalendar([]),
         )
 
         chaiany = next((p for p in result["leaderboard"] if p["name"] == "Chaiany"), None)
@@ -221,14 +219,10 @@ class TestCycleOnlyBuildersWork:
             "Cartola builder did not award Big Fone points from cycle-only fixtures"
         )
 
-    def test_cartola_events_use_cycle_field_only(self, monkeypatch):
+    def test_cartola_events_use_cycle_field_only(self):
         """Every event in cartola leaderboard must have 'cycle', not 'week'."""
         from builders.cartola import build_cartola_data
-
-        monkeypatch.setattr(
-            "builders.cartola.get_cycle_number",
-            lambda d, *a, **kw: 1,
-        )
+        from data_utils import CycleCalendar
 
         result = build_cartola_data(
             daily_snapshots=[{
@@ -242,6 +236,7 @@ class TestCycleOnlyBuildersWork:
             manual_events=CYCLE_ONLY_MANUAL_EVENTS,
             participants_index=_participants_index(["Chaiany", "Babu Santana"]),
             provas_data=CYCLE_ONLY_PROVAS,
+            calendar=CycleCalendar([]),
         )
 
         for entry in result.get("leaderboard", []):
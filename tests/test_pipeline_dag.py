@@ -0,0 +1,94 @@
+"""Tests for pipeline_dag.py — declared stage graph and parallel runner."""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import derived_pipeline
+from pipeline_dag import Stage, StageGraph, format_critical_path_report
+
+
+def _double(x):
+    return x * 2
+
+
+def _add(a, b):
+    return a + b
+
+
+def _split(x):
+    return x - 1, x + 1
+
+
+def _pid():
+    return os.getpid()
+
+
+def _graph():
+    return StageGraph([
+        Stage("sum", _add, ("doubled", "y"), ("total",)),
+        Stage("double", _double, ("x",), ("doubled",)),
+        Stage("split", _split, ("total",), ("low", "high")),
+        Stage("where", _pid, (), ("pid",), local=True),
+    ])
+
+
+class TestStageGraph:
+    def test_order_respects_dependencies(self):
+        order = _graph().order
+        assert order.index("double") < order.index("sum") < order.index("split")
+
+    def test_sequential_run(self):
+        context = {"x": 3, "y": 1}
+        timings = _graph().run(context)
+        assert (context["total"], context["low"], context["high"]) == (7, 6, 8)
+        assert set(timings) == {"sum", "double", "split", "where"}
+
+    def test_parallel_run_matches_sequential(self):
+        context = {"x": 3, "y": 1}
+        _graph().run(context, jobs=2)
+        assert (context["total"], context["low"], context["high"]) == (7, 6, 8)
+        assert context["pid"] == os.getpid()
+
+    def test_missing_input(self):
+        with pytest.raises(KeyError, match="y"):
+            _graph().run({"x": 3})
+
+    def test_cycle_is_rejected(self):
+        with pytest.raises(ValueError, match="cycle"):
+            StageGraph([Stage("a", _double, ("b_out",), ("a_out",)), Stage("b", _double, ("a_out",), ("b_out",))])
+
+    def test_duplicate_output_is_rejected(self):
+        with pytest.raises(ValueError, match="produced by both"):
+            StageGraph([Stage("a", _double, ("x",), ("out",)), Stage("b", _double, ("x",), ("out",))])
+
+    def test_after_adds_ordering(self):
+        graph = StageGraph([Stage("late", _pid, after=("early",)), Stage("early", _pid)])
+        assert graph.order == ["early", "late"]
+
+    def test_critical_path(self):
+        graph = _graph()
+        timings = {"double": 1.0, "sum": 2.0, "split": 0.5, "where": 3.0}
+        assert graph.critical_path(timings) == (3.5, ["double", "sum", "split"])
+        report = format_critical_path_report(graph, timings, wall=3.6, jobs=2)
+        assert "critical path 3.50s" in report
+        assert "double (1.00s) → sum (2.00s) → split (0.50s)" in report
+
+
+def test_derived_graph_writes_after_validation():
+    graph = derived_pipeline.DERIVED_GRAPH
+    assert graph.order.index("validate") < graph.order.index("write")
+    assert graph.order.index("write") < graph.order.index("index_data")
+    # Every stage output the writer needs is produced by some stage
+    write = graph.by_name["write"]
+    assert [i for i in write.inputs if i not in graph.producer] == ["now"]
+
+
+def test_stages_with_their_own_pool_run_locally():
+    # A stage that takes "jobs" opens its own process pool; inside a pool worker that would nest pools
+    pooled = [s.name for s in derived_pipeline.DERIVED_STAGES if "jobs" in s.inputs]
+    assert pooled == ["clusters_data", "cluster_evolution"]
+    assert all(derived_pipeline.DERIVED_GRAPH.by_name[name].local for name in pooled)
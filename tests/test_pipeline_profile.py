@@ -0,0 +1,61 @@
+"""Tests for pipeline_profile.py — opt-in stage instrumentation."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import pipeline_profile
+from pipeline_dag import Stage, StageGraph
+from pipeline_profile import (
+    PROFILE_BASIC,
+    PROFILE_MEMORY,
+    collect_sections,
+    format_profile_table,
+    measure,
+    section,
+    start_sections,
+)
+
+
+def _payload(n):
+    return {"items": list(range(n))}
+
+
+class TestMeasure:
+    def test_timings_only_by_default(self):
+        result, stats = measure(_payload, (3,))
+        assert result == {"items": [0, 1, 2]}
+        assert set(stats) == {"wall_s", "cpu_s"}
+
+    def test_basic_adds_rss_and_output_size(self):
+        _, stats = measure(_payload, (3,), PROFILE_BASIC)
+        assert stats["output_bytes"] == len('{"items": [0, 1, 2]}')
+        assert "alloc_peak_mb" not in stats
+
+    def test_memory_level_traces_allocations(self):
+        _, stats = measure(_payload, (200_000,), PROFILE_MEMORY)
+        assert stats["alloc_peak_mb"] > 1
+
+
+class TestSections:
+    def test_disabled_sections_record_nothing(self):
+        with section("idle"):
+            pass
+        assert collect_sections() == []
+
+    def test_enabled_sections_are_collected_once(self):
+        start_sections()
+        with section("work"):
+            _payload(10)
+        records = collect_sections()
+        assert [r["name"] for r in records] == ["work"]
+        assert pipeline_profile._sections is None
+
+
+def test_graph_run_reports_profile_stats():
+    graph = StageGraph([Stage("payload", _payload, ("n",), ("payload",))])
+    stats = graph.run({"n": 2}, profile=PROFILE_BASIC)
+    assert stats["payload"]["output_bytes"] > 0
+    table = format_profile_table(stats, [{"name": "inner", "wall_s": 0.1, "cpu_s": 0.1}])
+    assert table.splitlines()[2].startswith("payload")
+    assert "inner" in table
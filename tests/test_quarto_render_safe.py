@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 import shutil
 import subprocess
@@ -12,7 +13,7 @@ import pytest
 REPO_ROOT = Path(__file__).resolve().parents[1]
 SCRIPT = REPO_ROOT / "scripts" / "quarto_render_safe.py"
 
-pytestmark = pytest.mark.skipif(
+requires_quarto = pytest.mark.skipif(
     shutil.which("quarto") is None,
     reason="quarto not installed — render locking tests require quarto CLI",
 )
@@ -69,6 +70,7 @@ def _init_minimal_project(tmp_path: Path) -> Path:
     return project
 
 
+@requires_quarto
 def test_safe_quarto_wrapper_serializes_concurrent_project_renders(tmp_path: Path) -> None:
     project = _init_minimal_project(tmp_path)
 
@@ -95,3 +97,211 @@ def test_safe_quarto_wrapper_serializes_concurrent_project_renders(tmp_path: Pat
     assert (project / "_site" / "index.html").exists()
     assert (project / "_site" / "other.html").exists()
     assert (project / "_site" / "data" / "derived" / "repro.json").exists()
+
+
+# Stand-in for the quarto CLI: logs each call; with the parallel profile a
+# single-target render "executes" the page into _freeze/ of its project,
+# otherwise it writes the page's _site/ output.
+FAKE_QUARTO = """\
+import json, os, sys, time
+from pathlib import Path
+args = sys.argv[2:]
+target = args[0] if args and not args[0].startswith("-") else None
+started = time.time()
+if target and "--profile" in args:
+    time.sleep(0.3)
+    freeze = Path("_freeze") / Path(target).stem / "execute-results"
+    freeze.mkdir(parents=True, exist_ok=True)
+    (freeze / "html.json").write_text(json.dumps({"cwd": os.getcwd()}))
+    lib = Path("_freeze") / "site_libs" / Path(target).stem
+    lib.mkdir(parents=True, exist_ok=True)
+    (lib / "lib.js").write_text("")
+elif target:
+    Path("_site").mkdir(exist_ok=True)
+    (Path("_site") / Path(target).with_suffix(".html")).write_text(target)
+with open(os.environ["FAKE_QUARTO_LOG"], "a") as f:
+    f.write(json.dumps({"args": args, "cwd": os.getcwd(), "start": started, "end": time.time()}) + "\\n")
+sys.exit(1 if target == "broken.qmd" else 0)
+"""
+
+
+@pytest.fixture
+def fake_quarto(tmp_path: Path, monkeypatch) -> tuple[Path, Path]:
+    project = _init_minimal_project(tmp_path)
+    _write(project / "third.qmd", "# Third\n")
+    config = project / "_quarto.yml"
+    config.write_text(config.read_text(encoding="utf-8").replace("    - other.qmd\n", "    - other.qmd\n    - third.qmd\n"),
+                      encoding="utf-8")
+    script = tmp_path / "fake_quarto.py"
+    script.write_text(FAKE_QUARTO, encoding="utf-8")
+    bin_path = tmp_path / "quarto"
+    bin_path.write_text(f"#!/bin/sh\nexec {sys.executable} {script} \"$@\"\n", encoding="utf-8")
+    bin_path.chmod(0o755)
+    log = tmp_path / "calls.jsonl"
+    monkeypatch.setenv("FAKE_QUARTO_LOG", str(log))
+    return project, bin_path
+
+
+def _calls(project: Path) -> list[dict]:
+    log = project.parent / "calls.jsonl"
+    return [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+
+
+def _run_wrapper(project: Path, bin_path: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), "--quarto-bin", str(bin_path), *args],
+        cwd=project, capture_output=True, text=True, timeout=60,
+    )
+
+
+def test_jobs_executes_pages_concurrently_then_assembles_from_freeze(fake_quarto) -> None:
+    project, bin_path = fake_quarto
+    proc = _run_wrapper(project, bin_path, "--jobs", "3")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    calls = _calls(project)
+    pages, assembly = calls[:-1], calls[-1]
+    assert sorted(c["args"][0] for c in pages) == ["index.qmd", "other.qmd", "third.qmd"]
+    # Each page ran in its own scratch project, overlapping in time
+    assert len({c["cwd"] for c in pages}) == 3 and all(".quarto/parallel" in c["cwd"] for c in pages)
+    assert max(c["start"] for c in pages) < min(c["end"] for c in pages)
+    # One whole-site render in the project itself, after every page finished
+    assert assembly["args"] == ["--profile", "parallel"] and Path(assembly["cwd"]) == project
+    assert assembly["start"] >= max(c["end"] for c in pages)
+    for stem in ("index", "other", "third"):
+        assert (project / "_freeze" / stem / "execute-results" / "html.json").exists()
+        assert (project / "_freeze" / "site_libs" / stem / "lib.js").exists()
+    assert not (project / ".quarto" / "parallel").exists()
+
+
+def test_jobs_with_explicit_targets_assembles_only_those(fake_quarto) -> None:
+    project, bin_path = fake_quarto
+    proc = _run_wrapper(project, bin_path, "--jobs", "2", "other.qmd", "third.qmd")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assembly = [c["args"] for c in _calls(project) if Path(c["cwd"]) == project]
+    assert assembly == [["other.qmd", "--profile", "parallel"], ["third.qmd", "--profile", "parallel"]]
+
+
+def test_jobs_failure_skips_assembly_and_shows_log(fake_quarto) -> None:
+    project, bin_path = fake_quarto
+    _write(project / "broken.qmd", "# Broken\n")
+    proc = _run_wrapper(project, bin_path, "--jobs", "2", "index.qmd", "broken.qmd")
+    assert proc.returncode == 1
+    assert "broken.qmd: exit 1" in proc.stdout
+    assert all(Path(c["cwd"]) != project for c in _calls(project))
+
+
+def _declare_inputs(page: Path, *inputs: str) -> None:
+    body = page.read_text(encoding="utf-8").split("---\n", 2)[-1]
+    listed = "".join(f"  - {item}\n" for item in inputs) if inputs else ""
+    header = f"render-inputs:\n{listed}" if inputs else "render-inputs: []\n"
+    page.write_text(f"---\ntitle: {page.stem}\n{header}---\n{body}", encoding="utf-8")
+
+
+def _rendered(project: Path, since: int = 0) -> list[str]:
+    return [c["args"][0] for c in _calls(project)[since:]]
+
+
+def test_page_inputs_front_matter_scan(tmp_path: Path) -> None:
+    sys.path.insert(0, str(REPO_ROOT / "scripts"))
+    import render_plan
+
+    page = tmp_path / "page.qmd"
+    _write(page, """
+        ---
+        title: Page
+        render-inputs:
+          - data/derived/a.json
+          - "data/snapshots/*.json"
+        format:
+          html:
+            toc: false
+        ---
+        """)
+    assert render_plan.page_inputs(page) == ["data/derived/a.json", "data/snapshots/*.json"]
+    _write(page, "---\ntitle: Page\nrender-inputs: []\n---\n")
+    assert render_plan.page_inputs(page) == []
+    _write(page, "---\ntitle: Page\n---\n")
+    assert render_plan.page_inputs(page) is None
+
+
+def test_clock_pages_go_stale_when_the_bucket_turns(tmp_path: Path) -> None:
+    sys.path.insert(0, str(REPO_ROOT / "scripts"))
+    from datetime import datetime, timezone
+
+    import render_plan
+
+    _write(tmp_path / "live.qmd", "---\ntitle: Live\nrender-clock: 15\nrender-inputs: []\n---\n")
+    _write(tmp_path / "static.qmd", "---\ntitle: Static\nrender-inputs: []\n---\n")
+    (tmp_path / "_site").mkdir()
+    for name in ("live", "static"):
+        (tmp_path / "_site" / f"{name}.html").write_text("", encoding="utf-8")
+    assert render_plan.page_clock_minutes(tmp_path / "live.qmd") == 15
+    assert render_plan.page_clock_minutes(tmp_path / "static.qmd") is None
+
+    targets = ["live.qmd", "static.qmd"]
+    t0 = datetime(2026, 3, 10, 21, 0, tzinfo=timezone.utc)
+    _stale, _fresh, fingerprints = render_plan.plan_render(tmp_path, targets, now=t0)
+    render_plan.record_rendered(tmp_path, fingerprints)
+
+    # Same 15-minute window: nothing to do; next window: only the clock page, no file changed
+    assert render_plan.plan_render(tmp_path, targets, now=t0.replace(minute=14))[:2] == ([], targets)
+    assert render_plan.plan_render(tmp_path, targets, now=t0.replace(minute=15))[:2] == (["live.qmd"], ["static.qmd"])
+
+
+def test_live_pages_declare_the_render_clock() -> None:
+    sys.path.insert(0, str(REPO_ROOT / "scripts"))
+    import render_plan
+
+    for page in ("paredao.qmd", "index.qmd"):
+        assert render_plan.page_clock_minutes(REPO_ROOT / page) == 15, page
+
+
+def test_changed_only_renders_pages_whose_inputs_changed(fake_quarto) -> None:
+    project, bin_path = fake_quarto
+    data = project / "data" / "derived" / "repro.json"
+    _declare_inputs(project / "index.qmd", "data/derived/repro.json")
+    _declare_inputs(project / "other.qmd")
+
+    proc = _run_wrapper(project, bin_path, "--changed-only")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assert _rendered(project) == ["index.qmd", "other.qmd", "third.qmd"]
+
+    # Declared pages are skipped; third.qmd declares nothing and always renders
+    seen = len(_calls(project))
+    proc = _run_wrapper(project, bin_path, "--changed-only")
+    assert _rendered(project, seen) == ["third.qmd"]
+    assert "index.qmd: unchanged, skipped" in proc.stdout
+
+    # A new generated_at stamp alone is not a change
+    data.write_text(json.dumps({"ok": True, "_metadata": {"generated_at": "2026-01-01"}}), encoding="utf-8")
+    _run_wrapper(project, bin_path, "--changed-only")
+    seen = len(_calls(project))
+    data.write_text(json.dumps({"ok": True, "_metadata": {"generated_at": "2026-01-02"}}), encoding="utf-8")
+    _run_wrapper(project, bin_path, "--changed-only")
+    assert _rendered(project, seen) == ["third.qmd"]
+
+    # Changed data re-renders its page, and resources are synced even for skipped pages
+    seen = len(_calls(project))
+    data.write_text(json.dumps({"ok": False}), encoding="utf-8")
+    proc = _run_wrapper(project, bin_path, "--changed-only")
+    assert _rendered(project, seen) == ["index.qmd", "third.qmd"]
+    assert (project / "_site" / "data" / "derived" / "repro.json").read_text(encoding="utf-8") == data.read_text(encoding="utf-8")
+
+    # A missing output forces a render even with unchanged inputs
+    (project / "_site" / "other.html").unlink()
+    seen = len(_calls(project))
+    _run_wrapper(project, bin_path, "--changed-only", "other.qmd")
+    assert _rendered(project, seen) == ["other.qmd"]
+
+
+def test_changed_only_does_not_record_failed_pages(fake_quarto) -> None:
+    project, bin_path = fake_quarto
+    _write(project / "broken.qmd", "# Broken\n")
+    _declare_inputs(project / "broken.qmd")
+
+    for _ in range(2):
+        proc = _run_wrapper(project, bin_path, "--changed-only", "broken.qmd")
+        assert proc.returncode == 1
+    assert _rendered(project) == ["broken.qmd", "broken.qmd"]
+    assert not (project / ".quarto" / "render-plan.json").exists()
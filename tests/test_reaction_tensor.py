@@ -0,0 +1,248 @@
+"""Tests for builders/reaction_tensor.py — the dense queridômetro engine."""
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from builders.reaction_tensor import (
+    BASE_LABEL_CODES,
+    NO_CATEGORY,
+    PairDayCounts,
+    ReactionTensor,
+    hostility_masks,
+    streak_arrays,
+    vulnerability_counts,
+)
+from data_utils import MILD_NEGATIVE, POSITIVE, STRONG_NEGATIVE, ReactionMatrixCache, pack_snapshots
+
+LABELS = ["Coração", "Planta", "Cobra", "Coração partido", "Desconhecido", ""]
+
+
+def _random_matrices(names, days, seed=7):
+    rng = random.Random(seed)
+    matrices = []
+    for _ in range(days):
+        matrix = {}
+        for giver in names:
+            for receiver in names:
+                if giver != receiver and rng.random() < 0.8:
+                    matrix[(giver, receiver)] = rng.choice(LABELS)
+        matrices.append(matrix)
+    return matrices
+
+
+def _snapshots(matrices):
+    """Snapshot dicts whose ``build_reaction_matrix`` is each of ``matrices``."""
+    names = sorted({name for matrix in matrices for pair in matrix for name in pair})
+    snapshots = []
+    for day, matrix in enumerate(matrices):
+        participants = []
+        for receiver in names:
+            received = {}
+            for (giver, target), label in matrix.items():
+                if target == receiver:
+                    received.setdefault(label, []).append({"name": giver})
+            participants.append({"name": receiver, "characteristics": {"receivedReactions": [
+                {"label": label, "amount": len(givers), "participants": givers} for label, givers in received.items()
+            ]}})
+        snapshots.append({"file": f"snap{day}.json", "date": f"2026-01-{day + 1:02d}",
+                          "participants": participants, "metadata": {}})
+    return snapshots
+
+
+def _category(label):
+    return {"Coração": 0, "Planta": 1, "Coração partido": 1, "Cobra": 2}.get(label, NO_CATEGORY)
+
+
+def _reference_streak(history):
+    """Plain-Python walk over one pair's labels (the pre-tensor algorithm)."""
+    categorized = [(day, _category(label)) for day, label in history if _category(label) != NO_CATEGORY]
+    if not categorized:
+        return None
+    current = categorized[-1][1]
+    streak_len = 0
+    for _, c in reversed(categorized):
+        if c != current:
+            break
+        streak_len += 1
+    remaining = categorized[:len(categorized) - streak_len]
+    previous, previous_len = NO_CATEGORY, 0
+    if remaining:
+        previous = remaining[-1][1]
+        for _, c in reversed(remaining):
+            if c != previous:
+                break
+            previous_len += 1
+    return {
+        "current": current,
+        "streak_len": streak_len,
+        "previous": previous,
+        "previous_len": previous_len,
+        "break_day": categorized[len(categorized) - streak_len][0],
+        "total_days": len(history),
+        "latest_day": history[-1][0],
+    }
+
+
+class TestReactionTensor:
+    def test_roundtrip_labels(self):
+        names = ["A", "B", "C", "D"]
+        matrices = _random_matrices(names, 4)
+        tensor = ReactionTensor.from_matrices(matrices, ["Z"])
+        assert "Z" in tensor.index
+        for day, matrix in enumerate(matrices):
+            for (giver, receiver), label in matrix.items():
+                assert tensor.labels[tensor.codes[day, tensor.index[giver], tensor.index[receiver]]] == label
+        # Missing pairs decode as ""
+        assert tensor.labels[tensor.codes[0, tensor.index["Z"], tensor.index["A"]]] == ""
+
+    def test_known_label_codes_are_shared_across_tensors(self):
+        first = ReactionTensor.from_matrices([{("A", "B"): "Cobra"}])
+        second = ReactionTensor.from_matrices([{("B", "A"): "Cobra"}, {("A", "B"): "Novo"}])
+        assert first.codes[0, 0, 1] == second.codes[0, 0, 1]
+        assert second.labels[second.codes[1, second.index["A"], second.index["B"]]] == "Novo"
+
+    def test_unknown_labels_do_not_leak_between_tensors(self):
+        for i in range(3):
+            ReactionTensor.from_matrices([{("A", "B"): f"Novo {i}"}])
+        tensor = ReactionTensor.from_matrices([{("A", "B"): "Cobra"}])
+        assert tensor.labels == list(BASE_LABEL_CODES)
+        many = [{("A", "B"): f"Novo {i}"} for i in range(127 - len(BASE_LABEL_CODES))]
+        assert len(ReactionTensor.from_matrices(many).labels) == 127
+
+    def test_for_snapshots_reuses_tensor_for_same_snapshots(self):
+        cache = ReactionMatrixCache()
+        snapshots = _snapshots(_random_matrices(["A", "B"], 2))
+        tensor = ReactionTensor.for_snapshots(snapshots, cache=cache)
+        assert ReactionTensor.for_snapshots(list(snapshots), cache=cache) is tensor
+        assert ReactionTensor.for_snapshots([dict(s) for s in snapshots], cache=cache) is tensor
+        copies = _snapshots(_random_matrices(["A", "B"], 2))
+        assert ReactionTensor.for_snapshots(copies, cache=cache) is not tensor
+
+    def test_for_snapshots_memo_is_released_with_the_matrix_cache(self):
+        cache = ReactionMatrixCache()
+        snapshots = _snapshots(_random_matrices(["A", "B"], 2))
+        tensor = ReactionTensor.for_snapshots(snapshots, cache=cache)
+        cache.clear()
+        assert not cache.memo
+        assert ReactionTensor.for_snapshots(snapshots, cache=cache) is not tensor
+
+    def test_archive_codes_match_dict_matrices(self):
+        names = ["A", "B", "C", "D"]
+        matrices = _random_matrices(names, 5, seed=11)
+        snapshots = _snapshots(matrices)
+        cache = ReactionMatrixCache()
+        cache.add_archive(snapshots, pack_snapshots(snapshots, [(0, 0)] * len(snapshots)))
+        assert all(cache.codes(snap) is not None for snap in snapshots)
+        archived = ReactionTensor.for_snapshots(snapshots, ["Z"], cache=cache)
+        expected = ReactionTensor.from_matrices(matrices, ["Z"])
+        assert cache.builds == 0
+        for day in range(len(matrices)):
+            for giver in names + ["Z"]:
+                for receiver in names + ["Z"]:
+                    got = archived.labels[archived.codes[day, archived.index[giver], archived.index[receiver]]]
+                    want = expected.labels[expected.codes[day, expected.index[giver], expected.index[receiver]]]
+                    assert got == want, (day, giver, receiver)
+
+
+class TestClassification:
+    def test_hostility_and_vulnerability_match_dict_walk(self):
+        names = ["A", "B", "C", "D", "E"]
+        matrix = _random_matrices(names, 1, seed=3)[0]
+        tensor = ReactionTensor.from_matrices([matrix])
+        codes = tensor.day(0, tensor.indices(names))
+        mutual, blind = hostility_masks(tensor, codes)
+        false_friends, blind_attacks = vulnerability_counts(tensor, codes)
+
+        def neg(a, b):
+            label = matrix.get((a, b), "")
+            return label != "" and label not in POSITIVE
+
+        def pos(a, b):
+            return matrix.get((a, b), "") in POSITIVE
+
+        for i, a in enumerate(names):
+            for j, b in enumerate(names):
+                if a == b:
+                    continue
+                assert mutual[i, j] == (neg(a, b) and neg(b, a))
+                assert blind[i, j] == (neg(a, b) and pos(b, a))
+            assert false_friends[i] == sum(pos(a, b) and neg(b, a) for b in names if b != a)
+            assert blind_attacks[i] == sum(neg(a, b) and pos(b, a) for b in names if b != a)
+
+
+class TestStreakArrays:
+    def test_matches_reference_walk_with_cutoffs(self):
+        names = ["A", "B", "C", "D"]
+        matrices = _random_matrices(names, 12, seed=11)
+        tensor = ReactionTensor.from_matrices(matrices)
+        rng = np.random.default_rng(5)
+        cutoff = rng.integers(-1, 12, size=(len(names), len(names)))
+        arrays = streak_arrays(tensor, cutoff)
+
+        for giver in names:
+            for receiver in names:
+                if giver == receiver:
+                    continue
+                g, r = tensor.index[giver], tensor.index[receiver]
+                history = [
+                    (day, m[(giver, receiver)]) for day, m in enumerate(matrices)
+                    if m.get((giver, receiver)) and day <= cutoff[g, r]
+                ]
+                expected = _reference_streak(history)
+                if expected is None:
+                    assert arrays["current"][g, r] == NO_CATEGORY
+                    continue
+                for key, value in expected.items():
+                    assert arrays[key][g, r] == value, (giver, receiver, key)
+
+
+def _reference_pair_walk(matrices, giver, receiver, stop):
+    """Plain-Python walk over one pair's first ``stop`` days (the pre-prefix-sum loop)."""
+    out = {"labelled": 0, "positive": 0, "negative": 0, "mutual": 0, "last_labelled": -1, "last_flip": -1}
+    prev_positive = None
+    for day, matrix in enumerate(matrices[:stop]):
+        label = matrix.get((giver, receiver), "")
+        if not label:
+            continue
+        is_pos = label in POSITIVE
+        is_neg = label in MILD_NEGATIVE | STRONG_NEGATIVE
+        out["labelled"] += 1
+        out["positive"] += is_pos
+        out["negative"] += is_neg
+        out["mutual"] += is_pos and matrix.get((receiver, giver), "") in POSITIVE
+        if (is_pos and prev_positive is False) or (is_neg and prev_positive is True):
+            out["last_flip"] = day
+        out["last_labelled"] = day
+        prev_positive = is_pos
+    out["last_positive"] = prev_positive is True
+    return out
+
+
+class TestPairDayCounts:
+    def test_every_prefix_matches_reference_walk(self):
+        names = ["A", "B", "C", "D"]
+        matrices = _random_matrices(names, 15, seed=3)
+        day_counts = PairDayCounts.from_matrices(matrices)
+        for stop in range(len(matrices) + 1):
+            for giver in names:
+                for receiver in names:
+                    if giver != receiver:
+                        expected = _reference_pair_walk(matrices, giver, receiver, stop)
+                        assert day_counts.pair(giver, receiver, stop) == expected, (giver, receiver, stop)
+
+    def test_counts_are_prefix_rows(self):
+        matrices = _random_matrices(["A", "B", "C"], 6, seed=9)
+        day_counts = PairDayCounts.from_matrices(matrices)
+        i, j = day_counts.tensor.index["A"], day_counts.tensor.index["C"]
+        assert day_counts.counts(0)["labelled"].sum() == 0
+        assert day_counts.counts(6)["negative"][i, j] == sum(
+            m.get(("A", "C"), "") in MILD_NEGATIVE | STRONG_NEGATIVE for m in matrices
+        )
+
+    def test_unknown_pair(self):
+        day_counts = PairDayCounts.from_matrices(_random_matrices(["A", "B"], 3))
+        assert day_counts.pair("A", "Z", 3) is None
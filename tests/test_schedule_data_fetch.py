@@ -0,0 +1,93 @@
+"""Tests for schedule_data_fetch.py — in-process fast path of the poll cycle."""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import fetch_data
+import schedule_data_fetch as sdf
+
+
+def _args(**overrides):
+    defaults = dict(build=False, trigger_deploy=False, votalhada=False, votalhada_auto_update=False)
+    return argparse.Namespace(**{**defaults, **overrides})
+
+
+def _record_commands(monkeypatch):
+    commands = []
+
+    def run_cmd(cmd, label):
+        commands.append(label)
+        return 0
+
+    monkeypatch.setattr(sdf, "_run_cmd", run_cmd)
+    monkeypatch.setattr(sdf, "_has_git_changes", lambda *paths: False)
+    return commands
+
+
+def test_idle_poll_skips_git_and_subprocesses(monkeypatch):
+    commands = _record_commands(monkeypatch)
+    monkeypatch.setattr(fetch_data, "poll_for_change", lambda session, state: (False, {"data_hash": "h"}))
+    poller = sdf._ApiPoller(session=object())
+
+    result = sdf._poll_once(_args(), poller)
+
+    assert commands == []
+    assert result["fetched"] and not result["data_changed"]
+    assert poller.state == {"data_hash": "h"}
+
+
+def test_changed_api_runs_full_cycle_in_process(monkeypatch):
+    commands = _record_commands(monkeypatch)
+    monkeypatch.setattr(fetch_data, "poll_for_change", lambda session, state: (True, state))
+    fetched = []
+    monkeypatch.setattr(fetch_data, "fetch_and_save", lambda session=None: fetched.append(session))
+    session = object()
+
+    sdf._poll_once(_args(), sdf._ApiPoller(session=session))
+
+    assert commands[0] == "git-pull"
+    assert "fetch" not in commands  # no fetch_data.py subprocess
+    assert fetched == [session]
+
+
+def test_votalhada_work_is_due_during_active_paredao(monkeypatch):
+    monkeypatch.setattr(sdf, "_get_active_paredao", lambda: 7)
+    monkeypatch.setattr(sdf, "_votalhada_capture_complete", lambda n: False)
+    assert sdf._votalhada_work_due(_args(votalhada=True))
+    assert not sdf._votalhada_work_due(_args())
+
+
+def _run_built_cycle(monkeypatch, tmp_path, changed):
+    calls = []
+
+    def run_cmd(cmd, label):
+        calls.append((label, cmd))
+        return 0
+
+    monkeypatch.setattr(sdf, "_run_cmd", run_cmd)
+    monkeypatch.setattr(sdf, "_has_git_changes", lambda *paths: True)
+    monkeypatch.setattr(sdf, "ARTIFACT_CHANGES_JSON", tmp_path / "_artifact_changes.json")
+    monkeypatch.setattr(sdf, "POLLS_JSON", tmp_path / "polls.json")
+    monkeypatch.setattr(sdf, "PAREDOES_JSON", tmp_path / "paredoes.json")
+    sdf.ARTIFACT_CHANGES_JSON.write_text(json.dumps({"changed": changed, "unchanged": []}), encoding="utf-8")
+    result = sdf._poll_once(_args(build=True, trigger_deploy=True))
+    return result, dict(calls)
+
+
+def test_build_without_derived_changes_skips_derived_commit_and_deploy(monkeypatch, tmp_path):
+    result, calls = _run_built_cycle(monkeypatch, tmp_path, changed=[])
+
+    assert result["built"] and result["derived_unchanged"] and result["pushed"]
+    assert "data/snapshots/" in calls["git-add"] and "data/derived/" not in calls["git-add"]
+    assert "deploy" not in calls
+
+
+def test_build_with_derived_changes_commits_and_deploys(monkeypatch, tmp_path):
+    result, calls = _run_built_cycle(monkeypatch, tmp_path, changed=["balance_events.json"])
+
+    assert not result.get("derived_unchanged")
+    assert "data/derived/" in calls["git-add"]
+    assert result["deployed"]
@@ -0,0 +1,119 @@
+"""Tests for builders/streak_state.py — incremental streaks match the full recompute."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from builders.relations import compute_streak_data
+from builders.streak_state import StreakState, load_streak_state, save_streak_state
+from data_utils import clear_reaction_matrix_cache
+
+LABELS = ["Coração", "Coração", "Coração", "Planta", "Cobra", "Biscoito", "Alvo", "Saudade", ""]
+
+
+def _season(days=14, seed=3):
+    """Daily snapshots with Raio-X misses, a late entrant and an eliminated participant."""
+    rng = np.random.default_rng(seed)
+    snapshots = []
+    for day in range(days):
+        names = ["Ana", "Bia", "Caio", "Duda"] + (["Edu"] if day >= 4 else []) + (["Fabi"] if day < 9 else [])
+        received = {name: {} for name in names}
+        for giver in names:
+            if rng.random() < 0.1:
+                continue  # missed the Raio-X: reactions are carried forward
+            for receiver in names:
+                if receiver != giver:
+                    label = LABELS[rng.integers(len(LABELS))]
+                    received[receiver].setdefault(label, []).append(giver)
+        participants = [
+            {"name": name, "characteristics": {"receivedReactions": [
+                {"label": label, "amount": len(givers), "participants": [{"name": g} for g in givers]}
+                for label, givers in by_label.items()
+            ]}}
+            for name, by_label in received.items()
+        ]
+        date = f"2026-02-{day + 1:02d}"
+        snapshots.append({"file": f"{date}_15-00-00.json", "date": date, "participants": participants})
+    return snapshots
+
+
+@pytest.fixture(autouse=True)
+def _fresh_matrix_cache():
+    clear_reaction_matrix_cache()
+    yield
+    clear_reaction_matrix_cache()
+
+
+LAST_SEEN = {"Fabi": "2026-02-06"}  # earlier than Fabi's last snapshot, so the cutoff applies
+
+
+@pytest.mark.parametrize("saved_days", [0, 1, 5, 9, 13, 14])
+def test_resumed_state_matches_full_recompute(saved_days, tmp_path):
+    season = _season()
+    path = tmp_path / "_streak_state.json"
+    save_streak_state(StreakState.build(season[:saved_days], LAST_SEEN), path)
+    state = load_streak_state(path)
+    assert len(state.days) == saved_days
+
+    full = compute_streak_data(season, LAST_SEEN)
+    assert full[0] and full[2]
+    assert compute_streak_data(season, LAST_SEEN, state=state) == full
+
+
+def test_break_detection_matches_full_recompute():
+    # Long positive run, then a switch to negative on the last two days
+    season = _season(days=10, seed=0)
+    for snap in season[-2:]:
+        for p in snap["participants"]:
+            if p["name"] == "Bia":
+                p["characteristics"]["receivedReactions"] = [
+                    {"label": "Cobra", "amount": 1, "participants": [{"name": "Ana"}]},
+                ]
+    for snap in season[:-2]:
+        for p in snap["participants"]:
+            if p["name"] == "Bia":
+                p["characteristics"]["receivedReactions"] = [
+                    {"label": "Coração", "amount": 1, "participants": [{"name": "Ana"}]},
+                ]
+    full = compute_streak_data(season)
+    assert any(b["giver"] == "Ana" and b["receiver"] == "Bia" for b in full[1])
+    assert compute_streak_data(season, state=StreakState.build(season[:7])) == full
+
+
+def test_advance_is_one_day_per_call():
+    season = _season()
+    state = StreakState.build(season[:10], LAST_SEEN)
+    advanced = state.resumed(season[:11], LAST_SEEN)
+    assert advanced.dates == [snap["date"] for snap in season[:11]]
+    assert len(state.days) == 10  # resumed() does not modify the saved state
+
+
+class TestInvalidation:
+    def test_replaced_capture_is_not_a_prefix(self):
+        season = _season()
+        state = StreakState.build(season[:6])
+        season[5] = {**season[5], "file": "2026-02-06_23-00-00.json"}
+        assert not state.covers_prefix_of(season, {})
+        assert compute_streak_data(season, state=state) == compute_streak_data(season)
+
+    def test_new_cutoff_inside_saved_days_forces_rebuild(self):
+        season = _season()
+        state = StreakState.build(season[:12])
+        assert not state.covers_prefix_of(season, LAST_SEEN)
+        assert compute_streak_data(season, LAST_SEEN, state=state) == compute_streak_data(season, LAST_SEEN)
+
+    def test_cutoff_after_saved_days_keeps_state(self):
+        season = _season()
+        state = StreakState.build(season[:6])
+        assert state.covers_prefix_of(season, LAST_SEEN)
+
+    def test_unreadable_or_old_state_is_ignored(self, tmp_path):
+        path = tmp_path / "_streak_state.json"
+        assert load_streak_state(path) is None
+        path.write_text('{"_metadata": {"version": 0}}', encoding="utf-8")
+        assert load_streak_state(path) is None
+        path.write_text("{", encoding="utf-8")
+        assert load_streak_state(path) is None
@@ -0,0 +1,52 @@
+"""Tests for the benchmark suite's synthetic season generator and harness."""
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import data_utils
+import derived_pipeline
+from bench_builders import bench_season, format_results
+from data_utils import get_all_snapshots_with_data
+from schemas import validate_input_files
+from synthetic_season import generate_season
+
+
+def test_generated_season_is_valid(tmp_path):
+    info = generate_season(tmp_path, participants=8, days=15, captures_per_day=2)
+    assert info.snapshot_files == 30
+    validate_input_files(tmp_path)
+
+    snapshots = get_all_snapshots_with_data(tmp_path / "data" / "snapshots")
+    assert len(snapshots) == 30
+    first = snapshots[0]["participants"]
+    assert len(first) == 8
+    # Everyone receives exactly one reaction from each housemate
+    assert all(sum(r["amount"] for r in p["characteristics"]["receivedReactions"]) == 7 for p in first)
+    # Eliminated participants leave the house
+    assert len(snapshots[-1]["participants"]) == 8 - len(info.eliminated)
+
+
+def test_generation_is_deterministic(tmp_path):
+    generate_season(tmp_path / "a", participants=5, days=3, captures_per_day=1, seed=7)
+    generate_season(tmp_path / "b", participants=5, days=3, captures_per_day=1, seed=7)
+    for name in ("paredoes.json", "provas.json", "manual_events.json"):
+        a = json.loads((tmp_path / "a" / "data" / name).read_text(encoding="utf-8"))
+        b = json.loads((tmp_path / "b" / "data" / name).read_text(encoding="utf-8"))
+        assert a == b
+
+
+def test_bench_season_runs_every_stage_in_isolation(tmp_path):
+    generate_season(tmp_path, participants=6, days=10, captures_per_day=1)
+    cwd, derived_dir, cycle_ends = os.getcwd(), derived_pipeline.DERIVED_DIR, data_utils.CYCLE_END_DATES
+
+    results = bench_season(tmp_path, repeat=1, warmup=0)
+
+    assert set(derived_pipeline.DERIVED_GRAPH.by_name) | {"load_snapshots", "total"} == set(results)
+    assert (tmp_path / "data" / "derived" / "index_data.json").exists()
+    # Paths, cwd and the cycle calendar are restored afterwards
+    assert (os.getcwd(), derived_pipeline.DERIVED_DIR, data_utils.CYCLE_END_DATES) == (cwd, derived_dir, cycle_ends)
+    assert format_results({"6p×10d": results}).splitlines()[-1].startswith("total")